@@ -34,6 +34,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 
 from ..constants import AI_UPSCALE_FACTOR, VIDEO_MAX_HEIGHT, VIDEO_MAX_WIDTH
+from ..keyframe_spline import crop_positions, highlight_positions
 
 # Import utilities
 from . import utils
@@ -366,11 +367,12 @@ class AIVideoUpscaler:
             logger.info(f"Trim optimization: Starting from frame {start_frame}")
 
         # Step 1: Extract and crop all frames (no SR yet)
-        # Process only frames in trim range
+        # Process only frames in trim range. Every frame's crop is evaluated
+        # in one vectorized call up front.
+        crops = crop_positions(keyframes_sorted, (start_frame + np.arange(total_frames)) / original_fps)
         for output_frame_idx in range(total_frames):
             source_frame_idx = start_frame + output_frame_idx
-            time = source_frame_idx / original_fps
-            crop = self.interpolate_crop(keyframes_sorted, time)
+            crop = crops[output_frame_idx]
 
             frame = self.extract_frame_with_crop(input_path, source_frame_idx, crop)
 
@@ -747,6 +749,12 @@ class AIVideoUpscaler:
 
             logger.info("=" * 60)
 
+            # Crop (and highlight) for every frame in the trim range, each
+            # evaluated in one vectorized call instead of per frame.
+            frame_times = (start_frame + np.arange(total_frames)) / original_fps
+            crops = crop_positions(keyframes_sorted, frame_times)
+            highlights = highlight_positions(highlight_keyframes, frame_times) if highlight_keyframes else None
+
             # Check if using RealBasicVSR backend
             if self.sr_backend == 'realbasicvsr' and self.vsr_model is not None:
                 logger.info("Using RealBasicVSR temporal super-resolution backend")
@@ -772,12 +780,10 @@ class AIVideoUpscaler:
                     # Actual frame index in the source video
                     frame_idx = start_frame + output_frame_idx
                     time = frame_idx / original_fps
-                    crop = self.interpolate_crop(keyframes_sorted, time)
+                    crop = crops[output_frame_idx]
 
                     # Get highlight for this frame (if any)
-                    highlight = None
-                    if highlight_keyframes and len(highlight_keyframes) > 0:
-                        highlight = self.interpolate_highlight(highlight_keyframes, time)
+                    highlight = highlights[output_frame_idx] if highlights else None
 
                     # Assign GPU in round-robin fashion
                     gpu_id = output_frame_idx % num_workers if use_multi_gpu else 0
@@ -866,7 +872,7 @@ class AIVideoUpscaler:
                         # Actual frame index in the source video
                         source_frame_idx = start_frame + output_frame_idx
                         time = source_frame_idx / original_fps
-                        crop = self.interpolate_crop(keyframes_sorted, time)
+                        crop = crops[output_frame_idx]
 
                         # Log crop info for first and key frames
                         if output_frame_idx == 0 or output_frame_idx % 30 == 0:
@@ -882,8 +888,8 @@ class AIVideoUpscaler:
                                 logger.info(f"✓ De-zoomed frame size: {cropped_w}x{cropped_h}")
 
                             # Apply highlight overlay if keyframes are provided
-                            if highlight_keyframes and len(highlight_keyframes) > 0:
-                                highlight = self.interpolate_highlight(highlight_keyframes, time)
+                            if highlights:
+                                highlight = highlights[output_frame_idx]
                                 if highlight is not None:
                                     frame = KeyframeInterpolator.render_highlight_on_frame(frame, highlight, original_video_size, crop, highlight_effect_type)
                                     if output_frame_idx == 0:
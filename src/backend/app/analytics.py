@@ -4,7 +4,9 @@ import logging
 import re
 import threading
 from collections import defaultdict
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
+
+from psycopg2.extras import execute_values
 
 from app.services.pg import get_pg
 from app.user_context import get_current_impersonator_id, get_current_platform
@@ -62,49 +64,90 @@ def session_engaged_seconds(session_start, last_active, now=None) -> int:
 # ---------------------------------------------------------------------------
 
 class _DailyCounterBuffer:
-    def __init__(self, flush_interval=15):
-        self._buffer: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    """In-memory daily_counters increments, flushed to Postgres in one statement.
+
+    Increments are keyed (day, origin) -> {column: count}, with the day taken
+    when the event happens, so a buffer that straddles midnight lands on the
+    right rows. flush() writes every pending key with ONE multi-row
+    INSERT .. ON CONFLICT DO UPDATE (psycopg2 execute_values, a single page) on
+    ONE pool checkout -- not a statement per key.
+
+    Bounded: once `max_keys` (day, origin) keys are pending, the incrementing
+    thread flushes inline before adding more (backpressure instead of unbounded
+    growth). While Postgres is failing, new keys past 2 * max_keys are dropped
+    and counted in `dropped`; increments to pending keys still merge.
+    close() stops the timer and does the final flush (app shutdown); a later
+    increment restarts the timer.
+    """
+
+    def __init__(self, flush_interval=15, max_keys=1000):
+        self._buffer: dict[tuple[date, str], dict[str, int]] = defaultdict(lambda: defaultdict(int))
         self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one flush at a time
         self._flush_interval = flush_interval
+        self._max_keys = max_keys
         self._timer: threading.Timer | None = None
+        self._closed = False
+        self.dropped = 0
         self._start_flush_timer()
 
     def increment(self, origin: str, column: str):
+        key = (datetime.now(UTC).date(), origin)
         with self._lock:
-            self._buffer[origin][column] += 1
-
-    def flush(self):
+            if self._closed:  # incremented after close(): resume periodic flushing
+                self._closed = False
+                self._start_flush_timer()
+            full = key not in self._buffer and len(self._buffer) >= self._max_keys
+        if full:
+            self.flush()
         with self._lock:
-            if not self._buffer:
+            if key not in self._buffer and len(self._buffer) >= 2 * self._max_keys:
+                self.dropped += 1
+                if self.dropped == 1 or self.dropped % 1000 == 0:
+                    logger.error("[Analytics] Daily counter buffer full, dropped %d increments", self.dropped)
                 return
-            to_flush = dict(self._buffer)
-            self._buffer = defaultdict(lambda: defaultdict(int))
+            self._buffer[key][column] += 1
 
-        try:
-            with get_pg() as conn:
-                cur = conn.cursor()
-                for origin, columns in to_flush.items():
-                    set_clauses = ", ".join(
-                        f"{col} = daily_counters.{col} + %s" for col in columns
-                    )
-                    col_names = ", ".join(columns.keys())
-                    placeholders = ", ".join(["%s"] * len(columns))
-                    counts = list(columns.values())
-
-                    cur.execute(
-                        f"INSERT INTO daily_counters (counter_date, origin_type, {col_names}) "
-                        f"VALUES (CURRENT_DATE, %s, {placeholders}) "
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                if not self._buffer:
+                    return
+                to_flush = self._buffer
+                self._buffer = defaultdict(lambda: defaultdict(int))
+
+            columns = sorted({col for counts in to_flush.values() for col in counts})
+            rows = [
+                (day, origin, *(counts.get(col, 0) for col in columns))
+                for (day, origin), counts in to_flush.items()
+            ]
+            try:
+                set_clauses = ", ".join(f"{col} = daily_counters.{col} + EXCLUDED.{col}" for col in columns)
+                with get_pg() as conn:
+                    execute_values(
+                        conn.cursor(),
+                        f"INSERT INTO daily_counters (counter_date, origin_type, {', '.join(columns)}) "
+                        f"VALUES %s "
                         f"ON CONFLICT (counter_date, origin_type) "
                         f"DO UPDATE SET {set_clauses}",
-                        [origin] + counts + counts,
+                        rows,
+                        page_size=len(rows),
                     )
-            logger.info("[Analytics] Flushed daily counters: %d origins", len(to_flush))
-        except Exception:
-            with self._lock:
-                for origin, columns in to_flush.items():
-                    for col, count in columns.items():
-                        self._buffer[origin][col] += count
-            logger.exception("[Analytics] Failed to flush daily counters, will retry")
+                logger.info("[Analytics] Flushed daily counters: %d keys", len(rows))
+            except Exception:
+                with self._lock:
+                    for key, counts in to_flush.items():
+                        for col, count in counts.items():
+                            self._buffer[key][col] += count
+                logger.exception("[Analytics] Failed to flush daily counters, will retry")
+
+    def close(self):
+        """Stop the flush timer and flush what is pending."""
+        with self._lock:
+            self._closed = True
+            if self._timer:
+                self._timer.cancel()
+        self.flush()
 
     def _start_flush_timer(self):
         self._timer = threading.Timer(self._flush_interval, self._on_timer)
@@ -113,12 +156,19 @@ class _DailyCounterBuffer:
 
     def _on_timer(self):
         self.flush()
-        self._start_flush_timer()
+        if not self._closed:
+            self._start_flush_timer()
 
 
 _counter_buffer = _DailyCounterBuffer(flush_interval=15)
 atexit.register(_counter_buffer.flush)
 
+
+def close_counter_buffer():
+    """Final flush of buffered daily counters (app shutdown, before the PG pool closes)."""
+    _counter_buffer.close()
+
+
 INVITE_CODE_RE = re.compile(r'^[0-9a-f]{8}$')
 
 FLOW_EVENTS = {
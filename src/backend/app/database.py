@@ -44,6 +44,12 @@ _initialized_users: set = set()
 _user_db_versions: dict = {}  # (user_id, profile_id) -> version number
 _db_version_lock = threading.Lock()
 
+# In-process write generation per database -- bumped whenever a TrackedConnection
+# that wrote commits or closes. Keyed ('user', user_id) / ('profile', user_id,
+# profile_id). Feeds data_version() (bootstrap snapshot versioning).
+_write_generations: dict[tuple, int] = {}
+_write_generation_lock = threading.Lock()
+
 # R2 restore cooldown — avoids hammering R2 on transient failures
 _r2_restore_cooldowns: dict[str, float] = {}  # cache_key -> last failure timestamp
 RESTORE_COOLDOWN_SECONDS = 30
@@ -328,7 +334,7 @@ class TrackedCursor:
         """Execute SQL and track if it's a write operation."""
         sql_upper = sql.strip().upper()
         if sql_upper.startswith(('INSERT', 'UPDATE', 'DELETE', 'CREATE', 'DROP', 'ALTER', 'REPLACE')):
-            self._connection._mark_write()
+            self._connection._mark_write(sql_upper)
 
         start = time.perf_counter()
         if parameters is None:
@@ -369,7 +375,7 @@ class TrackedCursor:
         """Execute SQL for multiple parameter sets."""
         sql_upper = sql.strip().upper()
         if sql_upper.startswith(('INSERT', 'UPDATE', 'DELETE', 'REPLACE')):
-            self._connection._mark_write()
+            self._connection._mark_write(sql_upper)
 
         start = time.perf_counter()
         self._cursor.executemany(sql, seq_of_parameters)
@@ -437,10 +443,15 @@ class TrackedConnection:
         # write stranded on local disk -- the 400-credit prod loss.
         self._owner_user_id = owner_user_id
         self._owner_profile_id = owner_profile_id
+        # Set by a raw_clips write; commit() folds the tag-index queue its
+        # triggers filled into the same transaction (services/clip_tag_index.py).
+        self._raw_clips_written = False
 
-    def _mark_write(self):
+    def _mark_write(self, sql_upper: str = ""):
         """Mark that a write operation occurred."""
         self._has_writes = True
+        if 'RAW_CLIPS' in sql_upper:
+            self._raw_clips_written = True
         # Also mark in request context for middleware to detect.
         # Uses mutable dict so the change is visible across BaseHTTPMiddleware's
         # context copy boundary (see _request_context comment above).
@@ -465,13 +476,28 @@ class TrackedConnection:
         """Check if any write operations occurred."""
         return self._has_writes
 
+    def _bump_write_generation(self):
+        if not self._has_writes or not self._owner_user_id:
+            return
+        if self._db_type == 'user':
+            key = ('user', self._owner_user_id)
+        else:
+            key = ('profile', self._owner_user_id, self._owner_profile_id)
+        with _write_generation_lock:
+            _write_generations[key] = _write_generations.get(key, 0) + 1
+
     def cursor(self) -> TrackedCursor:
         """Return a tracked cursor."""
         return TrackedCursor(self._conn.cursor(), self)
 
     def commit(self):
         """Commit the transaction."""
+        if self._raw_clips_written and self._db_type == 'profile':
+            from .services.clip_tag_index import fold_pending_clip_tags
+            fold_pending_clip_tags(self.cursor())
+        self._raw_clips_written = False
         self._conn.commit()
+        self._bump_write_generation()
 
     def rollback(self):
         """Rollback the transaction."""
@@ -480,6 +506,7 @@ class TrackedConnection:
     def close(self):
         """Close the connection."""
         self._conn.close()
+        self._bump_write_generation()
 
     def execute(self, sql: str, parameters: Any = None) -> TrackedCursor:
         """Execute SQL directly on connection."""
@@ -521,6 +548,34 @@ def check_database_size(db_path: Path) -> None:
         logger.debug(f"Could not check database size: {e}")
 
 
+def data_version(db_path: Path, owner: tuple) -> str | None:
+    """Opaque token that changes whenever the SQLite database at `db_path` changes.
+
+    Combines the in-process write generation of `owner` (('user', user_id) or
+    ('profile', user_id, profile_id) -- exact for every TrackedConnection write in
+    this worker) with (inode, size, mtime_ns) of the file and its -wal sidecar,
+    which catches writers outside the tracked connections (raw sqlite3 writers,
+    other processes) and a file swapped in by an R2 restore. Costs two stat calls,
+    no connection: a held-open connection would keep the -wal/-shm sidecars alive
+    and block every WAL-gated restore.
+
+    Returns None when the database file does not exist.
+    """
+    with _write_generation_lock:
+        generation = _write_generations.get(owner, 0)
+    parts = [str(generation)]
+    for path in (db_path, db_path.with_name(db_path.name + "-wal")):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            if path == db_path:
+                return None
+            parts.append("-")
+            continue
+        parts.append(f"{st.st_ino}:{st.st_size}:{st.st_mtime_ns}")
+    return "/".join(parts)
+
+
 def get_local_db_version(user_id: str, profile_id: str) -> int | None:
     """
     Get the locally cached database version for a user+profile.
@@ -1273,6 +1328,23 @@ def ensure_database():
             ON modal_tasks(game_id)
         """)
 
+        # Modal task leases (profile_db v049): the dispatcher's claim on a
+        # running modal_tasks row, renewed by heartbeat; a lapsed lease fails
+        # the task so it is retried (see services/modal_queue.py).
+        # Kept in step with migrations/profile_db/v049_modal_task_leases.py.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS modal_task_leases (
+                task_id      INTEGER PRIMARY KEY REFERENCES modal_tasks(id) ON DELETE CASCADE,
+                owner        TEXT NOT NULL,
+                leased_until TIMESTAMP NOT NULL,
+                heartbeat_at TIMESTAMP NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_modal_task_leases_until
+            ON modal_task_leases(leased_until)
+        """)
+
         # User settings - persisted preferences (synced to R2)
         # Uses JSON for flexible settings storage without schema changes
         cursor.execute("""
@@ -1292,6 +1364,63 @@ def ensure_database():
             )
         """)
 
+        # Segment-packed project archives (profile_db v045): project -> byte
+        # range inside an immutable archive/segments/{segment_id}.seg object.
+        # Projects without a row use the legacy archive/{project_id}.msgpack.
+        # Kept in step with migrations/profile_db/v045_project_archive_segments.py.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_archive_index (
+                project_id   INTEGER PRIMARY KEY,
+                segment_key  TEXT NOT NULL,
+                byte_offset  INTEGER NOT NULL,
+                byte_length  INTEGER NOT NULL,
+                archived_at  TEXT DEFAULT (datetime('now'))
+            )
+        """)
+
+        # Incremental Collections aggregates (profile_db v046): derived member
+        # facts + per-(scope, ratio) rows read by collections_summary, kept
+        # current by triggers that queue changed reels. A profile that first
+        # gets the tables here (ahead of its v046 run) queues every reel, so
+        # the next summary folds a full build.
+        # Kept in step with migrations/profile_db/v046_collection_aggregates.py.
+        from .services.collection_aggregates import create_collection_aggregate_schema
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'collection_reels'"
+        )
+        had_collection_aggregates = cursor.fetchone() is not None
+        create_collection_aggregate_schema(cursor)
+        if not had_collection_aggregates:
+            cursor.execute(
+                "INSERT OR IGNORE INTO collection_dirty (final_video_id) SELECT id FROM final_videos"
+            )
+
+        # Normalized tag index for library clip filtering (profile_db v048):
+        # triggers queue clips whose tags change, the writer's commit folds the
+        # queue. A profile that first gets the tables here (ahead of its v048
+        # run) queues and indexes every clip.
+        # Kept in step with migrations/profile_db/v048_clip_tag_index.py.
+        from .services.clip_tag_index import create_clip_tag_index_schema, fold_pending_clip_tags
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'raw_clip_tags'"
+        )
+        had_clip_tag_index = cursor.fetchone() is not None
+        create_clip_tag_index_schema(cursor)
+        if not had_clip_tag_index:
+            cursor.execute(
+                "INSERT OR IGNORE INTO raw_clip_tags_dirty (clip_id) SELECT id FROM raw_clips"
+            )
+        # Index what is queued now (a new index, or a DB restored mid-queue):
+        # filtered reads judge queued clips from their blobs and never fold.
+        fold_pending_clip_tags(cursor)
+
+        # Row-per-region highlight storage (profile_db v047). Blobs are split
+        # into rows lazily by the first overlay action, so creating the empty
+        # table here (ahead of a profile's v047 run) is always safe.
+        # Kept in step with migrations/profile_db/v047_highlight_regions.py.
+        from .services.highlight_store import create_highlight_regions_schema
+        create_highlight_regions_schema(cursor)
+
         # T82: Multi-video games - track individual video files per game
         # Single-video games use games.blake3_hash directly (no game_videos rows)
         # Multi-video games set games.blake3_hash = NULL and use game_videos rows
@@ -1339,6 +1468,7 @@ def ensure_database():
                 r2_upload_id TEXT NOT NULL,
                 parts_json TEXT,
                 label TEXT,
+                video_metadata_set INTEGER NOT NULL DEFAULT 0,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
@@ -1,53 +1,13 @@
 """
 Crop interpolation utilities for FFmpeg filter generation.
 
-Uses Catmull-Rom cubic spline to match frontend interpolation.
+Uses Catmull-Rom cubic spline to match frontend interpolation (evaluated by
+keyframe_spline).
 """
 
 from typing import Any
 
 
-def _catmull_rom(p0: float, p1: float, p2: float, p3: float, t: float) -> float:
-    t2 = t * t
-    t3 = t2 * t
-    return 0.5 * (
-        (2 * p1)
-        + (-p0 + p2) * t
-        + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t2
-        + (-p0 + 3 * p1 - 3 * p2 + p3) * t3
-    )
-
-
-def _find_spline_indices(sorted_kf, time):
-    if len(sorted_kf) < 2:
-        return None
-    p1_idx = -1
-    p2_idx = -1
-    for i, kf in enumerate(sorted_kf):
-        if kf['time'] <= time:
-            p1_idx = i
-        if kf['time'] > time and p2_idx == -1:
-            p2_idx = i
-            break
-    if p1_idx == -1 or p2_idx == -1:
-        return None
-    duration = sorted_kf[p2_idx]['time'] - sorted_kf[p1_idx]['time']
-    if duration == 0:
-        return None
-    progress = (time - sorted_kf[p1_idx]['time']) / duration
-    p0_idx = max(0, p1_idx - 1)
-    p3_idx = min(len(sorted_kf) - 1, p2_idx + 1)
-    return p0_idx, p1_idx, p2_idx, p3_idx, progress
-
-
-def _spline_prop(sorted_kf, indices, prop):
-    p0_idx, p1_idx, p2_idx, p3_idx, progress = indices
-    return _catmull_rom(
-        sorted_kf[p0_idx][prop], sorted_kf[p1_idx][prop],
-        sorted_kf[p2_idx][prop], sorted_kf[p3_idx][prop], progress,
-    )
-
-
 def interpolate_crop(keyframes: list[dict[str, Any]], time: float) -> dict[str, float]:
     """
     Interpolate crop values between keyframes using Catmull-Rom cubic spline.
@@ -65,26 +25,12 @@ def interpolate_crop(keyframes: list[dict[str, Any]], time: float) -> dict[str,
     if len(keyframes) == 0:
         raise ValueError("No keyframes provided")
 
-    if len(keyframes) == 1:
-        return keyframes[0]
-
-    if time <= keyframes[0]['time']:
-        return keyframes[0]
+    # Single-time lookup through the shared vectorized evaluator (exports
+    # evaluate whole frame ranges with crop_positions directly). Imported here:
+    # it loads numpy, which must stay off the app.main import path.
+    from .keyframe_spline import crop_positions
 
-    if time >= keyframes[-1]['time']:
-        return keyframes[-1]
-
-    indices = _find_spline_indices(keyframes, time)
-    if indices is None:
-        nearest = min(keyframes, key=lambda k: abs(k['time'] - time))
-        return nearest
-
-    return {
-        'x': _spline_prop(keyframes, indices, 'x'),
-        'y': _spline_prop(keyframes, indices, 'y'),
-        'width': _spline_prop(keyframes, indices, 'width'),
-        'height': _spline_prop(keyframes, indices, 'height'),
-    }
+    return crop_positions(keyframes, [time])[0]
 
 
 def generate_crop_filter(keyframes: list[dict[str, Any]], duration: float, fps: float = 30.0) -> dict[str, Any]:
@@ -24,9 +24,13 @@ import sys
 import time
 import traceback
 
+# Cold-start accounting: everything below (dotenv, logging, every router and
+# its transitive imports) is charged to APP_IMPORT_SECONDS.
+_IMPORT_T0 = time.perf_counter()
+
 # Load environment variables from .env file (if exists)
 # Look in project root (two levels up from app/)
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -114,6 +118,25 @@ from app.routers.rank import router as rank_router
 from app.routers.telemetry import router as telemetry_router
 from app.websocket import websocket_export_progress
 
+APP_IMPORT_SECONDS = time.perf_counter() - _IMPORT_T0
+
+# Cold-start phases, name -> milliseconds, filled in by _startup_phase() during
+# lifespan startup and summarised in one "[Startup] ready" log line. Fly machines
+# autostop, so this runs on every wake and the breakdown is user-visible latency.
+STARTUP_PHASES: dict[str, float] = {}
+
+
+@contextmanager
+def _startup_phase(name: str):
+    """Time one startup step into STARTUP_PHASES (logged even if it raises)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+        STARTUP_PHASES[name] = elapsed_ms
+        logger.info(f"[Startup] phase {name}: {elapsed_ms:.0f}ms")
+
 # Environment detection
 ENV = os.getenv("ENV", "development")
 IS_DEV = ENV == "development"
@@ -144,6 +167,9 @@ async def lifespan(app: FastAPI):
     import asyncio
     from concurrent.futures import ThreadPoolExecutor
 
+    startup_t0 = time.perf_counter()
+    STARTUP_PHASES.clear()
+
     io_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="io")
     asyncio.get_running_loop().set_default_executor(io_executor)
     logger.info("[Startup] Default asyncio executor set to bounded I/O pool (max_workers=32)")
@@ -155,6 +181,11 @@ async def lifespan(app: FastAPI):
     set_main_loop(asyncio.get_running_loop())
 
     await _startup_event()
+    phases = ", ".join(f"{name}={ms:.0f}ms" for name, ms in STARTUP_PHASES.items())
+    logger.info(
+        f"[Startup] ready: import={APP_IMPORT_SECONDS * 1000:.0f}ms "
+        f"startup={(time.perf_counter() - startup_t0) * 1000:.0f}ms ({phases})"
+    )
     try:
         yield
     finally:
@@ -478,7 +509,8 @@ async def _startup_event():
     logger.info("VIDEO EDITOR BACKEND STARTING")
     logger.info("=" * 80)
 
-    git_info = get_git_version_info()
+    with _startup_phase("git_info"):
+        git_info = get_git_version_info()
     if git_info:
         logger.info("Git Version Information:")
         logger.info(f"  Branch: {git_info['branch']}")
@@ -520,14 +552,16 @@ async def _startup_event():
 
     # T1960: Initialize Postgres connection pool + schema for global data
     # (auth, sharing, game storage refs). Per-user SQLite stays as-is.
-    from app.services.pg import init_pg_pool, init_pg_schema
-    init_pg_pool()
-    init_pg_schema()
+    with _startup_phase("postgres"):
+        from app.services.pg import init_pg_pool, init_pg_schema
+        init_pg_pool()
+        init_pg_schema()
     logger.info("[Startup] Postgres pool + schema initialized")
 
     # T5683: Initialize poster warming service (in-flight dedup + bounded concurrency)
-    from app.services.poster_warmer import init_poster_warmer
-    init_poster_warmer()
+    with _startup_phase("poster_warmer"):
+        from app.services.poster_warmer import init_poster_warmer
+        init_poster_warmer()
     logger.info("[Startup] Poster warming service initialized")
 
     # Default user 'a' init removed — all users now go through auth.
@@ -543,12 +577,25 @@ async def _startup_event():
     )
 
     # T1583: Start background sweep loop for auto-export + R2 cleanup
-    from app.services.sweep_scheduler import start_sweep_loop
-    await start_sweep_loop()
+    with _startup_phase("sweep_loop"):
+        from app.services.sweep_scheduler import start_sweep_loop
+        await start_sweep_loop()
 
     # T1960: Hourly cleanup of expired sessions + OTP codes
-    from app.services.cleanup import start_cleanup_loop
-    await start_cleanup_loop()
+    with _startup_phase("cleanup_loop"):
+        from app.services.cleanup import start_cleanup_loop
+        await start_cleanup_loop()
+
+    # Admin bulk-email outbox: resume rows left open by a previous process.
+    with _startup_phase("email_outbox"):
+        from app.services.email_outbox import start_email_outbox
+        start_email_outbox()
+
+    # Modal task dispatcher: idle until a profile's session init or an enqueue
+    # hands it a queue; drains under the global and per-user caps from then on.
+    with _startup_phase("modal_queue"):
+        from app.services.modal_queue import start_modal_queue
+        await start_modal_queue()
 
 
 async def _shutdown_event():
@@ -558,6 +605,15 @@ async def _shutdown_event():
     from app.services.cleanup import stop_cleanup_loop
     await stop_cleanup_loop()
 
+    from app.services.email_outbox import stop_email_outbox
+    stop_email_outbox()
+
+    from app.services.modal_queue import stop_modal_queue
+    await stop_modal_queue()
+
+    from app.analytics import close_counter_buffer
+    close_counter_buffer()
+
     from app.services.pg import close_pg_pool
     close_pg_pool()
 
@@ -21,6 +21,9 @@ from .v019_credits import V019Credits
 from .v020_game_link_share_type import V020GameLinkShareType
 from .v021_share_claims import V021ShareClaims
 from .v022_user_usage_daily import V022UserUsageDaily
+from .v023_admin_email_outbox import V023AdminEmailOutbox
+from .v024_user_action_rollup import V024UserActionRollup
+from .v025_credit_user_totals import V025CreditUserTotals
 
 MIGRATIONS = [
     V001Baseline(),
@@ -45,6 +48,9 @@ MIGRATIONS = [
     V020GameLinkShareType(),
     V021ShareClaims(),
     V022UserUsageDaily(),
+    V023AdminEmailOutbox(),
+    V024UserActionRollup(),
+    V025CreditUserTotals(),
 ]
 
 RUNNER = MigrationRunner(MIGRATIONS)
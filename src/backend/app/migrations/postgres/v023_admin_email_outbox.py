@@ -0,0 +1,44 @@
+from ..base import BaseMigration
+
+
+class V023AdminEmailOutbox(BaseMigration):
+    """Durable outbox for admin bulk update emails.
+
+    POST /api/admin/users/bulk/email now enqueues one admin_email_outbox row per
+    recipient under an admin_email_jobs row and returns the job id; the
+    dispatcher in services/email_outbox.py drains the rows. Nothing to backfill
+    -- bulk sends before this were synchronous and left no state behind.
+    """
+
+    version = 23
+    description = "Add admin_email_jobs + admin_email_outbox for queued bulk emails"
+
+    def up(self, conn):
+        cur = conn.cursor()
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS admin_email_jobs (
+                job_id        TEXT PRIMARY KEY,
+                admin_user_id TEXT        NOT NULL,
+                subject       TEXT        NOT NULL,
+                body_html     TEXT        NOT NULL,
+                created_at    TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+        """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS admin_email_outbox (
+                id           BIGSERIAL PRIMARY KEY,
+                job_id       TEXT        NOT NULL REFERENCES admin_email_jobs(job_id) ON DELETE CASCADE,
+                user_id      TEXT        NOT NULL,
+                email        TEXT,
+                status       TEXT        NOT NULL DEFAULT 'pending',
+                attempts     INTEGER     NOT NULL DEFAULT 0,
+                error        TEXT,
+                leased_until TIMESTAMPTZ,
+                updated_at   TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+        """)
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_admin_email_outbox_job ON admin_email_outbox(job_id, id)")
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_admin_email_outbox_open
+                ON admin_email_outbox(id) WHERE status IN ('pending', 'sending')
+        """)
@@ -0,0 +1,94 @@
+from ..base import BaseMigration
+
+
+class V024UserActionRollup(BaseMigration):
+    """Rollups behind the admin user list.
+
+    user_action_rollup holds one row per (user, action) with the count summed
+    over platforms; user_action_totals holds distinct users per action (the
+    unfiltered funnel). trg_user_actions_rollup keeps both exact on every
+    user_actions write. Because the trigger may already have been created by
+    init_pg_schema's DDL before this runs, the rebuild below recomputes both
+    tables from scratch under a SHARE lock (writers wait, nothing is double
+    counted) instead of adding to whatever is there.
+    """
+
+    version = 24
+    description = "Add user_action_rollup + user_action_totals maintained by trigger"
+
+    def up(self, conn):
+        cur = conn.cursor()
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS user_action_rollup (
+                user_id   TEXT    NOT NULL,
+                action    TEXT    NOT NULL,
+                count     INTEGER NOT NULL DEFAULT 0,
+                platforms INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, action)
+            );
+            CREATE TABLE IF NOT EXISTS user_action_totals (
+                action TEXT PRIMARY KEY,
+                users  INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE OR REPLACE FUNCTION user_actions_rollup() RETURNS trigger AS $$
+            DECLARE
+                n INTEGER;
+            BEGIN
+                IF TG_OP = 'UPDATE' AND NEW.user_id = OLD.user_id AND NEW.action = OLD.action THEN
+                    IF NEW.count <> OLD.count THEN
+                        UPDATE user_action_rollup SET count = count + NEW.count - OLD.count
+                        WHERE user_id = NEW.user_id AND action = NEW.action;
+                    END IF;
+                    RETURN NULL;
+                END IF;
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    UPDATE user_action_rollup SET count = count - OLD.count, platforms = platforms - 1
+                    WHERE user_id = OLD.user_id AND action = OLD.action
+                    RETURNING platforms INTO n;
+                    IF n = 0 THEN
+                        DELETE FROM user_action_rollup WHERE user_id = OLD.user_id AND action = OLD.action;
+                        UPDATE user_action_totals SET users = users - 1 WHERE action = OLD.action;
+                    END IF;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO user_action_rollup AS r (user_id, action, count, platforms)
+                    VALUES (NEW.user_id, NEW.action, NEW.count, 1)
+                    ON CONFLICT (user_id, action)
+                    DO UPDATE SET count = r.count + EXCLUDED.count, platforms = r.platforms + 1
+                    RETURNING platforms INTO n;
+                    IF n = 1 THEN
+                        INSERT INTO user_action_totals AS t (action, users) VALUES (NEW.action, 1)
+                        ON CONFLICT (action) DO UPDATE SET users = t.users + 1;
+                    END IF;
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            DO $$
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_user_actions_rollup') THEN
+                    CREATE TRIGGER trg_user_actions_rollup
+                        AFTER INSERT OR UPDATE OR DELETE ON user_actions
+                        FOR EACH ROW EXECUTE FUNCTION user_actions_rollup();
+                END IF;
+            END $$;
+        """)
+        cur.execute(
+            "CREATE INDEX IF NOT EXISTS idx_segments_last_active_user "
+            "ON user_segments(last_active_at DESC, user_id DESC)"
+        )
+        # One DO block = one transaction even on an autocommit connection, so
+        # the lock covers the whole rebuild.
+        cur.execute("""
+            DO $$
+            BEGIN
+                LOCK TABLE user_actions IN SHARE MODE;
+                TRUNCATE user_action_rollup, user_action_totals;
+                INSERT INTO user_action_rollup (user_id, action, count, platforms)
+                SELECT user_id, action, SUM(count), COUNT(*)
+                FROM user_actions
+                GROUP BY user_id, action;
+                INSERT INTO user_action_totals (action, users)
+                SELECT action, COUNT(*) FROM user_action_rollup GROUP BY action;
+            END $$
+        """)
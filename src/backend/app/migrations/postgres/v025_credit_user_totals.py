@@ -0,0 +1,58 @@
+from ..base import BaseMigration
+
+
+class V025CreditUserTotals(BaseMigration):
+    """Per-user credit totals behind the admin panel and Stripe reconciliation.
+
+    credit_user_totals holds credits_spent, credits_purchased and the
+    stripe_purchase amounts and PaymentIntent ids per user;
+    services/credit_ledger.py updates it in the same transaction as every
+    ledger insert. init_pg_schema's DDL may have
+    created the table (and live writes may have started adding to it) before
+    this runs, so the backfill recomputes it from credit_transactions under a
+    SHARE lock rather than adding to whatever is there.
+    """
+
+    version = 25
+    description = "Add credit_user_totals maintained alongside credit_transactions"
+
+    def up(self, conn):
+        cur = conn.cursor()
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS credit_user_totals (
+                user_id           TEXT PRIMARY KEY,
+                credits_spent     BIGINT      NOT NULL DEFAULT 0,
+                credits_purchased BIGINT      NOT NULL DEFAULT 0,
+                purchase_amounts  INTEGER[]   NOT NULL DEFAULT '{}',
+                purchase_refs     TEXT[]      NOT NULL DEFAULT '{}',
+                updated_at        TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+        """)
+        # One statement, so the lock holds across the rebuild even on an
+        # autocommit connection.
+        cur.execute("""
+            DO $$
+            BEGIN
+                LOCK TABLE credit_transactions IN SHARE MODE;
+                TRUNCATE credit_user_totals;
+                INSERT INTO credit_user_totals
+                    (user_id, credits_spent, credits_purchased, purchase_amounts, purchase_refs)
+                SELECT
+                    user_id,
+                    COALESCE(SUM(CASE WHEN amount < 0 AND source != 'admin_set' THEN -amount ELSE 0 END), 0),
+                    COALESCE(SUM(CASE WHEN source = 'stripe_purchase' AND amount > 0 THEN amount ELSE 0 END), 0),
+                    COALESCE(
+                        ARRAY_AGG(amount ORDER BY created_at, id)
+                            FILTER (WHERE source = 'stripe_purchase' AND amount > 0),
+                        '{}'
+                    ),
+                    COALESCE(
+                        ARRAY_AGG(reference_id ORDER BY created_at, id)
+                            FILTER (WHERE source = 'stripe_purchase' AND amount > 0),
+                        '{}'
+                    )
+                FROM credit_transactions
+                GROUP BY user_id;
+            END
+            $$
+        """)
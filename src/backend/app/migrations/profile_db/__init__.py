@@ -41,6 +41,12 @@ from .v041_intro_min_duration import V041IntroMinDuration
 from .v042_text_overlays_regions import V042TextOverlaysRegions
 from .v043_drop_intro_min_duration import V043DropIntroMinDuration
 from .v044_working_clips_framing_version import V044WorkingClipsFramingVersion
+from .v045_project_archive_segments import V045ProjectArchiveSegments
+from .v046_collection_aggregates import V046CollectionAggregates
+from .v047_highlight_regions import V047HighlightRegions
+from .v048_clip_tag_index import V048ClipTagIndex
+from .v049_modal_task_leases import V049ModalTaskLeases
+from .v050_pending_uploads_video_metadata import V050PendingUploadsVideoMetadata
 
 MIGRATIONS = [
     V001Baseline(),
@@ -85,6 +91,12 @@ MIGRATIONS = [
     V042TextOverlaysRegions(),
     V043DropIntroMinDuration(),
     V044WorkingClipsFramingVersion(),
+    V045ProjectArchiveSegments(),
+    V046CollectionAggregates(),
+    V047HighlightRegions(),
+    V048ClipTagIndex(),
+    V049ModalTaskLeases(),
+    V050PendingUploadsVideoMetadata(),
 ]
 
 RUNNER = MigrationRunner(MIGRATIONS)
@@ -0,0 +1,43 @@
+"""
+v045: Add project_archive_index -- where a segment-archived project lives.
+
+Bulk archiving (project_archive.archive_projects_bulk) packs many projects
+into ONE R2 segment object (archive/segments/{segment_id}.seg) instead of one
+archive/{project_id}.msgpack PUT per project. This table maps each project to
+its byte range inside the segment so load_archive can issue a single ranged
+GET on restore/preview. A project with no row here is read from its legacy
+per-project object.
+
+Segments are immutable (a fresh segment_id per bulk run), so a row never goes
+stale; re-publishing a project writes a per-project archive and deletes its
+row in the same transaction (archive_project).
+
+Kept in step with database.py::ensure_database()'s DDL -- a fresh profile gets
+the table there, an existing one gets it here. Idempotent: CREATE TABLE IF
+NOT EXISTS; no backfill (legacy archives keep working through the fallback).
+"""
+
+import logging
+
+from ..base import BaseMigration
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ARCHIVE_INDEX_DDL = """
+CREATE TABLE IF NOT EXISTS project_archive_index (
+    project_id   INTEGER PRIMARY KEY,
+    segment_key  TEXT NOT NULL,     -- relative R2 path, archive/segments/{segment_id}.seg
+    byte_offset  INTEGER NOT NULL,
+    byte_length  INTEGER NOT NULL,
+    archived_at  TEXT DEFAULT (datetime('now'))
+)
+"""
+
+
+class V045ProjectArchiveSegments(BaseMigration):
+    version = 45
+    description = "Add project_archive_index for segment-packed project archives"
+
+    def up(self, conn) -> None:
+        conn.execute(_PROJECT_ARCHIVE_INDEX_DDL)
+        logger.info("[v045] ensured project_archive_index table")
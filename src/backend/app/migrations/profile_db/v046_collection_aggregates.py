@@ -0,0 +1,46 @@
+"""
+v046: Add incrementally maintained Collections aggregates.
+
+collections_summary now reads per-(scope, aspect_ratio) rows from
+collection_aggregates instead of scanning and decoding every published
+final_video per call. Triggers on final_videos / raw_clips / games queue
+changed reels into collection_dirty in the writer's transaction, and
+collection_aggregates.apply_pending_collection_changes folds them.
+See app/services/collection_aggregates.py for the table roles.
+
+Kept in step with database.py::ensure_database() -- both run
+create_collection_aggregate_schema. Idempotent: CREATE ... IF NOT EXISTS, then
+a full rebuild from final_videos (derived data, safe to recompute).
+"""
+
+import logging
+
+from app.services.collection_aggregates import (
+    create_collection_aggregate_schema,
+    rebuild_collection_aggregates,
+)
+
+from ..base import BaseMigration
+
+logger = logging.getLogger(__name__)
+
+
+class V046CollectionAggregates(BaseMigration):
+    version = 46
+    description = "Add incrementally maintained collection aggregates + change triggers"
+
+    def up(self, conn) -> None:
+        present = {
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name IN ('final_videos', 'raw_clips', 'games')"
+            ).fetchall()
+        }
+        if len(present) < 3:
+            # Partial schema (the triggers need all three tables); ensure_database
+            # creates the tables and this schema together on the profile's next open.
+            logger.info("[v046] source tables missing -- skipped")
+            return
+        create_collection_aggregate_schema(conn.cursor())
+        members = rebuild_collection_aggregates(conn)
+        logger.info(f"[v046] built collection aggregates for {members} member reel(s)")
@@ -0,0 +1,58 @@
+"""
+v047: Store overlay highlight regions one row per region.
+
+Overlay actions used to decode, mutate and rewrite the whole
+working_videos.highlights_data blob per gesture. highlight_regions holds one
+msgpack row per region so a gesture touches only its region; triggers hand
+authority back to the blob on any highlights_data write and drop the rows with
+their working video. See app/services/highlight_store.py.
+
+Kept in step with database.py::ensure_database() -- both run
+create_highlight_regions_schema. Splits the blob of every project's CURRENT
+working video (the only one overlay actions edit); older versions keep their
+blobs. Idempotent: a split working video has a NULL blob, so a re-run skips it.
+An undecodable blob is left untouched (T4210) and logged.
+"""
+
+import logging
+
+from app.services.highlight_store import create_highlight_regions_schema, split_highlights
+
+from ..base import BaseMigration
+
+logger = logging.getLogger(__name__)
+
+
+class V047HighlightRegions(BaseMigration):
+    version = 47
+    description = "Split working_videos.highlights_data into per-region highlight_regions rows"
+
+    def up(self, conn) -> None:
+        present = {
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name IN ('working_videos', 'projects')"
+            ).fetchall()
+        }
+        if len(present) < 2:
+            logger.info("[v047] working_videos/projects missing -- skipped")
+            return
+        cursor = conn.cursor()
+        create_highlight_regions_schema(cursor)
+        rows = conn.execute(
+            """
+            SELECT wv.id, wv.highlights_data
+            FROM working_videos wv
+            JOIN projects p ON p.working_video_id = wv.id
+            WHERE wv.highlights_data IS NOT NULL
+            """
+        ).fetchall()
+        split = regions = 0
+        for wv_id, blob in rows:
+            try:
+                regions += split_highlights(cursor, wv_id, blob)
+            except Exception as e:
+                logger.warning(f"[v047] working_video {wv_id}: undecodable highlights_data left as-is: {e}")
+                continue
+            split += 1
+        logger.info(f"[v047] split {split} working video(s) into {regions} highlight region row(s)")
@@ -0,0 +1,37 @@
+"""
+v048: Add the normalized raw_clip_tags index for library clip filtering.
+
+Project-from-clips and its preview filtered tags with one LIKE per tag over the
+msgpack tags blob, scanning every raw_clip. raw_clip_tags holds one
+(tag, clip_id) row per tag; triggers on raw_clips queue changed clips into
+raw_clip_tags_dirty in the writer's transaction and the filter queries fold
+them. See app/services/clip_tag_index.py.
+
+Kept in step with database.py::ensure_database() -- both run
+create_clip_tag_index_schema. Idempotent: CREATE ... IF NOT EXISTS, then a full
+rebuild from raw_clips.tags (derived data, safe to recompute).
+"""
+
+import logging
+
+from app.services.clip_tag_index import create_clip_tag_index_schema, rebuild_clip_tags
+
+from ..base import BaseMigration
+
+logger = logging.getLogger(__name__)
+
+
+class V048ClipTagIndex(BaseMigration):
+    version = 48
+    description = "Add raw_clip_tags index maintained from raw_clips.tags"
+
+    def up(self, conn) -> None:
+        present = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'raw_clips'"
+        ).fetchone()
+        if present is None:
+            logger.info("[v048] raw_clips missing -- skipped")
+            return
+        create_clip_tag_index_schema(conn.cursor())
+        rows = rebuild_clip_tags(conn)
+        logger.info(f"[v048] indexed {rows} clip tag row(s)")
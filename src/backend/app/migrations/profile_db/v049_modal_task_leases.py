@@ -0,0 +1,44 @@
+"""
+v049: Add modal_task_leases -- the dispatcher's claim on a running modal task.
+
+The modal queue used to claim a task by flipping it to 'running' and time it
+out 10 minutes after started_at, so a long GPU task could be failed while
+still alive and a dead one sat for the full 10 minutes. A claim now also
+writes a lease row (owner token + leased_until) that the running task renews
+by heartbeat; check_stale_tasks fails a running task once its lease lapses,
+and an outcome is only recorded by the lease's owner. See
+app/services/modal_queue.py.
+
+Kept in step with database.py::ensure_database()'s DDL -- a fresh profile gets
+the table there, an existing one gets it here. Idempotent: CREATE ... IF NOT
+EXISTS; no backfill (rows already running have no lease and keep the old
+started_at timeout).
+"""
+
+import logging
+
+from ..base import BaseMigration
+
+logger = logging.getLogger(__name__)
+
+_MODAL_TASK_LEASES_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS modal_task_leases (
+        task_id      INTEGER PRIMARY KEY REFERENCES modal_tasks(id) ON DELETE CASCADE,
+        owner        TEXT NOT NULL,
+        leased_until TIMESTAMP NOT NULL,
+        heartbeat_at TIMESTAMP NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_modal_task_leases_until ON modal_task_leases(leased_until)",
+)
+
+
+class V049ModalTaskLeases(BaseMigration):
+    version = 49
+    description = "Add modal_task_leases for leased, heartbeated modal task claims"
+
+    def up(self, conn) -> None:
+        for statement in _MODAL_TASK_LEASES_DDL:
+            conn.execute(statement)
+        logger.info("[v049] ensured modal_task_leases table")
@@ -0,0 +1,43 @@
+"""
+v050: Add pending_uploads.video_metadata_set -- whether the game's video
+metadata (duration/width/height) went onto the R2 object when its multipart
+upload was created.
+
+prepare-upload now attaches the metadata at create, so finalize no longer
+copies the object onto itself. Sessions created before that (or by a client
+that sent no metadata to prepare-upload) still need the copy at finalize; this
+flag tells finalize which sessions those are. See app/routers/games_upload.py.
+
+DEFAULT 0 is correct for every existing row: those sessions were created
+without metadata. During the deploy->migrate window prepare-upload only writes
+the flag when the column exists, and finalize reads a missing column as 0 --
+the copy path, which is always safe.
+
+Modeled on v044 (guarded PRAGMA table_info ALTER; rows are tuples under the
+migration runner's row factory). Idempotent: only adds the column when missing.
+"""
+
+import logging
+
+from ..base import BaseMigration
+
+logger = logging.getLogger(__name__)
+
+
+class V050PendingUploadsVideoMetadata(BaseMigration):
+    version = 50
+    description = "Add pending_uploads.video_metadata_set so finalize knows when to attach metadata"
+
+    def up(self, conn) -> None:
+        has_table = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='pending_uploads'"
+        ).fetchone()
+        if not has_table:
+            return
+
+        cols = {row[1] for row in conn.execute("PRAGMA table_info(pending_uploads)").fetchall()}
+        if "video_metadata_set" not in cols:
+            conn.execute(
+                "ALTER TABLE pending_uploads ADD COLUMN video_metadata_set INTEGER NOT NULL DEFAULT 0"
+            )
+            logger.info("[v050] added pending_uploads.video_metadata_set")
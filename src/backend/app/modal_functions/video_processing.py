@@ -27,6 +27,15 @@ import modal
 # Define the Modal app
 app = modal.App("reel-ballers-video-v2")
 
+_backend_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # src/backend
+_app_dir = os.path.join(_backend_root, "app")
+# The vectorized keyframe evaluator shared with the app-side export paths. It is
+# pure numpy with no `app` imports, so the render images ship just this file at
+# /root/app/keyframe_spline.py (`app` resolves as a namespace package there) and
+# import it lazily: `from app.keyframe_spline import ...`.
+_KEYFRAME_SPLINE_SRC = os.path.join(_app_dir, "keyframe_spline.py")
+_KEYFRAME_SPLINE_DST = "/root/app/keyframe_spline.py"
+
 # Define the container image with all dependencies
 image = (
     modal.Image.debian_slim(python_version="3.11")
@@ -36,6 +45,7 @@ image = (
         "opencv-python-headless",  # Headless for server use
         "numpy",
     )
+    .add_local_file(_KEYFRAME_SPLINE_SRC, remote_path=_KEYFRAME_SPLINE_DST, copy=True)
 )
 
 # Image for the CPU-only download-time composer (T7090 Phase 3,
@@ -47,8 +57,6 @@ image = (
 # does NOT pull `player_intro`/`intro_cards`/`text_render`/`user_db`/FastAPI/DB: the
 # PIL card RENDER runs app-side (its PNG layers arrive via R2 as the plan describes),
 # so only the ffmpeg BURN + concat + outro live here.
-_backend_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # src/backend
-_app_dir = os.path.join(_backend_root, "app")
 # Ship the WHOLE `app/` tree (python source AND the font/branding asset files) at
 # /root/app, which is on sys.path in Modal -- so `import app.services.branded_outro`
 # works and its `Path(__file__).parent.parent / "assets"` resolution finds the
@@ -104,6 +112,7 @@ upscale_image = (
         "wget -q -O /root/.cache/realesrgan/weights/realesr-general-x4v3.pth "
         "https://github.com/xinntao/Real-ESRGAN/releases/download/v0.2.5.0/realesr-general-x4v3.pth",
     )
+    .add_local_file(_KEYFRAME_SPLINE_SRC, remote_path=_KEYFRAME_SPLINE_DST, copy=True)
 )
 
 logging.basicConfig(level=logging.INFO)
@@ -416,6 +425,9 @@ def _process_overlay_gen(job_id: str, input_path: str, output_path: str, params:
     logger.info(f"[{job_id}] Video: {width}x{height} @ {fps}fps, {frame_count} frames")
 
     sorted_regions = sorted(highlight_regions, key=lambda r: r["start_time"])
+    # One track per region: its frames are splined in a single vectorized call
+    # the first time the loop enters it, instead of once per frame.
+    region_tracks = [_highlight_track(r, fps, width, height) for r in sorted_regions]
     # T5225: decode every text layer's PNG ONCE, before the frame loop.
     decoded_text_layers = _decode_text_layers(text_layers, width, height)
 
@@ -449,25 +461,16 @@ def _process_overlay_gen(job_id: str, input_path: str, output_path: str, params:
             current_time = frame_idx / fps
 
             active_region = None
-            for region in sorted_regions:
+            active_track = None
+            for region, track in zip(sorted_regions, region_tracks, strict=True):
                 if region["start_time"] <= current_time <= region["end_time"]:
                     active_region = region
+                    active_track = track
                     break
 
             if active_region:
-                detection_width = active_region.get('videoWidth')
-                detection_height = active_region.get('videoHeight')
-                if detection_width and detection_height and (detection_width != width or detection_height != height):
-                    scale_x = width / detection_width
-                    scale_y = height / detection_height
-                    scaled_keyframes = [{
-                        **kf,
-                        'x': kf['x'] * scale_x, 'y': kf['y'] * scale_y,
-                        'radiusX': kf['radiusX'] * scale_x, 'radiusY': kf['radiusY'] * scale_y,
-                    } for kf in active_region.get('keyframes', [])]
-                    frame = _render_highlight(frame, {**active_region, 'keyframes': scaled_keyframes}, current_time, effect_type, overlay_settings)
-                else:
-                    frame = _render_highlight(frame, active_region, current_time, effect_type, overlay_settings)
+                # Keyframes were scaled to the working video when the track was built.
+                frame = _draw_highlight(frame, active_track.at(frame_idx), active_region, current_time, effect_type, overlay_settings)
 
             if decoded_text_layers:
                 frame = _blend_text_layers(frame, decoded_text_layers, current_time)
@@ -557,6 +560,9 @@ def _process_overlay(job_id: str, input_path: str, output_path: str, params: dic
 
     # Sort regions by start time
     sorted_regions = sorted(highlight_regions, key=lambda r: r["start_time"])
+    # One track per region: its frames are splined in a single vectorized call
+    # the first time the loop enters it, instead of once per frame.
+    region_tracks = [_highlight_track(r, fps, width, height) for r in sorted_regions]
     # T5225: decode every text layer's PNG ONCE, before the frame loop.
     decoded_text_layers = _decode_text_layers(text_layers, width, height)
 
@@ -608,39 +614,19 @@ def _process_overlay(job_id: str, input_path: str, output_path: str, params: dic
 
             # Find active region for this frame
             active_region = None
-            for region in sorted_regions:
+            active_track = None
+            for region, track in zip(sorted_regions, region_tracks, strict=True):
                 if region["start_time"] <= current_time <= region["end_time"]:
                     active_region = region
+                    active_track = track
                     break
 
-            # Render highlight if in a region
+            # Render highlight if in a region. The track's keyframes were scaled
+            # from detection space to the working video when it was built.
             if active_region:
-                # Check if keyframe coordinates need to be scaled from detection space to working video space
-                # Detection may have run on source video (e.g., 2560x1440) but rendering is on working video (e.g., 1080x1920)
-                detection_width = active_region.get('videoWidth')
-                detection_height = active_region.get('videoHeight')
-
-                if detection_width and detection_height and (detection_width != width or detection_height != height):
-                    # Create a copy of region with scaled coordinates
-                    scale_x = width / detection_width
-                    scale_y = height / detection_height
-                    scaled_keyframes = []
-                    for kf in active_region.get('keyframes', []):
-                        scaled_keyframes.append({
-                            **kf,
-                            'x': kf['x'] * scale_x,
-                            'y': kf['y'] * scale_y,
-                            'radiusX': kf['radiusX'] * scale_x,
-                            'radiusY': kf['radiusY'] * scale_y,
-                        })
-                    scaled_region = {**active_region, 'keyframes': scaled_keyframes}
-                    frame = _render_highlight(
-                        frame, scaled_region, current_time, effect_type, overlay_settings
-                    )
-                else:
-                    frame = _render_highlight(
-                        frame, active_region, current_time, effect_type, overlay_settings
-                    )
+                frame = _draw_highlight(
+                    frame, active_track.at(frame_idx), active_region, current_time, effect_type, overlay_settings
+                )
 
             if decoded_text_layers:
                 frame = _blend_text_layers(frame, decoded_text_layers, current_time)
@@ -695,93 +681,53 @@ def _process_overlay(job_id: str, input_path: str, output_path: str, params: dic
     logger.info(f"[{job_id}] Overlay export complete: {frame_idx} frames")
 
 
-def _catmull_rom(p0, p1, p2, p3, t):
-    t2 = t * t
-    t3 = t2 * t
-    return 0.5 * (
-        (2 * p1)
-        + (-p0 + p2) * t
-        + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t2
-        + (-p0 + 3 * p1 - 3 * p2 + p3) * t3
-    )
+def _spline_interpolate_highlight(sorted_kf, current_time):
+    """Catmull-Rom spline interpolation matching frontend interpolateHighlightSpline.
 
+    Single-time lookup through the shared vectorized evaluator; the render loops
+    use _highlight_track() to evaluate a whole region at once.
+    """
+    from app.keyframe_spline import highlight_positions
 
-def _find_spline_indices(sorted_kf, time):
-    if len(sorted_kf) < 2:
-        return None
-    p1_idx = -1
-    p2_idx = -1
-    for i, kf in enumerate(sorted_kf):
-        if kf['time'] <= time:
-            p1_idx = i
-        if kf['time'] > time and p2_idx == -1:
-            p2_idx = i
-            break
-    if p1_idx == -1 or p2_idx == -1:
-        return None
-    duration = sorted_kf[p2_idx]['time'] - sorted_kf[p1_idx]['time']
-    if duration == 0:
-        return None
-    progress = (time - sorted_kf[p1_idx]['time']) / duration
-    p0_idx = max(0, p1_idx - 1)
-    p3_idx = min(len(sorted_kf) - 1, p2_idx + 1)
-    return p0_idx, p1_idx, p2_idx, p3_idx, progress
-
-
-def _spline_prop(sorted_kf, indices, prop):
-    p0_idx, p1_idx, p2_idx, p3_idx, progress = indices
-    return _catmull_rom(
-        sorted_kf[p0_idx][prop], sorted_kf[p1_idx][prop],
-        sorted_kf[p2_idx][prop], sorted_kf[p3_idx][prop], progress,
-    )
+    return highlight_positions(sorted_kf, [current_time])[0]
 
 
-def _spline_interpolate_highlight(sorted_kf, current_time):
-    """Catmull-Rom spline interpolation matching frontend interpolateHighlightSpline."""
-    if not sorted_kf:
-        return None
-    if current_time > sorted_kf[-1]['time']:
-        return None
-    if len(sorted_kf) == 1:
-        return sorted_kf[0]
-    if current_time <= sorted_kf[0]['time']:
-        return sorted_kf[0]
-    if current_time >= sorted_kf[-1]['time']:
-        return sorted_kf[-1]
-
-    p1_idx = -1
-    p2_idx = -1
-    for i, kf in enumerate(sorted_kf):
-        if kf['time'] <= current_time:
-            p1_idx = i
-        if kf['time'] > current_time and p2_idx == -1:
-            p2_idx = i
-            break
-    if p1_idx == -1 or p2_idx == -1:
-        return min(sorted_kf, key=lambda k: abs(k['time'] - current_time))
-
-    duration = sorted_kf[p2_idx]['time'] - sorted_kf[p1_idx]['time']
-    if duration == 0:
-        return sorted_kf[p1_idx]
-    progress = (current_time - sorted_kf[p1_idx]['time']) / duration
-
-    p0_idx = max(0, p1_idx - 1)
-    p3_idx = min(len(sorted_kf) - 1, p2_idx + 1)
-
-    def sp(prop):
-        return _catmull_rom(
-            sorted_kf[p0_idx][prop], sorted_kf[p1_idx][prop],
-            sorted_kf[p2_idx][prop], sorted_kf[p3_idx][prop], progress,
-        )
+def _region_render_keyframes(region: dict, width: int | None = None, height: int | None = None) -> list:
+    """The keyframes a region renders with: scaled from detection space to the
+    working video when the region was detected at another size, and limited to
+    the region's bounds (keyframes outside a shrunk region don't influence it)."""
+    keyframes = region.get("keyframes", [])
+    detection_width = region.get('videoWidth')
+    detection_height = region.get('videoHeight')
+    if width and height and detection_width and detection_height and (
+        detection_width != width or detection_height != height
+    ):
+        # Detection may have run on source video (e.g., 2560x1440) but rendering
+        # is on working video (e.g., 1080x1920)
+        scale_x = width / detection_width
+        scale_y = height / detection_height
+        keyframes = [{
+            **kf,
+            'x': kf['x'] * scale_x, 'y': kf['y'] * scale_y,
+            'radiusX': kf['radiusX'] * scale_x, 'radiusY': kf['radiusY'] * scale_y,
+        } for kf in keyframes]
 
-    return {
-        'x': sp('x'), 'y': sp('y'),
-        'radiusX': sp('radiusX'), 'radiusY': sp('radiusY'),
-        'strokeOpacity': max(0.0, min(1.0, sp('strokeOpacity'))),
-        'fillOpacity': max(0.0, min(1.0, sp('fillOpacity'))),
-        'color': sorted_kf[p1_idx].get('color'),
-        'time': current_time,
-    }
+    start_time = region.get("start_time")
+    end_time = region.get("end_time")
+    if start_time is not None and end_time is not None:
+        eps = 0.04
+        keyframes = [kf for kf in keyframes if start_time - eps <= kf["time"] <= end_time + eps]
+    return sorted(keyframes, key=lambda k: k['time'])
+
+
+def _highlight_track(region: dict, fps: float, width: int, height: int):
+    """HighlightTrack for one region: every frame it covers is splined in one
+    vectorized call when the render loop first enters it."""
+    from app.keyframe_spline import HighlightTrack
+
+    return HighlightTrack(
+        _region_render_keyframes(region, width, height), region["start_time"], region["end_time"], fps,
+    )
 
 
 # T5250 spotlight exit-fade envelope — INLINE MIRROR of the shared spec. Kept self-contained
@@ -816,27 +762,22 @@ def _render_highlight(frame, region: dict, current_time: float, effect_type: str
     Supports bold stroke with dark outline, optional fill, configurable dim.
     Applies the T5250 exit fade-out envelope on top (no entrance animation).
     """
+    result = _spline_interpolate_highlight(_region_render_keyframes(region), current_time)
+    return _draw_highlight(frame, result, region, current_time, effect_type, overlay_settings)
+
+
+def _draw_highlight(frame, result, region: dict, current_time: float, effect_type: str, overlay_settings: dict | None = None):
+    """Draw an already-interpolated highlight (`result`, None = nothing to draw)
+    for `region` at `current_time`. The render loops pass positions from a
+    _highlight_track(); _render_highlight() interpolates a single frame."""
     import cv2
     import numpy as np
 
-    keyframes = region.get("keyframes", [])
-    if not keyframes:
+    if result is None:
         return frame
 
     start_time = region.get("start_time")
     end_time = region.get("end_time")
-    if start_time is not None and end_time is not None:
-        eps = 0.04
-        keyframes = [kf for kf in keyframes if start_time - eps <= kf["time"] <= end_time + eps]
-        if not keyframes:
-            return frame
-
-    sorted_kf = sorted(keyframes, key=lambda k: k['time'])
-    result = _spline_interpolate_highlight(sorted_kf, current_time)
-
-    if result is None:
-        return frame
-
     settings = overlay_settings or {}
 
     # T5250: exit fade-out envelope, derived from the region bounds. Standard behavior —
@@ -1260,39 +1201,6 @@ def _get_realesrgan_model():
     return _realesrgan_model
 
 
-def _interpolate_crop(sorted_keyframes: list, time: float) -> dict:
-    """Interpolate crop position using Catmull-Rom spline.
-
-    Args:
-        sorted_keyframes: Keyframes pre-sorted by time (caller must sort).
-        time: Time in seconds (relative to clip start, 0-based).
-    """
-    if not sorted_keyframes:
-        return None
-
-    if len(sorted_keyframes) == 1:
-        return sorted_keyframes[0].copy()
-
-    if time <= sorted_keyframes[0]['time']:
-        return sorted_keyframes[0].copy()
-
-    if time >= sorted_keyframes[-1]['time']:
-        return sorted_keyframes[-1].copy()
-
-    indices = _find_spline_indices(sorted_keyframes, time)
-    if indices is None:
-        nearest = min(sorted_keyframes, key=lambda k: abs(k['time'] - time))
-        return nearest.copy()
-
-    return {
-        'time': time,
-        'x': _spline_prop(sorted_keyframes, indices, 'x'),
-        'y': _spline_prop(sorted_keyframes, indices, 'y'),
-        'width': _spline_prop(sorted_keyframes, indices, 'width'),
-        'height': _spline_prop(sorted_keyframes, indices, 'height'),
-    }
-
-
 def rotate_then_crop(frame, rotation_deg, x, y, w, h):
     """Rotate the full frame about its center (output kept at source W*H) THEN
     slice the axis-aligned crop (T5640).
@@ -1484,8 +1392,11 @@ def process_framing_ai(
 
             yield {"progress": 11, "phase": "seeking", "message": "Seeking to clip range..."}
 
-            # Sort keyframes once (pre-sorted for _interpolate_crop)
-            sorted_keyframes = sorted(keyframes, key=lambda k: k['time'])
+            # Every frame's crop in one vectorized call (keyframe_spline sorts).
+            import numpy as np
+
+            from app.keyframe_spline import crop_positions
+            crops = crop_positions(keyframes, np.arange(start_frame, end_frame) / original_fps)
 
             # Load Real-ESRGAN model
             yield {"progress": 12, "phase": "loading_model", "message": "Loading AI model..."}
@@ -1514,8 +1425,7 @@ def process_framing_ai(
                 # frame_idx is a scratch-file frame index, and the scratch file
                 # starts at the clip's start, so frame_idx/fps IS the
                 # clip-relative time (no clip_start subtraction needed).
-                crop_time = frame_idx / original_fps
-                crop = _interpolate_crop(sorted_keyframes, crop_time)
+                crop = crops[frame_idx - start_frame]
 
                 if crop:
                     # Apply crop
@@ -1883,8 +1793,11 @@ def process_framing_ai_l4(
             frames_to_process = end_frame - start_frame
             logger.info(f"[{job_id}] Processing frames {start_frame}-{end_frame} ({frames_to_process} frames)")
 
-            # Sort keyframes once
-            sorted_keyframes = sorted(keyframes, key=lambda k: k['time'])
+            # Every frame's crop in one vectorized call (keyframe_spline sorts).
+            import numpy as np
+
+            from app.keyframe_spline import crop_positions
+            crops = crop_positions(keyframes, np.arange(start_frame, end_frame) / original_fps - clip_start)
 
             # Load Real-ESRGAN model
             upsampler = _get_realesrgan_model()
@@ -1903,8 +1816,7 @@ def process_framing_ai_l4(
                     continue
 
                 # Crop keyframe time is relative to clip start (0-based)
-                crop_time = (frame_idx / original_fps) - clip_start
-                crop = _interpolate_crop(sorted_keyframes, crop_time)
+                crop = crops[frame_idx - start_frame]
 
                 if crop:
                     x = int(max(0, crop['x']))
@@ -2108,8 +2020,15 @@ def process_framing_ai_chunk(
 
             scratch_total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
 
-            # Sort keyframes for interpolation
-            sorted_keyframes = sorted(keyframes, key=lambda k: k['time'])
+            # Every scratch frame's crop in one vectorized call: scratch-local
+            # index -> source-absolute time -> clip-relative crop time.
+            import numpy as np
+
+            from app.keyframe_spline import crop_positions
+            crops = crop_positions(
+                keyframes,
+                (chunk_start_time + np.arange(scratch_total_frames) / original_fps) - source_start_time,
+            )
 
             # Load Real-ESRGAN model
             logger.info(f"[{chunk_id}] Loading AI model...")
@@ -2129,11 +2048,7 @@ def process_framing_ai_chunk(
                     logger.warning(f"[{chunk_id}] Could not read scratch frame {local_idx}")
                     continue
 
-                # Map scratch-local frame index back to source-absolute time,
-                # then subtract source_start_time to get clip-relative crop time.
-                source_time = chunk_start_time + (local_idx / original_fps)
-                crop_time = source_time - source_start_time
-                crop = _interpolate_crop(sorted_keyframes, crop_time)
+                crop = crops[local_idx]
 
                 if crop:
                     # Apply crop
@@ -2558,6 +2473,513 @@ def _build_simple_ffmpeg_cmd(frame_pattern, source_path, output_path, fps, has_a
         ]
 
 
+# ============================================================================
+# process_clips_ai pipeline: extract/decode -> enhance -> encode
+# ============================================================================
+# Run back to back per clip, the GPU idles through every scratch extraction,
+# decode and PNG->x264 encode. The three stages run concurrently instead:
+#
+#   reader thread   scratch-extract clip N+1, decode + crop its frames
+#   caller thread   Real-ESRGAN enhance + PNG write of clip N (yields progress)
+#   encode worker   FFmpeg encode (+ scratch/frames cleanup) of clip N-1
+#
+# Memory is bounded by the frame queue (CLIPS_AI_PREFETCH_FRAMES cropped frames
+# in flight) and disk by the encode backlog (at most CLIPS_AI_ENCODE_BACKLOG
+# finished clips waiting behind the encode in progress).
+CLIPS_AI_PREFETCH_FRAMES = int(os.environ.get("CLIPS_AI_PREFETCH_FRAMES", "48"))
+CLIPS_AI_ENCODE_BACKLOG = int(os.environ.get("CLIPS_AI_ENCODE_BACKLOG", "1"))
+
+
+def _clips_ai_read(
+    job_id: str,
+    clips_data: list,
+    source_full_keys: list,
+    temp_dir: str,
+    target_width: int,
+    target_height: int,
+    fps: int,
+    source_url,
+    out_q,
+    stop,
+    stage_seconds: dict,
+) -> None:
+    """Reader stage: for each clip in order, put ("clip", meta), then one
+    ("frame", clip_idx, cropped) per decoded frame, then ("end", clip_idx).
+    A failure is handed over as ("error", exc). Returns early once `stop` is set."""
+    import queue
+    import subprocess
+
+    import cv2
+    import numpy as np
+
+    from app.keyframe_spline import crop_positions
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                out_q.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    total_clips = len(clips_data)
+    try:
+        for clip_idx, clip_data in enumerate(clips_data):
+            busy_start = time.perf_counter()
+
+            # Get source key (handle index mapping if needed)
+            source_idx = clip_data.get('clipIndex', clip_idx)
+            if source_idx >= len(source_full_keys):
+                source_idx = clip_idx
+            full_source_key = source_full_keys[source_idx]
+
+            keyframes = clip_data.get('keyframes', [])
+            segment_data = clip_data.get('segment_data', {})
+            clip_rotation = clip_data.get('rotation', 0) or 0
+
+            # Determine clip range in source video (needed before extraction)
+            clip_source_start = clip_data.get('source_start_time', 0.0)
+            clip_source_end = clip_data.get('source_end_time', None)
+
+            # === Scratch-extract the clip's sub-range from R2 ===
+            # Fresh presigned URL per iteration (signing is local, free).
+            # Never pass a presigned URL to cv2.VideoCapture — HTTPS seeks
+            # hang 30+s (T1220 tracer). Always use a local scratch file.
+            scratch_path = os.path.join(temp_dir, f"clip_source_{clip_idx}.mp4")
+
+            # Need a known end for extraction; if not provided, probe duration.
+            # We can ask ffmpeg to copy to EOF by omitting -to when end is None.
+            extract_cmd = ["ffmpeg", "-y", "-ss", str(clip_source_start)]
+            if clip_source_end is not None:
+                extract_cmd += ["-to", str(clip_source_end)]
+            extract_cmd += ["-i", source_url(full_source_key), "-c", "copy", scratch_path]
+
+            logger.info(f"[{job_id}] Clip {clip_idx+1}/{total_clips}: scratch-extracting {full_source_key} "
+                        f"[{clip_source_start:.2f}s - {clip_source_end}]")
+            extract_result = subprocess.run(extract_cmd, capture_output=True, text=True)
+            if extract_result.returncode != 0:
+                logger.error(f"[{job_id}] Scratch extract failed: {extract_result.stderr[:500]}")
+                raise RuntimeError(f"Scratch extraction failed for clip {clip_idx+1}")
+
+            # Open scratch (local file, fast seeks)
+            cap = cv2.VideoCapture(scratch_path)
+            try:
+                if not cap.isOpened():
+                    raise ValueError(f"Could not open scratch video: {scratch_path}")
+
+                original_fps = cap.get(cv2.CAP_PROP_FPS) or fps
+                total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                original_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                original_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                duration = total_frames / original_fps if original_fps > 0 else 0  # scratch duration
+
+                logger.info(f"[{job_id}] Clip {clip_idx+1}: {original_width}x{original_height} @ {original_fps:.1f}fps, {total_frames} frames (scratch)")
+
+                # All times below are SCRATCH-RELATIVE (scratch frame 0 == original clip_source_start).
+                # Combine extraction range with user trim (trim is already relative to clip start)
+                trim_start_rel, trim_end_rel = _get_trim_range(segment_data, duration)
+                start_frame = int(trim_start_rel * original_fps)
+                end_frame = min(int(trim_end_rel * original_fps), total_frames)
+                frames_to_process = max(1, end_frame - start_frame)
+
+                logger.info(f"[{job_id}] Clip {clip_idx+1}: scratch-relative trim {trim_start_rel:.2f}s-{trim_end_rel:.2f}s")
+                logger.info(f"[{job_id}] Clip {clip_idx+1}: Processing frames {start_frame}-{end_frame} ({frames_to_process} frames)")
+
+                # Every frame's crop in one vectorized call (keyframe_spline sorts).
+                # Keyframe time is relative to clip start; scratch frame 0 IS clip start.
+                crops = crop_positions(keyframes or [], np.arange(start_frame, end_frame) / original_fps)
+
+                if not keyframes:
+                    # Smart center crop: maintain target aspect ratio
+                    target_ratio = target_width / target_height
+                    source_ratio = original_width / original_height
+                    if source_ratio > target_ratio:
+                        # Source is wider - crop sides
+                        crop_height = original_height
+                        crop_width = int(original_height * target_ratio)
+                        center_crop = {'x': (original_width - crop_width) / 2, 'y': 0,
+                                       'width': crop_width, 'height': crop_height}
+                    else:
+                        # Source is taller - crop top/bottom
+                        crop_width = original_width
+                        crop_height = int(original_width / target_ratio)
+                        center_crop = {'x': 0, 'y': (original_height - crop_height) / 2,
+                                       'width': crop_width, 'height': crop_height}
+
+                stage_seconds["extract_decode"] += time.perf_counter() - busy_start
+                if not put(("clip", {
+                    "clip_idx": clip_idx,
+                    "scratch_path": scratch_path,
+                    "segment_data": segment_data,
+                    "trim_start_rel": trim_start_rel,
+                    "frames_to_process": frames_to_process,
+                })):
+                    return
+
+                # Seek once (scratch file, fast), read sequentially
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+                for frame_num in range(start_frame, end_frame):
+                    busy_start = time.perf_counter()
+                    ret, frame = cap.read()
+                    if not ret or frame is None:
+                        logger.warning(f"[{job_id}] Could not read frame {frame_num}")
+                        continue
+
+                    # Get interpolated crop or use smart center crop
+                    crop = crops[frame_num - start_frame] if keyframes else center_crop
+
+                    # Apply crop with bounds checking
+                    x = max(0, min(int(crop['x']), original_width - int(crop['width'])))
+                    y = max(0, min(int(crop['y']), original_height - int(crop['height'])))
+                    w = int(crop['width'])
+                    h = int(crop['height'])
+
+                    # Ensure valid dimensions
+                    w = max(1, min(w, original_width - x))
+                    h = max(1, min(h, original_height - y))
+
+                    # Own copy of the crop so the queued item doesn't pin the full frame.
+                    cropped = np.ascontiguousarray(rotate_then_crop(frame, clip_rotation, x, y, w, h))
+                    stage_seconds["extract_decode"] += time.perf_counter() - busy_start
+                    if not put(("frame", clip_idx, cropped)):
+                        return
+            finally:
+                cap.release()
+
+            if not put(("end", clip_idx)):
+                return
+    except Exception as e:
+        put(("error", e))
+
+
+def _clips_ai_encode(
+    job_id: str,
+    clip: dict,
+    frames_dir: str,
+    frame_count: int,
+    clip_output_path: str,
+    fps: int,
+    include_audio: bool,
+    stage_seconds: dict,
+) -> str:
+    """Encode stage: PNG frames (+ scratch audio) -> clip MP4, then delete the
+    clip's scratch and frames. Returns the clip path; raises on FFmpeg failure."""
+    import subprocess
+
+    busy_start = time.perf_counter()
+    clip_idx = clip["clip_idx"]
+    scratch_path = clip["scratch_path"]
+    segment_data = clip["segment_data"]
+    trim_start_rel = clip["trim_start_rel"]
+    frame_pattern = os.path.join(frames_dir, "frame_%06d.png")
+
+    # Check if scratch has audio
+    has_audio = _has_audio_stream(scratch_path) and include_audio
+
+    # Check for speed changes
+    segments = segment_data.get('segments', []) if segment_data else []
+    has_speed_changes = any(seg.get('speed', 1.0) != 1.0 for seg in segments)
+
+    # Build FFmpeg command
+    if has_speed_changes and segments:
+        # Complex filtergraph for speed changes
+        logger.info(f"[{job_id}] Clip {clip_idx+1}: Applying speed changes")
+
+        filter_parts = []
+        audio_filter_parts = []
+        output_labels = []
+        audio_labels = []
+
+        trim_offset = trim_start_rel
+        output_duration = frame_count / fps
+
+        for seg_idx, seg in enumerate(segments):
+            seg_start = max(0, seg['start'] - trim_offset)
+            seg_end = min(output_duration, seg['end'] - trim_offset)
+            speed = seg.get('speed', 1.0)
+
+            if seg_end <= seg_start:
+                continue
+
+            # Video speed
+            if speed != 1.0:
+                filter_parts.append(
+                    f"[0:v]trim=start={seg_start}:end={seg_end},setpts=(PTS-STARTPTS)/{speed}[v{seg_idx}]"
+                )
+            else:
+                filter_parts.append(
+                    f"[0:v]trim=start={seg_start}:end={seg_end},setpts=PTS-STARTPTS[v{seg_idx}]"
+                )
+            output_labels.append(f"[v{seg_idx}]")
+
+            # Audio speed — times are clip-relative; scratch file is
+            # already trimmed to the clip, so no clip_start offset.
+            if has_audio:
+                audio_start = seg['start']
+                audio_end = seg['end']
+                if speed != 1.0:
+                    atempo_val = max(0.5, min(2.0, speed))
+                    audio_filter_parts.append(
+                        f"[1:a]atrim=start={audio_start}:end={audio_end},asetpts=PTS-STARTPTS,atempo={atempo_val}[a{seg_idx}]"
+                    )
+                else:
+                    audio_filter_parts.append(
+                        f"[1:a]atrim=start={audio_start}:end={audio_end},asetpts=PTS-STARTPTS[a{seg_idx}]"
+                    )
+                audio_labels.append(f"[a{seg_idx}]")
+
+        if output_labels:
+            v_concat = ''.join(output_labels)
+
+            if has_audio and audio_filter_parts:
+                a_concat = ''.join(audio_labels)
+                all_filters = ';'.join(filter_parts + audio_filter_parts)
+                filter_complex = f"{all_filters};{v_concat}concat=n={len(output_labels)}:v=1:a=0[outv];{a_concat}concat=n={len(audio_labels)}:v=0:a=1[outa]"
+
+                ffmpeg_cmd = [
+                    "ffmpeg", "-y",
+                    "-framerate", str(fps),
+                    "-i", frame_pattern,
+                    "-i", scratch_path,
+                    "-filter_complex", filter_complex,
+                    "-map", "[outv]",
+                    "-map", "[outa]",
+                    "-c:v", "libx264",
+                    "-pix_fmt", "yuv420p",
+                    "-preset", "fast",
+                    "-crf", "23",
+                    "-c:a", "aac",
+                    "-b:a", "192k",
+                    "-movflags", "+faststart",
+                    clip_output_path
+                ]
+            else:
+                all_filters = ';'.join(filter_parts)
+                filter_complex = f"{all_filters};{v_concat}concat=n={len(output_labels)}:v=1:a=0[outv]"
+
+                ffmpeg_cmd = [
+                    "ffmpeg", "-y",
+                    "-framerate", str(fps),
+                    "-i", frame_pattern,
+                    "-filter_complex", filter_complex,
+                    "-map", "[outv]",
+                    "-c:v", "libx264",
+                    "-pix_fmt", "yuv420p",
+                    "-preset", "fast",
+                    "-crf", "23",
+                    "-movflags", "+faststart",
+                    clip_output_path
+                ]
+        else:
+            # Fallback to simple encoding. The trim start is scratch-relative.
+            ffmpeg_cmd = _build_simple_ffmpeg_cmd(
+                frame_pattern, scratch_path, clip_output_path,
+                fps, has_audio, trim_start_rel, frame_count
+            )
+    else:
+        # Simple encoding (no speed changes). The trim start is scratch-relative.
+        ffmpeg_cmd = _build_simple_ffmpeg_cmd(
+            frame_pattern, scratch_path, clip_output_path,
+            fps, has_audio, trim_start_rel, frame_count
+        )
+
+    logger.info(f"[{job_id}] FFmpeg command: {' '.join(ffmpeg_cmd[:8])}...")
+    result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
+
+    if result.returncode != 0:
+        logger.error(f"[{job_id}] FFmpeg error: {result.stderr[:500]}")
+        raise RuntimeError(f"FFmpeg encoding failed for clip {clip_idx+1}")
+
+    logger.info(f"[{job_id}] Clip {clip_idx+1} encoded successfully")
+
+    # Clean up per-clip scratch + frames to keep disk bounded
+    try:
+        if os.path.exists(scratch_path):
+            os.remove(scratch_path)
+        if os.path.isdir(frames_dir):
+            import shutil as _shutil
+            _shutil.rmtree(frames_dir, ignore_errors=True)
+    except Exception as cleanup_err:
+        logger.warning(f"[{job_id}] Clip {clip_idx+1} cleanup failed: {cleanup_err}")
+
+    stage_seconds["encode"] += time.perf_counter() - busy_start
+    return clip_output_path
+
+
+def _clips_ai_pipeline(
+    job_id: str,
+    clips_data: list,
+    source_full_keys: list,
+    temp_dir: str,
+    upsampler,
+    target_width: int,
+    target_height: int,
+    fps: int,
+    include_audio: bool,
+    source_url=_presigned_source_url,
+):
+    """Upscale every clip of a process_clips_ai job with the three stages above
+    overlapped. Generator: yields the same progress dicts (15% -> 75%) the
+    sequential loop did and returns {"paths": clip MP4s in order,
+    "wall_seconds", "stage_seconds": busy time per stage}.
+
+    `upsampler` is anything with Real-ESRGAN's enhance(img, outscale) -> (img, _);
+    `source_url(key)` is what FFmpeg reads each scratch range from. Locally, a
+    MockVideoUpscaler and a path lookup run the whole pipeline on CPU.
+    """
+    import queue
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+
+    import cv2
+
+    total_clips = len(clips_data)
+
+    # Progress range: 15% to 75% for upscaling
+    upscale_progress_start = 15
+    upscale_progress_end = 75
+    upscale_progress_per_clip = (upscale_progress_end - upscale_progress_start) / total_clips
+
+    stage_seconds = {"extract_decode": 0.0, "enhance": 0.0, "encode": 0.0}
+    frames_q = queue.Queue(maxsize=max(1, CLIPS_AI_PREFETCH_FRAMES))
+    stop = threading.Event()
+    reader = threading.Thread(
+        target=_clips_ai_read,
+        args=(job_id, clips_data, source_full_keys, temp_dir, target_width, target_height,
+              fps, source_url, frames_q, stop, stage_seconds),
+        name=f"clips-ai-read-{job_id}",
+        daemon=True,
+    )
+    encoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clips-ai-encode")
+    encodes = []  # one future per finished clip, in clip order
+
+    wall_start = time.perf_counter()
+    reader.start()
+    try:
+        clips_done = 0
+        clip = None
+        while clips_done < total_clips:
+            try:
+                item = frames_q.get(timeout=1.0)
+            except queue.Empty:
+                if not reader.is_alive():
+                    raise RuntimeError("Clip reader stopped before all clips were decoded") from None
+                continue
+            kind = item[0]
+
+            if kind == "error":
+                raise item[1]
+
+            if kind == "clip":
+                clip = item[1]
+                clip_idx = clip["clip_idx"]
+                frames_to_process = clip["frames_to_process"]
+                clip_progress_start = upscale_progress_start + (clip_idx * upscale_progress_per_clip)
+                clip_progress_end = clip_progress_start + upscale_progress_per_clip
+                frames_dir = os.path.join(temp_dir, f"frames_{clip_idx}")
+                os.makedirs(frames_dir, exist_ok=True)
+                output_frame_idx = 0
+                last_yield_frame = 0
+                clip_loop_start = time.time()
+
+                logger.info(f"[{job_id}] Processing clip {clip_idx+1}/{total_clips}")
+                yield {
+                    "progress": int(clip_progress_start),
+                    "phase": "upscaling",
+                    "message": f"Processing clip {clip_idx+1}/{total_clips}...",
+                    "clip": clip_idx + 1,
+                    "total_clips": total_clips
+                }
+                continue
+
+            if kind == "frame":
+                cropped = item[2]
+                busy_start = time.perf_counter()
+
+                # AI upscale with Real-ESRGAN (4x for quality)
+                try:
+                    upscaled, _ = upsampler.enhance(cropped, outscale=4)
+                except Exception as e:
+                    logger.warning(f"[{job_id}] Upscale failed for clip {clip_idx+1} frame {output_frame_idx}: {e}, using resize")
+                    upscaled = cv2.resize(cropped, (target_width, target_height), interpolation=cv2.INTER_LANCZOS4)
+
+                # Resize to target dimensions
+                if upscaled.shape[1] != target_width or upscaled.shape[0] != target_height:
+                    upscaled = cv2.resize(upscaled, (target_width, target_height), interpolation=cv2.INTER_LANCZOS4)
+
+                # Save frame
+                frame_path = os.path.join(frames_dir, f"frame_{output_frame_idx:06d}.png")
+                cv2.imwrite(frame_path, upscaled)
+                output_frame_idx += 1
+                stage_seconds["enhance"] += time.perf_counter() - busy_start
+
+                # Yield progress every 15 frames
+                if output_frame_idx - last_yield_frame >= 15:
+                    frame_progress = output_frame_idx / frames_to_process
+                    progress = int(clip_progress_start + frame_progress * (clip_progress_end - clip_progress_start))
+                    yield {
+                        "progress": progress,
+                        "phase": "upscaling",
+                        "message": f"Clip {clip_idx+1}: frame {output_frame_idx}/{frames_to_process}",
+                        "clip": clip_idx + 1,
+                        "total_clips": total_clips,
+                        "current_frame": output_frame_idx,
+                        "total_frames": frames_to_process
+                    }
+                    last_yield_frame = output_frame_idx
+                    elapsed = time.time() - clip_loop_start
+                    rate = output_frame_idx / elapsed if elapsed > 0 else 0
+                    logger.info(
+                        f"[{job_id}] Clip {clip_idx+1}: frame {output_frame_idx}/{frames_to_process} "
+                        f"({progress}%) elapsed={elapsed:.1f}s rate={rate:.2f}fps"
+                    )
+                continue
+
+            # kind == "end": hand the clip to the encoder and move on.
+            clip_elapsed = time.time() - clip_loop_start
+            clip_rate = output_frame_idx / clip_elapsed if clip_elapsed > 0 else 0
+            logger.info(
+                f"[{job_id}] Clip {clip_idx+1}: {output_frame_idx} frames upscaled "
+                f"in {clip_elapsed:.1f}s ({clip_rate:.2f}fps avg)"
+            )
+            yield {
+                "progress": int(clip_progress_end - 2),
+                "phase": "encoding",
+                "message": f"Encoding clip {clip_idx+1}/{total_clips}...",
+                "clip": clip_idx + 1,
+                "total_clips": total_clips
+            }
+
+            # Bound the finished-but-unencoded frames on disk.
+            pending = [f for f in encodes if not f.done()]
+            while len(pending) > CLIPS_AI_ENCODE_BACKLOG:
+                pending.pop(0).result()
+            for f in encodes:
+                if f.done():
+                    f.result()  # surface an encode failure now, not at the end
+            encodes.append(encoder.submit(
+                _clips_ai_encode, job_id, clip, frames_dir, output_frame_idx,
+                os.path.join(temp_dir, f"clip_{clip_idx}.mp4"), fps, include_audio, stage_seconds,
+            ))
+            clips_done += 1
+
+        paths = [f.result() for f in encodes]
+    finally:
+        stop.set()
+        encoder.shutdown(wait=True, cancel_futures=True)
+        reader.join(timeout=30)
+
+    wall_seconds = time.perf_counter() - wall_start
+    busy = sum(stage_seconds.values())
+    logger.info(
+        f"[{job_id}] Clip pipeline: {len(paths)} clip(s) in {wall_seconds:.1f}s wall "
+        f"(extract/decode={stage_seconds['extract_decode']:.1f}s enhance={stage_seconds['enhance']:.1f}s "
+        f"encode={stage_seconds['encode']:.1f}s, overlap x{busy / wall_seconds if wall_seconds > 0 else 0:.2f})"
+    )
+    return {"paths": paths, "wall_seconds": wall_seconds, "stage_seconds": stage_seconds}
+
+
 @app.function(
     image=upscale_image,
     gpu="T4",
@@ -2602,8 +3024,6 @@ def process_clips_ai(
     """
     import subprocess
 
-    import cv2
-
     total_clips = len(clips_data)
 
     # remote_gen() gives the caller no handle to the function-call id (it's a
@@ -2679,342 +3099,14 @@ def process_clips_ai(
                 "total_clips": total_clips
             }
 
-            # === PHASE 3: Process each clip ===
-            # Progress range: 15% to 75% for upscaling
-            upscale_progress_start = 15
-            upscale_progress_end = 75
-            upscale_progress_per_clip = (upscale_progress_end - upscale_progress_start) / total_clips
-
-            processed_paths = []
-
-            for clip_idx, clip_data in enumerate(clips_data):
-                clip_progress_start = upscale_progress_start + (clip_idx * upscale_progress_per_clip)
-                clip_progress_end = clip_progress_start + upscale_progress_per_clip
-
-                # Get source key (handle index mapping if needed)
-                source_idx = clip_data.get('clipIndex', clip_idx)
-                if source_idx >= len(source_full_keys):
-                    source_idx = clip_idx
-                full_source_key = source_full_keys[source_idx]
-
-                keyframes = clip_data.get('keyframes', [])
-                segment_data = clip_data.get('segment_data', {})
-                clip_rotation = clip_data.get('rotation', 0) or 0
-
-                logger.info(f"[{job_id}] Processing clip {clip_idx+1}/{total_clips}")
-
-                yield {
-                    "progress": int(clip_progress_start),
-                    "phase": "upscaling",
-                    "message": f"Processing clip {clip_idx+1}/{total_clips}...",
-                    "clip": clip_idx + 1,
-                    "total_clips": total_clips
-                }
-
-                # Determine clip range in source video (needed before extraction)
-                clip_source_start = clip_data.get('source_start_time', 0.0)
-                clip_source_end = clip_data.get('source_end_time', None)
-
-                # === Scratch-extract the clip's sub-range from R2 ===
-                # Fresh presigned URL per iteration (signing is local, free).
-                # Never pass a presigned URL to cv2.VideoCapture — HTTPS seeks
-                # hang 30+s (T1220 tracer). Always use a local scratch file.
-                source_url = _presigned_source_url(full_source_key)
-                scratch_path = os.path.join(temp_dir, f"clip_source_{clip_idx}.mp4")
-
-                # Need a known end for extraction; if not provided, probe duration.
-                # We can ask ffmpeg to copy to EOF by omitting -to when end is None.
-                extract_cmd = ["ffmpeg", "-y", "-ss", str(clip_source_start)]
-                if clip_source_end is not None:
-                    extract_cmd += ["-to", str(clip_source_end)]
-                extract_cmd += ["-i", source_url, "-c", "copy", scratch_path]
-
-                logger.info(f"[{job_id}] Clip {clip_idx+1}: scratch-extracting {full_source_key} "
-                            f"[{clip_source_start:.2f}s - {clip_source_end}]")
-                extract_result = subprocess.run(extract_cmd, capture_output=True, text=True)
-                if extract_result.returncode != 0:
-                    logger.error(f"[{job_id}] Scratch extract failed: {extract_result.stderr[:500]}")
-                    raise RuntimeError(f"Scratch extraction failed for clip {clip_idx+1}")
-
-                # Open scratch (local file, fast seeks)
-                cap = cv2.VideoCapture(scratch_path)
-                if not cap.isOpened():
-                    raise ValueError(f"Could not open scratch video: {scratch_path}")
-
-                original_fps = cap.get(cv2.CAP_PROP_FPS) or fps
-                total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                original_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                original_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                duration = total_frames / original_fps if original_fps > 0 else 0  # scratch duration
-
-                logger.info(f"[{job_id}] Clip {clip_idx+1}: {original_width}x{original_height} @ {original_fps:.1f}fps, {total_frames} frames (scratch)")
-
-                # All times below are SCRATCH-RELATIVE (scratch frame 0 == original clip_source_start).
-                # clip_start is always 0 in scratch-space; clip_duration matches the scratch length.
-                clip_duration = duration
-
-                # Combine extraction range with user trim (trim is already relative to clip start)
-                trim_start_rel, trim_end_rel = _get_trim_range(segment_data, clip_duration)
-                # "absolute" here now means scratch-absolute (== scratch-relative)
-                absolute_start = trim_start_rel
-                absolute_end = trim_end_rel
-                start_frame = int(absolute_start * original_fps)
-                end_frame = min(int(absolute_end * original_fps), total_frames)
-                frames_to_process = max(1, end_frame - start_frame)
-
-                logger.info(f"[{job_id}] Clip {clip_idx+1}: scratch-relative trim {absolute_start:.2f}s-{absolute_end:.2f}s")
-                logger.info(f"[{job_id}] Clip {clip_idx+1}: Processing frames {start_frame}-{end_frame} ({frames_to_process} frames)")
-
-                # Sort keyframes by time (pre-sorted for _interpolate_crop)
-                sorted_keyframes = sorted(keyframes, key=lambda k: k.get('time', 0)) if keyframes else []
-
-                # Create frames directory for this clip
-                frames_dir = os.path.join(temp_dir, f"frames_{clip_idx}")
-                os.makedirs(frames_dir, exist_ok=True)
-
-                # Seek once (scratch file, fast), read sequentially
-                cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-                output_frame_idx = 0
-                last_yield_frame = 0
-                clip_loop_start = time.time()
-
-                for frame_num in range(start_frame, end_frame):
-                    ret, frame = cap.read()
-                    if not ret or frame is None:
-                        logger.warning(f"[{job_id}] Could not read frame {frame_num}")
-                        continue
-
-                    # Keyframe time is relative to clip start; scratch frame 0 IS clip start.
-                    frame_time = frame_num / original_fps
-
-                    # Get interpolated crop or use smart center crop
-                    if sorted_keyframes:
-                        crop = _interpolate_crop(sorted_keyframes, frame_time)
-                    else:
-                        # Smart center crop: maintain target aspect ratio
-                        target_ratio = target_width / target_height
-                        source_ratio = original_width / original_height
-
-                        if source_ratio > target_ratio:
-                            # Source is wider - crop sides
-                            crop_height = original_height
-                            crop_width = int(original_height * target_ratio)
-                            crop_x = (original_width - crop_width) / 2
-                            crop_y = 0
-                        else:
-                            # Source is taller - crop top/bottom
-                            crop_width = original_width
-                            crop_height = int(original_width / target_ratio)
-                            crop_x = 0
-                            crop_y = (original_height - crop_height) / 2
-
-                        crop = {
-                            'x': crop_x,
-                            'y': crop_y,
-                            'width': crop_width,
-                            'height': crop_height
-                        }
-
-                    # Apply crop with bounds checking
-                    x = max(0, min(int(crop['x']), original_width - int(crop['width'])))
-                    y = max(0, min(int(crop['y']), original_height - int(crop['height'])))
-                    w = int(crop['width'])
-                    h = int(crop['height'])
-
-                    # Ensure valid dimensions
-                    w = max(1, min(w, original_width - x))
-                    h = max(1, min(h, original_height - y))
-
-                    cropped = rotate_then_crop(frame, clip_rotation, x, y, w, h)
-
-                    # AI upscale with Real-ESRGAN (4x for quality)
-                    try:
-                        upscaled, _ = upsampler.enhance(cropped, outscale=4)
-                    except Exception as e:
-                        logger.warning(f"[{job_id}] Upscale failed for frame {frame_num}: {e}, using resize")
-                        upscaled = cv2.resize(cropped, (target_width, target_height), interpolation=cv2.INTER_LANCZOS4)
-
-                    # Resize to target dimensions
-                    if upscaled.shape[1] != target_width or upscaled.shape[0] != target_height:
-                        upscaled = cv2.resize(upscaled, (target_width, target_height), interpolation=cv2.INTER_LANCZOS4)
-
-                    # Save frame
-                    frame_path = os.path.join(frames_dir, f"frame_{output_frame_idx:06d}.png")
-                    cv2.imwrite(frame_path, upscaled)
-                    output_frame_idx += 1
-
-                    # Yield progress every 15 frames
-                    if output_frame_idx - last_yield_frame >= 15:
-                        frame_progress = output_frame_idx / frames_to_process
-                        progress = int(clip_progress_start + frame_progress * (clip_progress_end - clip_progress_start))
-                        yield {
-                            "progress": progress,
-                            "phase": "upscaling",
-                            "message": f"Clip {clip_idx+1}: frame {output_frame_idx}/{frames_to_process}",
-                            "clip": clip_idx + 1,
-                            "total_clips": total_clips,
-                            "current_frame": output_frame_idx,
-                            "total_frames": frames_to_process
-                        }
-                        last_yield_frame = output_frame_idx
-                        elapsed = time.time() - clip_loop_start
-                        rate = output_frame_idx / elapsed if elapsed > 0 else 0
-                        logger.info(
-                            f"[{job_id}] Clip {clip_idx+1}: frame {output_frame_idx}/{frames_to_process} "
-                            f"({progress}%) elapsed={elapsed:.1f}s rate={rate:.2f}fps"
-                        )
-
-                cap.release()
-                clip_elapsed = time.time() - clip_loop_start
-                clip_rate = output_frame_idx / clip_elapsed if clip_elapsed > 0 else 0
-                logger.info(
-                    f"[{job_id}] Clip {clip_idx+1}: {output_frame_idx} frames upscaled "
-                    f"in {clip_elapsed:.1f}s ({clip_rate:.2f}fps avg)"
-                )
-
-                # === Encode this clip ===
-                yield {
-                    "progress": int(clip_progress_end - 2),
-                    "phase": "encoding",
-                    "message": f"Encoding clip {clip_idx+1}/{total_clips}...",
-                    "clip": clip_idx + 1,
-                    "total_clips": total_clips
-                }
-
-                clip_output_path = os.path.join(temp_dir, f"clip_{clip_idx}.mp4")
-                frame_pattern = os.path.join(frames_dir, "frame_%06d.png")
-
-                # Check if scratch has audio
-                has_audio = _has_audio_stream(scratch_path) and include_audio
-
-                # Check for speed changes
-                segments = segment_data.get('segments', []) if segment_data else []
-                has_speed_changes = any(seg.get('speed', 1.0) != 1.0 for seg in segments)
-
-                # Build FFmpeg command
-                if has_speed_changes and segments:
-                    # Complex filtergraph for speed changes
-                    logger.info(f"[{job_id}] Clip {clip_idx+1}: Applying speed changes")
-
-                    filter_parts = []
-                    audio_filter_parts = []
-                    output_labels = []
-                    audio_labels = []
-
-                    trim_offset = trim_start_rel
-                    output_duration = output_frame_idx / fps
-
-                    for seg_idx, seg in enumerate(segments):
-                        seg_start = max(0, seg['start'] - trim_offset)
-                        seg_end = min(output_duration, seg['end'] - trim_offset)
-                        speed = seg.get('speed', 1.0)
-
-                        if seg_end <= seg_start:
-                            continue
-
-                        # Video speed
-                        if speed != 1.0:
-                            filter_parts.append(
-                                f"[0:v]trim=start={seg_start}:end={seg_end},setpts=(PTS-STARTPTS)/{speed}[v{seg_idx}]"
-                            )
-                        else:
-                            filter_parts.append(
-                                f"[0:v]trim=start={seg_start}:end={seg_end},setpts=PTS-STARTPTS[v{seg_idx}]"
-                            )
-                        output_labels.append(f"[v{seg_idx}]")
-
-                        # Audio speed — times are clip-relative; scratch file is
-                        # already trimmed to the clip, so no clip_start offset.
-                        if has_audio:
-                            audio_start = seg['start']
-                            audio_end = seg['end']
-                            if speed != 1.0:
-                                atempo_val = max(0.5, min(2.0, speed))
-                                audio_filter_parts.append(
-                                    f"[1:a]atrim=start={audio_start}:end={audio_end},asetpts=PTS-STARTPTS,atempo={atempo_val}[a{seg_idx}]"
-                                )
-                            else:
-                                audio_filter_parts.append(
-                                    f"[1:a]atrim=start={audio_start}:end={audio_end},asetpts=PTS-STARTPTS[a{seg_idx}]"
-                                )
-                            audio_labels.append(f"[a{seg_idx}]")
-
-                    if output_labels:
-                        v_concat = ''.join(output_labels)
-
-                        if has_audio and audio_filter_parts:
-                            a_concat = ''.join(audio_labels)
-                            all_filters = ';'.join(filter_parts + audio_filter_parts)
-                            filter_complex = f"{all_filters};{v_concat}concat=n={len(output_labels)}:v=1:a=0[outv];{a_concat}concat=n={len(audio_labels)}:v=0:a=1[outa]"
-
-                            ffmpeg_cmd = [
-                                "ffmpeg", "-y",
-                                "-framerate", str(fps),
-                                "-i", frame_pattern,
-                                "-i", scratch_path,
-                                "-filter_complex", filter_complex,
-                                "-map", "[outv]",
-                                "-map", "[outa]",
-                                "-c:v", "libx264",
-                                "-pix_fmt", "yuv420p",
-                                "-preset", "fast",
-                                "-crf", "23",
-                                "-c:a", "aac",
-                                "-b:a", "192k",
-                                "-movflags", "+faststart",
-                                clip_output_path
-                            ]
-                        else:
-                            all_filters = ';'.join(filter_parts)
-                            filter_complex = f"{all_filters};{v_concat}concat=n={len(output_labels)}:v=1:a=0[outv]"
-
-                            ffmpeg_cmd = [
-                                "ffmpeg", "-y",
-                                "-framerate", str(fps),
-                                "-i", frame_pattern,
-                                "-filter_complex", filter_complex,
-                                "-map", "[outv]",
-                                "-c:v", "libx264",
-                                "-pix_fmt", "yuv420p",
-                                "-preset", "fast",
-                                "-crf", "23",
-                                "-movflags", "+faststart",
-                                clip_output_path
-                            ]
-                    else:
-                        # Fallback to simple encoding. absolute_start is
-                        # scratch-relative (== trim_start_rel).
-                        ffmpeg_cmd = _build_simple_ffmpeg_cmd(
-                            frame_pattern, scratch_path, clip_output_path,
-                            fps, has_audio, absolute_start, output_frame_idx
-                        )
-                else:
-                    # Simple encoding (no speed changes). absolute_start is
-                    # scratch-relative (== trim_start_rel).
-                    ffmpeg_cmd = _build_simple_ffmpeg_cmd(
-                        frame_pattern, scratch_path, clip_output_path,
-                        fps, has_audio, absolute_start, output_frame_idx
-                    )
-
-                logger.info(f"[{job_id}] FFmpeg command: {' '.join(ffmpeg_cmd[:8])}...")
-                result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
-
-                if result.returncode != 0:
-                    logger.error(f"[{job_id}] FFmpeg error: {result.stderr[:500]}")
-                    raise RuntimeError(f"FFmpeg encoding failed for clip {clip_idx+1}")
-
-                processed_paths.append(clip_output_path)
-                logger.info(f"[{job_id}] Clip {clip_idx+1} encoded successfully")
-
-                # Clean up per-iteration scratch + frames to keep disk bounded
-                try:
-                    if os.path.exists(scratch_path):
-                        os.remove(scratch_path)
-                    if os.path.isdir(frames_dir):
-                        import shutil as _shutil
-                        _shutil.rmtree(frames_dir, ignore_errors=True)
-                except Exception as cleanup_err:
-                    logger.warning(f"[{job_id}] Clip {clip_idx+1} cleanup failed: {cleanup_err}")
+            # === PHASE 3: Upscale + encode each clip ===
+            # Pipelined: the next clip is extracted and decoded and the previous
+            # one encoded while this one is on the GPU (_clips_ai_pipeline).
+            pipeline = yield from _clips_ai_pipeline(
+                job_id, clips_data, source_full_keys, temp_dir, upsampler,
+                target_width, target_height, fps, include_audio,
+            )
+            processed_paths = pipeline["paths"]
 
             # === PHASE 4: Concatenate clips (if multiple) ===
             yield {
@@ -3149,15 +3241,60 @@ def _stitch_probe(path: str) -> dict:
     }
 
 
-def _stitch_concat(segments: list, out_path: str) -> None:
+# Member GETs in flight at once. Each member is probed the moment it lands, so
+# by the time the last download finishes every earlier probe is done and the
+# concat starts immediately, instead of after the sum of all GET latencies.
+STITCH_FETCH_CONCURRENCY = int(os.environ.get("STITCH_FETCH_CONCURRENCY", "6"))
+
+
+def _stitch_fetch(r2, bucket: str, full_keys: list, temp_dir: str) -> tuple:
+    """Download `full_keys` into `temp_dir` with up to STITCH_FETCH_CONCURRENCY
+    GETs in flight (submitted in member order, so the prefix lands first),
+    probing each member as soon as it is on disk. Returns (paths, probes) in
+    member order. Raises the first failure; members not yet started are dropped."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    started = time.perf_counter()
+    first_ready = None
+
+    def fetch(i: int, full_key: str):
+        nonlocal first_ready
+        local = os.path.join(temp_dir, f"member_{i}.mp4")
+        logger.info(f"[stitch_members] downloading {full_key}")
+        r2.download_file(bucket, full_key, local)
+        probe = _stitch_probe(local)
+        if first_ready is None:
+            first_ready = time.perf_counter() - started
+        return local, probe
+
+    workers = max(1, min(STITCH_FETCH_CONCURRENCY, len(full_keys)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stitch-fetch") as pool:
+        futures = [pool.submit(fetch, i, key) for i, key in enumerate(full_keys)]
+        try:
+            results = [f.result() for f in futures]
+        except BaseException:
+            for f in futures:
+                f.cancel()
+            raise
+
+    logger.info(
+        f"[stitch_members] {len(results)} members fetched + probed in "
+        f"{time.perf_counter() - started:.2f}s (first after {first_ready:.2f}s, {workers} in flight)"
+    )
+    return [r[0] for r in results], [r[1] for r in results]
+
+
+def _stitch_concat(segments: list, out_path: str, probes: list | None = None) -> None:
     """Join `segments` IN ORDER into `out_path`: stream-copy demuxer concat when
     all segments share width/height/pix_fmt, else a filter_complex re-encode to
     the FIRST segment's frame size. Raises on total failure / validation miss.
+    `probes` (one _stitch_probe per segment) skips re-probing the inputs.
     Mirrors services/ffmpeg_concat.concat_segments (kept behaviour-equivalent)."""
     import subprocess
     import tempfile as _tempfile
 
-    probes = [_stitch_probe(s) for s in segments]
+    if probes is None:
+        probes = [_stitch_probe(s) for s in segments]
     expected_min = sum(p["duration"] for p in probes) * 0.6
     ref = probes[0]
     has_audio = ref["has_audio"]
@@ -3238,9 +3375,10 @@ def _stitch_concat(segments: list, out_path: str) -> None:
     secrets=[modal.Secret.from_name("r2-credentials")],
 )
 def stitch_members(user_id: str, input_keys: list, output_key: str) -> dict:
-    """Download each member reel from R2, concat them IN ORDER (stream-copy with
-    a re-encode fallback on mixed resolution), upload the stitched file to
-    `output_key`. `user_id` is the R2 prefix; keys are `{user_id}/{key}`.
+    """Download the member reels from R2 (bounded-parallel, _stitch_fetch),
+    concat them IN ORDER (stream-copy with a re-encode fallback on mixed
+    resolution), upload the stitched file to `output_key`. `user_id` is the R2
+    prefix; keys are `{user_id}/{key}`.
 
     Read-only over the member sources (they are only ever downloaded); the sole
     write is `output_key` (the caller's disposable scratch object). Returns
@@ -3256,20 +3394,16 @@ def stitch_members(user_id: str, input_keys: list, output_key: str) -> dict:
         raise RuntimeError("stitch_members called with no members")
 
     with tempfile.TemporaryDirectory() as temp_dir:
-        seg_paths = []
-        for i, key in enumerate(input_keys):
-            full_key = f"{user_id}/{key}"
-            local = os.path.join(temp_dir, f"member_{i}.mp4")
-            logger.info(f"[stitch_members] downloading {full_key}")
-            r2.download_file(bucket, full_key, local)
-            seg_paths.append(local)
+        seg_paths, probes = _stitch_fetch(
+            r2, bucket, [f"{user_id}/{key}" for key in input_keys], temp_dir,
+        )
 
         stitched = os.path.join(temp_dir, "stitched.mp4")
         if len(seg_paths) == 1:
             import shutil as _shutil
             _shutil.copyfile(seg_paths[0], stitched)
         else:
-            _stitch_concat(seg_paths, stitched)
+            _stitch_concat(seg_paths, stitched, probes)
 
         full_out = f"{user_id}/{output_key}"
         logger.info(f"[stitch_members] uploading stitched -> {full_out}")
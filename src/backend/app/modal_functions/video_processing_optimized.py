@@ -18,6 +18,12 @@ import modal
 
 app = modal.App("reel-ballers-video-optimized")
 
+# The shared vectorized keyframe evaluator (pure numpy, no `app` imports),
+# shipped as a single file -- see video_processing.py.
+_KEYFRAME_SPLINE_SRC = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "keyframe_spline.py"
+)
+
 # Image with PyTorch 2.x for torch.compile support
 upscale_image = (
     modal.Image.debian_slim(python_version="3.11")
@@ -31,6 +37,7 @@ upscale_image = (
         "basicsr==1.4.2",
         "realesrgan==0.3.0",
     )
+    .add_local_file(_KEYFRAME_SPLINE_SRC, remote_path="/root/app/keyframe_spline.py", copy=True)
 )
 
 logging.basicConfig(level=logging.INFO)
@@ -199,80 +206,6 @@ def _get_model_fully_optimized(device='cuda', gpu_type='T4'):
     return _model_cache[cache_key]
 
 
-# ============================================================================
-# Interpolation Helpers
-# ============================================================================
-
-def _catmull_rom(p0, p1, p2, p3, t):
-    t2 = t * t
-    t3 = t2 * t
-    return 0.5 * (
-        (2 * p1)
-        + (-p0 + p2) * t
-        + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t2
-        + (-p0 + 3 * p1 - 3 * p2 + p3) * t3
-    )
-
-
-def _find_spline_indices(sorted_kf, time):
-    if len(sorted_kf) < 2:
-        return None
-    p1_idx = -1
-    p2_idx = -1
-    for i, kf in enumerate(sorted_kf):
-        if kf['time'] <= time:
-            p1_idx = i
-        if kf['time'] > time and p2_idx == -1:
-            p2_idx = i
-            break
-    if p1_idx == -1 or p2_idx == -1:
-        return None
-    duration = sorted_kf[p2_idx]['time'] - sorted_kf[p1_idx]['time']
-    if duration == 0:
-        return None
-    progress = (time - sorted_kf[p1_idx]['time']) / duration
-    p0_idx = max(0, p1_idx - 1)
-    p3_idx = min(len(sorted_kf) - 1, p2_idx + 1)
-    return p0_idx, p1_idx, p2_idx, p3_idx, progress
-
-
-def _spline_prop(sorted_kf, indices, prop):
-    p0_idx, p1_idx, p2_idx, p3_idx, progress = indices
-    return _catmull_rom(
-        sorted_kf[p0_idx][prop], sorted_kf[p1_idx][prop],
-        sorted_kf[p2_idx][prop], sorted_kf[p3_idx][prop], progress,
-    )
-
-
-def _interpolate_crop(keyframes: list, time: float) -> dict:
-    """Interpolate crop position using Catmull-Rom spline."""
-    if not keyframes:
-        return None
-
-    sorted_kf = sorted(keyframes, key=lambda k: k['time'])
-
-    if len(sorted_kf) == 1:
-        return sorted_kf[0].copy()
-
-    if time <= sorted_kf[0]['time']:
-        return sorted_kf[0].copy()
-    if time >= sorted_kf[-1]['time']:
-        return sorted_kf[-1].copy()
-
-    indices = _find_spline_indices(sorted_kf, time)
-    if indices is None:
-        nearest = min(sorted_kf, key=lambda k: abs(k['time'] - time))
-        return nearest.copy()
-
-    return {
-        'time': time,
-        'x': _spline_prop(sorted_kf, indices, 'x'),
-        'y': _spline_prop(sorted_kf, indices, 'y'),
-        'width': _spline_prop(sorted_kf, indices, 'width'),
-        'height': _spline_prop(sorted_kf, indices, 'height'),
-    }
-
-
 # ============================================================================
 # Core Processing Function
 # ============================================================================
@@ -293,8 +226,12 @@ def _process_frames(
 ) -> int:
     """Process frames with the given upsampler."""
     import cv2
+    import numpy as np
+
+    from app.keyframe_spline import crop_positions
 
-    sorted_keyframes = sorted(keyframes, key=lambda k: k['time'])
+    # Every frame's crop in one vectorized call.
+    crops = crop_positions(keyframes, np.arange(start_frame, end_frame) / original_fps)
     frames_to_process = end_frame - start_frame
     output_frame_idx = 0
 
@@ -304,8 +241,7 @@ def _process_frames(
         if not ret or frame is None:
             continue
 
-        time_val = frame_idx / original_fps
-        crop = _interpolate_crop(sorted_keyframes, time_val)
+        crop = crops[frame_idx - start_frame]
 
         if crop:
             x = int(max(0, crop['x']))
@@ -8,6 +8,7 @@ multiple files.
 
 
 import logging
+from datetime import datetime
 
 from app.constants import get_rating_adjective
 
@@ -128,7 +129,7 @@ def latest_working_clips_subquery(alias: str = "wc", project_filter: bool = True
     """.strip()
 
 
-def latest_final_videos_subquery() -> str:
+def latest_final_videos_subquery(source: str = "final_videos") -> str:
     """
     Returns SQL subquery for filtering to latest version per source in final_videos.
 
@@ -148,6 +149,10 @@ def latest_final_videos_subquery() -> str:
     a project_id (brilliant_clip / custom_project) or a game_id (annotated_game),
     so the CASE yields 0 and version dedup within a source is unchanged.
 
+    Args:
+        source: Table or parenthesized subquery to rank, for callers that only
+            need some partitions (the rows must include every version of them).
+
     Returns:
         SQL string for use in WHERE ... id IN (...)
 
@@ -157,7 +162,7 @@ def latest_final_videos_subquery() -> str:
             WHERE fv.id IN ({latest_final_videos_subquery()})
         ''')
     """
-    return """
+    return f"""
         SELECT id FROM (
             SELECT id, ROW_NUMBER() OVER (
                 PARTITION BY COALESCE(project_id, 0), COALESCE(game_id, 0),
@@ -165,11 +170,41 @@ def latest_final_videos_subquery() -> str:
                                   THEN id ELSE 0 END
                 ORDER BY version DESC
             ) as rn
-            FROM final_videos
+            FROM {source}
         ) WHERE rn = 1
     """.strip()
 
 
+def season_for_month(month: int) -> str:
+    """Get season name for a given month (1-12)."""
+    if month in (9, 10, 11, 12):  # Sep-Dec
+        return "Fall"
+    elif month in (1, 2, 3, 4, 5):  # Jan-May
+        return "Spring"
+    else:  # Jun-Aug
+        return "Summer"
+
+
+def season_key(date_str: str | None) -> str | None:
+    """'<Season> <Year>' from a 'YYYY-MM-DD[...]' string, or None if unparseable."""
+    if not date_str:
+        return None
+    try:
+        normalized = date_str.replace("T", " ").replace("Z", "").strip()
+        dt = datetime.strptime(normalized[:10], "%Y-%m-%d")
+    except (ValueError, AttributeError):
+        return None
+    return f"{season_for_month(dt.month)} {dt.year}"
+
+
+def utc_timestamp(ts: str | None) -> str | None:
+    """Normalize a SQLite timestamp to ISO-UTC ('...Z') like downloads.py, so
+    JS parses it and lexical comparison orders it correctly."""
+    if ts and not ts.endswith("Z"):
+        return ts.replace(" ", "T") + "Z"
+    return ts
+
+
 def exclude_teammate_reels_clause(fv_alias: str = "fv") -> str:
     """AND-prefixed SQL fragment that drops teammate-only single-clip reels from
     the user's OWN collections + rankings (bug 22).
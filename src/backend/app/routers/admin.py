@@ -9,15 +9,19 @@ downloads or SQLite counting.
 """
 
 import asyncio
+import base64
+import json
 import logging
 import math
+import os
+import time
 from datetime import UTC, date, datetime, timedelta
 
 from fastapi import APIRouter, HTTPException, Query, Request, Response
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
 
-from ..services import credit_ledger
+from ..services import credit_ledger, email_outbox
 from ..services.auth_db import (
     IMPERSONATION_TTL_MINUTES,
     create_impersonation_session,
@@ -90,6 +94,134 @@ async def admin_me():
     return {"is_admin": is_admin(user_id), "environment": APP_ENV}
 
 
+# ---------------------------------------------------------------------------
+# User list paging
+#
+# The list is ordered (last_active_at DESC, user_id DESC) and paged by keyset:
+# each response carries an opaque next_cursor naming the last row, and the next
+# page starts strictly after it, so page 500 costs the same as page 1. Users
+# with a segment row are walked on idx_segments_last_active_user; segmentless
+# users (T4970) follow in user_id order. Every segment filter tests an s.*
+# column, which excludes segmentless users, so that second phase only runs
+# unfiltered. `page` without a cursor still works (OFFSET) for deep links.
+#
+# The total and the funnel counts are cached per filter for
+# ADMIN_USER_COUNT_TTL_SECONDS -- a "1,234 users" label does not need to be
+# recounted on every page turn.
+# ---------------------------------------------------------------------------
+
+ADMIN_USER_COUNT_TTL_SECONDS = int(os.getenv("ADMIN_USER_COUNT_TTL_SECONDS", "60"))
+
+_USER_LIST_COLUMNS = """
+    u.user_id, u.email, u.created_at,
+    s.origin, s.acquired_at,
+    s.total_spent_cents, s.last_active_at,
+    s.total_usage_seconds, s.current_session_start
+"""
+
+# (where_clause, params) -> (monotonic time computed, total_users, action_totals)
+_user_count_cache: dict[tuple, tuple[float, int, dict[str, int]]] = {}
+
+
+def reset_user_count_cache_for_tests():
+    _user_count_cache.clear()
+
+
+def _encode_user_cursor(row: dict) -> str:
+    ts = row["last_active_at"].isoformat() if row["last_active_at"] else None
+    raw = json.dumps([ts, row["user_id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_user_cursor(cursor: str) -> tuple[datetime | None, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ts, user_id = json.loads(raw)
+        return (datetime.fromisoformat(ts) if ts else None), str(user_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _fetch_user_page(cur, where_parts, params, after, limit, offset=0) -> list[dict]:
+    """Up to `limit` user-list rows after keyset `after` (or skipping `offset`)."""
+    seg_where = list(where_parts)
+    seg_params = list(params)
+    if offset:
+        seg_clause = ("WHERE " + " AND ".join(seg_where)) if seg_where else ""
+        segmentless = "" if where_parts else f"""
+            UNION ALL
+            (SELECT {_USER_LIST_COLUMNS}, 1 AS phase
+             FROM users u LEFT JOIN user_segments s ON u.user_id = s.user_id
+             WHERE s.user_id IS NULL)"""
+        cur.execute(f"""
+            SELECT * FROM (
+                (SELECT {_USER_LIST_COLUMNS}, 0 AS phase
+                 FROM user_segments s JOIN users u ON u.user_id = s.user_id
+                 {seg_clause})
+                {segmentless}
+            ) page
+            ORDER BY phase, last_active_at DESC, user_id DESC
+            LIMIT %s OFFSET %s
+        """, [*seg_params, limit, offset])
+        return cur.fetchall()
+
+    rows: list[dict] = []
+    after_ts, after_id = after if after else (None, None)
+    if after is None or after_ts is not None:
+        if after is not None:
+            seg_where.append("(s.last_active_at, s.user_id) < (%s, %s)")
+            seg_params += [after_ts, after_id]
+        seg_clause = ("WHERE " + " AND ".join(seg_where)) if seg_where else ""
+        cur.execute(f"""
+            SELECT {_USER_LIST_COLUMNS}
+            FROM user_segments s JOIN users u ON u.user_id = s.user_id
+            {seg_clause}
+            ORDER BY s.last_active_at DESC, s.user_id DESC
+            LIMIT %s
+        """, [*seg_params, limit])
+        rows = cur.fetchall()
+        after_id = None
+    if len(rows) < limit and not where_parts:
+        cur.execute(f"""
+            SELECT {_USER_LIST_COLUMNS}
+            FROM users u LEFT JOIN user_segments s ON u.user_id = s.user_id
+            WHERE s.user_id IS NULL {"AND u.user_id < %s" if after_id else ""}
+            ORDER BY u.user_id DESC
+            LIMIT %s
+        """, [after_id, limit - len(rows)] if after_id else [limit - len(rows)])
+        rows += cur.fetchall()
+    return rows
+
+
+def _user_list_totals(cur, where_parts, params) -> tuple[int, dict[str, int]]:
+    """(total users, distinct users per action) for the filter, cached briefly."""
+    key = (" AND ".join(where_parts), tuple(params))
+    hit = _user_count_cache.get(key)
+    if hit and time.monotonic() - hit[0] < ADMIN_USER_COUNT_TTL_SECONDS:
+        return hit[1], hit[2]
+
+    if where_parts:
+        where_clause = "WHERE " + " AND ".join(where_parts)
+        cur.execute(f"SELECT COUNT(*) AS cnt FROM user_segments s {where_clause}", params)
+        total_users = cur.fetchone()["cnt"]
+        cur.execute(f"""
+            SELECT r.action, COUNT(*) AS users
+            FROM user_action_rollup r
+            JOIN user_segments s ON r.user_id = s.user_id
+            {where_clause}
+            GROUP BY r.action
+        """, params)
+    else:
+        # LEFT JOIN semantics (T4970): every users row counts, segment or not.
+        cur.execute("SELECT COUNT(*) AS cnt FROM users")
+        total_users = cur.fetchone()["cnt"]
+        cur.execute("SELECT action, users FROM user_action_totals")
+    action_totals = {r["action"]: r["users"] for r in cur.fetchall()}
+
+    _user_count_cache[key] = (time.monotonic(), total_users, action_totals)
+    return total_users, action_totals
+
+
 @router.get("/users")
 async def list_users(
     page: int = Query(1, ge=1),
@@ -98,59 +230,41 @@ async def list_users(
     acquired_from: str = Query(None),
     acquired_to: str = Query(None),
     filter: str = Query(None),
+    cursor: str = Query(None),
 ):
-    """List users with milestone stats from Postgres. Paginated by user count. Admin only."""
+    """List users with milestone stats from Postgres. Admin only.
+
+    Pass the previous response's next_cursor (and the page number being shown)
+    to page forward; see "User list paging" above.
+    """
     _require_admin()
 
     where_parts, params = _build_segment_filter(origin, acquired_from, acquired_to, filter)
-
-    where_clause = ""
-    if where_parts:
-        where_clause = "WHERE " + " AND ".join(where_parts)
+    after = _decode_user_cursor(cursor) if cursor else None
 
     with get_pg() as conn:
         cur = conn.cursor()
 
-        # LEFT JOIN (T4970): a user with no user_segments row (test-login/OTP-
-        # bypass accounts, copied accounts — segments are created only in the
-        # OAuth/OTP signup flows) must still be enumerated, not dropped. An
-        # inner join here made such users invisible in GET /api/admin/users.
-        # An origin/date filter (where_clause) still legitimately excludes NULL
-        # segment fields, so filtered views are unchanged.
-        cur.execute(f"""
-            SELECT COUNT(*) AS cnt
-            FROM users u
-            LEFT JOIN user_segments s ON u.user_id = s.user_id
-            {where_clause}
-        """, params)
-        total_users = cur.fetchone()["cnt"]
+        total_users, action_totals = _user_list_totals(cur, where_parts, params)
         total_pages = max(1, math.ceil(total_users / page_size))
-        page = min(page, total_pages)
-
-        offset = (page - 1) * page_size
-
-        cur.execute(f"""
-            SELECT
-                u.user_id, u.email, u.created_at,
-                s.origin, s.acquired_at,
-                s.total_spent_cents, s.last_active_at,
-                s.total_usage_seconds, s.current_session_start
-            FROM users u
-            LEFT JOIN user_segments s ON u.user_id = s.user_id
-            {where_clause}
-            ORDER BY s.last_active_at DESC NULLS LAST
-            LIMIT %s OFFSET %s
-        """, [*params, page_size, offset])
-
-        rows = cur.fetchall()
+        offset = 0
+        if after is None:
+            page = min(page, total_pages)
+            offset = (page - 1) * page_size
+
+        # One extra row tells whether there is a next page.
+        rows = _fetch_user_page(cur, where_parts, params, after, page_size + 1, offset)
+        next_cursor = _encode_user_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+        rows = rows[:page_size]
         page_user_ids = [row["user_id"] for row in rows]
 
         if page_user_ids:
+            # Per-user counts come from the trigger-maintained rollup: one row
+            # per (user, action) instead of one per platform.
             cur.execute("""
-                SELECT user_id, action, SUM(count) AS count
-                FROM user_actions
+                SELECT user_id, action, count
+                FROM user_action_rollup
                 WHERE user_id = ANY(%s)
-                GROUP BY user_id, action
             """, (page_user_ids,))
             action_rows = cur.fetchall()
 
@@ -176,16 +290,6 @@ async def list_users(
 
         from ..analytics import FLOW_EVENTS, FUNNEL_STEPS, session_engaged_seconds
 
-        funnel_join = f"JOIN user_segments s ON a.user_id = s.user_id {where_clause}" if where_parts else ""
-        funnel_params = list(params) if where_parts else []
-        cur.execute(f"""
-            SELECT a.action, COUNT(DISTINCT a.user_id) AS users
-            FROM user_actions a
-            {funnel_join}
-            GROUP BY a.action
-        """, funnel_params)
-        action_totals = {r["action"]: r["users"] for r in cur.fetchall()}
-
         funnel_totals = {"signed_up": total_users}
         for step in FUNNEL_STEPS:
             label = FLOW_EVENTS[step]["label"]
@@ -262,6 +366,7 @@ async def list_users(
         "page_size": page_size,
         "total_users": total_users,
         "total_pages": total_pages,
+        "next_cursor": next_cursor,
         "funnel_totals": funnel_totals,
     }
 
@@ -272,8 +377,9 @@ async def list_users(
 # These MUST be registered before /users/{user_id}/grant-credits below: FastAPI
 # matches routes in definition order, and /users/bulk/grant-credits would
 # otherwise be captured by the {user_id} route with user_id="bulk". A max of
-# 100 ids per request keeps the sequential loops bounded. Partial failure is a
-# first-class outcome (per-user result), never an all-or-nothing error.
+# 100 ids per request keeps the grant loop and each email job bounded. Partial
+# failure is a first-class outcome (per-user result), never an all-or-nothing
+# error.
 # ---------------------------------------------------------------------------
 
 BULK_MAX_IDS = 100
@@ -347,15 +453,17 @@ async def admin_bulk_grant_credits(request: BulkGrantCreditsRequest):
 
 @router.post("/users/bulk/email")
 async def admin_bulk_email(request: BulkEmailRequest):
-    """Send an individual branded update email to many users at once. Admin only.
-
-    Renders the template body once, then sends one email per recipient
-    sequentially via send_admin_update_email (never one email with many
-    recipients — that would leak user emails to each other). Emails are resolved
-    from the Postgres users table (project rule, never auth.sqlite). Awaits real
-    per-recipient results — no background_tasks, the admin is watching. When
-    test=true, user_ids is ignored and one email goes to the calling admin's own
-    address so they can confirm rendering before any bulk send.
+    """Queue an individual branded update email to many users at once. Admin only.
+
+    Renders the template body once, resolves every recipient's email from the
+    Postgres users table in one query (project rule, never auth.sqlite) and
+    writes one outbox row per recipient (never one email with many recipients
+    -- that would leak user emails to each other). Returns {job_id, total,
+    queued} immediately; services/email_outbox.py sends under its own
+    concurrency and rate limits, and GET /users/bulk/email/{job_id} reports
+    per-recipient results. When test=true, user_ids is ignored and one email
+    goes to the calling admin's own address, awaited inline, so they can confirm
+    rendering before any bulk send.
     """
     _require_admin()
 
@@ -371,7 +479,7 @@ async def admin_bulk_email(request: BulkEmailRequest):
 
     if request.test:
         admin_id = get_current_user_id()
-        admin = get_user_by_id(admin_id)
+        admin = await asyncio.to_thread(get_user_by_id, admin_id)
         admin_email = admin.get("email") if admin else None
         if not admin_email:
             raise HTTPException(status_code=400, detail="Admin account has no email on file")
@@ -386,31 +494,20 @@ async def admin_bulk_email(request: BulkEmailRequest):
     if len(request.user_ids) > BULK_MAX_IDS:
         raise HTTPException(status_code=400, detail=f"Too many users (max {BULK_MAX_IDS})")
 
-    results: list[dict] = []
-    sent = 0
-    failed = 0
-    for uid in request.user_ids:
-        user = get_user_by_id(uid)
-        email = user.get("email") if user else None
-        if not email:
-            results.append({"user_id": uid, "ok": False, "error": "no email on file"})
-            failed += 1
-            continue
-        try:
-            ok = await send_admin_update_email(email, subject, body_html)
-        except Exception as exc:
-            logger.exception(f"[Admin] bulk email failed for {uid}")
-            results.append({"user_id": uid, "email": email, "ok": False, "error": str(exc)})
-            failed += 1
-            continue
-        if ok:
-            results.append({"user_id": uid, "email": email, "ok": True})
-            sent += 1
-        else:
-            results.append({"user_id": uid, "email": email, "ok": False, "error": "send failed"})
-            failed += 1
+    return await asyncio.to_thread(
+        email_outbox.enqueue_bulk_email, get_current_user_id(), request.user_ids, subject, body_html,
+    )
 
-    return {"results": results, "sent": sent, "failed": failed}
+
+@router.get("/users/bulk/email/{job_id}")
+async def admin_bulk_email_status(job_id: str):
+    """Progress of a queued bulk email: {status: sending|done, sent, failed,
+    pending, results}. `results` lists finished recipients only. Admin only."""
+    _require_admin()
+    job = await asyncio.to_thread(email_outbox.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 
 class GrantCreditsRequest(BaseModel):
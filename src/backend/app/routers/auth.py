@@ -116,6 +116,7 @@ def _purge_user_data(user_id: str) -> dict:
         cur.execute("DELETE FROM credit_transactions WHERE user_id = %s", (user_id,))
         cur.execute("DELETE FROM credit_reservations WHERE user_id = %s", (user_id,))
         cur.execute("DELETE FROM credits WHERE user_id = %s", (user_id,))
+        cur.execute("DELETE FROM credit_user_totals WHERE user_id = %s", (user_id,))
 
     # Invalidate in-process caches so a same-process relogin cannot resurrect old data
     # from a stale "already initialized" flag / cached version.
@@ -4,20 +4,43 @@ on page load. The two independent read groups (user.sqlite + profile.sqlite) run
 concurrently: the user-scoped group on a worker thread, the profile-scoped group
 on the event loop (T4771). Single logical read path, single response shape, no
 writes.
+
+Versioned snapshot: every request first reads a version vector -- the
+database.data_version of user.sqlite and profile.sqlite, a digest of which of
+this profile's game hashes are in the Postgres grace set (the games section's
+can_extend reads r2_grace_deletions) and a time bucket of
+BOOTSTRAP_SNAPSHOT_TTL_SECONDS (bounds
+presigned-URL age and the "last 24h" export window) -- and the live credit
+balance (Postgres, not covered by the vector). Together they form the response
+ETag:
+  * `If-None-Match` equal to it -> 304, no section is read.
+  * otherwise the sections come from the in-process snapshot of the same
+    (user, profile, vector), or are read in full and stored as that snapshot.
+  * `?delta=1` with an older bootstrap ETag in `If-None-Match` returns only
+    the sections whose source version moved (plus credits) and `"delta": true`.
 """
 
 import asyncio
 import contextvars
+import hashlib
 import logging
+import os
+import threading
 import time
+from collections import OrderedDict
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
 
-from ..database import get_db_connection
+from ..database import data_version, get_database_path, get_db_connection
+from ..profile_context import get_current_profile_id
 from ..queries import exclude_teammate_reels_clause, latest_final_videos_subquery
+from ..services.auth_db import get_grace_deletion_hashes_among
 from ..services.credit_ledger import get_credit_balance
 from ..services.user_db import (
     INTRO_FACT_FIELDS,
+    _get_user_db_path,
     get_all_intro_consents,
     get_all_intro_facts,
     get_all_intro_full_names,
@@ -27,15 +50,107 @@ from ..services.user_db import (
 )
 from ..storage import generate_presigned_url_global
 from ..user_context import get_current_user_id
+from ..utils.offload import run_in_context
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["bootstrap"])
 
+BOOTSTRAP_SNAPSHOT_TTL_SECONDS = int(os.getenv("BOOTSTRAP_SNAPSHOT_TTL_SECONDS", "300"))
+BOOTSTRAP_SNAPSHOT_MAX_ENTRIES = int(os.getenv("BOOTSTRAP_SNAPSHOT_MAX_ENTRIES", "512"))
+
+# Which version-vector components each cached section is read from:
+# "u" = user.sqlite, "p" = profile.sqlite, "g" = r2_grace_deletions (Postgres).
+# (Credits are read live every time.)
+_SECTION_SOURCES = {
+    "profiles": "u",
+    "settings": "u",
+    "quests_progress": "up",
+    "projects": "p",
+    # owning-profile names of reference games come from user.sqlite;
+    # can_extend from the grace set
+    "games": "upg",
+    "downloads": "p",
+    "exports": "p",
+    "pending_uploads": "p",
+}
+
+# (user_id, profile_id) -> (version vector, jsonable sections). One snapshot per
+# user+profile -- an older vector is never served again, so it is replaced.
+_snapshots: "OrderedDict[tuple[str, str], tuple[dict, dict]]" = OrderedDict()
+_snapshots_lock = threading.Lock()
+
+
+def _grace_digest() -> str:
+    """Digest of the profile's game hashes that are in the grace set. Only this
+    profile's membership moves it -- grace writes for other users' games don't."""
+    with get_db_connection() as conn:
+        hashes = [
+            row[0] for row in conn.cursor().execute(
+                "SELECT DISTINCT blake3_hash FROM games WHERE blake3_hash IS NOT NULL"
+            ).fetchall()
+        ]
+    in_grace = get_grace_deletion_hashes_among(hashes)
+    return hashlib.sha1(",".join(sorted(in_grace)).encode()).hexdigest()[:12]
+
+
+def _read_versions_and_credits(user_id: str) -> tuple[dict | None, dict]:
+    """Version vector {u, p, g, t} (None if a file's version is unknown) + live credits."""
+    user_version = data_version(_get_user_db_path(user_id), ("user", user_id))
+    profile_version = data_version(get_database_path(), ("profile", user_id, get_current_profile_id()))
+    credits = get_credit_balance(user_id)
+    if user_version is None or profile_version is None:
+        return None, credits
+    versions = {
+        "u": hashlib.sha1(user_version.encode()).hexdigest()[:12],
+        "p": hashlib.sha1(profile_version.encode()).hexdigest()[:12],
+        "g": _grace_digest(),
+        "t": str(int(time.time() // BOOTSTRAP_SNAPSHOT_TTL_SECONDS)),
+    }
+    return versions, credits
+
+
+def _etag(versions: dict, credits: dict) -> str:
+    return (
+        f'"b2.{versions["u"]}.{versions["p"]}.{versions["g"]}.{versions["t"]}.'
+        f'{credits.get("balance")}"'
+    )
+
+
+def _parse_etag(etag: str | None) -> dict | None:
+    """Version vector encoded in one of our ETags, or None if it is not one."""
+    parts = (etag or "").strip().removeprefix("W/").strip('"').split(".")
+    if len(parts) != 6 or parts[0] != "b2":
+        return None
+    return {"u": parts[1], "p": parts[2], "g": parts[3], "t": parts[4]}
+
+
+def _get_snapshot(key: tuple[str, str], versions: dict) -> dict | None:
+    with _snapshots_lock:
+        entry = _snapshots.get(key)
+        if entry is None or entry[0] != versions:
+            return None
+        _snapshots.move_to_end(key)
+        return entry[1]
+
+
+def _put_snapshot(key: tuple[str, str], versions: dict, sections: dict) -> None:
+    with _snapshots_lock:
+        _snapshots[key] = (versions, sections)
+        _snapshots.move_to_end(key)
+        while len(_snapshots) > BOOTSTRAP_SNAPSHOT_MAX_ENTRIES:
+            _snapshots.popitem(last=False)
+
+
+def clear_snapshots() -> None:
+    """Drop every cached snapshot. Used by tests."""
+    with _snapshots_lock:
+        _snapshots.clear()
+
 
 def _read_user_scoped(user_id: str) -> dict:
-    """Read everything sourced from user.sqlite (profiles, credits, settings,
-    quests). Pure synchronous reads — run on a worker thread so they overlap the
+    """Read everything sourced from user.sqlite (profiles, settings, quests).
+    Pure synchronous reads — run on a worker thread so they overlap the
     profile.sqlite reads (see bootstrap()). No writes: safe to run concurrently
     with the profile-scoped reads (different DB file; quests' read of
     profile.sqlite is a concurrent WAL reader, which SQLite allows)."""
@@ -76,8 +191,6 @@ def _read_user_scoped(user_id: str) -> dict:
         for p in profiles_raw
     ]
 
-    credits = get_credit_balance(user_id)
-
     from ..routers.settings import DEFAULTS, _to_nested, get_all_preferences
     stored = get_all_preferences()
     settings = _to_nested({**DEFAULTS, **stored})
@@ -113,7 +226,6 @@ def _read_user_scoped(user_id: str) -> dict:
 
     return {
         "profiles": profiles,
-        "credits": credits,
         "settings": settings,
         "quests_progress": quests_progress,
         "_ms": int((time.perf_counter() - t0) * 1000),
@@ -207,19 +319,9 @@ async def _read_profile_scoped():
     return projects_response, games_response, misc
 
 
-@router.get("/bootstrap")
-async def bootstrap():
-    """Single GET that replaces 9+ page-load fetches.
-
-    T4771: the two independent read groups run concurrently instead of serially.
-    The user.sqlite group (profiles/credits/settings/quests) runs on a worker
-    thread while the profile.sqlite group (projects/games/downloads/exports/
-    pending) runs on the event loop; wall-clock becomes ~max(group) instead of
-    the sum. Still a single logical read path -- one endpoint, one response,
-    no writes.
-    """
+async def _read_sections(user_id: str) -> dict:
+    """Every cached section, read in full (T4771: the two groups run concurrently)."""
     t_start = time.perf_counter()
-    user_id = get_current_user_id()
 
     # Kick the user-scoped reads onto a worker thread. run_in_executor submits to
     # the pool synchronously, so the thread starts NOW, concurrently with the
@@ -244,9 +346,8 @@ async def bootstrap():
         f"wall={int((t_end-t_start)*1000)}ms"
     )
 
-    return {
+    return jsonable_encoder({
         "profiles": user_scoped["profiles"],
-        "credits": user_scoped["credits"],
         "settings": user_scoped["settings"],
         "quests_progress": user_scoped["quests_progress"],
         "projects": projects_response,
@@ -254,4 +355,49 @@ async def bootstrap():
         "downloads": misc["downloads"],
         "exports": misc["exports"],
         "pending_uploads": misc["pending_uploads"],
-    }
+    })
+
+
+@router.get("/bootstrap")
+async def bootstrap(request: Request, delta: bool = False):
+    """Single GET that replaces 9+ page-load fetches.
+
+    T4771: the two independent read groups run concurrently instead of serially.
+    The user.sqlite group (profiles/settings/quests) runs on a worker thread
+    while the profile.sqlite group (projects/games/downloads/exports/pending)
+    runs on the event loop; wall-clock becomes ~max(group) instead of the sum.
+    Still a single logical read path -- one endpoint, one response, no writes.
+
+    Repeat loads are answered from the version vector (see module docstring):
+    304 on an ETag match, the cached snapshot when no version source moved.
+    """
+    user_id = get_current_user_id()
+    key = (user_id, get_current_profile_id())
+    # Versions are read BEFORE the sections: a write that lands mid-read leaves
+    # the snapshot tagged with the older vector, so the next request re-reads.
+    versions, credits = await run_in_context(_read_versions_and_credits, user_id)
+    headers = {"Cache-Control": "private, no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+
+    sections = None
+    if versions is not None:
+        etag = _etag(versions, credits)
+        headers["ETag"] = etag
+        if if_none_match == etag:
+            return Response(status_code=304, headers=headers)
+        sections = _get_snapshot(key, versions)
+    if sections is None:
+        sections = await _read_sections(user_id)
+        if versions is not None:
+            _put_snapshot(key, versions, sections)
+
+    body = {"credits": credits, **sections}
+    previous = _parse_etag(if_none_match) if delta and versions is not None else None
+    if previous is not None and previous["t"] == versions["t"]:
+        moved = {source for source in "upg" if previous[source] != versions[source]}
+        body = {
+            "delta": True,
+            "credits": credits,
+            **{name: value for name, value in sections.items() if moved & set(_SECTION_SOURCES[name])},
+        }
+    return JSONResponse(body, headers=headers)
@@ -2,10 +2,12 @@
 Collections summary endpoint (T3610).
 
 Aggregates the published, latest-version final_videos into everything the
-Collections tab needs in ONE DB pass + one Python pass (summary-first, EPIC #13):
-per-game buckets, the Mixes bucket, season totals, and per-tag totals -- each
-split by aspect ratio, with a server-computed eligibility flag (a (scope, ratio)
-is a collection only once it has >= COLLECTION_MIN_DURATION_SEC of content).
+Collections tab needs (summary-first, EPIC #13): per-game buckets, the Mixes
+bucket, season totals, and per-tag totals -- each split by aspect ratio, with a
+server-computed eligibility flag (a (scope, ratio) is a collection only once it
+has >= COLLECTION_MIN_DURATION_SEC of content). The per-(scope, ratio) numbers
+are maintained incrementally in collection_aggregates
+(services/collection_aggregates.py); the summary is one read of those rows.
 
 Game attribution reads the FROZEN final_videos.game_ids BLOB (T3605) via
 collection_metadata.route_game_ids -- the SAME read path as the game_id/mixes
@@ -22,7 +24,9 @@ import logging
 import os
 import shutil
 import tempfile
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Literal
@@ -35,7 +39,16 @@ from app.analytics import record_milestone
 from app.database import get_db_connection
 from app.profile_context import get_current_profile_id
 from app.queries import exclude_teammate_reels_clause, latest_final_videos_subquery
+from app.services.collection_aggregates import (
+    ALL_SCOPE,
+    MIXES_SCOPE,
+    TOP_PLAYS_SCOPE,
+    apply_pending_collection_changes,
+    combo_scope,
+    read_collection_aggregates,
+)
 from app.services.collection_metadata import ORDER_BY_RANK, route_collection
+from app.services.download_metadata import open_download_stream
 from app.services.intro_cards import (
     collection_intro_settings_key,
     get_collection_intro_card_id,
@@ -235,14 +248,6 @@ class CollectionsSummaryResponse(BaseModel):
 # Accumulation helpers
 # ---------------------------------------------------------------------------
 
-def _utc(ts: str | None) -> str | None:
-    """Normalize a SQLite timestamp to ISO-UTC ('...Z') like downloads.py, so
-    JS parses it and lexical comparison orders it correctly."""
-    if ts and not ts.endswith("Z"):
-        return ts.replace(" ", "T") + "Z"
-    return ts
-
-
 def _new_bucket() -> dict:
     return {
         "reel_count": 0,
@@ -256,28 +261,6 @@ def _new_bucket() -> dict:
     }
 
 
-def _add_reel(bucket: dict, ratio: str, duration, published_at: str | None,
-              unwatched: bool = False, reel_id: int | None = None) -> None:
-    bucket["reel_count"] += 1
-    if unwatched:
-        bucket["unwatched_count"] += 1
-    bucket["ratio_counts"][ratio] = bucket["ratio_counts"].get(ratio, 0) + 1
-    if duration is None:
-        bucket["has_null_durations"] = True
-    else:
-        bucket["total_duration"] += duration
-        bucket["ratio_durations"][ratio] = (
-            bucket["ratio_durations"].get(ratio, 0.0) + duration
-        )
-    if published_at and (
-        bucket["latest_published_at"] is None
-        or published_at > bucket["latest_published_at"]
-    ):
-        bucket["latest_published_at"] = published_at
-    if bucket["leading_reel_id"] is None and reel_id is not None:
-        bucket["leading_reel_id"] = reel_id
-
-
 def _finalize_bucket(bucket: dict) -> dict:
     """Round durations and compute per-ratio eligibility (keyed off the ratios
     that have reels; a ratio with only NULL-duration reels is ineligible)."""
@@ -299,31 +282,6 @@ def _finalize_bucket(bucket: dict) -> dict:
     }
 
 
-def _add_total(acc: dict, key, duration) -> None:
-    """Accumulate a ratio-scoped (season/tag) total."""
-    t = acc.get(key)
-    if t is None:
-        t = {"reel_count": 0, "total_duration": 0.0, "has_null_durations": False}
-        acc[key] = t
-    t["reel_count"] += 1
-    if duration is None:
-        t["has_null_durations"] = True
-    else:
-        t["total_duration"] += duration
-
-
-def _season_key(date_str: str | None, season_fn) -> str | None:
-    """'<Season> <Year>' from a 'YYYY-MM-DD[...]' string, or None if unparseable."""
-    if not date_str:
-        return None
-    try:
-        normalized = date_str.replace("T", " ").replace("Z", "").strip()
-        dt = datetime.strptime(normalized[:10], "%Y-%m-%d")
-    except (ValueError, AttributeError):
-        return None
-    return f"{season_fn(dt.month)} {dt.year}"
-
-
 def _month_key_label(date_str: str | None) -> tuple[str, str] | None:
     """('YYYY-MM', '<Month> <Year>') from a 'YYYY-MM-DD[...]' string, or None if
     unparseable (T5880). The key sorts newest-first lexically; the label is the
@@ -389,6 +347,43 @@ def _build_game_groups(games: list, games_info: dict) -> list:
 # Endpoint
 # ---------------------------------------------------------------------------
 
+def _bucket_from_aggregates(by_ratio: dict[str, dict] | None) -> dict:
+    """Rebuild a _new_bucket()-shaped accumulator from a scope's per-ratio
+    aggregate rows (collection_aggregates). Ratios iterate in sorted order so
+    the float sums are deterministic; leading reel = lowest id (the order the
+    old per-call scan visited reels in)."""
+    bucket = _new_bucket()
+    for ratio in sorted(by_ratio or {}):
+        agg = by_ratio[ratio]
+        bucket["reel_count"] += agg["reel_count"]
+        bucket["unwatched_count"] += agg["unwatched_count"]
+        bucket["ratio_counts"][ratio] = agg["reel_count"]
+        if agg["null_duration_count"]:
+            bucket["has_null_durations"] = True
+        if agg["reel_count"] > agg["null_duration_count"]:
+            bucket["total_duration"] += agg["duration_sum"]
+            bucket["ratio_durations"][ratio] = agg["duration_sum"]
+        latest = agg["latest_published_at"]
+        if latest and (bucket["latest_published_at"] is None
+                       or latest > bucket["latest_published_at"]):
+            bucket["latest_published_at"] = latest
+        leading = agg["leading_reel_id"]
+        if leading is not None and (bucket["leading_reel_id"] is None
+                                    or leading < bucket["leading_reel_id"]):
+            bucket["leading_reel_id"] = leading
+    return bucket
+
+
+def _totals_from_aggregates(by_ratio: dict[str, dict], acc: dict, label) -> None:
+    """Season/tag totals keyed (label, ratio), as `_totals` consumes them."""
+    for ratio, agg in by_ratio.items():
+        acc[(label, ratio)] = {
+            "reel_count": agg["reel_count"],
+            "total_duration": agg["duration_sum"],
+            "has_null_durations": agg["null_duration_count"] > 0,
+        }
+
+
 @router.get("/summary", response_model=CollectionsSummaryResponse)
 async def collections_summary(sport: str | None = None):
     """Per-game / mixes / season / tag aggregates for the Collections tab.
@@ -397,74 +392,60 @@ async def collections_summary(sport: str | None = None):
     are sport-agnostic). It only chooses which curated nudge cards to attempt --
     a combo with no matching reels is omitted -- so eligibility stays fully
     server-computed regardless of the value passed.
+
+    Reads the incrementally maintained collection_aggregates rows (one row per
+    (scope, ratio); see services/collection_aggregates.py) after folding any
+    queued reel changes -- no per-call scan/decode of final_videos.
     """
-    # Reuse the downloads helpers (router->router import has precedent here).
-    from app.routers.downloads import (
-        _generate_game_display_name,
-        _get_season_for_month,
-    )
+    # Reuse the downloads helper (router->router import has precedent here).
+    from app.routers.downloads import _generate_game_display_name
 
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            f"""
-            SELECT fv.id, fv.game_ids, fv.aspect_ratio, fv.duration,
-                   fv.tags, fv.created_at, fv.published_at, fv.clip_count,
-                   fv.watched_at
-            FROM final_videos fv
-            WHERE fv.id IN ({latest_final_videos_subquery()})
-              AND fv.published_at IS NOT NULL
-              {exclude_teammate_reels_clause()}
-            """
-        )
-        rows = cursor.fetchall()
-
-        # Pass 1: decode + route. Collect resolved game ids for a batch lookup.
-        parsed = []
-        resolved_game_ids = set()
-        for row in rows:
-            ratio = row["aspect_ratio"]
-            if not ratio:
-                # annotated_game reels (the only NULL-ratio source) can never be
-                # published, so a NULL ratio here is a real data bug -- surface it,
-                # don't bucket it (no silent 'unknown' coercion; EPIC decision #4).
-                logger.warning(
-                    f"[Collections] published final_video id={row['id']} has NULL "
-                    f"aspect_ratio -- excluded from summary (data bug)."
-                )
-                continue
-            # T3630: collections are single-clip reels only. route_collection
-            # sends multi-clip reels (clip_count != 1) to Mixes; only single-clip
-            # reels resolve to a game / smart / season bucket.
-            single_clip = row["clip_count"] == 1
-            game_id = route_collection(row["game_ids"], row["clip_count"])
-            if game_id is not None:
-                resolved_game_ids.add(game_id)
-            parsed.append({
-                "id": row["id"],
-                "ratio": ratio,
-                "duration": row["duration"],
-                "published_at": _utc(row["published_at"]),
-                "created_at": row["created_at"],
-                "game_id": game_id,
-                "single_clip": single_clip,
-                "unwatched": row["watched_at"] is None,
-                "tags": decode_data(row["tags"]) or [],
-            })
+        apply_pending_collection_changes(conn)
+        scopes = read_collection_aggregates(conn)
+
+        game_buckets: dict[int, dict] = {}
+        mixes = _bucket_from_aggregates(scopes.get(MIXES_SCOPE))
+        season_acc: dict = {}
+        tag_acc: dict = {}
+        tag_buckets: dict[str, dict] = {}   # per-tag dynamic collections
+        for scope, by_ratio in scopes.items():
+            kind, _, value = scope.partition(":")
+            if kind == "game":
+                game_buckets[int(value)] = _bucket_from_aggregates(by_ratio)
+            elif kind == "season":
+                _totals_from_aggregates(by_ratio, season_acc, value)
+            elif kind == "tag":
+                _totals_from_aggregates(by_ratio, tag_acc, value)
+                tag_buckets[value] = _bucket_from_aggregates(by_ratio)
+        # Dict order = first-reel order, as the per-reel scan produced it (the
+        # stable latest_published_at sort below breaks ties by it).
+        game_buckets = dict(sorted(game_buckets.items(),
+                                   key=lambda kv: kv[1]["leading_reel_id"]))
+
+        curated_defs = _curated_for(sport)
+        curated_buckets = {
+            d["key"]: _bucket_from_aggregates(scopes.get(
+                TOP_PLAYS_SCOPE if d["tags"] is None else combo_scope(d["key"])
+            ))
+            for d in curated_defs
+        }
+        total_reel_count = sum(a["reel_count"] for a in scopes.get(ALL_SCOPE, {}).values())
 
         # Batch game display info. A routed game id whose row was later deleted
         # still belongs to its game (the frozen id is authoritative); it gets a
         # 'Game N' fallback name rather than being rerouted to mixes -- this keeps
         # the route_game_ids parity with the /api/downloads member filter trivial.
         games_info = {}
-        if resolved_game_ids:
-            placeholders = ",".join("?" for _ in resolved_game_ids)
+        if game_buckets:
+            cursor = conn.cursor()
+            placeholders = ",".join("?" for _ in game_buckets)
             cursor.execute(
                 f"""
                 SELECT id, name, game_date, opponent_name, game_type, tournament_name
                 FROM games WHERE id IN ({placeholders})
                 """,
-                list(resolved_game_ids),
+                list(game_buckets),
             )
             for g in cursor.fetchall():
                 games_info[g["id"]] = {
@@ -476,49 +457,6 @@ async def collections_summary(sport: str | None = None):
                     "tournament": g["tournament_name"] or None,   # T5880 axis
                 }
 
-        # Pass 2: build buckets + season/tag totals + smart-collection buckets.
-        game_buckets: dict[int, dict] = {}
-        mixes = _new_bucket()
-        season_acc: dict = {}
-        tag_acc: dict = {}
-        curated_defs = _curated_for(sport)
-        curated_buckets = {d["key"]: _new_bucket() for d in curated_defs}
-        tag_buckets: dict[str, dict] = {}   # per-tag dynamic collections
-
-        for p in parsed:
-            reel_id, ratio, duration, gid = p["id"], p["ratio"], p["duration"], p["game_id"]
-            unwatched = p["unwatched"]
-
-            # Multi-clip reels are NOT collection-eligible (T3630): they only
-            # count toward Mixes, never game/smart/season.
-            if not p["single_clip"]:
-                _add_reel(mixes, ratio, duration, p["published_at"], unwatched, reel_id)
-                continue
-
-            bucket = (game_buckets.setdefault(gid, _new_bucket())
-                      if gid is not None else mixes)
-            _add_reel(bucket, ratio, duration, p["published_at"], unwatched, reel_id)
-
-            # Season: the game's date when game-resolved, else the reel's created_at.
-            date_src = (games_info.get(gid, {}).get("date")
-                        if gid is not None else None) or p["created_at"]
-            skey = _season_key(date_src, _get_season_for_month)
-            if skey:
-                _add_total(season_acc, (skey, ratio), duration)
-
-            reel_tags = set(p["tags"])
-            for tag in reel_tags:
-                _add_total(tag_acc, (tag, ratio), duration)
-                _add_reel(tag_buckets.setdefault(tag, _new_bucket()),
-                          ratio, duration, p["published_at"], unwatched, reel_id)
-
-            # Curated collections: per-reel membership (tag-less group = all),
-            # so a multi-tag reel is counted once per matching group.
-            for d in curated_defs:
-                if d["tags"] is None or (reel_tags & d["tags"]):
-                    _add_reel(curated_buckets[d["key"]], ratio, duration,
-                              p["published_at"], unwatched, reel_id)
-
     games = [
         GameCollection(
             game_id=gid,
@@ -587,7 +525,7 @@ async def collections_summary(sport: str | None = None):
         mixes=RatioBucketed(**_finalize_bucket(mixes)),
         season_totals=season_totals,
         tag_totals=tag_totals,
-        total_reel_count=len(parsed),
+        total_reel_count=total_reel_count,
     )
 
 
@@ -829,6 +767,8 @@ async def get_collection_intro_playback(
 # stitch with the intro/outro cards in ONE pass. This endpoint is the wiring.
 
 _MEMBER_KEY_PREFIX = "final_videos"
+# Member downloads in flight at once for the local (MODAL_ENABLED=false) stitch.
+COLLECTION_STITCH_FETCH_CONCURRENCY = int(os.getenv("COLLECTION_STITCH_FETCH_CONCURRENCY", "4"))
 
 
 def _collection_download_filename(scope_type: str, tags: list[str] | None) -> str:
@@ -906,26 +846,16 @@ def _collection_download_cache_key(
     return f"{r2_prefix}/{_CACHE_KEY_PREFIX}/{digest}.mp4"
 
 
-def _stream_file_and_cleanup(path: str, cleanup_dir: str):
-    """Stream an on-disk MP4 in 1 MiB chunks, then `rmtree` `cleanup_dir` in a
-    `finally`. Shared by the cache-hit and freshly-built collection-download
-    paths so they never drift on chunk size / cleanup. A failure here is
-    genuinely post-headers (the 200 is already committed) -- logged loudly with
-    context rather than silently swallowed."""
-    def _gen():
-        try:
-            with open(path, "rb") as fin:
-                while True:
-                    chunk = fin.read(1024 * 1024)
-                    if not chunk:
-                        break
-                    yield chunk
-        except Exception:
-            logger.exception(f"[CollectionDownload] streaming file failed mid-stream: {path}")
-            raise
-        finally:
-            shutil.rmtree(cleanup_dir, ignore_errors=True)
-    return _gen()
+def _stamped_download_response(
+    serve_path: str, tmp_dir: str, meta: dict, headers: dict,
+) -> StreamingResponse:
+    """T6360 stamp + stream, shared by the cache-hit and freshly-built paths so
+    they never drift. Blocking (may spawn ffmpeg and wait for its first chunk) --
+    call via `asyncio.to_thread`. The body is the streamed fragmented-MP4 stamp
+    (chunked) or, when that does not apply, the stamped file with its exact
+    Content-Length; `tmp_dir` is rmtree'd once the body is done either way."""
+    chunks, extra = open_download_stream(serve_path, tmp_dir, meta, cleanup_dir=tmp_dir)
+    return StreamingResponse(chunks, media_type="video/mp4", headers={**headers, **extra})
 
 
 def _stitch_members_local(
@@ -945,8 +875,9 @@ def _stitch_members_local(
     from app.database import get_final_videos_path
     from app.services.ffmpeg_concat import concat_segments, probe_media
 
-    seg_paths: list[str] = []
-    for i, key in enumerate(member_keys):
+    final_videos = None if R2_ENABLED else get_final_videos_path()
+
+    def fetch(i: int, key: str) -> str:
         local = os.path.join(tmp_dir, f"member_{i}.mp4")
         if R2_ENABLED:
             # Explicit profile_id (T5340): this runs inside the deferred
@@ -956,11 +887,23 @@ def _stitch_members_local(
                 raise RuntimeError(f"could not download collection member {key!r}")
         else:
             filename = key.split("/", 1)[1] if "/" in key else key
-            src = get_final_videos_path() / filename
+            src = final_videos / filename
             if not src.exists():
                 raise RuntimeError(f"collection member file missing: {src}")
             shutil.copyfile(src, local)
-        seg_paths.append(local)
+        return local
+
+    # Up to COLLECTION_STITCH_FETCH_CONCURRENCY members in flight, in member
+    # order; map() hands the paths back in that order and re-raises the first
+    # failure. A 20-reel collection pays roughly the slowest GETs, not their sum.
+    started = time.perf_counter()
+    workers = max(1, min(COLLECTION_STITCH_FETCH_CONCURRENCY, len(member_keys)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="collection-fetch") as pool:
+        seg_paths = list(pool.map(fetch, range(len(member_keys)), member_keys))
+    logger.info(
+        f"[CollectionDownload] fetched {len(seg_paths)} members in "
+        f"{time.perf_counter() - started:.2f}s ({workers} in flight)"
+    )
 
     if len(seg_paths) == 1:
         # One member: the "stitch" is just that member -- compose still prepends
@@ -1052,10 +995,7 @@ async def download_collection(
     # DELIBERATELY NOT baked into the T4947 cache -- `artist` is the current
     # profile name, so a rename must reflect on the next download without
     # poisoning the cached bytes (which stay keyed on stitch + cards only).
-    from app.services.download_metadata import (
-        apply_download_metadata,
-        build_collection_metadata,
-    )
+    from app.services.download_metadata import build_collection_metadata
     coll_meta = build_collection_metadata(scope_type, tag_list, user_id, profile_id)
 
     record_milestone(user_id, "collection_downloaded", {
@@ -1095,12 +1035,8 @@ async def download_collection(
         if await asyncio.to_thread(download_from_r2_global, cache_key, Path(cached_path)):
             logger.info(f"[CollectionDownload] cache HIT {cache_key}")
             # Stamp metadata on the cached (unstamped) bytes at serve time.
-            stamped_path = await asyncio.to_thread(
-                apply_download_metadata, cached_path, cache_tmp, coll_meta,
-            )
-            return StreamingResponse(
-                _stream_file_and_cleanup(stamped_path, cache_tmp),
-                media_type="video/mp4", headers=dl_headers,
+            return await asyncio.to_thread(
+                _stamped_download_response, cached_path, cache_tmp, coll_meta, dl_headers,
             )
         # HEAD said present but the GET failed (transient blip / just-evicted) --
         # tear down and fall through to a fresh build rather than 5xx.
@@ -1225,14 +1161,9 @@ async def download_collection(
 
     # T6360: stamp AFTER the cache write above, so the cache stores the unstamped
     # compose output (matching the cache-HIT path, which stamps on read) while
-    # this caller streams the stamped file.
-    serve_path = await asyncio.to_thread(
-        apply_download_metadata, serve_path, tmp_dir, coll_meta,
-    )
-
-    return StreamingResponse(
-        _stream_file_and_cleanup(serve_path, tmp_dir),
-        media_type="video/mp4", headers=dl_headers,
+    # this caller streams the stamped bytes.
+    return await asyncio.to_thread(
+        _stamped_download_response, serve_path, tmp_dir, coll_meta, dl_headers,
     )
 
 
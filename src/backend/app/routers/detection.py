@@ -24,7 +24,6 @@ import tempfile
 import uuid
 from pathlib import Path
 
-import cv2
 from fastapi import APIRouter, File, HTTPException, UploadFile
 
 from ..database import get_db_connection
@@ -47,10 +46,14 @@ from ..storage import (
     upload_bytes_to_r2,
 )
 from ..user_context import get_current_user_id
+from ..utils.lazy_import import lazy_module
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/detect", tags=["detection"])
 
+# Deferred to the first local frame extraction (cold-start hygiene).
+cv2 = lazy_module("cv2")
+
 # YOLO model singleton
 _yolo_model = None
 
@@ -15,6 +15,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from starlette.concurrency import iterate_in_threadpool
 
 from app.constants import SourceType
 from app.database import column_exists, get_db_connection, get_final_videos_path, sync_db_to_r2_explicit
@@ -24,7 +25,11 @@ from app.middleware.db_sync import (
     set_durable_sync_failure_response,
 )
 from app.profile_context import get_current_profile_id
-from app.queries import exclude_teammate_reels_clause, latest_final_videos_subquery
+from app.queries import (
+    exclude_teammate_reels_clause,
+    latest_final_videos_subquery,
+    season_for_month,
+)
 from app.services.collection_metadata import ORDER_BY_RANK, route_collection
 from app.services.intro_cards import (
     load_profile_cards,
@@ -100,16 +105,6 @@ def get_download_file_url(filename: str, verify_exists: bool = False) -> str | N
     return url
 
 
-def _get_season_for_month(month: int) -> str:
-    """Get season name for a given month (1-12)."""
-    if month in (9, 10, 11, 12):  # Sep-Dec
-        return "Fall"
-    elif month in (1, 2, 3, 4, 5):  # Jan-May
-        return "Spring"
-    else:  # Jun-Aug
-        return "Summer"
-
-
 def _generate_game_display_name(
     opponent_name: str | None,
     game_date: str | None,
@@ -180,7 +175,7 @@ def _generate_group_key(game_names: list[str], game_dates: list[str]) -> str | N
                 year = int(parts[0])
                 month = int(parts[1])
                 years.add(year)
-                season = _get_season_for_month(month)
+                season = season_for_month(month)
                 if year not in seasons_by_year:
                     seasons_by_year[year] = set()
                 seasons_by_year[year].add(season)
@@ -661,16 +656,17 @@ def generate_download_filename(project_name: str) -> str:
     return f"{safe_name}_final.mp4"
 
 
-def _stamp_download(
+def _open_stamped_download(
     serve_path: str, tmp_dir: str, meta: dict,
     user_id: str, profile_id: str,
-) -> str:
+):
     """T6360: download the reel's cover-art poster (when it has one) into
-    `tmp_dir`, then run the metadata/cover-art stamping pass over `serve_path`
-    (the composed `[intro?][reel][outro?]` file). Returns the path to stream:
-    the stamped file on success, `serve_path` unchanged on any skip/failure.
+    `tmp_dir`, then open the metadata/cover-art stamped body for `serve_path`
+    (the composed `[intro?][reel][outro?]` file). Returns `(chunks, headers)`
+    from `download_metadata.open_download_stream`: a streamed fragmented-MP4 mux
+    when there is no cover, else the stamped (or, on failure, unstamped) file.
     Blocking (ffmpeg + R2); callers wrap it in `asyncio.to_thread`. Never raises."""
-    from app.services.download_metadata import apply_download_metadata, fetch_owner_cover
+    from app.services.download_metadata import fetch_owner_cover, open_download_stream
 
     poster_basename = meta.get("poster_basename") if meta else None
     if poster_basename:
@@ -683,7 +679,7 @@ def _stamp_download(
             logger.info(
                 f"[Download] no cover art for poster={poster_basename}; stamping tags only"
             )
-    return apply_download_metadata(serve_path, tmp_dir, meta)
+    return open_download_stream(serve_path, tmp_dir, meta)
 
 
 @router.get("/{download_id}/file")
@@ -817,17 +813,15 @@ async def download_file(download_id: int):
                         if intro is not None:
                             intro.cleanup()
 
-                    serve_path = await asyncio.to_thread(
-                        _stamp_download, serve_path, tmp_dir, dl_meta,
+                    chunks, _ = await asyncio.to_thread(
+                        _open_stamped_download, serve_path, tmp_dir, dl_meta,
                         user_id, profile_id,
                     )
-
-                    with open(serve_path, "rb") as fin:
-                        while True:
-                            chunk = fin.read(1024 * 1024)
-                            if not chunk:
-                                break
+                    try:
+                        async for chunk in iterate_in_threadpool(chunks):
                             yield chunk
+                    finally:
+                        chunks.close()  # client gone early -> stop the stamping ffmpeg now
                 finally:
                     _shutil.rmtree(tmp_dir, ignore_errors=True)
 
@@ -868,17 +862,15 @@ async def download_file(download_id: int):
                     if intro is not None:
                         intro.cleanup()
 
-                serve_path = await asyncio.to_thread(
-                    _stamp_download, serve_path, tmp_dir, dl_meta,
+                chunks, _ = await asyncio.to_thread(
+                    _open_stamped_download, serve_path, tmp_dir, dl_meta,
                     user_id, profile_id,
                 )
-
-                with open(serve_path, "rb") as fin:
-                    while True:
-                        chunk = fin.read(1024 * 1024)
-                        if not chunk:
-                            break
+                try:
+                    async for chunk in iterate_in_threadpool(chunks):
                         yield chunk
+                finally:
+                    chunks.close()  # client gone early -> stop the stamping ffmpeg now
             finally:
                 _shutil.rmtree(tmp_dir, ignore_errors=True)
 
@@ -1206,7 +1198,8 @@ async def set_download_intro(download_id: int, body: IntroAttachRequest):
 
 
 async def _serve_reel_poster_jpeg(rel_path: str, if_none_match: str | None = None):
-    """Proxy a published reel's poster object with a FRESH presign per request.
+    """Proxy a published reel's poster object, presigning FRESH whenever R2 is
+    contacted.
 
     Per-profile (the owner's current profile prefix), resolved through
     `generate_presigned_url`. Mirrors `projects._serve_draft_poster_jpeg`. The
@@ -1214,58 +1207,37 @@ async def _serve_reel_poster_jpeg(rel_path: str, if_none_match: str | None = Non
     upstream rather than a 502 from a signed GET of a nonexistent key.
     T5682: long cache (86400s) + ETag (R2's own) for 304 cache hits.
 
-    `if_none_match` (T5682): HEADs R2 first (body-free) when present -> a match
-    short-circuits to 304 without a full GET. No header -> unchanged single-GET
-    hot path.
-
-    Uses the shared pooled httpx client (`get_poster_r2_client`) -- a fresh
-    `AsyncClient()` per request paid a full TLS handshake to R2 every time
-    (~300-600ms observed), the T4773 landmine repeated here (T5682 fix).
+    Bytes come from the local ETag-keyed poster cache (`poster_cache`): a hot
+    poster is served with zero R2 round trips, a stale one is revalidated with
+    a conditional GET through the shared pooled httpx client
+    (`get_poster_r2_client`, T5682 -- a fresh `AsyncClient()` per request paid
+    a full TLS handshake every time). `if_none_match` matching the cached ETag
+    -> 304.
     """
-    from fastapi.responses import Response
-
-    from app.storage import get_poster_r2_client, r2_head_object
+    from app.services import poster_cache
 
     user_id = get_current_user_id()
-
-    if if_none_match:
-        head = r2_head_object(user_id, rel_path)
-        if head and head.get("ETag") == if_none_match:
-            return Response(status_code=304, headers={
-                "Cache-Control": "private, max-age=86400",
-                "ETag": head["ETag"],
-            })
-
-    url = generate_presigned_url(
-        user_id, rel_path, expires_in=3600, content_type="image/jpeg"
-    )
-    if not url:
+    key = r2_key(user_id, rel_path)
+    try:
+        entry = await poster_cache.get_poster(key, lambda: generate_presigned_url(
+            user_id, rel_path, expires_in=3600, content_type="image/jpeg"
+        ))
+    except poster_cache.PosterFetchError as e:
+        log_video_resolution(
+            logger, kind="reel_poster",
+            outcome=video_outcome_for_status(e.status_code),
+            key=key, user_id=user_id,
+            profile_id=get_current_profile_id(), reason=f"r2_status_{e.status_code}",
+        )
+        raise HTTPException(status_code=502, detail="Poster fetch failed") from e
+    if entry is None:
         log_video_resolution(
             logger, kind="reel_poster", outcome=VideoServeOutcome.MISSING,
-            key=r2_key(user_id, rel_path), user_id=user_id,
+            key=key, user_id=user_id,
             profile_id=get_current_profile_id(), reason="presign_unavailable",
         )
         raise HTTPException(status_code=404, detail="No poster for this reel")
-    resp = await get_poster_r2_client().get(url)
-    if resp.status_code != 200:
-        log_video_resolution(
-            logger, kind="reel_poster",
-            outcome=video_outcome_for_status(resp.status_code),
-            key=r2_key(user_id, rel_path), user_id=user_id,
-            profile_id=get_current_profile_id(), reason=f"r2_status_{resp.status_code}",
-        )
-        raise HTTPException(status_code=502, detail="Poster fetch failed")
-
-    # T5682: reuse R2's own ETag (already on the GET response) -- no extra hashing.
-    etag = resp.headers.get("etag", "")
-    headers = {"Cache-Control": "private, max-age=86400"}
-    if etag:
-        headers["ETag"] = etag
-    return Response(
-        content=resp.content,
-        media_type="image/jpeg",
-        headers=headers,
-    )
+    return poster_cache.poster_response(entry, if_none_match, "private, max-age=86400")
 
 
 @router.get("/{download_id}/poster.jpg")
@@ -1295,6 +1267,7 @@ async def get_reel_poster(download_id: int, request: Request):
     """
     from fastapi.responses import Response
 
+    from app.services import poster_cache
     from app.services.poster import ensure_reel_card_poster, reel_card_poster_rel_path
     from app.storage import r2_head_object
 
@@ -1316,6 +1289,12 @@ async def get_reel_poster(download_id: int, request: Request):
     user_id = get_current_user_id()
 
     if_none_match = request.headers.get("if-none-match")
+    # A fresh locally cached card answers both the 304 and the 200 with zero
+    # R2 round trips (no HEADs, no GET).
+    cached = await poster_cache.peek(r2_key(user_id, card_rel_path))
+    if cached is not None:
+        return poster_cache.poster_response(cached, if_none_match, "private, max-age=86400")
+
     if if_none_match:
         head = r2_head_object(user_id, card_rel_path)
         if head and head.get("ETag") == if_none_match:
@@ -34,6 +34,7 @@ from ...interpolation import generate_crop_filter
 from ...models import CropKeyframe
 from ...profile_context import get_current_profile_id
 from ...queries import latest_working_clips_subquery
+from ...services import highlight_store
 from ...services.ffmpeg_service import get_video_duration, get_video_info
 from ...storage import generate_presigned_url, upload_bytes_to_r2
 from ...user_context import get_current_user_id
@@ -239,13 +240,16 @@ async def export_framing(
 
         # Get existing overlay data from current working video to carry forward
         cursor.execute("""
-            SELECT wv.highlights_data, wv.effect_type
+            SELECT wv.id, wv.highlights_data, wv.effect_type
             FROM projects p
             LEFT JOIN working_videos wv ON p.working_video_id = wv.id
             WHERE p.id = ?
         """, (project_id,))
         existing = cursor.fetchone()
-        existing_highlights = existing['highlights_data'] if existing else None
+        existing_highlights = (
+            highlight_store.highlights_blob(cursor, existing['id'], existing['highlights_data'])
+            if existing else None
+        )
         existing_effect_type = normalize_effect_type(existing['effect_type']) if existing else DEFAULT_HIGHLIGHT_EFFECT.value
 
         # T4010: do NOT null final_video_id on a framing re-export. The published
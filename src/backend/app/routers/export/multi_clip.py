@@ -11,6 +11,7 @@ Uses the transition strategy pattern for different transition types.
 
 import asyncio
 import base64
+import functools
 import json
 import logging
 import math
@@ -28,11 +29,6 @@ from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import FileResponse, JSONResponse
 from starlette.background import BackgroundTask
 
-try:
-    import torch
-except ImportError:
-    torch = None
-
 from ...constants import AI_UPSCALE_FACTOR, VIDEO_MAX_HEIGHT, VIDEO_MAX_WIDTH, ExportStage, ExportStatus
 from ...database import column_exists, get_db_connection
 from ...profile_context import get_current_profile_id, set_current_profile_id
@@ -51,13 +47,24 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# AI upscaler will be imported on-demand
-AIVideoUpscaler = None
-try:
-    from app.ai_upscaler import AIVideoUpscaler as _AIVideoUpscaler
-    AIVideoUpscaler = _AIVideoUpscaler
-except (ImportError, OSError, AttributeError) as e:
-    logger.warning(f"AI upscaler dependencies not available: {e}")
+
+@functools.cache
+def _load_gpu_stack():
+    """(AIVideoUpscaler, torch), imported on the first LOCAL export rather than
+    at app import -- app.ai_upscaler pulls in cv2/numpy (and tries torch +
+    torchvision), which every cold start paid for even though prod renders on
+    Modal. Either element is None when its dependencies are missing (the lean
+    CPU image has no torch)."""
+    try:
+        import torch
+    except ImportError:
+        torch = None
+    try:
+        from app.ai_upscaler import AIVideoUpscaler
+    except (ImportError, OSError, AttributeError) as e:
+        logger.warning(f"AI upscaler dependencies not available: {e}")
+        AIVideoUpscaler = None
+    return AIVideoUpscaler, torch
 
 
 # Default duration for auto-generated highlight regions (seconds)
@@ -1007,6 +1014,7 @@ async def process_single_clip(
     # Reuse provided upscaler or create a new one
     if upscaler is None:
         # Check AI upscaler availability (only when no upscaler provided)
+        AIVideoUpscaler, _torch = _load_gpu_stack()
         if AIVideoUpscaler is None:
             raise HTTPException(
                 status_code=503,
@@ -1271,6 +1279,9 @@ async def _export_clips(
 ) -> JSONResponse:
     """Core export pipeline. Handles 1-N clips via Modal or local GPU."""
     logger.info(f"[T1116] _export_clips entered: export_id={export_id}, clips={len(clips)}, modal={modal_enabled()}")
+    # Bound by the LOCAL branch below; stays None on the Modal path so the
+    # error/cleanup handlers never import torch just to skip a cache flush.
+    torch = None
     # Reconstruct legacy formats for internal functions
     clips_data = []
     video_files: dict[int, Any] = {}
@@ -1555,6 +1566,7 @@ async def _export_clips(
 
         # ===== LOCAL PROCESSING (GPU or mock for tests) =====
 
+        AIVideoUpscaler, torch = _load_gpu_stack()
         if is_test_mode:
             from app.services.local_processors import MockVideoUpscaler
             shared_upscaler = MockVideoUpscaler()
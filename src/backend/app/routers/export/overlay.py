@@ -11,6 +11,7 @@ These endpoints handle highlight regions, effect types, and final output.
 """
 
 import asyncio
+import heapq
 import json
 import logging
 import math
@@ -42,6 +43,7 @@ from ...highlight_transform import (
 from ...middleware.db_sync import DURABLE_SYNC_FAILED_RESPONSE, durable_sync
 from ...profile_context import get_current_profile_id
 from ...schemas import TextSpec
+from ...services import highlight_store
 from ...services.collection_metadata import (
     compute_project_game_ids,
     compute_project_metadata,
@@ -405,38 +407,47 @@ class OverlayActionResponse(BaseModel):
     error: str | None = None
 
 
-def _get_overlay_data(cursor, project_id: int) -> tuple:
-    """
-    Get current overlay data for a project.
-    Returns (highlights_data list, effect_type str, highlight_color str, working_video_id int, version int).
-    """
+def _select_overlay_row(cursor, project_id: int):
+    """The project's current working_videos row (overlay columns), or None."""
     cursor.execute("""
         SELECT wv.id, wv.highlights_data, wv.effect_type, wv.highlight_color, wv.overlay_version
         FROM working_videos wv
         JOIN projects p ON p.working_video_id = wv.id
         WHERE p.id = ?
     """, (project_id,))
-    row = cursor.fetchone()
+    return cursor.fetchone()
+
+
+def _log_undecodable_highlights(row, project_id: int, e: Exception) -> None:
+    # NEVER fall back to []. A swallowed decode failure would let the user's
+    # next gesture persist an empty list and permanently erase every highlight.
+    # Callers re-raise (endpoint returns 500) and the stored blob is left intact
+    # for recovery. See T4210 / CLAUDE.md "No Silent Fallbacks for Internal Data".
+    logger.error(
+        f"[Overlay] Failed to decode highlights_data for working_video_id={row['id']} "
+        f"(project_id={project_id}): {e}. Refusing to overwrite with empty list.",
+        exc_info=True,
+    )
+
+
+def _get_overlay_data(cursor, project_id: int) -> tuple:
+    """
+    Get current overlay data for a project.
+    Returns (highlights_data list, effect_type str, highlight_color str, working_video_id int, version int).
+
+    The highlights list is assembled from the highlight_regions rows when the
+    working video has been split, else decoded from the blob (highlight_store).
+    """
+    row = _select_overlay_row(cursor, project_id)
 
     if not row:
         return None, None, None, None, None
 
-    highlights = []
-    if row['highlights_data']:
-        try:
-            highlights = decode_data(row['highlights_data'])
-        except Exception as e:
-            # NEVER fall back to []. Every overlay action does read-modify-write of
-            # the whole blob, so returning [] here would make the user's next gesture
-            # persist an empty list and permanently erase every highlight. Fail
-            # visibly instead (endpoint returns 500) and leave the stored blob intact
-            # for recovery. See T4210 / CLAUDE.md "No Silent Fallbacks for Internal Data".
-            logger.error(
-                f"[Overlay] Failed to decode highlights_data for working_video_id={row['id']} "
-                f"(project_id={project_id}): {e}. Refusing to overwrite with empty list.",
-                exc_info=True,
-            )
-            raise
+    try:
+        highlights = highlight_store.load_highlights(cursor, row['id'], row['highlights_data'])
+    except Exception as e:
+        _log_undecodable_highlights(row, project_id, e)
+        raise
 
     effect_type = normalize_effect_type(row['effect_type'])
     highlight_color = row['highlight_color']  # Can be None
@@ -445,13 +456,17 @@ def _get_overlay_data(cursor, project_id: int) -> tuple:
     return highlights, effect_type, highlight_color, row['id'], version
 
 
-def _save_overlay_data(cursor, working_video_id: int, highlights: list, effect_type: str, highlight_color: str, new_version: int):
-    """Save overlay data back to the working_videos table."""
+def _save_overlay_settings(cursor, working_video_id: int, effect_type: str, highlight_color: str, new_version: int):
+    """Save the working video's effect/color and bump overlay_version.
+
+    Region and keyframe edits are written per region by the action itself
+    (highlight_store); this never touches highlights_data.
+    """
     cursor.execute("""
         UPDATE working_videos
-        SET highlights_data = ?, effect_type = ?, highlight_color = ?, overlay_version = ?
+        SET effect_type = ?, highlight_color = ?, overlay_version = ?
         WHERE id = ?
-    """, (encode_data(highlights), effect_type, highlight_color, new_version, working_video_id))
+    """, (effect_type, highlight_color, new_version, working_video_id))
 
 
 def _get_text_overlays(cursor, working_video_id: int) -> list:
@@ -514,12 +529,12 @@ def _find_text_element(text_overlays: list, element_id: str) -> tuple:
     return -1, -1
 
 
-def _find_region_index(highlights: list, region_id: str) -> int:
-    """Find index of region by ID. Returns -1 if not found."""
-    for i, region in enumerate(highlights):
-        if region.get('id') == region_id:
-            return i
-    return -1
+def _load_region(cursor, working_video_id: int, region_id: str) -> tuple[int, dict]:
+    """(row id, region) of a highlight region by ID. Raises ValueError if not found."""
+    found = highlight_store.get_region(cursor, working_video_id, region_id)
+    if found is None:
+        raise ValueError(f"Region {region_id} not found")
+    return found
 
 
 def _find_keyframe_index(keyframes: list, time: float, tolerance: float = 0.02) -> int:
@@ -635,12 +650,17 @@ async def overlay_action(project_id: int, action: OverlayAction):
     with get_db_connection() as conn:
         cursor = conn.cursor()
 
-        # Get current overlay data
-        highlights, effect_type, highlight_color, working_video_id, version = _get_overlay_data(cursor, project_id)
+        # Get current overlay settings; regions are read per action below.
+        row = _select_overlay_row(cursor, project_id)
 
-        if working_video_id is None:
+        if row is None:
             raise HTTPException(status_code=404, detail="Project not found or has no working video")
 
+        working_video_id = row['id']
+        effect_type = normalize_effect_type(row['effect_type'])
+        highlight_color = row['highlight_color']  # Can be None
+        version = row['overlay_version'] or 0
+
         # T4330: conflict detection -- a mismatched expected_version means
         # another writer committed since this caller last read. Pure
         # comparison against the already-read `version`, no I/O -- must stay
@@ -654,6 +674,15 @@ async def overlay_action(project_id: int, action: OverlayAction):
                 "message": "This project was edited elsewhere. Refresh to see the latest.",
             })
 
+        # A gesture rewrites one region row, never the whole list: move a
+        # still-blob working video into highlight_regions (once). An undecodable
+        # blob raises here (500) and stays byte-identical (T4210).
+        try:
+            highlight_store.split_highlights(cursor, working_video_id, row['highlights_data'])
+        except Exception as e:
+            _log_undecodable_highlights(row, project_id, e)
+            raise
+
         new_version = version + 1
         region_id = None
         error = None
@@ -696,7 +725,7 @@ async def overlay_action(project_id: int, action: OverlayAction):
                     "keyframes": seed_keyframes,
                     "detections": [],
                 }
-                highlights.append(new_region)
+                highlight_store.insert_region(cursor, working_video_id, new_region)
                 logger.info(f"[Overlay Action] Created region {region_id}")
 
             elif action.action == "delete_region":
@@ -704,11 +733,9 @@ async def overlay_action(project_id: int, action: OverlayAction):
                 if not action.target or not action.target.region_id:
                     raise ValueError("delete_region requires target.region_id")
 
-                idx = _find_region_index(highlights, action.target.region_id)
-                if idx == -1:
+                if not highlight_store.delete_region(cursor, working_video_id, action.target.region_id):
                     raise ValueError(f"Region {action.target.region_id} not found")
 
-                del highlights[idx]
                 logger.info(f"[Overlay Action] Deleted region {action.target.region_id}")
 
             elif action.action == "update_region":
@@ -716,11 +743,7 @@ async def overlay_action(project_id: int, action: OverlayAction):
                 if not action.target or not action.target.region_id:
                     raise ValueError("update_region requires target.region_id")
 
-                idx = _find_region_index(highlights, action.target.region_id)
-                if idx == -1:
-                    raise ValueError(f"Region {action.target.region_id} not found")
-
-                region = highlights[idx]
+                row_id, region = _load_region(cursor, working_video_id, action.target.region_id)
                 if action.data:
                     # T7180 (prod bug 44p): write canonical snake_case, and drop
                     # a stale camelCase pair if one exists. Auto-generated
@@ -741,6 +764,7 @@ async def overlay_action(project_id: int, action: OverlayAction):
                     if action.data.end_time is not None:
                         region['end_time'] = action.data.end_time
                         region.pop('endTime', None)
+                highlight_store.update_region(cursor, row_id, region)
                 logger.info(f"[Overlay Action] Updated region {action.target.region_id}")
 
             elif action.action == "toggle_region":
@@ -750,11 +774,9 @@ async def overlay_action(project_id: int, action: OverlayAction):
                 if not action.data or action.data.enabled is None:
                     raise ValueError("toggle_region requires data.enabled")
 
-                idx = _find_region_index(highlights, action.target.region_id)
-                if idx == -1:
-                    raise ValueError(f"Region {action.target.region_id} not found")
-
-                highlights[idx]['enabled'] = action.data.enabled
+                row_id, region = _load_region(cursor, working_video_id, action.target.region_id)
+                region['enabled'] = action.data.enabled
+                highlight_store.update_region(cursor, row_id, region)
                 logger.info(f"[Overlay Action] Toggled region {action.target.region_id} to {action.data.enabled}")
 
             elif action.action == "add_keyframe":
@@ -764,11 +786,7 @@ async def overlay_action(project_id: int, action: OverlayAction):
                 if not action.data or action.data.time is None:
                     raise ValueError("add_keyframe requires data.time")
 
-                idx = _find_region_index(highlights, action.target.region_id)
-                if idx == -1:
-                    raise ValueError(f"Region {action.target.region_id} not found")
-
-                region = highlights[idx]
+                row_id, region = _load_region(cursor, working_video_id, action.target.region_id)
                 keyframes = region.get('keyframes', [])
 
                 # Check if keyframe already exists at this time
@@ -808,17 +826,14 @@ async def overlay_action(project_id: int, action: OverlayAction):
                     keyframes.sort(key=lambda k: k.get('time', 0))
                     region['keyframes'] = keyframes
                     logger.info(f"[Overlay Action] Added keyframe at {action.data.time}s")
+                highlight_store.update_region(cursor, row_id, region)
 
             elif action.action == "update_keyframe":
                 # Update existing keyframe properties
                 if not action.target or not action.target.region_id or action.target.keyframe_time is None:
                     raise ValueError("update_keyframe requires target.region_id and target.keyframe_time")
 
-                idx = _find_region_index(highlights, action.target.region_id)
-                if idx == -1:
-                    raise ValueError(f"Region {action.target.region_id} not found")
-
-                region = highlights[idx]
+                row_id, region = _load_region(cursor, working_video_id, action.target.region_id)
                 keyframes = region.get('keyframes', [])
                 kf_idx = _find_keyframe_index(keyframes, action.target.keyframe_time)
                 if kf_idx == -1:
@@ -845,6 +860,7 @@ async def overlay_action(project_id: int, action: OverlayAction):
 
                 # Re-sort if time changed
                 keyframes.sort(key=lambda k: k.get('time', 0))
+                highlight_store.update_region(cursor, row_id, region)
                 logger.info(f"[Overlay Action] Updated keyframe at {action.target.keyframe_time}s")
 
             elif action.action == "delete_keyframe":
@@ -852,11 +868,7 @@ async def overlay_action(project_id: int, action: OverlayAction):
                 if not action.target or not action.target.region_id or action.target.keyframe_time is None:
                     raise ValueError("delete_keyframe requires target.region_id and target.keyframe_time")
 
-                idx = _find_region_index(highlights, action.target.region_id)
-                if idx == -1:
-                    raise ValueError(f"Region {action.target.region_id} not found")
-
-                region = highlights[idx]
+                row_id, region = _load_region(cursor, working_video_id, action.target.region_id)
                 keyframes = region.get('keyframes', [])
                 kf_idx = _find_keyframe_index(keyframes, action.target.keyframe_time)
                 if kf_idx == -1:
@@ -872,6 +884,7 @@ async def overlay_action(project_id: int, action: OverlayAction):
                     )
                 else:
                     del keyframes[kf_idx]
+                    highlight_store.update_region(cursor, row_id, region)
                     logger.info(f"[Overlay Action] Deleted keyframe at {action.target.keyframe_time}s")
 
             elif action.action == "set_effect_type":
@@ -1107,7 +1120,7 @@ async def overlay_action(project_id: int, action: OverlayAction):
             else:
                 raise ValueError(f"Unknown action: {action.action}")
 
-            _save_overlay_data(cursor, working_video_id, highlights, effect_type, highlight_color, new_version)
+            _save_overlay_settings(cursor, working_video_id, effect_type, highlight_color, new_version)
             conn.commit()
 
             return JSONResponse({
@@ -1210,6 +1223,55 @@ def _blend_text_layers(frame, decoded_layers: list, current_time: float):
     return frame
 
 
+class _IntervalCursor:
+    """Which intervals are active at time t, for a render loop whose t only grows.
+
+    Built once per export from (start, end, item) triples. Each advance() pops
+    the intervals that started since the last call and drops the ones that
+    ended, so a frame costs amortized O(1) however many regions or text blocks
+    a game-length overlay has -- instead of a scan of every interval per frame.
+    The active list is rebuilt only on the frames where it changes.
+
+    `closed_end` picks the boundary rule: highlight regions are active on the
+    closed [start, end], text layers on the half-open [start, end) (O6). Active
+    items come back in their input order (the region list's start order, the
+    text layers' blend order). A time earlier than the previous one (never
+    seen from the frame loop) restarts the cursor rather than answering wrongly.
+    """
+
+    def __init__(self, intervals: list[tuple[float, float, object]], closed_end: bool):
+        self._intervals = intervals
+        self._closed_end = closed_end
+        self._by_start = sorted(range(len(intervals)), key=lambda i: intervals[i][0])
+        self._reset()
+
+    def _reset(self) -> None:
+        self._next = 0           # next interval (in start order) not yet started
+        self._ends: list = []    # heap of (end, index) for started intervals
+        self._active: set = set()
+        self._items: list = []
+        self._last_t = float('-inf')
+
+    def advance(self, t: float) -> list:
+        """Items active at `t`, in input order."""
+        if t < self._last_t:
+            self._reset()
+        self._last_t = t
+        changed = False
+        while self._next < len(self._by_start) and self._intervals[self._by_start[self._next]][0] <= t:
+            i = self._by_start[self._next]
+            heapq.heappush(self._ends, (self._intervals[i][1], i))
+            self._active.add(i)
+            self._next += 1
+            changed = True
+        while self._ends and (self._ends[0][0] < t or (not self._closed_end and self._ends[0][0] <= t)):
+            self._active.discard(heapq.heappop(self._ends)[1])
+            changed = True
+        if changed:
+            self._items = [self._intervals[i][2] for i in sorted(self._active)]
+        return self._items
+
+
 def _process_frames_to_ffmpeg(
     input_path: str,
     output_path: str,
@@ -1230,6 +1292,7 @@ def _process_frames_to_ffmpeg(
     import cv2
 
     from app.ai_upscaler.keyframe_interpolator import KeyframeInterpolator
+    from app.keyframe_spline import HighlightTrack
 
     # DEBUG: Log what we received
     logger.info(f"[Overlay Export] DEBUG - _process_frames_to_ffmpeg called with {len(highlight_regions)} regions, effect={highlight_effect_type}")
@@ -1303,10 +1366,25 @@ def _process_frames_to_ffmpeg(
     # Sort regions by start time for efficient lookup. _region_bounds tolerates
     # both camelCase (action-written) and snake_case (transform-written) blobs.
     sorted_regions = sorted(highlight_regions, key=lambda r: _region_bounds(r)[0])
+    # Interval index over the regions, built once: the loop asks it for the
+    # active region instead of scanning every region per frame. The FIRST
+    # active region in start order wins, as before. Each entry carries the
+    # region's bounds and a track that splines all of its frames in a single
+    # vectorized call the first time the loop enters it.
+    region_intervals = []
+    for region in sorted_regions:
+        bounds = _region_bounds(region)
+        track = HighlightTrack(_keyframes_within_bounds(region), *bounds, fps)
+        region_intervals.append((*bounds, (region, bounds, track)))
+    region_cursor = _IntervalCursor(region_intervals, closed_end=True)
 
     # T5225: decode every text layer's PNG ONCE, before the frame loop -- never
     # re-rasterised or re-decoded per frame.
     decoded_text_layers = _decode_text_layers(text_layers or [], width, height)
+    text_cursor = _IntervalCursor(
+        [(layer['startTime'], layer['endTime'], layer) for layer in decoded_text_layers],
+        closed_end=False,
+    )
 
     frame_idx = 0
     try:
@@ -1317,26 +1395,18 @@ def _process_frames_to_ffmpeg(
 
             current_time = frame_idx / fps
 
-            # Find active region for this frame
-            active_region = None
-            for region in sorted_regions:
-                r_start, r_end = _region_bounds(region)
-                if r_start <= current_time <= r_end:
-                    active_region = region
-                    break
+            # Active region for this frame (first in start order)
+            active = region_cursor.advance(current_time)
 
             # Render highlight if in a region
-            if active_region:
-                region_keyframes = _keyframes_within_bounds(active_region)
-
+            if active:
+                active_region, active_bounds, active_track = active[0]
                 # T5250: exit fade-out envelope, derived from the region bounds +
                 # current_time (shared spec, mirrored in HighlightOverlay + video_processing).
                 # Applied by render_highlight_on_frame — never mutates keyframe data.
-                reveal_opacity, reveal_scale = compute_spotlight_reveal(
-                    current_time, *_region_bounds(active_region)
-                )
+                reveal_opacity, reveal_scale = compute_spotlight_reveal(current_time, *active_bounds)
 
-                highlight = KeyframeInterpolator.interpolate_highlight(region_keyframes, current_time)
+                highlight = active_track.at(frame_idx)
                 if highlight is not None:
                     # Check if keyframe coordinates need to be scaled from detection space to working video space
                     # Detection may have run on source video (e.g., 2560x1440) but rendering is on working video (e.g., 1080x1920)
@@ -1369,8 +1439,9 @@ def _process_frames_to_ffmpeg(
             # T5225: alpha-blend any ACTIVE text layer AFTER the highlight but
             # BEFORE the frame is written -- decoded once above, blended fresh
             # every frame.
-            if decoded_text_layers:
-                frame = _blend_text_layers(frame, decoded_text_layers, current_time)
+            active_text_layers = text_cursor.advance(current_time)
+            if active_text_layers:
+                frame = _blend_text_layers(frame, active_text_layers, current_time)
 
             # Write frame directly to FFmpeg's stdin (no disk I/O!)
             ffmpeg_proc.stdin.write(frame.tobytes())
@@ -2144,7 +2215,7 @@ async def get_overlay_data(project_id: int):
         # below already falls back to hoisting detections from the regions.
         _has_detections = column_exists(cursor, "working_videos", "detections_data")
         cursor.execute(f"""
-            SELECT highlights_data, text_overlays, effect_type, highlight_color, duration,
+            SELECT id, highlights_data, text_overlays, effect_type, highlight_color, duration,
                    highlight_shape, stroke_width, fill_enabled, fill_opacity, dim_strength, version,
                    {'detections_data' if _has_detections else 'NULL AS detections_data'}
             FROM working_videos
@@ -2173,11 +2244,10 @@ async def get_overlay_data(project_id: int):
         version = 0
 
         if result:
-            if result['highlights_data']:
-                try:
-                    highlights = decode_data(result['highlights_data'])
-                except Exception:
-                    pass
+            try:
+                highlights = highlight_store.load_highlights(cursor, result['id'], result['highlights_data'])
+            except Exception:
+                pass
 
             if result['text_overlays']:
                 text_overlays = decode_data(result['text_overlays']) or []
@@ -2833,6 +2903,14 @@ async def render_overlay(request: OverlayRenderRequest, http_request: Request):
         from app.services.export_helpers import derive_project_name
         project_name = derive_project_name(project_id, cursor) or project['name']
 
+        # Assembled from highlight_regions rows when split, else the blob.
+        try:
+            stored_regions = highlight_store.load_highlights(
+                cursor, project['working_video_id'], project['highlights_data'])
+        except Exception as e:
+            stored_regions = []
+            logger.error(f"[Overlay Render] DEBUG - decode error: {e}")
+
         working_filename = project['working_filename']
 
         video_duration = project['duration'] if project['duration'] else None
@@ -2862,20 +2940,13 @@ async def render_overlay(request: OverlayRenderRequest, http_request: Request):
     # written before T7180 rather than the primary defense — kept as the
     # single DB-read boundary so both the local and Modal paths stay covered
     # without touching the stored blob.
-    highlight_regions = []
-    if project['highlights_data']:
-        try:
-            highlight_regions = [
-                _normalize_region_keys(r)
-                for r in (decode_data(project['highlights_data']) or [])
-            ]
-            # DEBUG: Log what we loaded from database
-            logger.info(f"[Overlay Render] DEBUG - Loaded highlights_data from DB: {len(project['highlights_data'])} chars")
-            if highlight_regions and highlight_regions[0].get('keyframes'):
-                first_kf = highlight_regions[0]['keyframes'][:3]
-                logger.info(f"[Overlay Render] DEBUG - First region keyframes sample: {first_kf}")
-        except Exception as e:
-            logger.error(f"[Overlay Render] DEBUG - decode error: {e}")
+    highlight_regions = [_normalize_region_keys(r) for r in stored_regions]
+    if highlight_regions:
+        # DEBUG: Log what we loaded from database
+        logger.info(f"[Overlay Render] DEBUG - Loaded {len(highlight_regions)} highlight regions from DB")
+        if highlight_regions[0].get('keyframes'):
+            first_kf = highlight_regions[0]['keyframes'][:3]
+            logger.info(f"[Overlay Render] DEBUG - First region keyframes sample: {first_kf}")
     else:
         logger.warning("[Overlay Render] DEBUG - highlights_data is empty/None!")
 
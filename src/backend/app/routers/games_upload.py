@@ -7,6 +7,15 @@ This router handles deduplicated game uploads:
 
 Games are stored globally in R2 at games/{blake3_hash}.mp4 for deduplication.
 The blake3_hash is stored in the games table for lookup.
+
+Object metadata is set when the multipart upload is created, and finalize
+verifies the client's parts against R2's own part list (ETags and sizes) before
+completing. Finalize never HEADs or copies a multi-GB object in the common path.
+Clients send the video metadata to both prepare-upload and finalize; finalize
+only uses it for a session created without it (pending_uploads.
+video_metadata_set = 0: created before metadata moved to prepare-upload, or by
+a client that sent none), and that copy-in-place runs as parallel
+UploadPartCopy ranges.
 """
 
 import logging
@@ -18,7 +27,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 
 from app.constants import UploadStatus
-from app.database import get_db_connection
+from app.database import column_exists, get_db_connection
 from app.middleware.db_sync import durable_sync
 from app.services.credit_ledger import get_credit_balance
 from app.services.storage_credits import calculate_upload_cost
@@ -31,6 +40,7 @@ from app.storage import (
     r2_create_multipart_upload,
     r2_head_object_global,
     r2_is_multipart_upload_valid,
+    r2_list_multipart_parts,
     r2_set_object_metadata_global,
 )
 from app.user_context import get_current_user_id
@@ -60,6 +70,49 @@ def validate_file_size(size: int) -> bool:
     return 0 < size <= MAX_FILE_SIZE
 
 
+def build_object_metadata(
+    original_filename: str,
+    video_duration: float | None = None,
+    video_width: int | None = None,
+    video_height: int | None = None,
+) -> dict:
+    """R2 user metadata for a game object (S3 metadata values are strings)."""
+    metadata = {
+        'original_filename': original_filename,
+        'created_at': datetime.utcnow().isoformat() + 'Z'
+    }
+    if video_duration:
+        metadata['duration'] = str(video_duration)
+    if video_width:
+        metadata['width'] = str(video_width)
+    if video_height:
+        metadata['height'] = str(video_height)
+    return metadata
+
+
+def verify_uploaded_parts(client_parts: list, uploaded_parts: list, expected_size: int) -> str | None:
+    """Check the client's part list against R2's (r2_list_multipart_parts).
+
+    Every client part must exist in R2 with the same ETag, and the parts the
+    upload will be assembled from must add up to `expected_size` -- the same
+    guarantee the post-completion HEAD gave, checked before completing.
+
+    Returns None when the parts are consistent, else an error message.
+    """
+    uploaded = {p['PartNumber']: p for p in uploaded_parts}
+    total = 0
+    for part in client_parts:
+        stored = uploaded.get(part['PartNumber'])
+        if stored is None:
+            return f"Part {part['PartNumber']} was not uploaded"
+        if stored['ETag'].strip('"') != part['ETag'].strip('"'):
+            return f"Part {part['PartNumber']} ETag mismatch"
+        total += stored['Size']
+    if total != expected_size:
+        return f"File size mismatch: expected {expected_size}, got {total}"
+    return None
+
+
 # ==============================================================================
 # Request/Response Models
 # ==============================================================================
@@ -69,6 +122,10 @@ class PrepareUploadRequest(BaseModel):
     file_size: int = Field(..., description="File size in bytes")
     original_filename: str = Field(..., description="Original filename")
     label: str | None = Field(None, description="Display label (e.g. 'First Half')")
+    # Video metadata stored on the R2 object, set when the multipart upload is created
+    video_duration: float | None = Field(None, description="Video duration in seconds")
+    video_width: int | None = Field(None, description="Video width in pixels")
+    video_height: int | None = Field(None, description="Video height in pixels")
 
 
 class PartInfo(BaseModel):
@@ -79,7 +136,8 @@ class PartInfo(BaseModel):
 class FinalizeUploadRequest(BaseModel):
     upload_session_id: str = Field(..., description="Session ID from prepare-upload")
     parts: list[PartInfo] = Field(..., description="List of uploaded parts with ETags")
-    # Video metadata stored on R2 object for future reference
+    # Only used when the session was created without video metadata (see
+    # pending_uploads.video_metadata_set); then it costs a copy-in-place.
     video_duration: float | None = Field(None, description="Video duration in seconds")
     video_width: int | None = Field(None, description="Video width in pixels")
     video_height: int | None = Field(None, description="Video height in pixels")
@@ -207,7 +265,13 @@ async def prepare_upload(request: PrepareUploadRequest):
                 # Fall through to create new upload below
 
     # Game doesn't exist and no pending upload - create new multipart upload
-    upload_id = r2_create_multipart_upload(r2_key)
+    metadata = build_object_metadata(
+        request.original_filename,
+        request.video_duration,
+        request.video_width,
+        request.video_height,
+    )
+    upload_id = r2_create_multipart_upload(r2_key, metadata=metadata)
     if not upload_id:
         raise HTTPException(
             status_code=500,
@@ -218,6 +282,7 @@ async def prepare_upload(request: PrepareUploadRequest):
     session_id = f"upload_{uuid.uuid4().hex}"
 
     # Store pending upload in user's database
+    video_metadata_set = bool(request.video_duration or request.video_width or request.video_height)
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
@@ -233,6 +298,13 @@ async def prepare_upload(request: PrepareUploadRequest):
             upload_id,
             request.label,
         ))
+        # Before v050 runs the column is missing and the session reads as
+        # created without metadata -- finalize then copies, which is safe.
+        if video_metadata_set and column_exists(cursor, "pending_uploads", "video_metadata_set"):
+            cursor.execute(
+                "UPDATE pending_uploads SET video_metadata_set = 1 WHERE id = ?",
+                (session_id,)
+            )
         conn.commit()
 
     # Generate presigned URLs for all parts (4 hour expiry)
@@ -268,7 +340,10 @@ async def finalize_upload(
     """
     Complete a multipart upload after all parts have been uploaded.
 
-    Verifies the upload, sets metadata, and links the game to the user.
+    Verifies the client's parts against R2's part list (ETags and total size),
+    then completes the upload. Metadata was normally set at create time
+    (prepare-upload); a session created without it gets the request's video
+    metadata by copy-in-place.
     """
     if not R2_ENABLED:
         raise HTTPException(
@@ -303,6 +378,22 @@ async def finalize_upload(
             for p in request.parts
         ]
 
+        expected_size = pending['file_size']
+
+        # Verify parts before completing: R2's list_parts returns each part's
+        # ETag and size, so no HEAD of the assembled object is needed after.
+        uploaded_parts = r2_list_multipart_parts(r2_key, r2_upload_id)
+        if uploaded_parts is None:
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to list uploaded parts"
+            )
+        mismatch = verify_uploaded_parts(r2_parts, uploaded_parts, expected_size)
+        if mismatch:
+            logger.error(f"Part verification failed for {blake3_hash}: {mismatch}")
+            # Don't abort - the session stays resumable / available to investigate
+            raise HTTPException(status_code=400, detail=mismatch)
+
         # Complete multipart upload
         if not r2_complete_multipart_upload(r2_key, r2_upload_id, r2_parts):
             # Attempt to abort the upload to clean up
@@ -312,43 +403,26 @@ async def finalize_upload(
                 detail="Failed to complete multipart upload"
             )
 
-        # Verify file size matches
-        head_result = r2_head_object_global(r2_key)
-        if not head_result:
-            raise HTTPException(
-                status_code=500,
-                detail="Upload completed but object not found"
-            )
+        actual_size = expected_size
 
-        actual_size = head_result.get('ContentLength', 0)
-        expected_size = pending['file_size']
-
-        if actual_size != expected_size:
-            logger.error(
-                f"Size mismatch for {blake3_hash}: "
-                f"expected {expected_size}, got {actual_size}"
-            )
-            # Don't delete - let admin investigate
-            raise HTTPException(
-                status_code=400,
-                detail=f"File size mismatch: expected {expected_size}, got {actual_size}"
+        # Sessions created without video metadata (before prepare-upload took
+        # it, or by a client that sent none there) still need it attached.
+        metadata_set = (
+            column_exists(cursor, "pending_uploads", "video_metadata_set")
+            and pending['video_metadata_set']
+        )
+        if not metadata_set and (request.video_duration or request.video_width or request.video_height):
+            r2_set_object_metadata_global(
+                r2_key,
+                build_object_metadata(
+                    pending['original_filename'],
+                    request.video_duration,
+                    request.video_width,
+                    request.video_height,
+                ),
+                size=actual_size,
             )
 
-        # Set metadata on the R2 object
-        initial_metadata = {
-            'original_filename': pending['original_filename'],
-            'created_at': datetime.utcnow().isoformat() + 'Z'
-        }
-        # Add video metadata if provided
-        if request.video_duration:
-            initial_metadata['duration'] = str(request.video_duration)
-        if request.video_width:
-            initial_metadata['width'] = str(request.video_width)
-        if request.video_height:
-            initial_metadata['height'] = str(request.video_height)
-
-        r2_set_object_metadata_global(r2_key, initial_metadata)
-
         # Delete pending upload record
         cursor.execute(
             "DELETE FROM pending_uploads WHERE id = ?",
@@ -12,7 +12,8 @@ from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
 from pydantic import BaseModel
 
 from app.database import get_db_connection
-from app.queries import derive_clip_name, latest_working_clips_subquery
+from app.queries import derive_clip_name, latest_working_clips_subquery, season_for_month
+from app.services.clip_tag_index import all_tags_clause, drop_queued_mismatches
 from app.services.collection_metadata import compute_unified_clip_start
 from app.storage import (
     R2_ENABLED,
@@ -69,16 +70,6 @@ def _working_video_r2_key(filename: str) -> str:
     return r2_key(get_current_user_id(), f"working_videos/{filename}")
 
 
-def _get_season_for_month(month: int) -> str:
-    """Get season name for a given month (1-12)."""
-    if month in (9, 10, 11, 12):  # Sep-Dec
-        return "Fall"
-    elif month in (1, 2, 3, 4, 5):  # Jan-May
-        return "Spring"
-    else:  # Jun-Aug
-        return "Summer"
-
-
 def _generate_game_display_name(
     opponent_name: str | None,
     game_date: str | None,
@@ -150,7 +141,7 @@ def _generate_group_key(game_names: list[str], game_dates: list[str]) -> str | N
                 year = int(parts[0])
                 month = int(parts[1])
                 years.add(year)
-                season = _get_season_for_month(month)
+                season = season_for_month(month)
                 if year not in seasons_by_year:
                     seasons_by_year[year] = set()
                 seasons_by_year[year].add(season)
@@ -346,6 +337,7 @@ def _read_projects_list():
                 -- Check for overlay edits (highlights or text overlays with actual content)
                 CASE WHEN (
                     (wv.highlights_data IS NOT NULL AND wv.highlights_data != '[]' AND wv.highlights_data != '') OR
+                    EXISTS (SELECT 1 FROM highlight_regions hr WHERE hr.working_video_id = wv.id) OR
                     (wv.text_overlays IS NOT NULL AND wv.text_overlays != '[]' AND wv.text_overlays != '')
                 ) THEN 1 ELSE 0 END as has_overlay_edits,
                 -- Final video info (check if ANY final video exists for this project)
@@ -662,26 +654,25 @@ async def create_project(project: ProjectCreate):
 
 
 def _build_clips_filter_query(game_ids: list[int], min_rating: int, tags: list[str]):
-    """Build SQL query and params for filtering raw clips."""
-    # min_rating = 0 means "All clips" (include everything regardless of rating)
-    if min_rating <= 0:
-        query = """
-            SELECT rc.id, rc.filename, rc.rating, rc.tags, rc.name, rc.notes,
-                   rc.start_time, rc.end_time, rc.game_id,
-                   COALESCE(rc.boundaries_version, 1) as boundaries_version
-            FROM raw_clips rc
-            WHERE 1=1
-        """
-        params = []
-    else:
-        query = """
-            SELECT rc.id, rc.filename, rc.rating, rc.tags, rc.name, rc.notes,
-                   rc.start_time, rc.end_time, rc.game_id,
-                   COALESCE(rc.boundaries_version, 1) as boundaries_version
-            FROM raw_clips rc
-            WHERE COALESCE(rc.rating, 0) >= ?
-        """
-        params = [min_rating]
+    """Build SQL query and params for filtering raw clips.
+
+    Tags go through the raw_clip_tags index (services/clip_tag_index.py); with
+    tags, callers pass the fetched rows through drop_queued_mismatches.
+    """
+    query = """
+        SELECT rc.id, rc.filename, rc.rating, rc.tags, rc.name, rc.notes,
+               rc.start_time, rc.end_time, rc.game_id,
+               COALESCE(rc.boundaries_version, 1) as boundaries_version
+        FROM raw_clips rc
+        WHERE 1=1
+    """
+    params = []
+
+    # min_rating = 0 means "All clips" (include everything regardless of rating).
+    # rating is NOT NULL, so the bare column keeps idx_raw_clips_game_rating usable.
+    if min_rating > 0:
+        query += " AND rc.rating >= ?"
+        params.append(min_rating)
 
     if game_ids:
         placeholders = ','.join(['?' for _ in game_ids])
@@ -689,11 +680,10 @@ def _build_clips_filter_query(game_ids: list[int], min_rating: int, tags: list[s
         params.extend(game_ids)
 
     # Tag filtering - clips must have ALL specified tags
-    # Tags are stored as JSON array, so we need to check each tag
     if tags:
-        for tag in tags:
-            query += " AND rc.tags LIKE ?"
-            params.append(f'%"{tag}"%')
+        clause, tag_params = all_tags_clause(tags)
+        query += f" AND {clause}"
+        params.extend(tag_params)
 
     query += " ORDER BY created_at DESC"
     return query, params
@@ -714,6 +704,8 @@ async def preview_clips(request: ClipsPreviewRequest):
         )
         cursor.execute(query, params)
         clips = cursor.fetchall()
+        if request.tags:
+            clips = drop_queued_mismatches(cursor, clips, request.tags)
 
         total_duration = 0.0
         clips_info = []
@@ -786,6 +778,8 @@ async def create_project_from_clips(request: ProjectFromClipsCreate):
             )
             cursor.execute(query, params)
             clips = cursor.fetchall()
+            if request.tags:
+                clips = drop_queued_mismatches(cursor, clips, request.tags)
 
         if not clips:
             raise HTTPException(
@@ -954,6 +948,10 @@ async def delete_project(project_id: int):
             DELETE FROM final_videos WHERE project_id = ?
         """, (project_id,))
 
+        # An archived project may live in a shared archive segment; dropping
+        # its index row leaves the segment to the session-init reclaim sweep.
+        cursor.execute("DELETE FROM project_archive_index WHERE project_id = ?", (project_id,))
+
         # Delete project — cascades to working_clips, working_videos, export_jobs
         # projects.working_video_id and final_video_id use ON DELETE SET NULL
         # so deleting working_videos/final_videos first would auto-null them,
@@ -1362,7 +1360,7 @@ async def get_working_video_playback_url(project_id: int):
 
 
 async def _serve_draft_poster_jpeg(rel_path: str, if_none_match: str | None = None):
-    """Proxy a draft poster object with a FRESH presign per request.
+    """Proxy a draft poster object, presigning FRESH whenever R2 is contacted.
 
     Mirrors `shares.py::_serve_poster_jpeg`, but the key is PROFILE-scoped (the
     draft's owner), resolved through `generate_presigned_url` (current-context
@@ -1370,46 +1368,24 @@ async def _serve_draft_poster_jpeg(rel_path: str, if_none_match: str | None = No
     failure. T5682: long cache (86400s) + ETag (R2's own, no extra hashing) for
     304 cache hits on 200s; short negative cache (60s) on 404s.
 
-    `if_none_match` (T5682): when the caller has a cached ETag, this HEADs R2
-    first (body-free round trip) to compare -- a match short-circuits to a 304
-    WITHOUT a full GET. No `if_none_match` -> the original single-GET hot path,
-    unchanged (no extra R2 round trip for first-time visitors).
-
-    Uses the shared pooled httpx client (`get_poster_r2_client`) -- a fresh
-    `AsyncClient()` per request paid a full TLS handshake to R2 every time
-    (~300-600ms observed), the T4773 landmine repeated here (T5682 fix).
+    Bytes come from the local ETag-keyed poster cache (`poster_cache`): a hot
+    poster is served with zero R2 round trips, a stale one is revalidated with
+    a conditional GET through the shared pooled httpx client
+    (`get_poster_r2_client`, T5682). `if_none_match` matching the cached ETag
+    -> 304.
     """
-    from fastapi.responses import Response
-
-    from app.storage import get_poster_r2_client, r2_head_object
+    from app.services import poster_cache
 
     user_id = get_current_user_id()
-
-    if if_none_match:
-        head = r2_head_object(user_id, rel_path)
-        if head and head.get("ETag") == if_none_match:
-            return Response(status_code=304, headers={
-                "Cache-Control": "private, max-age=86400",
-                "ETag": head["ETag"],
-            })
-
-    url = generate_presigned_url(user_id, rel_path, expires_in=3600, content_type="image/jpeg")
-    if not url:
+    try:
+        entry = await poster_cache.get_poster(r2_key(user_id, rel_path), lambda: generate_presigned_url(
+            user_id, rel_path, expires_in=3600, content_type="image/jpeg"
+        ))
+    except poster_cache.PosterFetchError as e:
+        raise HTTPException(status_code=502, detail="Poster fetch failed") from e
+    if entry is None:
         raise HTTPException(status_code=404, detail="No poster for this draft")
-    resp = await get_poster_r2_client().get(url)
-    if resp.status_code != 200:
-        raise HTTPException(status_code=502, detail="Poster fetch failed")
-
-    # T5682: reuse R2's own ETag (already on the GET response) -- no extra hashing.
-    etag = resp.headers.get("etag", "")
-    headers = {"Cache-Control": "private, max-age=86400"}
-    if etag:
-        headers["ETag"] = etag
-    return Response(
-        content=resp.content,
-        media_type="image/jpeg",
-        headers=headers,
-    )
+    return poster_cache.poster_response(entry, if_none_match, "private, max-age=86400")
 
 
 @router.get("/{project_id}/poster.jpg")
@@ -1433,12 +1409,19 @@ async def get_draft_poster(project_id: int, request: Request):
     """
     from fastapi.responses import Response
 
+    from app.services import poster_cache
     from app.services.poster import draft_poster_rel_path, ensure_draft_poster
     from app.storage import r2_head_object
 
     user_id = get_current_user_id()
 
     if_none_match = request.headers.get("if-none-match")
+    # A fresh locally cached poster answers both the 304 and the 200 with zero
+    # R2 round trips.
+    cached = await poster_cache.peek(r2_key(user_id, draft_poster_rel_path(project_id)))
+    if cached is not None:
+        return poster_cache.poster_response(cached, if_none_match, "private, max-age=86400")
+
     if if_none_match:
         rel_path = draft_poster_rel_path(project_id)
         head = r2_head_object(user_id, rel_path)
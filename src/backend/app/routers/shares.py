@@ -21,10 +21,12 @@ from typing import Union
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from starlette.concurrency import iterate_in_threadpool
 
 from ..analytics import record_milestone
 from ..database import get_db_connection
 from ..profile_context import get_current_profile_id
+from ..services import poster_cache
 from ..services.auth_db import (
     get_user_by_email,
     get_user_by_id,
@@ -326,24 +328,24 @@ def _resolve_share_metadata(share: dict) -> dict | None:
         conn.close()
 
 
-def _stamp_shared_download(serve_path: str, tmp_dir: str, share: dict) -> str:
-    """Download the sharer's poster (when present) into `tmp_dir` and run the
-    T6360 metadata/cover-art stamping pass over the composed share download.
-    Returns the path to stream (stamped on success, `serve_path` otherwise).
+def _open_stamped_shared_download(serve_path: str, tmp_dir: str, share: dict):
+    """Download the sharer's poster (when present) into `tmp_dir` and open the
+    T6360 metadata/cover-art stamped body for the composed share download.
+    Returns `(chunks, headers)` from `download_metadata.open_download_stream`
+    (streamed when there is no cover, else the stamped or unstamped file).
     Blocking (R2 + ffmpeg) -- callers wrap in `asyncio.to_thread`. Never raises."""
     from pathlib import Path
 
-    from app.services.download_metadata import apply_download_metadata
+    from app.services.download_metadata import open_download_stream
 
     meta = _resolve_share_metadata(share)
-    if not meta:
-        return serve_path
-    poster_key = _build_poster_r2_key(share)
-    if r2_head_object_global(poster_key) is not None:
-        cover_local = os.path.join(tmp_dir, "cover.jpg")
-        if download_from_r2_global(poster_key, Path(cover_local)):
-            meta["cover_path"] = cover_local
-    return apply_download_metadata(serve_path, tmp_dir, meta)
+    if meta:
+        poster_key = _build_poster_r2_key(share)
+        if r2_head_object_global(poster_key) is not None:
+            cover_local = os.path.join(tmp_dir, "cover.jpg")
+            if download_from_r2_global(poster_key, Path(cover_local)):
+                meta["cover_path"] = cover_local
+    return open_download_stream(serve_path, tmp_dir, meta)
 
 
 def _recap_poster_r2_key(share: dict) -> str:
@@ -702,7 +704,7 @@ async def get_shared_game_link(
 
 
 @shared_router.get("/game/{share_token}/poster.jpg")
-async def get_shared_game_poster(share_token: str):
+async def get_shared_game_poster(share_token: str, request: Request = None):
     """Stable unfurl image for a public game link: the TEAM recap's clearest
     frame (T5720). Generated-on-first-request at `recaps/posters/{game_id}_team.jpg`
     then reused; never a presigned URL in og:image (T4890). 404 when no team
@@ -719,9 +721,12 @@ async def get_shared_game_poster(share_token: str):
         raise HTTPException(404, "Share not found")
 
     team_poster_key = _team_recap_poster_r2_key(share)
-    if not ensure_recap_poster(_team_recap_r2_key(share), team_poster_key):
+    # A cached poster already exists in R2; skip ensure_recap_poster's HEAD.
+    if await poster_cache.peek(team_poster_key) is None and not ensure_recap_poster(
+        _team_recap_r2_key(share), team_poster_key
+    ):
         raise HTTPException(404, "No recap poster for this share")
-    return await _serve_poster_jpeg(team_poster_key)
+    return await _serve_poster_jpeg(team_poster_key, _if_none_match(request))
 
 
 @shared_router.post("/game/{share_token}/viewed", status_code=204)
@@ -989,16 +994,14 @@ async def download_shared_video(share_token: str, request: Request):
                 if intro is not None:
                     intro.cleanup()
 
-            serve_path = await asyncio.to_thread(
-                _stamp_shared_download, serve_path, tmp_dir, share,
+            chunks, _ = await asyncio.to_thread(
+                _open_stamped_shared_download, serve_path, tmp_dir, share,
             )
-
-            with open(serve_path, "rb") as fin:
-                while True:
-                    chunk = fin.read(1024 * 1024)
-                    if not chunk:
-                        break
+            try:
+                async for chunk in iterate_in_threadpool(chunks):
                     yield chunk
+            finally:
+                chunks.close()  # client gone early -> stop the stamping ffmpeg now
         finally:
             _shutil.rmtree(tmp_dir, ignore_errors=True)
 
@@ -1009,28 +1012,32 @@ async def download_shared_video(share_token: str, request: Request):
     )
 
 
-async def _serve_poster_jpeg(poster_key: str) -> Response:
-    """Proxy a poster object with a FRESH presign per request (24h client cache).
-    404 when the object is absent; 502 on an R2 fetch failure. Never presigned
-    URLs in responses - crawlers refetch after signatures expire."""
-    if r2_head_object_global(poster_key) is None:
+async def _serve_poster_jpeg(poster_key: str, if_none_match: str | None = None) -> Response:
+    """Proxy a poster object, presigning FRESH only when R2 must be contacted
+    (24h client cache). Bytes come from the local ETag-keyed poster cache
+    (poster_cache), so a hot poster costs zero R2 round trips and a browser
+    that already holds the ETag gets a 304. 404 when the object is absent; 502
+    on an R2 fetch failure. Never presigned URLs in responses - crawlers
+    refetch after signatures expire."""
+    try:
+        entry = await poster_cache.get_poster(
+            poster_key, lambda: generate_presigned_url_global(poster_key)
+        )
+    except poster_cache.PosterFetchError as e:
+        if e.status_code == 404:
+            raise HTTPException(404, "No poster for this share") from e
+        raise HTTPException(502, "Poster fetch failed") from e
+    if entry is None:
         raise HTTPException(404, "No poster for this share")
+    return poster_cache.poster_response(entry, if_none_match, "public, max-age=86400")
 
-    import httpx
-    url = generate_presigned_url_global(poster_key)
-    async with httpx.AsyncClient(timeout=httpx.Timeout(15.0, connect=5.0)) as client:
-        resp = await client.get(url)
-    if resp.status_code != 200:
-        raise HTTPException(502, "Poster fetch failed")
-    return Response(
-        content=resp.content,
-        media_type="image/jpeg",
-        headers={"Cache-Control": "public, max-age=86400"},
-    )
+
+def _if_none_match(request: Request | None) -> str | None:
+    return request.headers.get("if-none-match") if request is not None else None
 
 
 @shared_router.get("/collection/{share_token}/poster.jpg")
-async def get_shared_collection_poster(share_token: str):
+async def get_shared_collection_poster(share_token: str, request: Request = None):
     """Stable unfurl image for a COLLECTION share: the first member's poster.
 
     Public collections only - crawlers cannot authenticate, and a private
@@ -1044,11 +1051,11 @@ async def get_shared_collection_poster(share_token: str):
     poster_key = first_member_poster_key(share)
     if poster_key is None:
         raise HTTPException(404, "No poster for this share")
-    return await _serve_poster_jpeg(poster_key)
+    return await _serve_poster_jpeg(poster_key, _if_none_match(request))
 
 
 @shared_router.get("/teammate/{share_token}/poster.jpg")
-async def get_shared_teammate_poster(share_token: str):
+async def get_shared_teammate_poster(share_token: str, request: Request = None):
     """Stable unfurl image for a TEAMMATE (game) share: the game recap's clearest
     frame (T5180). Generated-on-first-request and cached at the deterministic key
     `recaps/posters/{game_id}.jpg`, then reused. Whole-clip clearest-frame policy
@@ -1066,25 +1073,28 @@ async def get_shared_teammate_poster(share_token: str):
 
     from ..services.poster import ensure_recap_poster
     recap_poster_key = _recap_poster_r2_key(share)
-    if not ensure_recap_poster(_recap_r2_key(share), recap_poster_key):
+    if await poster_cache.peek(recap_poster_key) is None and not ensure_recap_poster(
+        _recap_r2_key(share), recap_poster_key
+    ):
         raise HTTPException(404, "No recap poster for this share")
-    return await _serve_poster_jpeg(recap_poster_key)
+    return await _serve_poster_jpeg(recap_poster_key, _if_none_match(request))
 
 
 @shared_router.get("/{share_token}/poster.jpg")
-async def get_shared_poster(share_token: str):
+async def get_shared_poster(share_token: str, request: Request = None):
     """Stable public poster image for unfurl crawlers (T4890 follow-up).
 
     og:image must never embed a presigned URL: crawlers refetch after the
     signature's 4h expiry and the edge-cached share HTML would carry a dead
-    link. This proxies the poster object with a FRESH presign per request.
+    link. This proxies the poster object (local byte cache, fresh presign
+    whenever R2 is contacted).
     Access model: knowing the share token grants the poster (one frame of an
     already-shared video), same trust boundary as the share link itself.
     """
     share = get_share_by_token(share_token)
     if not share or share["revoked_at"]:
         raise HTTPException(404, "Share not found")
-    return await _serve_poster_jpeg(_build_poster_r2_key(share))
+    return await _serve_poster_jpeg(_build_poster_r2_key(share), _if_none_match(request))
 
 
 @shared_router.post("/{share_token}/viewed", status_code=204)
@@ -13,6 +13,7 @@ from app.services.ffmpeg_service import (
 )
 from app.services.image_extractor import (
     extract_player_image,
+    extract_player_images,
     extract_player_images_for_region,
     get_image_url,
     list_highlight_images,
@@ -61,6 +62,7 @@ __all__ = [
     'apply_transition',
     # Image extraction for highlights
     'extract_player_image',
+    'extract_player_images',
     'extract_player_images_for_region',
     'get_image_url',
     'list_highlight_images',
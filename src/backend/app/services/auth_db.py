@@ -59,6 +59,19 @@ def get_user_by_id(user_id: str) -> dict | None:
         return cur.fetchone()
 
 
+def get_emails_by_user_ids(user_ids: list[str]) -> dict[str, str]:
+    """{user_id: email} for many users in one query; unknown ids are absent."""
+    if not user_ids:
+        return {}
+    with get_auth_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT user_id, email FROM users WHERE user_id = ANY(%s)",
+            (list(user_ids),),
+        )
+        return {r["user_id"]: r["email"] for r in cur.fetchall() if r["email"]}
+
+
 def create_user(
     user_id: str,
     email: str | None = None,
@@ -359,48 +372,153 @@ def insert_game_storage_ref(
     game_size_bytes: int,
     storage_expires_at: str,
 ) -> None:
+    insert_game_storage_refs(
+        user_id, profile_id, [(blake3_hash, game_size_bytes, storage_expires_at)]
+    )
+
+
+def insert_game_storage_refs(
+    user_id: str,
+    profile_id: str,
+    refs: list[tuple[str, int, str]],
+) -> dict[str, int]:
+    """Upsert several (blake3_hash, game_size_bytes, storage_expires_at) refs.
+
+    One SQLite transaction for the profile's game_storage rows, then one
+    statement per Postgres change for the whole batch (multi-video games,
+    share imports) instead of a round trip per hash. Same semantics as calling
+    insert_game_storage_ref per ref in order: a hash new to this profile bumps
+    game_ref_counts once; a repeated hash only moves its expiry.
+
+    Returns {blake3_hash: new ref_count} for the hashes that were incremented.
+    """
     from ..database import get_db_connection
 
+    # Last write wins in SQLite (as sequential calls would); Postgres keeps the
+    # latest expiry seen for each hash.
+    latest: dict[str, tuple[int, str]] = {}
+    pg_expiry: dict[str, str] = {}
+    for blake3_hash, game_size_bytes, storage_expires_at in refs:
+        latest[blake3_hash] = (game_size_bytes, storage_expires_at)
+        pg_expiry[blake3_hash] = max(pg_expiry.get(blake3_hash, storage_expires_at), storage_expires_at)
+    if not latest:
+        return {}
+
+    new_hashes: dict[str, None] = {}  # ordered set
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute(
-            """INSERT OR IGNORE INTO game_storage
-               (blake3_hash, game_size_bytes, storage_expires_at)
-               VALUES (?, ?, ?)""",
-            (blake3_hash, game_size_bytes, storage_expires_at),
-        )
-        is_new = cursor.rowcount == 1
-        if not is_new:
+        for blake3_hash, (game_size_bytes, storage_expires_at) in latest.items():
             cursor.execute(
-                """UPDATE game_storage
-                   SET game_size_bytes = ?, storage_expires_at = ?
-                   WHERE blake3_hash = ?""",
-                (game_size_bytes, storage_expires_at, blake3_hash),
+                """INSERT OR IGNORE INTO game_storage
+                   (blake3_hash, game_size_bytes, storage_expires_at)
+                   VALUES (?, ?, ?)""",
+                (blake3_hash, game_size_bytes, storage_expires_at),
             )
+            if cursor.rowcount == 1:
+                new_hashes[blake3_hash] = None
+            else:
+                cursor.execute(
+                    """UPDATE game_storage
+                       SET game_size_bytes = ?, storage_expires_at = ?
+                       WHERE blake3_hash = ?""",
+                    (game_size_bytes, storage_expires_at, blake3_hash),
+                )
         conn.commit()
 
+    existing_hashes = [h for h in latest if h not in new_hashes]
     with get_pg() as pg_conn:
         cur = pg_conn.cursor()
-        if is_new:
+        counts = _increment_ref_counts(cur, {h: pg_expiry[h] for h in new_hashes})
+        if existing_hashes:
             cur.execute(
-                """INSERT INTO game_ref_counts (blake3_hash, ref_count, latest_expiry)
-                   VALUES (%s, 1, %s)
-                   ON CONFLICT (blake3_hash) DO UPDATE
-                       SET ref_count = game_ref_counts.ref_count + 1,
-                           latest_expiry = GREATEST(game_ref_counts.latest_expiry, EXCLUDED.latest_expiry)""",
-                (blake3_hash, storage_expires_at),
-            )
-        else:
-            cur.execute(
-                """UPDATE game_ref_counts
-                   SET latest_expiry = GREATEST(latest_expiry, %s)
-                   WHERE blake3_hash = %s""",
-                (storage_expires_at, blake3_hash),
+                """UPDATE game_ref_counts g
+                   SET latest_expiry = GREATEST(g.latest_expiry, t.expiry)
+                   FROM unnest(%s::text[], %s::timestamptz[]) AS t(blake3_hash, expiry)
+                   WHERE g.blake3_hash = t.blake3_hash""",
+                (existing_hashes, [pg_expiry[h] for h in existing_hashes]),
             )
         cur.execute(
-            "DELETE FROM r2_grace_deletions WHERE blake3_hash = %s",
-            (blake3_hash,),
+            "DELETE FROM r2_grace_deletions WHERE blake3_hash = ANY(%s)",
+            (list(latest),),
+        )
+    return counts
+
+
+def _increment_ref_counts(cur, expiry_by_hash: dict[str, str]) -> dict[str, int]:
+    """Atomically add one ref per hash (creating counters as needed) on `cur`.
+
+    A single INSERT .. ON CONFLICT DO UPDATE .. RETURNING: concurrent adds of
+    the same game serialize on the row lock, so no increment is lost.
+    """
+    if not expiry_by_hash:
+        return {}
+    hashes = list(expiry_by_hash)
+    cur.execute(
+        """INSERT INTO game_ref_counts (blake3_hash, ref_count, latest_expiry)
+           SELECT blake3_hash, 1, expiry
+           FROM unnest(%s::text[], %s::timestamptz[]) AS t(blake3_hash, expiry)
+           ON CONFLICT (blake3_hash) DO UPDATE
+               SET ref_count = game_ref_counts.ref_count + 1,
+                   latest_expiry = GREATEST(game_ref_counts.latest_expiry, EXCLUDED.latest_expiry)
+           RETURNING blake3_hash, ref_count""",
+        (hashes, [expiry_by_hash[h] for h in hashes]),
+    )
+    return {r["blake3_hash"]: r["ref_count"] for r in cur.fetchall()}
+
+
+def increment_game_ref_counts(hashes: list[str]) -> dict[str, int]:
+    """Add one ref to each EXISTING counter; returns {hash: new ref_count}.
+
+    Hashes without a counter row are left out of the result (a counter is
+    created with its expiry by insert_game_storage_refs).
+    """
+    if not hashes:
+        return {}
+    with get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """UPDATE game_ref_counts SET ref_count = ref_count + 1
+               WHERE blake3_hash = ANY(%s)
+               RETURNING blake3_hash, ref_count""",
+            (list(hashes),),
+        )
+        return {r["blake3_hash"]: r["ref_count"] for r in cur.fetchall()}
+
+
+def decrement_game_ref_counts(hashes: list[str]) -> dict[str, int]:
+    """Remove one ref from each counter, floored at 0; returns {hash: new ref_count}."""
+    if not hashes:
+        return {}
+    with get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """UPDATE game_ref_counts SET ref_count = GREATEST(ref_count - 1, 0)
+               WHERE blake3_hash = ANY(%s)
+               RETURNING blake3_hash, ref_count""",
+            (list(hashes),),
+        )
+        return {r["blake3_hash"]: r["ref_count"] for r in cur.fetchall()}
+
+
+def get_all_game_ref_counts() -> dict[str, int]:
+    """{blake3_hash: ref_count} for every counter row (reconciliation)."""
+    with get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT blake3_hash, ref_count FROM game_ref_counts")
+        return {r["blake3_hash"]: r["ref_count"] for r in cur.fetchall()}
+
+
+def delete_zero_ref_counts(hashes: list[str]) -> int:
+    """Drop counter rows that are still at 0 (reconciliation cleanup)."""
+    if not hashes:
+        return 0
+    with get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "DELETE FROM game_ref_counts WHERE blake3_hash = ANY(%s) AND ref_count = 0",
+            (list(hashes),),
         )
+        return cur.rowcount
 
 
 def get_game_storage_ref(
@@ -422,6 +540,38 @@ def get_game_storage_ref(
         return None
 
 
+def get_game_storage_refs(
+    user_id: str, profile_id: str, blake3_hashes: list[str]
+) -> dict[str, dict]:
+    """get_game_storage_ref for several hashes in one query.
+
+    Returns {blake3_hash: ref} for the hashes that have a row; missing hashes
+    are simply absent.
+    """
+    from ..database import get_db_connection
+
+    hashes = list(dict.fromkeys(blake3_hashes))
+    if not hashes:
+        return {}
+    refs: dict[str, dict] = {}
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        # Chunked to stay under SQLite's bound-parameter limit.
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = cursor.execute(
+                f"""SELECT blake3_hash, storage_expires_at, game_size_bytes, created_at
+                    FROM game_storage WHERE blake3_hash IN ({placeholders})""",
+                chunk,
+            ).fetchall()
+            for r in rows:
+                refs[r["blake3_hash"]] = {"storage_expires_at": r["storage_expires_at"],
+                                          "game_size_bytes": r["game_size_bytes"],
+                                          "created_at": r["created_at"]}
+    return refs
+
+
 def get_storage_refs_for_user(user_id: str) -> list[dict]:
     from ..database import get_db_connection
 
@@ -595,6 +745,19 @@ def get_grace_deletion_hashes() -> set[str]:
         return {r["blake3_hash"] for r in cur.fetchall()}
 
 
+def get_grace_deletion_hashes_among(blake3_hashes: list[str]) -> set[str]:
+    """The subset of `blake3_hashes` currently in the grace set."""
+    if not blake3_hashes:
+        return set()
+    with get_auth_db() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT blake3_hash FROM r2_grace_deletions WHERE blake3_hash = ANY(%s)",
+            (list(blake3_hashes),),
+        )
+        return {r["blake3_hash"] for r in cur.fetchall()}
+
+
 def delete_grace_deletion(blake3_hash: str) -> None:
     with get_auth_db() as conn:
         cur = conn.cursor()
@@ -680,10 +680,20 @@ def ensure_recap(user_id: str, profile_id: str, game_id: int, layer: str) -> dic
     a usable legacy recap remains to stitch from (should not happen in
     practice -- the game source or its recap always outlives annotation).
     """
-    from .poster import ensure_recap_poster, recap_poster_r2_keys_for_layer
+    from .poster import (
+        ensure_recap_poster,
+        recap_card_poster_r2_key,
+        recap_poster_r2_keys_for_layer,
+    )
 
     recap_key, mapping_key = recap_r2_keys(game_id, layer)
     _, poster_key = recap_poster_r2_keys_for_layer(user_id, profile_id, game_id, layer)
+    # The home-tile card is the athlete recap's (games.py::get_game_poster);
+    # write it from the same decode as the full-size poster.
+    card_key = (
+        recap_card_poster_r2_key(user_id, profile_id, game_id)
+        if layer == RecapLayer.ATHLETE else None
+    )
 
     def _result(status: str, clip_count: int) -> dict:
         return {
@@ -698,7 +708,10 @@ def ensure_recap(user_id: str, profile_id: str, game_id: int, layer: str) -> dic
     if file_exists_in_r2(user_id, recap_key):
         mapping_layer, existing_clips = load_recap_mapping(user_id, mapping_key)
         if mapping_layer == layer:
-            ensure_recap_poster(*recap_poster_r2_keys_for_layer(user_id, profile_id, game_id, layer))
+            ensure_recap_poster(
+                *recap_poster_r2_keys_for_layer(user_id, profile_id, game_id, layer),
+                card_poster_key=card_key,
+            )
             return _result("present", len(existing_clips))
 
     # 2. Empty path -- never stitch an empty video.
@@ -731,7 +744,10 @@ def ensure_recap(user_id: str, profile_id: str, game_id: int, layer: str) -> dic
             )
         _generate_recap_from_legacy_slice(user_id, profile_id, game_id, layer, layer_entries)
 
-    ensure_recap_poster(*recap_poster_r2_keys_for_layer(user_id, profile_id, game_id, layer))
+    ensure_recap_poster(
+        *recap_poster_r2_keys_for_layer(user_id, profile_id, game_id, layer),
+        card_poster_key=card_key,
+    )
     return _result("stitched", len(clips))
 
 
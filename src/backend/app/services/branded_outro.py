@@ -39,6 +39,7 @@ import subprocess
 import tempfile
 from pathlib import Path
 
+from app.services.card_cache import get_or_build as _get_or_build_cached
 from app.services.ffmpeg_concat import escape_filter_path as _escape_filter_path
 from app.services.ffmpeg_concat import probe_media as _probe_media
 from app.services.ffmpeg_concat import run as _run
@@ -46,9 +47,9 @@ from app.services.ffmpeg_concat import run as _run
 logger = logging.getLogger(__name__)
 
 # Card cache: one card per (resolution/fps/format) combo, shared across all download
-# requests. Built once per unique params for the lifetime of the process; stored in the
-# system temp dir (survives in-process but not across pod restarts, which is fine --
-# a 1.75s card build on a cold start is negligible).
+# requests and workers (see card_cache: single-flight builds, LRU-trimmed by bytes).
+# Stored in the system temp dir (survives in-process but not across pod restarts,
+# which is fine -- a 1.75s card build on a cold start is negligible).
 _CARD_CACHE_DIR: Path = Path(tempfile.gettempdir()) / "rb_outro_cards"
 
 # ~4.5s, structured as READ -> HOLD -> REVEAL -> HOLD so viewers can actually read both
@@ -136,8 +137,9 @@ def _card_cache_key(info: dict) -> str:
 def _get_or_build_card(info: dict) -> str | None:
     """Return a cached card path for `info`, building it if absent.
 
-    Writes to _CARD_CACHE_DIR using an atomic rename so concurrent callers
-    never read a partial file. Returns None on any failure (never raises).
+    Goes through the shared card cache: concurrent callers for the same card wait
+    for ONE build (single-flight across threads and workers) and never read a
+    partial file. Returns None on any failure (never raises).
     """
     try:
         _CARD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
@@ -145,21 +147,13 @@ def _get_or_build_card(info: dict) -> str | None:
         logger.warning(f"[BrandedOutro] cannot create card cache dir: {e}")
         return None
 
-    card_path = _CARD_CACHE_DIR / f"card_{_card_cache_key(info)}.mp4"
-    if card_path.exists():
-        return str(card_path)
-
-    tmp_card = str(card_path) + ".tmp"
     try:
-        _build_outro_card(tmp_card, info)
-        os.replace(tmp_card, str(card_path))
-        return str(card_path)
+        return _get_or_build_cached(
+            _CARD_CACHE_DIR, _card_cache_key(info),
+            lambda tmp_card: _build_outro_card(tmp_card, info), namespace="outro",
+        )
     except Exception as e:
         logger.error(f"[BrandedOutro] card build failed: {e}")
-        try:
-            os.remove(tmp_card)
-        except OSError:
-            pass
         return None
 
 
@@ -0,0 +1,201 @@
+"""
+Shared on-disk cache for rendered intro/outro card MP4s.
+
+`player_intro` and `branded_outro` both key a card by a content hash and keep the
+rendered MP4 in a temp-dir cache. Before this module each of them checked for the
+file and otherwise ran its own FFmpeg build, so a burst of collection downloads
+asking for the same card rendered it once PER REQUEST until one atomic rename won,
+and the card directories grew without bound.
+
+`get_or_build(cache_dir, key, build)`:
+
+  * HIT: the file exists -> its mtime is bumped (the LRU clock) and the path is
+    returned. No lock is taken.
+  * MISS: single-flight per card path. An in-process lock serializes the threads of
+    this worker; an exclusive file lock (`card_<key>.lock`, fcntl) serializes the
+    other workers on the box. Whoever wins the locks re-checks the file and, if it
+    is still missing, builds it to a private temp name and atomically renames it
+    into place. Everyone who waited finds the file and returns it as a hit. Each
+    distinct card is rendered exactly once.
+  * After a build the directory is trimmed to CARD_CACHE_MAX_BYTES, least recently
+    used first. Cards used in the last CARD_CACHE_EVICT_GRACE_SECONDS are never
+    evicted, so a caller that was just handed a path can still copy/concat it.
+    The empty `.lock` files are never deleted: another worker may hold or wait on
+    one, and unlinking it would let the next builder lock a new inode at the same
+    path while the old holder still builds.
+
+Per-namespace counters (hits, misses, coalesced waits, builds, build time,
+failures, evictions) are kept in-process; `stats()` returns them.
+
+Build failures propagate to the caller (both builders already map them to their
+non-fatal None). On platforms without fcntl (Windows dev) only the in-process
+lock applies.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows dev: single worker, in-process lock only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CARD_CACHE_MAX_BYTES = int(os.getenv("CARD_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+CARD_CACHE_EVICT_GRACE_SECONDS = float(os.getenv("CARD_CACHE_EVICT_GRACE_SECONDS", "120"))
+
+_locks_guard = threading.Lock()
+_key_locks: dict[str, list] = {}  # card path -> [lock, waiter count]
+
+_COUNTERS = ("hits", "misses", "coalesced", "builds", "build_seconds", "build_failures", "evictions")
+_stats_lock = threading.Lock()
+_stats: dict[str, dict[str, float]] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+
+
+def card_path(cache_dir: Path, key: str) -> Path:
+    return Path(cache_dir) / f"card_{key}.mp4"
+
+
+def stats(namespace: str | None = None) -> dict:
+    """Counter snapshot: {namespace: {hits, misses, coalesced, builds, build_seconds,
+    build_failures, evictions}}, or just one namespace's counters."""
+    with _stats_lock:
+        snapshot = {ns: dict(counters) for ns, counters in _stats.items()}
+    if namespace is not None:
+        return snapshot.get(namespace, dict.fromkeys(_COUNTERS, 0))
+    return snapshot
+
+
+def reset_stats() -> None:
+    """Zero every counter. Used by tests."""
+    with _stats_lock:
+        _stats.clear()
+
+
+def _count(namespace: str, name: str, amount: float = 1) -> None:
+    with _stats_lock:
+        _stats[namespace][name] += amount
+
+
+def _touch(path: Path) -> bool:
+    """Bump `path`'s mtime (last use). False when the file is gone."""
+    try:
+        os.utime(path)
+        return True
+    except FileNotFoundError:
+        return False
+    except OSError:
+        return path.exists()
+
+
+def _acquire_key_lock(path: Path) -> threading.Lock:
+    with _locks_guard:
+        entry = _key_locks.setdefault(str(path), [threading.Lock(), 0])
+        entry[1] += 1
+    entry[0].acquire()
+    return entry[0]
+
+
+def _release_key_lock(path: Path) -> None:
+    with _locks_guard:
+        entry = _key_locks[str(path)]
+        entry[0].release()
+        entry[1] -= 1
+        if entry[1] == 0:
+            del _key_locks[str(path)]
+
+
+class _FileLock:
+    """Exclusive advisory lock on `card_<key>.lock`, held across the build."""
+
+    def __init__(self, path: Path):
+        self._path = path.with_suffix(".lock")
+        self._fd: int | None = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self._fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+def get_or_build(
+    cache_dir: Path, key: str, build: Callable[[str], None], namespace: str = "card",
+) -> str:
+    """Path of the cached card `key` in `cache_dir`, calling `build(tmp_path)` to
+    render it on a miss. At most one build per card runs at a time across threads
+    and workers. Raises OSError if the cache dir is unusable and whatever `build`
+    raises on a failed render."""
+    cache_dir = Path(cache_dir)
+    path = card_path(cache_dir, key)
+    if path.exists() and _touch(path):
+        _count(namespace, "hits")
+        return str(path)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _acquire_key_lock(path)
+    try:
+        with _FileLock(path):
+            if path.exists() and _touch(path):
+                _count(namespace, "coalesced")
+                return str(path)
+
+            _count(namespace, "misses")
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            started = time.perf_counter()
+            try:
+                build(tmp)
+                os.replace(tmp, path)
+            except BaseException:
+                _count(namespace, "build_failures")
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                raise
+            elapsed = time.perf_counter() - started
+            _count(namespace, "builds")
+            _count(namespace, "build_seconds", elapsed)
+            logger.info(f"[CardCache] {namespace} built card_{key} in {elapsed:.2f}s")
+    finally:
+        _release_key_lock(path)
+
+    _trim(cache_dir, namespace)
+    return str(path)
+
+
+def _trim(cache_dir: Path, namespace: str) -> None:
+    """Delete least-recently-used cards until the dir fits CARD_CACHE_MAX_BYTES."""
+    cards = []
+    total = 0
+    for card in cache_dir.glob("card_*.mp4"):
+        try:
+            st = card.stat()
+        except FileNotFoundError:
+            continue
+        cards.append((st.st_mtime, st.st_size, card))
+        total += st.st_size
+    if total <= CARD_CACHE_MAX_BYTES:
+        return
+
+    cutoff = time.time() - CARD_CACHE_EVICT_GRACE_SECONDS
+    for mtime, size, card in sorted(cards):
+        if mtime >= cutoff:
+            break
+        card.unlink(missing_ok=True)
+        _count(namespace, "evictions")
+        total -= size
+        if total <= CARD_CACHE_MAX_BYTES:
+            break
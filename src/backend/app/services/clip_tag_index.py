@@ -0,0 +1,184 @@
+"""
+Normalized tag index for library clip filtering (profile_db v048).
+
+Project-from-clips and its preview used to filter tags with one
+`rc.tags LIKE '%"tag"%'` clause per tag over the msgpack tags blob -- a full
+scan of raw_clips on every call, and a pattern that never matched msgpack
+strings. raw_clip_tags holds one (tag, clip_id) row per tag, keyed tag-first,
+so an all-tags filter is an intersection of per-tag index ranges.
+
+SQLite triggers cannot decode msgpack, so they do the part that must happen in
+the writer's own transaction: an insert or a tags update on raw_clips queues the
+clip into raw_clip_tags_dirty, and a delete drops the clip's rows directly. No
+write path (clip edits, imports, shared-clip materialization, a profile
+transfer) can forget to. The queue is folded on the write side, in the
+writer's own transaction: TrackedConnection.commit() runs
+fold_pending_clip_tags() when the transaction wrote raw_clips, and
+materialization (a raw sqlite3 writer) folds before it commits -- O(changed
+clips), derived rows written with execute_local.
+
+Filtered reads never write (a preview commit would move the profile's
+data_version and invalidate the bootstrap snapshot). A clip still queued -- an
+untracked writer, a DB restored with a queue -- is admitted by all_tags_clause
+and judged from its own tags blob by drop_queued_mismatches().
+"""
+
+import logging
+import sqlite3
+from collections.abc import Iterable
+
+from app.utils.encoding import decode_data
+
+logger = logging.getLogger(__name__)
+
+# Kept in step with migrations/profile_db/v048_clip_tag_index.py and
+# database.py::ensure_database() (which both execute these statements).
+CLIP_TAG_INDEX_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS raw_clip_tags (
+        tag     TEXT NOT NULL,
+        clip_id INTEGER NOT NULL,
+        PRIMARY KEY (tag, clip_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_raw_clip_tags_clip ON raw_clip_tags(clip_id)",
+    "CREATE TABLE IF NOT EXISTS raw_clip_tags_dirty (clip_id INTEGER PRIMARY KEY)",
+    # Rating/game filters: game_id IN (...) AND rating >= ? is one range per game.
+    "CREATE INDEX IF NOT EXISTS idx_raw_clips_game_rating ON raw_clips(game_id, rating)",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_raw_clip_tags_insert
+    AFTER INSERT ON raw_clips WHEN NEW.tags IS NOT NULL
+    BEGIN
+        INSERT OR IGNORE INTO raw_clip_tags_dirty (clip_id) VALUES (NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_raw_clip_tags_update AFTER UPDATE OF tags ON raw_clips
+    BEGIN
+        INSERT OR IGNORE INTO raw_clip_tags_dirty (clip_id) VALUES (NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_raw_clip_tags_delete AFTER DELETE ON raw_clips
+    BEGIN
+        DELETE FROM raw_clip_tags WHERE clip_id = OLD.id;
+        DELETE FROM raw_clip_tags_dirty WHERE clip_id = OLD.id;
+    END
+    """,
+)
+
+
+def create_clip_tag_index_schema(cursor) -> None:
+    """Create the tables, indexes and triggers (idempotent)."""
+    for statement in CLIP_TAG_INDEX_DDL:
+        cursor.execute(statement)
+
+
+def _write(cursor, sql: str, params=()):
+    """Derived-data write that must not, by itself, schedule an R2 sync."""
+    execute_local = getattr(cursor, "execute_local", None)
+    if execute_local is not None:
+        return execute_local(sql, params)
+    return cursor.execute(sql, params)
+
+
+def _chunks(items: list, size: int = 500) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _clip_tags(clip_id: int, blob) -> set[str]:
+    try:
+        tags = decode_data(blob) or []
+    except Exception as e:
+        logger.warning(f"[ClipTags] clip {clip_id}: undecodable tags left unindexed: {e}")
+        return set()
+    return {tag for tag in tags if isinstance(tag, str) and tag}
+
+
+def fold_pending_clip_tags(cursor) -> int:
+    """Re-derive the tag rows of every queued clip inside the caller's
+    transaction (no commit); returns clips re-derived.
+
+    The common case (nothing queued) is one indexed read and no write.
+    """
+    try:
+        cursor.execute("SELECT 1 FROM raw_clip_tags_dirty LIMIT 1")
+    except sqlite3.OperationalError as e:
+        # A profile ensure_database hasn't opened yet has no queue -- and no
+        # triggers to fill one; it indexes every clip when it first opens.
+        if "no such table" in str(e):
+            return 0
+        raise
+    if cursor.fetchone() is None:
+        return 0
+
+    cursor.execute("SELECT clip_id FROM raw_clip_tags_dirty")
+    queued = [row[0] for row in cursor.fetchall()]
+    for chunk in _chunks(queued):
+        placeholders = ",".join("?" for _ in chunk)
+        cursor.execute(f"SELECT id, tags FROM raw_clips WHERE id IN ({placeholders})", chunk)
+        rows = [
+            (tag, clip_id)
+            for clip_id, blob in cursor.fetchall()
+            for tag in sorted(_clip_tags(clip_id, blob))
+        ]
+        _write(cursor, f"DELETE FROM raw_clip_tags WHERE clip_id IN ({placeholders})", chunk)
+        for batch in _chunks(rows):
+            values = ",".join("(?, ?)" for _ in batch)
+            _write(
+                cursor,
+                f"INSERT OR IGNORE INTO raw_clip_tags (tag, clip_id) VALUES {values}",
+                [value for row in batch for value in row],
+            )
+        _write(cursor, f"DELETE FROM raw_clip_tags_dirty WHERE clip_id IN ({placeholders})", chunk)
+    logger.debug(f"[ClipTags] re-indexed tags of {len(queued)} clip(s)")
+    return len(queued)
+
+
+def apply_pending_clip_tags(conn) -> int:
+    """fold_pending_clip_tags in a transaction of its own (migrations, repair)."""
+    folded = fold_pending_clip_tags(conn.cursor())
+    if folded:
+        conn.commit()
+    return folded
+
+
+def rebuild_clip_tags(conn) -> int:
+    """Drop every tag row and re-derive all clips; returns tag rows written."""
+    cursor = conn.cursor()
+    _write(cursor, "DELETE FROM raw_clip_tags")
+    _write(cursor, "INSERT OR IGNORE INTO raw_clip_tags_dirty (clip_id) SELECT id FROM raw_clips")
+    apply_pending_clip_tags(conn)
+    cursor.execute("SELECT COUNT(*) FROM raw_clip_tags")
+    return cursor.fetchone()[0]
+
+
+def all_tags_clause(tags: list[str], clip_column: str = "rc.id") -> tuple[str, list]:
+    """SQL predicate (and params) matching clips that carry EVERY tag.
+
+    Queued clips are admitted too, whatever their index rows say; callers pass
+    the fetched rows through drop_queued_mismatches.
+    """
+    wanted = list(dict.fromkeys(tags))
+    placeholders = ",".join("?" for _ in wanted)
+    clause = (
+        f"{clip_column} IN (SELECT clip_id FROM raw_clip_tags WHERE tag IN ({placeholders})"
+        f" GROUP BY clip_id HAVING COUNT(*) = ?"
+        f" UNION SELECT clip_id FROM raw_clip_tags_dirty)"
+    )
+    return clause, [*wanted, len(wanted)]
+
+
+def drop_queued_mismatches(cursor, rows: list, tags: list[str]) -> list:
+    """Drop queued clips (admitted unchecked by all_tags_clause) that lack a
+    tag, judging them from their tags blob. Rows need `id` and `tags`."""
+    cursor.execute("SELECT clip_id FROM raw_clip_tags_dirty")
+    queued = {row[0] for row in cursor.fetchall()}
+    if not queued:
+        return rows
+    wanted = set(tags)
+    return [
+        row for row in rows
+        if row["id"] not in queued or wanted <= _clip_tags(row["id"], row["tags"])
+    ]
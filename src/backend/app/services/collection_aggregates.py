@@ -0,0 +1,520 @@
+"""
+Incrementally maintained Collections aggregates (GET /api/collections/summary).
+
+collections_summary used to scan every latest published final_video, decode its
+game_ids/tags BLOBs and rebuild every bucket on each call -- paid on every
+library load, and users with hundreds of reels load it constantly. It now reads
+pre-aggregated rows instead:
+
+  collection_reels         one row per collection member (latest-version,
+                           published, non-teammate reel) with its decoded,
+                           routed facts and the scopes it counts toward.
+  collection_scope_members (scope, reel) index used to recompute a bucket's
+                           latest_published_at / leading_reel_id on removal.
+  collection_aggregates    one row per (scope, aspect_ratio): reel/unwatched
+                           counts, duration sum, NULL-duration count, latest
+                           publish time, leading (lowest-id) reel.
+  collection_dirty         reels whose facts may have changed.
+
+Scopes: 'all' (every member -> total_reel_count), 'mixes', 'game:{id}',
+'season:{Season Year}', 'tag:{tag}', 'top_plays' and 'combo:{key}' for every
+curated combo of every sport (the summary picks the sport's combos at read).
+
+Keeping it current: SQL triggers on final_videos / raw_clips / games queue the
+affected reel ids into collection_dirty INSIDE the writer's own transaction, so
+no write path -- publish, unpublish, watched, delete, a render finishing, a
+profile transfer, a my_athlete flip, a game date edit -- can forget to. The
+queue is folded by apply_pending_collection_changes() (delta upserts, O(changed
+reels)), which the summary runs before its read. The fold only rewrites derived
+data the queue can always re-derive, so it uses execute_local (no R2 sync from a
+GET); a machine that restores the DB from R2 re-folds from the synced queue.
+
+check_collection_aggregates() rebuilds the expected aggregates from scratch and
+reports any drift (optionally repairing it); a CURATED_COMBOS edit is exactly
+such drift until the next repair.
+"""
+
+import json
+import logging
+from collections.abc import Iterable
+
+from app.queries import (
+    exclude_teammate_reels_clause,
+    latest_final_videos_subquery,
+    season_key,
+    utc_timestamp,
+)
+from app.services.collection_metadata import route_collection
+from app.utils.encoding import decode_data
+
+logger = logging.getLogger(__name__)
+
+ALL_SCOPE = "all"
+MIXES_SCOPE = "mixes"
+TOP_PLAYS_SCOPE = "top_plays"
+
+# Duration sums are maintained by +/- deltas; anything below this is float noise.
+DURATION_DRIFT_TOLERANCE = 1e-6
+
+# Kept in step with migrations/profile_db/v046_collection_aggregates.py and
+# database.py::ensure_database() (which both execute these statements).
+COLLECTION_AGGREGATE_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS collection_reels (
+        final_video_id INTEGER PRIMARY KEY,
+        aspect_ratio   TEXT NOT NULL,
+        duration       REAL,
+        published_at   TEXT,             -- ISO-UTC ('...Z'), as the summary returns it
+        unwatched      INTEGER NOT NULL,
+        game_id        INTEGER,          -- routed game (single-clip, single-game reels)
+        scopes         TEXT NOT NULL     -- JSON list of scope keys
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_collection_reels_game ON collection_reels(game_id)",
+    """
+    CREATE TABLE IF NOT EXISTS collection_scope_members (
+        scope          TEXT NOT NULL,
+        aspect_ratio   TEXT NOT NULL,
+        published_at   TEXT,
+        final_video_id INTEGER NOT NULL,
+        PRIMARY KEY (scope, final_video_id)
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_collection_members_latest
+    ON collection_scope_members(scope, aspect_ratio, published_at)
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_collection_members_leading
+    ON collection_scope_members(scope, aspect_ratio, final_video_id)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS collection_aggregates (
+        scope               TEXT NOT NULL,
+        aspect_ratio        TEXT NOT NULL,
+        reel_count          INTEGER NOT NULL,
+        unwatched_count     INTEGER NOT NULL,
+        duration_sum        REAL NOT NULL,
+        null_duration_count INTEGER NOT NULL,
+        latest_published_at TEXT,
+        leading_reel_id     INTEGER,
+        PRIMARY KEY (scope, aspect_ratio)
+    )
+    """,
+    "CREATE TABLE IF NOT EXISTS collection_dirty (final_video_id INTEGER PRIMARY KEY)",
+    "CREATE INDEX IF NOT EXISTS idx_final_videos_source_clip ON final_videos(source_clip_id)",
+    # Row-level changes. The fold expands each queued id to its whole
+    # latest-version partition, so only the OLD partition (gone after a delete
+    # or a project/game re-key) has to be queued here.
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_collection_fv_insert AFTER INSERT ON final_videos
+    BEGIN
+        INSERT OR IGNORE INTO collection_dirty (final_video_id) VALUES (NEW.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_collection_fv_update
+    AFTER UPDATE OF published_at, watched_at, tags, game_ids, clip_count, duration,
+                    aspect_ratio, source_clip_id, version, project_id, game_id
+    ON final_videos
+    BEGIN
+        INSERT OR IGNORE INTO collection_dirty (final_video_id) VALUES (NEW.id);
+        INSERT OR IGNORE INTO collection_dirty (final_video_id)
+            SELECT id FROM final_videos
+            WHERE (OLD.project_id IS NOT NEW.project_id OR OLD.game_id IS NOT NEW.game_id)
+              AND (OLD.project_id IS NOT NULL OR OLD.game_id IS NOT NULL)
+              AND project_id IS OLD.project_id AND game_id IS OLD.game_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_collection_fv_delete AFTER DELETE ON final_videos
+    BEGIN
+        INSERT OR IGNORE INTO collection_dirty (final_video_id) VALUES (OLD.id);
+        INSERT OR IGNORE INTO collection_dirty (final_video_id)
+            SELECT id FROM final_videos
+            WHERE (OLD.project_id IS NOT NULL OR OLD.game_id IS NOT NULL)
+              AND project_id IS OLD.project_id AND game_id IS OLD.game_id;
+    END
+    """,
+    # Teammate exclusion reads raw_clips.my_athlete through source_clip_id.
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_collection_clip_insert AFTER INSERT ON raw_clips
+    BEGIN
+        INSERT OR IGNORE INTO collection_dirty (final_video_id)
+            SELECT id FROM final_videos WHERE source_clip_id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_collection_clip_athlete
+    AFTER UPDATE OF my_athlete ON raw_clips
+    BEGIN
+        INSERT OR IGNORE INTO collection_dirty (final_video_id)
+            SELECT id FROM final_videos WHERE source_clip_id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_collection_clip_delete AFTER DELETE ON raw_clips
+    BEGIN
+        INSERT OR IGNORE INTO collection_dirty (final_video_id)
+            SELECT id FROM final_videos WHERE source_clip_id = OLD.id;
+    END
+    """,
+    # Season buckets use the routed game's date (else the reel's created_at).
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_collection_game_insert AFTER INSERT ON games
+    BEGIN
+        INSERT OR IGNORE INTO collection_dirty (final_video_id)
+            SELECT final_video_id FROM collection_reels WHERE game_id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_collection_game_date AFTER UPDATE OF game_date ON games
+    BEGIN
+        INSERT OR IGNORE INTO collection_dirty (final_video_id)
+            SELECT final_video_id FROM collection_reels WHERE game_id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_collection_game_delete AFTER DELETE ON games
+    BEGIN
+        INSERT OR IGNORE INTO collection_dirty (final_video_id)
+            SELECT final_video_id FROM collection_reels WHERE game_id = OLD.id;
+    END
+    """,
+)
+
+
+def create_collection_aggregate_schema(cursor) -> None:
+    """Create the tables, indexes and triggers (idempotent)."""
+    for statement in COLLECTION_AGGREGATE_DDL:
+        cursor.execute(statement)
+
+
+def game_scope(game_id: int) -> str:
+    return f"game:{game_id}"
+
+
+def season_scope(season: str) -> str:
+    return f"season:{season}"
+
+
+def tag_scope(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+def combo_scope(key: str) -> str:
+    return f"combo:{key}"
+
+
+# ---------------------------------------------------------------------------
+# Fact derivation (the summary's former per-call pass, now per changed reel)
+# ---------------------------------------------------------------------------
+
+def _write(cursor, sql: str, params=()):
+    """Derived-data write that must not, by itself, schedule an R2 sync."""
+    execute_local = getattr(cursor, "execute_local", None)
+    if execute_local is not None:
+        return execute_local(sql, params)
+    return cursor.execute(sql, params)
+
+
+def _all_combos() -> list[dict]:
+    from app.routers.collections import CURATED_COMBOS
+
+    seen: dict[str, dict] = {}
+    for combos in CURATED_COMBOS.values():
+        for combo in combos:
+            seen.setdefault(combo["key"], combo)
+    return list(seen.values())
+
+
+def _chunks(items: list, size: int = 500) -> Iterable[list]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _derive_facts(cursor, only_dirty: bool) -> dict[int, tuple]:
+    """{final_video_id: (ratio, duration, published_at, unwatched, game_id, scopes)}
+    for collection members -- every member, or only those queued in
+    collection_dirty (whose latest-version partitions the fold has expanded)."""
+    source = "final_videos"
+    if only_dirty:
+        source = "(SELECT * FROM final_videos WHERE id IN (SELECT final_video_id FROM collection_dirty))"
+    cursor.execute(
+        f"""
+        SELECT fv.id, fv.game_ids, fv.aspect_ratio, fv.duration, fv.tags,
+               fv.created_at, fv.published_at, fv.clip_count, fv.watched_at
+        FROM final_videos fv
+        WHERE fv.id IN ({latest_final_videos_subquery(source)})
+          AND fv.published_at IS NOT NULL
+          {exclude_teammate_reels_clause()}
+        """
+    )
+    rows = cursor.fetchall()
+
+    parsed = []
+    game_ids = set()
+    for fv_id, game_ids_blob, ratio, duration, tags, created_at, published_at, clip_count, watched_at in rows:
+        if not ratio:
+            # annotated_game reels (the only NULL-ratio source) can never be
+            # published, so a NULL ratio here is a real data bug -- surface it,
+            # don't bucket it (no silent 'unknown' coercion; EPIC decision #4).
+            logger.warning(
+                f"[Collections] published final_video id={fv_id} has NULL "
+                f"aspect_ratio -- excluded from summary (data bug)."
+            )
+            continue
+        game_id = route_collection(game_ids_blob, clip_count)
+        if game_id is not None:
+            game_ids.add(game_id)
+        parsed.append((fv_id, ratio, duration, utc_timestamp(published_at), created_at,
+                       game_id, clip_count == 1, watched_at is None,
+                       decode_data(tags) or []))
+
+    game_dates = {}
+    for chunk in _chunks(sorted(game_ids)):
+        cursor.execute(
+            f"SELECT id, game_date FROM games WHERE id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        )
+        game_dates.update({gid: date or None for gid, date in cursor.fetchall()})
+
+    combos = _all_combos()
+    facts = {}
+    for fv_id, ratio, duration, published_at, created_at, game_id, single_clip, unwatched, tags in parsed:
+        # T3630: multi-clip reels only count toward Mixes, never game/smart/season.
+        scopes = [ALL_SCOPE]
+        if not single_clip:
+            scopes.append(MIXES_SCOPE)
+        else:
+            scopes.append(game_scope(game_id) if game_id is not None else MIXES_SCOPE)
+            date_src = (game_dates.get(game_id) if game_id is not None else None) or created_at
+            season = season_key(date_src)
+            if season:
+                scopes.append(season_scope(season))
+            reel_tags = set(tags)
+            scopes.extend(tag_scope(t) for t in sorted(reel_tags))
+            scopes.append(TOP_PLAYS_SCOPE)
+            scopes.extend(combo_scope(c["key"]) for c in combos if reel_tags & c["tags"])
+        facts[fv_id] = (ratio, duration, published_at, int(unwatched), game_id, tuple(scopes))
+    return facts
+
+
+# ---------------------------------------------------------------------------
+# Fold
+# ---------------------------------------------------------------------------
+
+_UPSERT_ADD = """
+    INSERT INTO collection_aggregates (scope, aspect_ratio, reel_count, unwatched_count,
+                                       duration_sum, null_duration_count,
+                                       latest_published_at, leading_reel_id)
+    VALUES (?, ?, 1, ?, ?, ?, ?, ?)
+    ON CONFLICT(scope, aspect_ratio) DO UPDATE SET
+        reel_count = reel_count + 1,
+        unwatched_count = unwatched_count + excluded.unwatched_count,
+        duration_sum = duration_sum + excluded.duration_sum,
+        null_duration_count = null_duration_count + excluded.null_duration_count,
+        latest_published_at = CASE
+            WHEN latest_published_at IS NULL
+              OR excluded.latest_published_at > latest_published_at
+            THEN excluded.latest_published_at ELSE latest_published_at END,
+        leading_reel_id = MIN(leading_reel_id, excluded.leading_reel_id)
+"""
+
+
+def _add_reel(cursor, fv_id: int, fact: tuple) -> None:
+    ratio, duration, published_at, unwatched, game_id, scopes = fact
+    _write(cursor,
+           "INSERT INTO collection_reels (final_video_id, aspect_ratio, duration, published_at, "
+           "unwatched, game_id, scopes) VALUES (?, ?, ?, ?, ?, ?, ?)",
+           (fv_id, ratio, duration, published_at, unwatched, game_id, json.dumps(list(scopes))))
+    for scope in scopes:
+        _write(cursor,
+               "INSERT INTO collection_scope_members (scope, aspect_ratio, published_at, "
+               "final_video_id) VALUES (?, ?, ?, ?)",
+               (scope, ratio, published_at, fv_id))
+        _write(cursor, _UPSERT_ADD, (
+            scope, ratio, unwatched, duration or 0.0, int(duration is None),
+            published_at, fv_id,
+        ))
+
+
+def _remove_reel(cursor, fv_id: int, fact: tuple, touched: set) -> None:
+    ratio, duration, _published_at, unwatched, _game_id, scopes = fact
+    _write(cursor, "DELETE FROM collection_reels WHERE final_video_id = ?", (fv_id,))
+    _write(cursor, "DELETE FROM collection_scope_members WHERE final_video_id = ?", (fv_id,))
+    for scope in scopes:
+        _write(cursor, """
+            UPDATE collection_aggregates
+            SET reel_count = reel_count - 1,
+                unwatched_count = unwatched_count - ?,
+                duration_sum = duration_sum - ?,
+                null_duration_count = null_duration_count - ?
+            WHERE scope = ? AND aspect_ratio = ?
+        """, (unwatched, duration or 0.0, int(duration is None), scope, ratio))
+        touched.add((scope, ratio))
+
+
+def _refresh_extremes(cursor, touched: set) -> None:
+    """Recompute latest/leading for buckets that lost a reel (index-only MAX/MIN)."""
+    for scope, ratio in touched:
+        _write(cursor, """
+            UPDATE collection_aggregates SET
+                latest_published_at = (
+                    SELECT MAX(published_at) FROM collection_scope_members
+                    WHERE scope = ? AND aspect_ratio = ?),
+                leading_reel_id = (
+                    SELECT MIN(final_video_id) FROM collection_scope_members
+                    WHERE scope = ? AND aspect_ratio = ?)
+            WHERE scope = ? AND aspect_ratio = ?
+        """, (scope, ratio, scope, ratio, scope, ratio))
+    if touched:
+        _write(cursor, "DELETE FROM collection_aggregates WHERE reel_count <= 0")
+
+
+def _load_stored_facts(cursor, only_dirty: bool) -> dict[int, tuple]:
+    where = "WHERE final_video_id IN (SELECT final_video_id FROM collection_dirty)" if only_dirty else ""
+    cursor.execute(
+        "SELECT final_video_id, aspect_ratio, duration, published_at, unwatched, game_id, scopes "
+        f"FROM collection_reels {where}"
+    )
+    return {
+        row[0]: (row[1], row[2], row[3], row[4], row[5], tuple(json.loads(row[6])))
+        for row in cursor.fetchall()
+    }
+
+
+def apply_pending_collection_changes(conn) -> int:
+    """Fold queued reel changes into the aggregates; returns reels re-derived.
+
+    The common case (nothing queued) is one indexed read and no write.
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM collection_dirty LIMIT 1")
+    if cursor.fetchone() is None:
+        return 0
+
+    # Whole latest-version partitions: a new version demotes its predecessor.
+    _write(cursor, """
+        INSERT OR IGNORE INTO collection_dirty (final_video_id)
+        SELECT f.id FROM collection_dirty d
+        JOIN final_videos q ON q.id = d.final_video_id
+        JOIN final_videos f ON f.project_id IS q.project_id AND f.game_id IS q.game_id
+        WHERE q.project_id IS NOT NULL OR q.game_id IS NOT NULL
+    """)
+    cursor.execute("SELECT final_video_id FROM collection_dirty")
+    queued = [row[0] for row in cursor.fetchall()]
+
+    old = _load_stored_facts(cursor, only_dirty=True)
+    new = _derive_facts(cursor, only_dirty=True)
+
+    touched: set = set()
+    changed = 0
+    for fv_id in queued:
+        before, after = old.get(fv_id), new.get(fv_id)
+        if before == after:
+            continue
+        changed += 1
+        if before is not None:
+            _remove_reel(cursor, fv_id, before, touched)
+        if after is not None:
+            _add_reel(cursor, fv_id, after)
+    _refresh_extremes(cursor, touched)
+    _write(cursor, "DELETE FROM collection_dirty")
+    conn.commit()
+    if changed:
+        logger.debug(f"[Collections] folded {changed} changed reel(s) into aggregates")
+    return changed
+
+
+def rebuild_collection_aggregates(conn) -> int:
+    """Drop all derived rows and re-derive every member; returns member count."""
+    cursor = conn.cursor()
+    for table in ("collection_aggregates", "collection_scope_members", "collection_reels"):
+        _write(cursor, f"DELETE FROM {table}")
+    _write(cursor, "INSERT OR IGNORE INTO collection_dirty (final_video_id) SELECT id FROM final_videos")
+    apply_pending_collection_changes(conn)
+    cursor.execute("SELECT COUNT(*) FROM collection_reels")
+    return cursor.fetchone()[0]
+
+
+# ---------------------------------------------------------------------------
+# Read + consistency check
+# ---------------------------------------------------------------------------
+
+def read_collection_aggregates(conn) -> dict[str, dict[str, dict]]:
+    """{scope: {ratio: row}} -- the whole summary in one read."""
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT scope, aspect_ratio, reel_count, unwatched_count, duration_sum, "
+        "null_duration_count, latest_published_at, leading_reel_id FROM collection_aggregates"
+    )
+    out: dict[str, dict[str, dict]] = {}
+    for scope, ratio, count, unwatched, dsum, nulls, latest, leading in cursor.fetchall():
+        out.setdefault(scope, {})[ratio] = {
+            "reel_count": count,
+            "unwatched_count": unwatched,
+            "duration_sum": dsum,
+            "null_duration_count": nulls,
+            "latest_published_at": latest,
+            "leading_reel_id": leading,
+        }
+    return out
+
+
+def _expected_aggregates(facts: dict[int, tuple]) -> dict[tuple[str, str], dict]:
+    expected: dict[tuple[str, str], dict] = {}
+    for fv_id in sorted(facts):
+        ratio, duration, published_at, unwatched, _game_id, scopes = facts[fv_id]
+        for scope in scopes:
+            agg = expected.setdefault((scope, ratio), {
+                "reel_count": 0, "unwatched_count": 0, "duration_sum": 0.0,
+                "null_duration_count": 0, "latest_published_at": None,
+                "leading_reel_id": fv_id,
+            })
+            agg["reel_count"] += 1
+            agg["unwatched_count"] += unwatched
+            if duration is None:
+                agg["null_duration_count"] += 1
+            else:
+                agg["duration_sum"] += duration
+            if published_at and (agg["latest_published_at"] is None
+                                 or published_at > agg["latest_published_at"]):
+                agg["latest_published_at"] = published_at
+    return expected
+
+
+def check_collection_aggregates(conn, repair: bool = False) -> list[str]:
+    """Re-derive every aggregate from final_videos and diff against the stored
+    rows. Returns one human-readable line per drifted (scope, ratio) field;
+    empty means consistent. Pending queued changes are folded first (they are
+    not drift). `repair=True` rebuilds the tables when drift is found."""
+    apply_pending_collection_changes(conn)
+    cursor = conn.cursor()
+    expected = _expected_aggregates(_derive_facts(cursor, only_dirty=False))
+    stored = {
+        (scope, ratio): row
+        for scope, by_ratio in read_collection_aggregates(conn).items()
+        for ratio, row in by_ratio.items()
+    }
+
+    drift = []
+    for key in sorted(set(expected) | set(stored)):
+        want, have = expected.get(key), stored.get(key)
+        if want is None or have is None:
+            drift.append(f"{key[0]} [{key[1]}]: "
+                         f"{'unexpected row' if want is None else 'missing row'}")
+            continue
+        for field, value in want.items():
+            got = have[field]
+            if field == "duration_sum":
+                if abs(got - value) > DURATION_DRIFT_TOLERANCE:
+                    drift.append(f"{key[0]} [{key[1]}]: {field} stored={got} expected={value}")
+            elif got != value:
+                drift.append(f"{key[0]} [{key[1]}]: {field} stored={got} expected={value}")
+
+    if drift:
+        logger.warning(f"[Collections] aggregate drift: {len(drift)} field(s); first: {drift[0]}")
+        if repair:
+            rebuild_collection_aggregates(conn)
+    return drift
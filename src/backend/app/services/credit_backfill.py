@@ -41,7 +41,7 @@ import tempfile
 from collections import Counter
 from pathlib import Path
 
-from .credit_ledger import credit_key
+from .credit_ledger import _rewrite_totals, credit_key
 from .pg import get_pg
 
 logger = logging.getLogger(__name__)
@@ -403,6 +403,8 @@ def _backfill_one_user(user_id: str, email: str | None, apply: bool) -> dict:
                 "UPDATE credits SET balance = %s, updated_at = now() WHERE user_id = %s",
                 (projected_balance, user_id),
             )
+            if to_insert:
+                _rewrite_totals(cur, [user_id])
             pg_balance_after = projected_balance
         else:
             conn.rollback()
@@ -542,11 +544,26 @@ def reconcile_against_stripe() -> dict:
     (design 3d) -- for every succeeded live-mode PI the expected ledger key is
     stripe:{pi.id} and the expected amount is int(pi.metadata['credits']), read off
     the PI (not CREDIT_PACKS), so T4940's reprice has zero effect on historical rows.
+
+    The ledger side comes from credit_user_totals.purchase_refs/purchase_amounts
+    (one row per purchaser) rather than a has_key round trip per PI plus a scan
+    of every stripe_purchase row; has_key is only consulted for a PI whose id is
+    not among its user's purchase refs, to rule out a grant keyed by the PI but
+    stored under another reference_id.
     """
     from .credit_ledger import credit_key, has_key
     from .revenue_reconciliation import fetch_stripe_intents
 
     intents = fetch_stripe_intents()
+    with get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT user_id, purchase_refs, purchase_amounts FROM credit_user_totals "
+            "WHERE cardinality(purchase_refs) > 0"
+        )
+        purchases = cur.fetchall()
+    refs_by_user = {r["user_id"]: set(r["purchase_refs"]) for r in purchases}
+
     rows = []
     seen_pi_ids: set[str] = set()
     for pi in intents:
@@ -558,8 +575,9 @@ def reconcile_against_stripe() -> dict:
         if not user_id or not credits:
             continue
         seen_pi_ids.add(pi["id"])
-        key = credit_key("stripe_purchase", pi["id"])
-        if has_key(user_id, key):
+        if pi["id"] in refs_by_user.get(user_id, ()):
+            continue
+        if has_key(user_id, credit_key("stripe_purchase", pi["id"])):
             continue
         rows.append({
             "pi_id": pi["id"],
@@ -571,17 +589,12 @@ def reconcile_against_stripe() -> dict:
     # unknown_stripe_grant: a stripe_purchase ledger row whose PI id has no
     # matching succeeded live-mode PI in this fetch (expected for test-mode-era
     # rows -- T5760's test_mode_era classification covers WHY, this only detects).
-    with get_pg() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT user_id, reference_id, amount FROM credit_transactions "
-            "WHERE source = 'stripe_purchase' AND amount > 0"
-        )
-        purchase_rows = cur.fetchall()
+    # purchase_refs and purchase_amounts are parallel arrays (same rows, same order).
     unknown = [
-        {"pi_id": r["reference_id"], "user_id": r["user_id"], "amount": r["amount"], "flag": "unknown_stripe_grant"}
-        for r in purchase_rows
-        if r["reference_id"] not in seen_pi_ids
+        {"pi_id": ref, "user_id": r["user_id"], "amount": amount, "flag": "unknown_stripe_grant"}
+        for r in purchases
+        for ref, amount in zip(r["purchase_refs"], r["purchase_amounts"])
+        if ref not in seen_pi_ids
     ]
 
     return {"missing_stripe_grant": rows, "unknown_stripe_grant": unknown}
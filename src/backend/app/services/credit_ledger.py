@@ -17,6 +17,12 @@ Two write primitives, each ONE Postgres transaction:
     debit row exists without the matching balance change, and no negative
     balance (`CHECK (balance >= 0)` is belt-and-braces).
 
+credit_user_totals: every ledger insert also adds its row to the user's
+running totals (spent, purchased, purchase amounts) in the SAME transaction,
+so stats_for_admin and the Stripe reconciliation read one row per user instead
+of grouping credit_transactions. check_user_totals re-derives them from the
+ledger and reports (or repairs) any drift.
+
 credits_ready gate: every mutation (grant/debit/set_balance) checks
 credit_migration_state.ready_at and raises CreditsUnavailable (-> HTTP 503) until
 an admin has confirmed the backfill report shows zero drift. Reads (get_balance,
@@ -94,6 +100,137 @@ def credit_key(source: str, reference_id: str) -> str:
     return f"{prefix}:{reference_id}"
 
 
+# ---------------------------------------------------------------------------
+# Per-user totals (credit_user_totals)
+# ---------------------------------------------------------------------------
+
+def _add_to_totals(cur, user_id: str, amount: int, source: str, reference_id: str | None = None) -> None:
+    """Fold one newly inserted ledger row into the user's totals. Must run on
+    the cursor that inserted the row, so both commit or roll back together."""
+    spent = -amount if amount < 0 and source != "admin_set" else 0
+    purchased = amount if source == "stripe_purchase" and amount > 0 else 0
+    if not spent and not purchased:
+        return
+    cur.execute(
+        """
+        INSERT INTO credit_user_totals
+            (user_id, credits_spent, credits_purchased, purchase_amounts, purchase_refs)
+        VALUES (%s, %s, %s, %s::integer[], %s::text[])
+        ON CONFLICT (user_id) DO UPDATE SET
+            credits_spent = credit_user_totals.credits_spent + EXCLUDED.credits_spent,
+            credits_purchased = credit_user_totals.credits_purchased + EXCLUDED.credits_purchased,
+            purchase_amounts = credit_user_totals.purchase_amounts || EXCLUDED.purchase_amounts,
+            purchase_refs = credit_user_totals.purchase_refs || EXCLUDED.purchase_refs,
+            updated_at = now()
+        """,
+        (
+            user_id, spent, purchased,
+            [purchased] if purchased else [],
+            [reference_id] if purchased else [],
+        ),
+    )
+
+
+# The ledger-side definition of every credit_user_totals column (v025's backfill
+# carries its own copy). stats_for_admin used to run this per request; now only
+# the verify/repair path does.
+_TOTALS_FROM_LEDGER = """
+    SELECT
+        user_id,
+        COALESCE(SUM(CASE WHEN amount < 0 AND source != 'admin_set' THEN -amount ELSE 0 END), 0) AS credits_spent,
+        COALESCE(SUM(CASE WHEN source = 'stripe_purchase' AND amount > 0 THEN amount ELSE 0 END), 0) AS credits_purchased,
+        COALESCE(
+            ARRAY_AGG(amount ORDER BY created_at, id) FILTER (WHERE source = 'stripe_purchase' AND amount > 0),
+            '{{}}'
+        ) AS purchase_amounts,
+        COALESCE(
+            ARRAY_AGG(reference_id ORDER BY created_at, id) FILTER (WHERE source = 'stripe_purchase' AND amount > 0),
+            '{{}}'
+        ) AS purchase_refs
+    FROM credit_transactions
+    {where}
+    GROUP BY user_id
+"""
+
+
+def _rewrite_totals(cur, user_ids: list[str]) -> None:
+    """Replace these users' totals with a fresh aggregate of their ledger rows.
+    For writers that insert ledger rows in bulk (credit_backfill) and for
+    check_user_totals' repair; the caller owns the transaction."""
+    cur.execute("DELETE FROM credit_user_totals WHERE user_id = ANY(%s)", (user_ids,))
+    cur.execute(
+        "INSERT INTO credit_user_totals "
+        "(user_id, credits_spent, credits_purchased, purchase_amounts, purchase_refs) "
+        + _TOTALS_FROM_LEDGER.format(where="WHERE user_id = ANY(%s)"),
+        (user_ids,),
+    )
+
+
+def check_user_totals(user_ids: list[str] | None = None, repair: bool = False) -> list[dict]:
+    """Compare credit_user_totals against a fresh aggregate of the ledger.
+
+    Returns one dict per drifted user (ledger vs stored values; a missing
+    totals row reads as zeros). With repair=True the drifted rows are rewritten
+    from the ledger. Runs under a SHARE lock on credit_transactions, so no
+    debit/grant can land between the comparison and the repair.
+    """
+    if user_ids is not None and not user_ids:
+        return []
+    where, params = ("WHERE user_id = ANY(%s)", (user_ids, user_ids)) if user_ids is not None else ("", ())
+    with get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute("LOCK TABLE credit_transactions IN SHARE MODE")
+        cur.execute(
+            f"""
+            WITH ledger AS ({_TOTALS_FROM_LEDGER.format(where=where)}),
+            stored AS (
+                SELECT user_id, credits_spent, credits_purchased, purchase_amounts, purchase_refs
+                FROM credit_user_totals {where}
+            )
+            SELECT
+                user_id,
+                COALESCE(l.credits_spent, 0) AS ledger_spent,
+                COALESCE(s.credits_spent, 0) AS stored_spent,
+                COALESCE(l.credits_purchased, 0) AS ledger_purchased,
+                COALESCE(s.credits_purchased, 0) AS stored_purchased,
+                COALESCE(l.purchase_amounts, '{{}}') AS ledger_purchase_amounts,
+                COALESCE(s.purchase_amounts, '{{}}') AS stored_purchase_amounts,
+                COALESCE(l.purchase_refs, '{{}}') AS ledger_purchase_refs,
+                COALESCE(s.purchase_refs, '{{}}') AS stored_purchase_refs
+            FROM ledger l FULL JOIN stored s USING (user_id)
+            WHERE (COALESCE(l.credits_spent, 0), COALESCE(l.credits_purchased, 0),
+                   COALESCE(l.purchase_amounts, '{{}}'), COALESCE(l.purchase_refs, '{{}}'))
+                IS DISTINCT FROM
+                  (COALESCE(s.credits_spent, 0), COALESCE(s.credits_purchased, 0),
+                   COALESCE(s.purchase_amounts, '{{}}'), COALESCE(s.purchase_refs, '{{}}'))
+            ORDER BY user_id
+            """,
+            params,
+        )
+        drift = [
+            {
+                "user_id": r["user_id"],
+                "ledger_spent": int(r["ledger_spent"]),
+                "stored_spent": int(r["stored_spent"]),
+                "ledger_purchased": int(r["ledger_purchased"]),
+                "stored_purchased": int(r["stored_purchased"]),
+                "ledger_purchase_amounts": list(r["ledger_purchase_amounts"]),
+                "stored_purchase_amounts": list(r["stored_purchase_amounts"]),
+                "ledger_purchase_refs": list(r["ledger_purchase_refs"]),
+                "stored_purchase_refs": list(r["stored_purchase_refs"]),
+            }
+            for r in cur.fetchall()
+        ]
+        if repair and drift:
+            _rewrite_totals(cur, [d["user_id"] for d in drift])
+    if drift:
+        logger.warning(
+            f"[CreditLedger] credit_user_totals drift for {len(drift)} user(s)"
+            f"{' (repaired)' if repair else ''}: {[d['user_id'] for d in drift][:20]}"
+        )
+    return drift
+
+
 # ---------------------------------------------------------------------------
 # Core primitives
 # ---------------------------------------------------------------------------
@@ -142,6 +279,7 @@ def grant(
         applied = bool(row["applied"])
         if applied:
             balance = row["new_balance"]
+            _add_to_totals(cur, user_id, amount, source, reference_id)
         else:
             cur.execute("SELECT balance FROM credits WHERE user_id = %s", (user_id,))
             b = cur.fetchone()
@@ -217,6 +355,7 @@ def debit(
             )
             return {"ok": False, "applied": False, "balance": balance, "required": amount}
         balance = updated["balance"]
+        _add_to_totals(cur, user_id, -amount, source)
     logger.info(
         f"[CreditLedger] debit user={user_id} amount={amount} source={source} "
         f"key={key} applied=True balance={balance}"
@@ -300,6 +439,9 @@ def set_balance(user_id: str, amount: int, key: str, reference_id: str | None =
             "UPDATE credits SET balance = %s, updated_at = now() WHERE user_id = %s",
             (amount, user_id),
         )
+        # admin_set rows count toward neither total today; routed through the
+        # helper anyway so that rule lives in one place.
+        _add_to_totals(cur, user_id, delta, "admin_set")
     logger.info(
         f"[CreditLedger] set_balance user={user_id} amount={amount} "
         f"delta={delta} key={key}"
@@ -346,8 +488,10 @@ def list_transactions(user_id: str, limit: int = 50) -> list[dict]:
 
 
 def stats_for_admin(user_ids: list[str] | None = None) -> dict:
-    """One grouped Postgres query for the admin panel (replaces per-file R2/local
-    reads across up to `page_size` other users' SQLite files, T4870 -> gone).
+    """Per-user credit stats for the admin panel, read from credit_user_totals
+    and credits -- one row per user, never a scan of credit_transactions
+    (replaces per-file R2/local reads across up to `page_size` other users'
+    SQLite files, T4870 -> gone).
 
     Returns dict keyed by user_id: credits_spent, credits_purchased,
     credits_balance (a real int -- absent row = 0, never null/unavailable),
@@ -361,30 +505,14 @@ def stats_for_admin(user_ids: list[str] | None = None) -> dict:
         if user_ids is not None:
             cur.execute(
                 """
-                SELECT
-                    user_id,
-                    COALESCE(SUM(CASE WHEN amount < 0 AND source != 'admin_set' THEN -amount ELSE 0 END), 0) AS credits_spent,
-                    COALESCE(SUM(CASE WHEN source = 'stripe_purchase' AND amount > 0 THEN amount ELSE 0 END), 0) AS credits_purchased,
-                    ARRAY_AGG(amount ORDER BY created_at, id) FILTER (WHERE source = 'stripe_purchase' AND amount > 0) AS purchase_credit_amounts
-                FROM credit_transactions
-                WHERE user_id = ANY(%s)
-                GROUP BY user_id
+                SELECT user_id, credits_spent, credits_purchased, purchase_amounts
+                FROM credit_user_totals WHERE user_id = ANY(%s)
                 """,
                 (user_ids,),
             )
         else:
-            cur.execute(
-                """
-                SELECT
-                    user_id,
-                    COALESCE(SUM(CASE WHEN amount < 0 AND source != 'admin_set' THEN -amount ELSE 0 END), 0) AS credits_spent,
-                    COALESCE(SUM(CASE WHEN source = 'stripe_purchase' AND amount > 0 THEN amount ELSE 0 END), 0) AS credits_purchased,
-                    ARRAY_AGG(amount ORDER BY created_at, id) FILTER (WHERE source = 'stripe_purchase' AND amount > 0) AS purchase_credit_amounts
-                FROM credit_transactions
-                GROUP BY user_id
-                """
-            )
-        agg_rows = cur.fetchall()
+            cur.execute("SELECT user_id, credits_spent, credits_purchased, purchase_amounts FROM credit_user_totals")
+        total_rows = cur.fetchall()
 
         if user_ids is not None:
             cur.execute("SELECT user_id, balance FROM credits WHERE user_id = ANY(%s)", (user_ids,))
@@ -392,18 +520,18 @@ def stats_for_admin(user_ids: list[str] | None = None) -> dict:
             cur.execute("SELECT user_id, balance FROM credits")
         balance_rows = cur.fetchall()
 
-    agg_by_user = {r["user_id"]: r for r in agg_rows}
+    totals_by_user = {r["user_id"]: r for r in total_rows}
     balance_by_user = {r["user_id"]: r["balance"] for r in balance_rows}
 
-    ids = user_ids if user_ids is not None else sorted(set(agg_by_user) | set(balance_by_user))
+    ids = user_ids if user_ids is not None else sorted(set(totals_by_user) | set(balance_by_user))
     stats = {}
     for uid in ids:
-        a = agg_by_user.get(uid)
+        t = totals_by_user.get(uid)
         stats[uid] = {
-            "credits_spent": int(a["credits_spent"]) if a else 0,
-            "credits_purchased": int(a["credits_purchased"]) if a else 0,
+            "credits_spent": int(t["credits_spent"]) if t else 0,
+            "credits_purchased": int(t["credits_purchased"]) if t else 0,
             "credits_balance": balance_by_user.get(uid, 0),
-            "purchase_credit_amounts": list(a["purchase_credit_amounts"]) if a and a["purchase_credit_amounts"] else [],
+            "purchase_credit_amounts": list(t["purchase_amounts"]) if t else [],
         }
     return stats
 
@@ -457,7 +585,8 @@ def reserve_credits(
 
 
 def confirm_reservation(user_id: str, job_id: str) -> bool:
-    """Atomic: DELETE reservation + INSERT credit_transaction (the debit becomes real)."""
+    """Atomic: DELETE reservation + INSERT credit_transaction (the debit becomes
+    real, and counts toward credit_user_totals.credits_spent from here)."""
     _require_ready()
     with get_pg() as conn:
         cur = conn.cursor()
@@ -474,16 +603,23 @@ def confirm_reservation(user_id: str, job_id: str) -> bool:
             INSERT INTO credit_transactions (user_id, amount, source, idempotency_key, reference_id, video_seconds)
             VALUES (%s, %s, 'framing_usage', %s, %s, %s)
             ON CONFLICT (user_id, idempotency_key) DO NOTHING
+            RETURNING id
             """,
             (user_id, -row["amount"], credit_key("framing_usage", job_id), job_id, row["video_seconds"]),
         )
+        if cur.fetchone() is not None:
+            _add_to_totals(cur, user_id, -row["amount"], "framing_usage")
     from app.analytics import record_milestone
     record_milestone(user_id, "credits_consumed", {"job_id": job_id})
     return True
 
 
 def release_reservation(user_id: str, job_id: str) -> bool:
-    """Atomic: DELETE reservation + UPDATE credits += amount (no ledger row, matches SQLite behavior)."""
+    """Atomic: DELETE reservation + UPDATE credits += amount (no ledger row, matches SQLite behavior).
+
+    A reserved amount was never counted as spent, so credit_user_totals is
+    left as is.
+    """
     _require_ready()
     with get_pg() as conn:
         cur = conn.cursor()
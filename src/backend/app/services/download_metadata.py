@@ -16,7 +16,10 @@ when the outro/intro are disabled.
 
 Everything here is written with `-c copy` -- NO re-encode, NO pixel/audio change.
 The cover art is added as an `attached_pic` stream; the real video stream is
-copied byte-for-byte.
+copied byte-for-byte. `open_download_stream` is the router entry point: when
+there is no cover to embed it runs the same mux into a fragmented MP4 piped
+straight into the response body (no stamped scratch copy, first byte as soon as
+ffmpeg has read the input header), else it falls back to the file pass.
 
 Same failure contract as the outro (T3950): this NEVER raises and NEVER fails a
 download. `stamp_download_metadata` returns False and the caller ships the
@@ -38,6 +41,8 @@ from __future__ import annotations
 
 import logging
 import os
+import shutil
+import tempfile
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -212,6 +217,28 @@ def build_collection_metadata(
     return {"tags": field_map, "cover_path": None, "poster_basename": None}
 
 
+def _stamp_cmd(in_path: str, tags: dict[str, str], cover_path: str | None) -> list[str]:
+    """The `-c copy` stamping command minus its output args (shared by the
+    file-writing pass and the streamed pass so they never drift on mapping)."""
+    cmd = ["ffmpeg", "-y", "-i", in_path]
+    if cover_path:
+        cmd += ["-i", cover_path]
+    cmd += ["-map", "0"]
+    if cover_path:
+        cmd += ["-map", "1"]
+    cmd += ["-c", "copy"]
+    if cover_path:
+        # Encode input 1 as an mjpeg attached_pic (the `covr` cover-art stream).
+        # It is a still, not a real video track -- attached_pic disposition keeps
+        # players from listing it as a selectable video stream.
+        cmd += ["-c:v:1", "mjpeg", "-disposition:v:1", "attached_pic"]
+    for key, value in tags.items():
+        if value is None:
+            continue
+        cmd += ["-metadata", f"{key}={value}"]
+    return cmd
+
+
 def stamp_download_metadata(in_path: str, out_path: str, meta: dict) -> bool:
     """Stream-copy `in_path` to `out_path`, writing `meta["tags"]` as container
     metadata and (when `meta["cover_path"]` is a readable JPEG) embedding it as an
@@ -229,22 +256,7 @@ def stamp_download_metadata(in_path: str, out_path: str, meta: dict) -> bool:
     if not tags and not has_cover:
         return False
 
-    cmd = ["ffmpeg", "-y", "-i", in_path]
-    if has_cover:
-        cmd += ["-i", cover_path]
-    cmd += ["-map", "0"]
-    if has_cover:
-        cmd += ["-map", "1"]
-    cmd += ["-c", "copy"]
-    if has_cover:
-        # Encode input 1 as an mjpeg attached_pic (the `covr` cover-art stream).
-        # It is a still, not a real video track -- attached_pic disposition keeps
-        # players from listing it as a selectable video stream.
-        cmd += ["-c:v:1", "mjpeg", "-disposition:v:1", "attached_pic"]
-    for key, value in tags.items():
-        if value is None:
-            continue
-        cmd += ["-metadata", f"{key}={value}"]
+    cmd = _stamp_cmd(in_path, tags, cover_path if has_cover else None)
     cmd += ["-movflags", "+faststart", out_path]
 
     try:
@@ -266,6 +278,153 @@ def stamp_download_metadata(in_path: str, out_path: str, meta: dict) -> bool:
     return True
 
 
+# =============================================================================
+# Streamed delivery: stamp straight into the response body
+# =============================================================================
+# The file pass above writes a whole second copy of the reel and only then can
+# the router start sending. The streamed pass runs the SAME `-c copy` mux into a
+# FRAGMENTED MP4 on ffmpeg's stdout (`empty_moov` puts a sample-less moov -- with
+# every metadata tag -- up front, media follows as moof/mdat fragments), so the
+# first bytes reach the client as soon as ffmpeg has read the input header and
+# nothing is written to scratch. Length is unknown up front, so the response goes
+# out chunked.
+#
+# Cover art is the one thing fMP4 cannot carry: the mov muxer needs the
+# attached_pic packet before it writes the moov, and with `empty_moov` it emits a
+# broken extra video track instead of a `covr` atom. A download WITH a cover
+# therefore keeps the file pass (cover art is a shipped T6360 guarantee); tags-only
+# downloads (collections, pre-T5280 reels, shares without a poster) stream.
+
+STREAM_CHUNK_BYTES = 1024 * 1024
+_FRAGMENTED_MOVFLAGS = "+frag_keyframe+empty_moov+default_base_moof"
+
+
+class StreamedStampFailed(Exception):
+    """ffmpeg exited nonzero after the streamed body had started. Raised from the
+    chunk iterator so the server aborts the chunked response instead of ending a
+    truncated file as a clean 200."""
+
+
+def open_stamped_stream(in_path: str, meta: dict | None):
+    """Start the streamed stamping mux over `in_path` and return an iterator of
+    fragmented-MP4 chunks, or None when streaming does not apply (no tags, a
+    cover to embed) or ffmpeg failed within the first STREAM_CHUNK_BYTES -- the
+    caller then takes the file path, so a failure here never costs the download.
+
+    The first chunk is read in full before returning, so a short reel is muxed
+    and its exit code checked before any response header goes out. Past that
+    point the response is chunked with no Content-Length: a nonzero exit is
+    logged and the iterator raises StreamedStampFailed, which aborts the
+    connection rather than ending a truncated body cleanly.
+
+    Blocking (spawns ffmpeg and waits for the first chunk); routers call it via
+    `asyncio.to_thread`. Closing the iterator early (client disconnect) kills
+    ffmpeg. Never raises itself."""
+    import subprocess
+
+    tags: dict[str, str] = (meta or {}).get("tags") or {}
+    cover_path = (meta or {}).get("cover_path")
+    if not tags or (cover_path and os.path.exists(cover_path)):
+        return None
+
+    cmd = _stamp_cmd(in_path, tags, None)
+    cmd += ["-movflags", _FRAGMENTED_MOVFLAGS, "-f", "mp4", "pipe:1"]
+
+    err_file = tempfile.TemporaryFile()  # noqa: SIM115 -- closed by the stream's finally
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err_file)
+    except Exception as e:
+        err_file.close()
+        logger.error(f"[DownloadMetadata] could not start streamed stamp: {e}")
+        return None
+
+    def _stderr_tail() -> str:
+        err_file.seek(0)
+        return err_file.read().decode("utf-8", errors="replace")[-600:]
+
+    first = proc.stdout.read(STREAM_CHUNK_BYTES)
+    # A short first read means ffmpeg already hit EOF: its outcome is known
+    # before the response starts, so a failure can still take the file pass.
+    if len(first) < STREAM_CHUNK_BYTES and (proc.wait() != 0 or not first):
+        logger.error(
+            f"[DownloadMetadata] streamed stamp failed before the response "
+            f"(rc={proc.returncode}, {len(first)} bytes); falling back to file pass. "
+            f"stderr:\n{_stderr_tail()}"
+        )
+        proc.stdout.close()
+        err_file.close()
+        return None
+
+    def _chunks():
+        try:
+            chunk = first
+            while chunk:
+                yield chunk
+                chunk = proc.stdout.read1(STREAM_CHUNK_BYTES)
+            if proc.wait() != 0:
+                # Post-headers: the 200 is out, so the only honest signal left
+                # is to abort the connection before the terminating chunk.
+                logger.error(
+                    f"[DownloadMetadata] streamed stamp failed mid-stream "
+                    f"(rc={proc.returncode}); aborting the response. stderr:\n{_stderr_tail()}"
+                )
+                raise StreamedStampFailed(f"ffmpeg exited {proc.returncode} mid-stream")
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+            err_file.close()
+
+    logger.info(f"[DownloadMetadata] streaming {len(tags)} tag(s) as fragmented MP4")
+    return _chunks()
+
+
+def _file_chunks(path: str, cleanup_dir: str | None):
+    try:
+        with open(path, "rb") as fin:
+            while True:
+                chunk = fin.read(STREAM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+    finally:
+        if cleanup_dir:
+            shutil.rmtree(cleanup_dir, ignore_errors=True)
+
+
+def _chunks_then_cleanup(chunks, cleanup_dir: str | None):
+    try:
+        yield from chunks
+    finally:
+        chunks.close()
+        if cleanup_dir:
+            shutil.rmtree(cleanup_dir, ignore_errors=True)
+
+
+def open_download_stream(
+    serve_path: str, tmp_dir: str, meta: dict | None, cleanup_dir: str | None = None,
+):
+    """Router entry point: the body iterator + extra headers for a stamped download
+    of `serve_path`.
+
+    Streams the fragmented-MP4 stamp when it applies (no extra headers -- the
+    response is chunked); otherwise runs the file pass (`apply_download_metadata`,
+    still never-fail) and streams that file with an exact `Content-Length`.
+    `cleanup_dir`, when given, is rmtree'd once the body is exhausted or closed.
+    Blocking -- call via `asyncio.to_thread`. Never raises for a readable file."""
+    chunks = None
+    try:
+        chunks = open_stamped_stream(serve_path, meta)
+    except Exception as e:  # defense in depth -- open_stamped_stream swallows
+        logger.error(f"[DownloadMetadata] streamed stamp errored; using file pass: {e}")
+    if chunks is not None:
+        return _chunks_then_cleanup(chunks, cleanup_dir), {}
+    path = apply_download_metadata(serve_path, tmp_dir, meta)
+    headers = {"Content-Length": str(os.path.getsize(path))}
+    return _file_chunks(path, cleanup_dir), headers
+
+
 def apply_download_metadata(serve_path: str, tmp_dir: str, meta: dict | None) -> str:
     """Router convenience: run the stamping pass over `serve_path` (the composed
     file), returning the path to STREAM. On success that's a new stamped file in
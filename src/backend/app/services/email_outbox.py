@@ -0,0 +1,240 @@
+"""
+Durable outbox for admin bulk update emails (T4860 follow-up).
+
+POST /api/admin/users/bulk/email used to resolve and send to every recipient
+inside the request, one at a time, holding the request (and, for the Postgres
+lookups, the event loop) open for up to BULK_MAX_IDS sends. Now the endpoint
+resolves every address in ONE query, writes an admin_email_jobs row plus one
+admin_email_outbox row per recipient, and returns the job id straight away.
+
+A single dispatcher thread drains the outbox on its own event loop:
+ADMIN_EMAIL_CONCURRENCY workers, each claiming one row at a time, with send
+starts paced to ADMIN_EMAIL_RATE_PER_SEC (Resend's default account limit is
+2 requests/second). A claim leases the row for ADMIN_EMAIL_LEASE_SECONDS; a row
+whose lease ran out (the process died mid-send) is reclaimed on the next pass,
+so delivery is at-least-once, bounded by ADMIN_EMAIL_MAX_ATTEMPTS claims.
+Because the rows live in Postgres, a restart picks up where it left off
+(start_email_outbox runs at app startup).
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+
+from .auth_db import get_emails_by_user_ids
+from .pg import get_pg
+
+logger = logging.getLogger(__name__)
+
+ADMIN_EMAIL_CONCURRENCY = int(os.getenv("ADMIN_EMAIL_CONCURRENCY", "4"))
+ADMIN_EMAIL_RATE_PER_SEC = float(os.getenv("ADMIN_EMAIL_RATE_PER_SEC", "2"))
+ADMIN_EMAIL_LEASE_SECONDS = int(os.getenv("ADMIN_EMAIL_LEASE_SECONDS", "300"))
+ADMIN_EMAIL_MAX_ATTEMPTS = int(os.getenv("ADMIN_EMAIL_MAX_ATTEMPTS", "3"))
+
+
+def enqueue_bulk_email(admin_id: str, user_ids: list[str], subject: str, body_html: str) -> dict:
+    """Queue one email per recipient under a new job and wake the dispatcher.
+
+    Duplicate ids are sent once. Recipients with no email on file are recorded
+    as failed immediately so the job's result list still covers every id.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    emails = get_emails_by_user_ids(user_ids)
+    job_id = uuid.uuid4().hex
+    rows = [
+        (job_id, uid, emails.get(uid), "pending" if emails.get(uid) else "failed",
+         None if emails.get(uid) else "no email on file")
+        for uid in user_ids
+    ]
+    with get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO admin_email_jobs (job_id, admin_user_id, subject, body_html) VALUES (%s, %s, %s, %s)",
+            (job_id, admin_id, subject, body_html),
+        )
+        cur.executemany(
+            "INSERT INTO admin_email_outbox (job_id, user_id, email, status, error) VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+    queued = sum(1 for r in rows if r[3] == "pending")
+    logger.info(f"[EmailOutbox] Job {job_id}: {queued} queued, {len(rows) - queued} without email")
+    if queued:
+        _dispatcher.kick()
+    return {"job_id": job_id, "total": len(rows), "queued": queued}
+
+
+def get_job(job_id: str) -> dict | None:
+    """Progress and per-recipient results of one bulk email job, or None."""
+    with get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT job_id, created_at FROM admin_email_jobs WHERE job_id = %s", (job_id,))
+        job = cur.fetchone()
+        if not job:
+            return None
+        cur.execute(
+            "SELECT user_id, email, status, error FROM admin_email_outbox WHERE job_id = %s ORDER BY id",
+            (job_id,),
+        )
+        rows = cur.fetchall()
+
+    results: list[dict] = []
+    sent = failed = 0
+    for r in rows:
+        if r["status"] == "sent":
+            results.append({"user_id": r["user_id"], "email": r["email"], "ok": True})
+            sent += 1
+        elif r["status"] == "failed":
+            result = {"user_id": r["user_id"], "ok": False, "error": r["error"]}
+            if r["email"]:
+                result["email"] = r["email"]
+            results.append(result)
+            failed += 1
+    pending = len(rows) - sent - failed
+    return {
+        "job_id": job["job_id"],
+        "status": "done" if pending == 0 else "sending",
+        "total": len(rows),
+        "sent": sent,
+        "failed": failed,
+        "pending": pending,
+        "results": results,
+    }
+
+
+def _claim() -> dict | None:
+    """Lease the oldest open row (pending, or sending with an expired lease)."""
+    with get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """UPDATE admin_email_outbox
+               SET status = 'failed', error = %s, leased_until = NULL, updated_at = now()
+               WHERE status = 'sending' AND leased_until < now() AND attempts >= %s""",
+            (f"gave up after {ADMIN_EMAIL_MAX_ATTEMPTS} attempts", ADMIN_EMAIL_MAX_ATTEMPTS),
+        )
+        cur.execute(
+            """UPDATE admin_email_outbox o
+               SET status = 'sending', attempts = o.attempts + 1,
+                   leased_until = now() + make_interval(secs => %s), updated_at = now()
+               FROM admin_email_jobs j
+               WHERE o.id = (
+                   SELECT id FROM admin_email_outbox
+                   WHERE status = 'pending' OR (status = 'sending' AND leased_until < now())
+                   ORDER BY id LIMIT 1
+                   FOR UPDATE SKIP LOCKED
+               ) AND j.job_id = o.job_id
+               RETURNING o.id, o.job_id, o.user_id, o.email, j.subject, j.body_html""",
+            (ADMIN_EMAIL_LEASE_SECONDS,),
+        )
+        return cur.fetchone()
+
+
+def _finish(row_id: int, ok: bool, error: str | None):
+    with get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """UPDATE admin_email_outbox
+               SET status = %s, error = %s, leased_until = NULL, updated_at = now()
+               WHERE id = %s""",
+            ("sent" if ok else "failed", error, row_id),
+        )
+
+
+class _SendPacer:
+    """Spaces send starts at least 1/rate seconds apart across all workers."""
+
+    def __init__(self, rate_per_sec: float):
+        self._interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+                now = self._next
+            self._next = now + self._interval
+
+
+async def _drain(stop: threading.Event):
+    """Send every open row, then return (the dispatcher waits for the next kick)."""
+    from .email import send_admin_update_email
+
+    pacer = _SendPacer(ADMIN_EMAIL_RATE_PER_SEC)
+
+    async def worker():
+        while not stop.is_set():
+            await pacer.wait()
+            row = await asyncio.to_thread(_claim)
+            if row is None:
+                return
+            try:
+                ok = await send_admin_update_email(row["email"], row["subject"], row["body_html"])
+                error = None if ok else "send failed"
+            except Exception as exc:
+                logger.exception(f"[EmailOutbox] Send to {row['user_id']} (job {row['job_id']}) failed")
+                ok, error = False, str(exc)
+            await asyncio.to_thread(_finish, row["id"], ok, error)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, ADMIN_EMAIL_CONCURRENCY))))
+
+
+class _Dispatcher:
+    """One daemon thread running _drain whenever kicked.
+
+    It also re-drains every ADMIN_EMAIL_LEASE_SECONDS while idle, so a row
+    leased by a process that died is picked up without a new enqueue.
+    """
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def kick(self):
+        with self._lock:
+            self._stop.clear()
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="admin-email-outbox", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, timeout: float = 10.0):
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stop.set()
+            self._wake.set()
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(ADMIN_EMAIL_LEASE_SECONDS)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                asyncio.run(_drain(self._stop))
+            except Exception:
+                logger.exception("[EmailOutbox] Drain failed")
+
+
+_dispatcher = _Dispatcher()
+
+
+def start_email_outbox():
+    """Start the dispatcher and resume any rows left open by a previous process."""
+    _dispatcher.kick()
+    logger.info(
+        f"[EmailOutbox] Dispatcher started (concurrency={ADMIN_EMAIL_CONCURRENCY}, "
+        f"rate={ADMIN_EMAIL_RATE_PER_SEC}/s)"
+    )
+
+
+def stop_email_outbox():
+    """Stop the dispatcher; in-flight sends finish, leftover rows wait for the next start."""
+    _dispatcher.stop()
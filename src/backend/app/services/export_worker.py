@@ -21,6 +21,7 @@ from ..database import get_db_connection, get_working_videos_path
 from ..routers.exports import get_export_job, update_job_complete, update_job_error, update_job_started
 from ..utils.encoding import decode_data
 from ..websocket import export_progress, manager
+from . import highlight_store
 from .ffmpeg_service import get_video_duration
 from .modal_client import call_modal_overlay, modal_enabled
 
@@ -271,13 +272,16 @@ async def process_framing_export(job_id: str, project_id: int, config: dict) ->
 
         # Get existing overlay data from current working video to carry forward
         cursor.execute("""
-            SELECT wv.highlights_data, wv.effect_type
+            SELECT wv.id, wv.highlights_data, wv.effect_type
             FROM projects p
             LEFT JOIN working_videos wv ON p.working_video_id = wv.id
             WHERE p.id = ?
         """, (project_id,))
         existing = cursor.fetchone()
-        existing_highlights = existing['highlights_data'] if existing else None
+        existing_highlights = (
+            highlight_store.highlights_blob(cursor, existing['id'], existing['highlights_data'])
+            if existing else None
+        )
         existing_effect_type = normalize_effect_type(existing['effect_type']) if existing else DEFAULT_HIGHLIGHT_EFFECT.value
 
     output_filename = f"project_{project_id}_v{next_version}.mp4"
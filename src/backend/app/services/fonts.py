@@ -11,11 +11,16 @@ The render container has no fontconfig (same constraint as
 path, never a fontconfig family name.
 """
 
+from __future__ import annotations
+
 import functools
 import json
 from pathlib import Path
 
-from PIL import ImageFont
+from app.utils.lazy_import import lazy_module
+
+# Pillow loads on the first render, not when the manifest is read.
+ImageFont = lazy_module("PIL.ImageFont")
 
 FONT_ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets" / "fonts"
 _MANIFEST_PATH = FONT_ASSETS_DIR / "fonts.json"
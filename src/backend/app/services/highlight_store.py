@@ -0,0 +1,201 @@
+"""
+Row-per-region storage for overlay highlight regions (profile_db v047).
+
+working_videos.highlights_data used to be the only copy of a working video's
+regions: every overlay gesture decoded the whole msgpack list, changed one
+region or keyframe, then re-encoded and rewrote the whole blob -- O(total
+keyframes) per drag, and every drag dirtied the blob's pages for the next R2
+sync. highlight_regions stores one msgpack row per region (its keyframes
+embedded), so a gesture reads and rewrites only the region it touches.
+
+Exactly one representation is authoritative per working video:
+
+  * rows exist   -> the rows, in `position` order; highlights_data is NULL.
+  * no rows      -> highlights_data (export finalize, the framing carry-over and
+                    archive restore still write whole lists as a blob).
+
+split_highlights() moves a blob into rows the first time an overlay action
+touches the working video (v047 does it up front for every project's current
+working video). Triggers keep the rule without any writer having to know about
+the rows: ANY write of highlights_data hands authority back to the blob (the
+rows are deleted), and deleting a working video deletes its rows.
+
+Readers that need the assembled list call load_highlights(); the archive path
+substitutes project_highlight_blobs() into the rows it serializes so archives
+carry the blob, as before, without writing to the profile DB.
+"""
+
+import logging
+
+from app.utils.encoding import decode_data, encode_data
+
+logger = logging.getLogger(__name__)
+
+# Kept in step with migrations/profile_db/v047_highlight_regions.py and
+# database.py::ensure_database() (which both execute these statements).
+HIGHLIGHT_REGIONS_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS highlight_regions (
+        id               INTEGER PRIMARY KEY AUTOINCREMENT,
+        working_video_id INTEGER NOT NULL,
+        region_id        TEXT,             -- region['id']; NULL for id-less legacy regions
+        position         INTEGER NOT NULL, -- list order of the assembled highlights
+        data             BLOB NOT NULL     -- msgpack region dict, keyframes included
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_highlight_regions_wv ON highlight_regions(working_video_id, position)",
+    "CREATE INDEX IF NOT EXISTS idx_highlight_regions_region ON highlight_regions(working_video_id, region_id)",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_highlight_regions_blob_write
+    AFTER UPDATE OF highlights_data ON working_videos
+    BEGIN
+        DELETE FROM highlight_regions WHERE working_video_id = NEW.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_highlight_regions_wv_delete
+    AFTER DELETE ON working_videos
+    BEGIN
+        DELETE FROM highlight_regions WHERE working_video_id = OLD.id;
+    END
+    """,
+)
+
+
+def create_highlight_regions_schema(cursor) -> None:
+    """Create the table, indexes and triggers (idempotent)."""
+    for statement in HIGHLIGHT_REGIONS_DDL:
+        cursor.execute(statement)
+
+
+def _region_rows(cursor, working_video_id: int) -> list:
+    cursor.execute(
+        "SELECT data FROM highlight_regions WHERE working_video_id = ? ORDER BY position, id",
+        (working_video_id,),
+    )
+    return cursor.fetchall()
+
+
+def load_highlights(cursor, working_video_id: int, blob) -> list:
+    """The assembled region list for a working video (rows, else the blob).
+
+    `blob` is the row's highlights_data as already selected by the caller.
+    Decode errors propagate: callers decide between failing (the action path,
+    T4210) and logging (read-only paths).
+    """
+    rows = _region_rows(cursor, working_video_id)
+    if rows:
+        return [decode_data(row[0]) for row in rows]
+    if blob:
+        return decode_data(blob) or []
+    return []
+
+
+def highlights_blob(cursor, working_video_id: int | None, blob):
+    """highlights_data-shaped bytes for a working video: the rows re-encoded as
+    one list when split, else `blob` unchanged. For writers that copy a working
+    video's highlights into a NEW row (framing re-export carry-over)."""
+    if working_video_id is None:
+        return blob
+    rows = _region_rows(cursor, working_video_id)
+    if rows:
+        return encode_data([decode_data(row[0]) for row in rows])
+    return blob
+
+
+def split_highlights(cursor, working_video_id: int, blob) -> int:
+    """Move a working video's highlights_data blob into per-region rows.
+
+    No-op when the blob is NULL (already split, or no highlights). Raises on an
+    undecodable blob and leaves it untouched -- never replaced by an empty list
+    (T4210). Returns the number of region rows written.
+    """
+    if blob is None:
+        return 0
+    regions = decode_data(blob) or []
+    # Blob first: the UPDATE fires trg_highlight_regions_blob_write, which must
+    # not see the rows inserted below.
+    cursor.execute("UPDATE working_videos SET highlights_data = NULL WHERE id = ?", (working_video_id,))
+    cursor.executemany(
+        "INSERT INTO highlight_regions (working_video_id, region_id, position, data) VALUES (?, ?, ?, ?)",
+        [
+            (working_video_id, region.get("id"), position, encode_data(region))
+            for position, region in enumerate(regions)
+        ],
+    )
+    return len(regions)
+
+
+def get_region(cursor, working_video_id: int, region_id: str) -> tuple[int, dict] | None:
+    """(row id, region) for the first region with `region_id`, or None."""
+    cursor.execute(
+        """
+        SELECT id, data FROM highlight_regions
+        WHERE working_video_id = ? AND region_id = ?
+        ORDER BY position, id
+        LIMIT 1
+        """,
+        (working_video_id, region_id),
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return row[0], decode_data(row[1])
+
+
+def insert_region(cursor, working_video_id: int, region: dict) -> None:
+    """Append `region` after the working video's last region."""
+    cursor.execute(
+        """
+        INSERT INTO highlight_regions (working_video_id, region_id, position, data)
+        SELECT ?, ?, COALESCE(MAX(position), -1) + 1, ?
+        FROM highlight_regions WHERE working_video_id = ?
+        """,
+        (working_video_id, region.get("id"), encode_data(region), working_video_id),
+    )
+
+
+def update_region(cursor, row_id: int, region: dict) -> None:
+    """Rewrite one region row (as returned by get_region)."""
+    cursor.execute(
+        "UPDATE highlight_regions SET region_id = ?, data = ? WHERE id = ?",
+        (region.get("id"), encode_data(region), row_id),
+    )
+
+
+def delete_region(cursor, working_video_id: int, region_id: str) -> bool:
+    """Delete the first region with `region_id`. False when there is none."""
+    found = get_region(cursor, working_video_id, region_id)
+    if found is None:
+        return False
+    cursor.execute("DELETE FROM highlight_regions WHERE id = ?", (found[0],))
+    return True
+
+
+def project_highlight_blobs(cursor, project_id: int) -> dict[int, bytes]:
+    """{working_video_id: highlights_data-shaped bytes} for each of the
+    project's split working videos. Read-only: for serializers (project
+    archive) that substitute the assembled list into the rows they copy."""
+    cursor.execute(
+        """
+        SELECT DISTINCT hr.working_video_id
+        FROM highlight_regions hr
+        JOIN working_videos wv ON wv.id = hr.working_video_id
+        WHERE wv.project_id = ?
+        """,
+        (project_id,),
+    )
+    wv_ids = [row[0] for row in cursor.fetchall()]
+    return {wv_id: highlights_blob(cursor, wv_id, None) for wv_id in wv_ids}
+
+
+def fold_project_highlights(cursor, project_id: int) -> int:
+    """Write each of the project's split working videos back to one blob.
+
+    The blob write deletes the rows via trg_highlight_regions_blob_write.
+    Returns the number of working videos folded.
+    """
+    blobs = project_highlight_blobs(cursor, project_id)
+    for wv_id, blob in blobs.items():
+        cursor.execute("UPDATE working_videos SET highlights_data = ? WHERE id = ?", (blob, wv_id))
+    return len(blobs)
@@ -11,133 +11,202 @@ directly via the /api/highlights/<filename> endpoint.
 """
 
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import cv2
-
 from ..database import get_highlights_path
+from ..utils.lazy_import import lazy_module
 
 logger = logging.getLogger(__name__)
 
+# Deferred: app.services re-exports this module, so a top-level cv2 import
+# would load OpenCV (and numpy) on every cold start.
+cv2 = lazy_module("cv2")
+
+# extract_player_images decodes forward with grab() up to this many frames
+# rather than seeking; a seek lands on the previous keyframe and decodes from
+# there anyway, so short gaps are cheaper to walk.
+PLAYER_IMAGE_SEEK_GAP = int(os.getenv("PLAYER_IMAGE_SEEK_GAP", "60"))
+# PNG writes in flight at once while the capture keeps decoding.
+PLAYER_IMAGE_WRITE_WORKERS = int(os.getenv("PLAYER_IMAGE_WRITE_WORKERS", "4"))
+
+
+def _crop_player(frame, bbox: dict, padding_percent: float):
+    """Crop the padded, center-based bbox out of `frame`; None if it falls outside."""
+    frame_height, frame_width = frame.shape[:2]
+
+    # Convert center-based bbox to corner-based
+    center_x = bbox.get('x', bbox.get('raw_x', 0))
+    center_y = bbox.get('y', bbox.get('raw_y', 0))
+    radius_x = bbox.get('radiusX', bbox.get('raw_radiusX', 50))
+    radius_y = bbox.get('radiusY', bbox.get('raw_radiusY', 80))
+
+    # Add padding
+    padded_radius_x = radius_x * (1 + padding_percent)
+    padded_radius_y = radius_y * (1 + padding_percent)
+
+    # Clamp to frame bounds
+    x1 = max(0, int(center_x - padded_radius_x))
+    y1 = max(0, int(center_y - padded_radius_y))
+    x2 = min(frame_width, int(center_x + padded_radius_x))
+    y2 = min(frame_height, int(center_y + padded_radius_y))
+
+    # Validate crop region
+    if x2 <= x1 or y2 <= y1:
+        logger.warning(f"Invalid crop region: ({x1},{y1}) to ({x2},{y2})")
+        return None
 
-def extract_player_image(
+    # Copied: the write runs on a pool thread while decoding moves on.
+    player_img = frame[y1:y2, x1:x2].copy()
+    if player_img.size == 0:
+        logger.warning("Extracted image is empty")
+        return None
+    return player_img
+
+
+def _write_player_image(filepath: Path, player_img) -> str | None:
+    if not cv2.imwrite(str(filepath), player_img):
+        logger.error(f"Failed to save image: {filepath}")
+        return None
+    height, width = player_img.shape[:2]
+    logger.info(f"Saved player image: {filepath.name} ({width}x{height} px)")
+    return f"highlights/{filepath.name}"
+
+
+def extract_player_images(
     video_path: str,
-    frame_number: int,
-    bbox: dict,
     raw_clip_id: int,
-    keyframe_index: int,
+    requests: list[tuple[int, int, dict]],
     padding_percent: float = 0.1
-) -> str | None:
+) -> list[str | None]:
     """
-    Extract and save the player image from a video frame.
+    Extract and save player images for several frames of one video.
+
+    The video is opened once. Requested frames are visited in ascending order,
+    decoding forward with grab() and seeking only backwards or across a gap of
+    more than PLAYER_IMAGE_SEEK_GAP frames, so a region's keyframes cost one
+    decode pass instead of one open + seek each. Crops are written to PNG on up
+    to PLAYER_IMAGE_WRITE_WORKERS threads while decoding continues.
 
     Args:
         video_path: Path to the video file
-        frame_number: Frame to extract from (0-indexed)
-        bbox: Bounding box {x, y, radiusX, radiusY} - center-based with radii
-        raw_clip_id: For naming the saved file
-        keyframe_index: For naming the saved file
-        padding_percent: Extra padding around the bbox (default 10%)
+        raw_clip_id: For naming the saved files
+        requests: (frame_number, keyframe_index, bbox) per image; bbox as in
+            extract_player_image
+        padding_percent: Extra padding around each bbox (default 10%)
 
     Returns:
-        Relative path to saved image (e.g., "highlights/clip_42_frame_75_kf0.png"),
-        or None on failure
-
-    The saved image filename format:
-        clip_{raw_clip_id}_frame_{frame_number}_kf{keyframe_index}.png
-
-    This allows easy identification and sorting of images.
+        One entry per request, in request order: the relative path
+        ("highlights/clip_{raw_clip_id}_frame_{frame_number}_kf{keyframe_index}.png")
+        or None if that image could not be extracted.
     """
+    results: list[str | None] = [None] * len(requests)
+    if not requests:
+        return results
+
     try:
         # Validate video path
         if not Path(video_path).exists():
             logger.error(f"Video file not found: {video_path}")
-            return None
+            return results
 
-        # Open video
         cap = cv2.VideoCapture(str(video_path))
         if not cap.isOpened():
             logger.error(f"Cannot open video: {video_path}")
-            return None
+            return results
 
+        # Resolved here: the user context does not reach the writer threads.
+        highlights_dir = get_highlights_path()
+        pending = {}
+        workers = max(1, min(PLAYER_IMAGE_WRITE_WORKERS, len(requests)))
         try:
-            # Get video properties
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-
-            if frame_number < 0 or frame_number >= total_frames:
-                logger.warning(f"Frame {frame_number} out of range (0-{total_frames-1})")
-                return None
-
-            # Seek to frame
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-            ret, frame = cap.read()
-
-            if not ret or frame is None:
-                logger.error(f"Failed to read frame {frame_number}")
-                return None
-
-            # Get frame dimensions
-            frame_height, frame_width = frame.shape[:2]
-
-            # Convert center-based bbox to corner-based
-            center_x = bbox.get('x', bbox.get('raw_x', 0))
-            center_y = bbox.get('y', bbox.get('raw_y', 0))
-            radius_x = bbox.get('radiusX', bbox.get('raw_radiusX', 50))
-            radius_y = bbox.get('radiusY', bbox.get('raw_radiusY', 80))
-
-            # Add padding
-            padded_radius_x = radius_x * (1 + padding_percent)
-            padded_radius_y = radius_y * (1 + padding_percent)
-
-            x1 = int(center_x - padded_radius_x)
-            y1 = int(center_y - padded_radius_y)
-            x2 = int(center_x + padded_radius_x)
-            y2 = int(center_y + padded_radius_y)
-
-            # Clamp to frame bounds
-            x1 = max(0, x1)
-            y1 = max(0, y1)
-            x2 = min(frame_width, x2)
-            y2 = min(frame_height, y2)
-
-            # Validate crop region
-            if x2 <= x1 or y2 <= y1:
-                logger.warning(f"Invalid crop region: ({x1},{y1}) to ({x2},{y2})")
-                return None
-
-            # Extract region
-            player_img = frame[y1:y2, x1:x2]
-
-            if player_img.size == 0:
-                logger.warning("Extracted image is empty")
-                return None
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="player-image") as pool:
+                total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+                by_frame: dict[int, list[int]] = {}
+                for i, (frame_number, _, _) in enumerate(requests):
+                    if frame_number < 0 or frame_number >= total_frames:
+                        logger.warning(f"Frame {frame_number} out of range (0-{total_frames-1})")
+                        continue
+                    by_frame.setdefault(frame_number, []).append(i)
+
+                position = 0  # index of the frame the next read() returns
+                seeks = 0
+                for frame_number in sorted(by_frame):
+                    if frame_number < position or frame_number - position > PLAYER_IMAGE_SEEK_GAP:
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                        position = frame_number
+                        seeks += 1
+                    while position < frame_number and cap.grab():
+                        position += 1
+
+                    ret, frame = cap.read() if position == frame_number else (False, None)
+                    if not ret or frame is None:
+                        logger.error(f"Failed to read frame {frame_number}")
+                        # Position unknown after a failed read: seek for the next frame.
+                        position = total_frames
+                        continue
+                    position += 1
+
+                    for i in by_frame[frame_number]:
+                        _, keyframe_index, bbox = requests[i]
+                        player_img = _crop_player(frame, bbox, padding_percent)
+                        if player_img is None:
+                            continue
+                        if not pending:
+                            highlights_dir.mkdir(parents=True, exist_ok=True)
+                        filename = f"clip_{raw_clip_id}_frame_{frame_number}_kf{keyframe_index}.png"
+                        pending[i] = pool.submit(_write_player_image, highlights_dir / filename, player_img)
+
+                for i, future in pending.items():
+                    results[i] = future.result()
+        finally:
+            cap.release()
 
-            # Ensure highlights directory exists
-            highlights_dir = get_highlights_path()
-            highlights_dir.mkdir(parents=True, exist_ok=True)
+        logger.debug(
+            f"[PlayerImages] clip {raw_clip_id}: {sum(1 for r in results if r)}/{len(requests)} "
+            f"images from {len(by_frame)} frame(s), {seeks} seek(s)"
+        )
+        return results
 
-            # Generate filename
-            filename = f"clip_{raw_clip_id}_frame_{frame_number}_kf{keyframe_index}.png"
-            filepath = highlights_dir / filename
+    except Exception as e:
+        logger.error(f"Failed to extract player images: {e}")
+        return results
 
-            # Save image
-            success = cv2.imwrite(str(filepath), player_img)
 
-            if not success:
-                logger.error(f"Failed to save image: {filepath}")
-                return None
+def extract_player_image(
+    video_path: str,
+    frame_number: int,
+    bbox: dict,
+    raw_clip_id: int,
+    keyframe_index: int,
+    padding_percent: float = 0.1
+) -> str | None:
+    """
+    Extract and save the player image from a video frame.
 
-            logger.info(f"Saved player image: {filename} ({x2-x1}x{y2-y1} px)")
+    Args:
+        video_path: Path to the video file
+        frame_number: Frame to extract from (0-indexed)
+        bbox: Bounding box {x, y, radiusX, radiusY} - center-based with radii
+        raw_clip_id: For naming the saved file
+        keyframe_index: For naming the saved file
+        padding_percent: Extra padding around the bbox (default 10%)
 
-            # Return relative path
-            return f"highlights/{filename}"
+    Returns:
+        Relative path to saved image (e.g., "highlights/clip_42_frame_75_kf0.png"),
+        or None on failure
 
-        finally:
-            cap.release()
+    The saved image filename format:
+        clip_{raw_clip_id}_frame_{frame_number}_kf{keyframe_index}.png
 
-    except Exception as e:
-        logger.error(f"Failed to extract player image: {e}")
-        return None
+    This allows easy identification and sorting of images. For several frames
+    of the same video, use extract_player_images (one open, one decode pass).
+    """
+    return extract_player_images(
+        video_path, raw_clip_id, [(frame_number, keyframe_index, bbox)], padding_percent
+    )[0]
 
 
 def extract_player_images_for_region(
@@ -158,26 +227,27 @@ def extract_player_images_for_region(
     Returns:
         List of keyframes with player_image_path populated
     """
+    image_paths = extract_player_images(
+        video_path,
+        raw_clip_id,
+        [
+            (
+                kf.get('raw_frame', 0),
+                i,
+                {
+                    'raw_x': kf.get('raw_x', 0),
+                    'raw_y': kf.get('raw_y', 0),
+                    'raw_radiusX': kf.get('raw_radiusX', 50),
+                    'raw_radiusY': kf.get('raw_radiusY', 80)
+                },
+            )
+            for i, kf in enumerate(keyframes)
+        ],
+    )
+
+    # Update keyframes with image paths
     updated_keyframes = []
-
-    for i, kf in enumerate(keyframes):
-        raw_frame = kf.get('raw_frame', 0)
-
-        # Extract image
-        image_path = extract_player_image(
-            video_path=video_path,
-            frame_number=raw_frame,
-            bbox={
-                'raw_x': kf.get('raw_x', 0),
-                'raw_y': kf.get('raw_y', 0),
-                'raw_radiusX': kf.get('raw_radiusX', 50),
-                'raw_radiusY': kf.get('raw_radiusY', 80)
-            },
-            raw_clip_id=raw_clip_id,
-            keyframe_index=i
-        )
-
-        # Update keyframe with image path
+    for kf, image_path in zip(keyframes, image_paths):
         updated_kf = kf.copy()
         updated_kf['player_image_path'] = image_path
         updated_keyframes.append(updated_kf)
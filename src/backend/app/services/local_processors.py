@@ -38,6 +38,15 @@ class MockVideoUpscaler:
         # and raises 503 if falsy (see multi_clip.py process_single_clip)
         self.upsampler = True
 
+    def enhance(self, img, outscale: float = 4):
+        """RealESRGANer.enhance() stand-in for frame-level pipelines (the Modal
+        process_clips_ai pipeline run on CPU): a plain cubic resize, no AI."""
+        import cv2
+
+        h, w = img.shape[:2]
+        size = (max(1, round(w * outscale)), max(1, round(h * outscale)))
+        return cv2.resize(img, size, interpolation=cv2.INTER_CUBIC), None
+
     def process_video_with_upscale(
         self,
         input_path: str,
@@ -511,7 +520,7 @@ async def local_framing(
 
 # --- Sync functions for subprocess isolation (T2640) ---
 # These run in a child process via ProcessPoolExecutor.
-# All I/O is sync, progress_callback is a plain function (writes to queue).
+# All I/O is sync, progress_callback is a plain function (writes to the progress pipe).
 
 
 def _overlay_sync(
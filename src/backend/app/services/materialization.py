@@ -7,12 +7,14 @@ already has annotations on the same game.
 """
 
 
+import heapq
 import logging
 import sqlite3
 from pathlib import Path
 
 from app.database import USER_DATA_BASE, sync_db_to_r2_explicit
-from app.services.auth_db import get_game_storage_ref, insert_game_storage_ref
+from app.services.auth_db import get_game_storage_refs, insert_game_storage_refs
+from app.services.clip_tag_index import fold_pending_clip_tags
 from app.services.db_refresh import RefreshFailed, clear_stale_wal_sidecars, wal_sidecars_present
 from app.services.pg import get_pg
 from app.services.sharing_db import (
@@ -546,48 +548,161 @@ def merge_clips(existing: dict, incoming: dict) -> dict:
 
 
 def _get_existing_clips(conn: sqlite3.Connection, game_id: int) -> list[dict]:
-    """Get existing raw_clips for a game in recipient's DB."""
+    """Get existing raw_clips for a game in recipient's DB, oldest first."""
     cur = conn.cursor()
     cur.execute(
         """SELECT id, rating, name, notes, start_time, end_time, video_sequence,
                   tagged_teammates, my_athlete
-           FROM raw_clips WHERE game_id = ?""",
+           FROM raw_clips WHERE game_id = ? ORDER BY id""",
         (game_id,),
     )
     return [dict(r) for r in cur.fetchall()]
 
 
+def _clip_insert_params(
+    game_id: int, clip: dict,
+    shared_by: str | None = None,
+    tagged_teammates_blob: bytes | None = None,
+) -> tuple:
+    tags = clip.get("tags")
+    if isinstance(tags, list):
+        tags = encode_data(tags) if tags else None
+    return (
+        clip.get("rating", 3),
+        tags,
+        clip.get("name"),
+        clip.get("notes"),
+        clip.get("start_time"),
+        clip.get("end_time"),
+        game_id,
+        clip.get("video_sequence"),
+        tagged_teammates_blob,
+        shared_by,
+    )
+
+
+_INSERT_CLIP_SQL = """INSERT INTO raw_clips
+           (filename, rating, tags, name, notes, start_time, end_time,
+            game_id, video_sequence, tagged_teammates, my_athlete, shared_by)
+           VALUES ('', ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)"""
+
+
 def _insert_clip(
     conn: sqlite3.Connection, game_id: int, clip: dict,
     shared_by: str | None = None,
     tagged_teammates_blob: bytes | None = None,
 ) -> int:
     """Insert a raw_clip into recipient's DB. Returns new clip id."""
-    tags = clip.get("tags")
-    if isinstance(tags, list):
-        tags = encode_data(tags) if tags else None
     cur = conn.cursor()
     cur.execute(
-        """INSERT INTO raw_clips
-           (filename, rating, tags, name, notes, start_time, end_time,
-            game_id, video_sequence, tagged_teammates, my_athlete, shared_by)
-           VALUES ('', ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?)""",
-        (
-            clip.get("rating", 3),
-            tags,
-            clip.get("name"),
-            clip.get("notes"),
-            clip.get("start_time"),
-            clip.get("end_time"),
-            game_id,
-            clip.get("video_sequence"),
-            tagged_teammates_blob,
-            shared_by,
-        ),
+        _INSERT_CLIP_SQL,
+        _clip_insert_params(game_id, clip, shared_by, tagged_teammates_blob),
     )
     return cur.lastrowid
 
 
+def _insert_clips(
+    conn: sqlite3.Connection, game_id: int, params: list[tuple],
+) -> list[int]:
+    """Insert many raw_clips with one executemany. Returns the new ids in order.
+
+    New rowids are always above the table's current MAX(id) and increase with
+    insertion order, and the inserts run inside the caller's write transaction,
+    so the new rows are exactly this game's ids above the pre-insert maximum.
+    """
+    if not params:
+        return []
+    cur = conn.cursor()
+    high_water = cur.execute("SELECT COALESCE(MAX(id), 0) FROM raw_clips").fetchone()[0]
+    cur.executemany(_INSERT_CLIP_SQL, params)
+    ids = [r[0] for r in cur.execute(
+        "SELECT id FROM raw_clips WHERE game_id = ? AND id > ? ORDER BY id",
+        (game_id, high_water),
+    ).fetchall()]
+    if len(ids) != len(params):
+        raise RuntimeError(
+            f"raw_clips batch insert for game {game_id}: expected {len(params)} ids, got {len(ids)}"
+        )
+    return ids
+
+
+def _assign_merge_targets(existing: list[dict], incoming: list[dict]) -> list[int | None]:
+    """For each incoming clip, the index into `existing` of the clip it merges into.
+
+    Only existing Team-layer clips are targets (T5745): incoming share clips
+    are Team layer, and a cross-layer overlap must not swallow the recipient's
+    own My Athlete clip. Incoming clips never merge with each other. Among the
+    targets overlapping an incoming clip the oldest (lowest id) wins, measured
+    against its extent as grown by the merges already assigned to it.
+
+    Sort-and-sweep per video_sequence instead of comparing every pair: incoming
+    clips are visited by start time; targets whose start has been passed sit in
+    a heap keyed by id (dead ones -- end <= the sweep position -- are dropped
+    lazily, and a target only grows when it is chosen, so a dropped one never
+    comes back); targets starting inside the incoming clip's range are read off
+    the start-sorted list. O((n + m) log m) for the usual short, sparse clips.
+    """
+    targets_by_seq: dict = {}
+    for idx, ex in enumerate(existing):
+        if _is_team_layer(ex):
+            targets_by_seq.setdefault(ex.get("video_sequence"), []).append(idx)
+    incoming_by_seq: dict = {}
+    for i, clip in enumerate(incoming):
+        incoming_by_seq.setdefault(clip.get("video_sequence"), []).append(i)
+
+    assignment: list[int | None] = [None] * len(incoming)
+    for seq, incoming_idx in incoming_by_seq.items():
+        target_idx = targets_by_seq.get(seq)
+        if not target_idx:
+            continue
+        # Working extents; `existing` itself is left untouched.
+        ext = {t: [existing[t].get("start_time", 0) or 0, existing[t].get("end_time", 0) or 0]
+               for t in target_idx}
+        pending = sorted(target_idx, key=lambda t: ext[t][0])
+        admitted: set[int] = set()
+        heap: list[int] = []  # target indices; index order == id order
+        ptr = 0
+        for i in sorted(incoming_idx, key=lambda i: (
+            incoming[i].get("start_time", 0) or 0, incoming[i].get("end_time", 0) or 0, i,
+        )):
+            clip = incoming[i]
+            s = clip.get("start_time", 0) or 0
+            e = clip.get("end_time", 0) or 0
+            while ptr < len(pending) and ext[pending[ptr]][0] <= s:
+                t = pending[ptr]
+                ptr += 1
+                if t not in admitted:
+                    admitted.add(t)
+                    heapq.heappush(heap, t)
+            while heap and ext[heap[0]][1] <= s:
+                heapq.heappop(heap)
+
+            best = None
+            if heap:
+                if ext[heap[0]][0] < e:
+                    best = heap[0]
+                else:
+                    # Only a zero-length incoming clip can miss the heap top.
+                    best = min((t for t in heap if ext[t][0] < e and s < ext[t][1]), default=None)
+            j = ptr
+            while j < len(pending) and ext[pending[j]][0] < e:
+                t = pending[j]
+                if t not in admitted and s < ext[t][1] and (best is None or t < best):
+                    best = t
+                j += 1
+
+            if best is None:
+                continue
+            assignment[i] = best
+            ext[best][0] = min(ext[best][0], s)
+            ext[best][1] = max(ext[best][1], e)
+            if best not in admitted:
+                # Its start moved back to <= s: it is live for the rest of the sweep.
+                admitted.add(best)
+                heapq.heappush(heap, best)
+    return assignment
+
+
 def _build_athlete_set(clip: dict, sharer_profile_name: str | None = None) -> set[str]:
     """Build the set of athlete names for a clip."""
     athletes = set()
@@ -611,74 +726,76 @@ def _materialize_clips(
     shared_by: str | None = None,
     sharer_profile_name: str | None = None,
 ) -> dict:
-    """Insert clips into recipient's DB, merging overlaps with existing clips."""
+    """Insert clips into recipient's DB, merging overlaps with existing clips.
+
+    Merge targets come from _assign_merge_targets; each merged target then
+    folds in its incoming clips in share order (so notes and names come out as
+    they always have). All updates go out in one executemany, all inserts in
+    another.
+    """
     existing = _get_existing_clips(recipient_conn, recipient_game_id)
-    inserted = 0
-    merged = 0
-    inserted_clips: list[dict] = []
-
-    for clip in incoming_clips:
-        incoming_athletes = _build_athlete_set(clip, sharer_profile_name)
-        overlap_found = False
-        for ex in existing:
-            # Incoming share clips are always Team layer (my_athlete=0). Merge
-            # only with an existing clip on the SAME (Team) layer -- a cross-
-            # layer intersection (the recipient's own My Athlete clip on the
-            # same play) must NOT be merged, or the recipient loses their own
-            # curation. A cross-layer overlap falls through to a plain insert
-            # so both clips coexist (T5745).
-            if _is_team_layer(ex) and clips_overlap(ex, clip):
-                merged_data = merge_clips(ex, clip)
-                existing_athletes = set(decode_data(ex.get("tagged_teammates")) or [])
-                all_athletes = existing_athletes | incoming_athletes
-                merged_teammates = encode_data(sorted(all_athletes)) if all_athletes else None
-                cur = recipient_conn.cursor()
-                # Never rewrite the row's my_athlete -- both clips are already
-                # Team layer, and a merge must never change a row's layer.
-                cur.execute(
-                    """UPDATE raw_clips
-                       SET start_time = ?, end_time = ?, name = ?, notes = ?,
-                           tagged_teammates = ?
-                       WHERE id = ?""",
-                    (
-                        merged_data["start_time"],
-                        merged_data["end_time"],
-                        merged_data["name"],
-                        merged_data["notes"],
-                        merged_teammates,
-                        ex["id"],
-                    ),
-                )
-                ex["start_time"] = merged_data["start_time"]
-                ex["end_time"] = merged_data["end_time"]
-                ex["name"] = merged_data["name"]
-                ex["notes"] = merged_data["notes"]
-                ex["tagged_teammates"] = merged_teammates
-                overlap_found = True
-                merged += 1
-                break
+    assignment = _assign_merge_targets(existing, incoming_clips)
+
+    merges: dict[int, list[dict]] = {}
+    to_insert: list[tuple[dict, bytes | None]] = []
+    for clip, target in zip(incoming_clips, assignment):
+        if target is None:
+            athletes = _build_athlete_set(clip, sharer_profile_name)
+            to_insert.append((clip, encode_data(sorted(athletes)) if athletes else None))
+        else:
+            merges.setdefault(target, []).append(clip)
+
+    updates = []
+    for target in sorted(merges):
+        ex = existing[target]
+        all_athletes = set(decode_data(ex.get("tagged_teammates")) or [])
+        merged_data = ex
+        for clip in merges[target]:
+            merged_data = merge_clips(merged_data, clip)
+            all_athletes |= _build_athlete_set(clip, sharer_profile_name)
+        merged_teammates = encode_data(sorted(all_athletes)) if all_athletes else None
+        # Never rewrite the row's my_athlete -- both clips are already
+        # Team layer, and a merge must never change a row's layer.
+        updates.append((
+            merged_data["start_time"],
+            merged_data["end_time"],
+            merged_data["name"],
+            merged_data["notes"],
+            merged_teammates,
+            ex["id"],
+        ))
+    if updates:
+        recipient_conn.executemany(
+            """UPDATE raw_clips
+               SET start_time = ?, end_time = ?, name = ?, notes = ?,
+                   tagged_teammates = ?
+               WHERE id = ?""",
+            updates,
+        )
 
-        if not overlap_found:
-            teammates_blob = encode_data(sorted(incoming_athletes)) if incoming_athletes else None
-            new_id = _insert_clip(
-                recipient_conn, recipient_game_id, clip,
-                shared_by=shared_by, tagged_teammates_blob=teammates_blob,
-            )
-            new_clip = {
-                "id": new_id,
-                "start_time": clip.get("start_time"),
-                "end_time": clip.get("end_time"),
-                "video_sequence": clip.get("video_sequence"),
-                "name": clip.get("name"),
-                "notes": clip.get("notes"),
-                "rating": clip.get("rating"),
-                "tagged_teammates": teammates_blob,
-            }
-            existing.append(new_clip)
-            inserted_clips.append(new_clip)
-            inserted += 1
+    new_ids = _insert_clips(recipient_conn, recipient_game_id, [
+        _clip_insert_params(recipient_game_id, clip, shared_by, blob)
+        for clip, blob in to_insert
+    ])
+    inserted_clips = [
+        {
+            "id": new_id,
+            "start_time": clip.get("start_time"),
+            "end_time": clip.get("end_time"),
+            "video_sequence": clip.get("video_sequence"),
+            "name": clip.get("name"),
+            "notes": clip.get("notes"),
+            "rating": clip.get("rating"),
+            "tagged_teammates": blob,
+        }
+        for new_id, (clip, blob) in zip(new_ids, to_insert)
+    ]
 
-    return {"inserted": inserted, "merged": merged, "inserted_clips": inserted_clips}
+    return {
+        "inserted": len(inserted_clips),
+        "merged": len(incoming_clips) - len(inserted_clips),
+        "inserted_clips": inserted_clips,
+    }
 
 
 def _create_storage_refs(
@@ -688,17 +805,18 @@ def _create_storage_refs(
     recipient_profile_id: str,
     hashes: list[str],
 ) -> None:
-    """Create game_storage_refs in Postgres for the recipient."""
-    for h in hashes:
-        sharer_ref = get_game_storage_ref(sharer_user_id, sharer_profile_id, h)
-        if sharer_ref:
-            insert_game_storage_ref(
-                user_id=recipient_user_id,
-                profile_id=recipient_profile_id,
-                blake3_hash=h,
-                game_size_bytes=sharer_ref["game_size_bytes"],
-                storage_expires_at=str(sharer_ref["storage_expires_at"]),
-            )
+    """Create game_storage_refs in Postgres for the recipient.
+
+    All of a game's videos in one batch: one lookup of the sharer's refs, one
+    profile transaction and one atomic game_ref_counts increment for the lot.
+    """
+    sharer_refs = get_game_storage_refs(sharer_user_id, sharer_profile_id, hashes)
+    refs = [
+        (h, sharer_refs[h]["game_size_bytes"], str(sharer_refs[h]["storage_expires_at"]))
+        for h in hashes if h in sharer_refs
+    ]
+    if refs:
+        insert_game_storage_refs(recipient_user_id, recipient_profile_id, refs)
 
 
 def materialize_game_share(
@@ -821,6 +939,11 @@ def materialize_game_share(
                 _create_auto_project_for_clip(
                     reel_cursor, clip["id"], clip["name"] or "")
 
+        # A raw connection, so TrackedConnection.commit() won't fold the clips
+        # the raw_clips triggers just queued into the tag index: fold them here,
+        # in the same transaction.
+        fold_pending_clip_tags(reel_cursor)
+
         recipient_conn.commit()
 
         # BLOCKING NEW-A (T4315 round 3): _open_profile_db sets
@@ -28,9 +28,9 @@ Usage:
 import asyncio
 import logging
 import multiprocessing
-import multiprocessing.managers
 import os
 import socket
+import threading
 import time
 from concurrent.futures import ProcessPoolExecutor
 
@@ -39,7 +39,6 @@ logger = logging.getLogger(__name__)
 # --- Subprocess isolation for local processing (T2640) ---
 
 _process_pool: ProcessPoolExecutor | None = None
-_mp_manager: multiprocessing.managers.SyncManager | None = None
 
 
 def _get_process_pool() -> ProcessPoolExecutor:
@@ -49,56 +48,143 @@ def _get_process_pool() -> ProcessPoolExecutor:
     return _process_pool
 
 
-def _get_mp_manager() -> multiprocessing.managers.SyncManager:
-    global _mp_manager
-    if _mp_manager is None:
-        _mp_manager = multiprocessing.Manager()
-    return _mp_manager
+class SubprocessCancelled(Exception):
+    """Raised inside the child when the parent cancels the job mid-run."""
 
 
-def _subprocess_worker(sync_fn, kwargs, queue):
-    """Run sync_fn in child process, sending progress via manager queue."""
+def _subprocess_worker(sync_fn, kwargs, conn):
+    """Run sync_fn in child process, sending progress over a pipe.
+
+    conn is the child end of a duplex multiprocessing.Pipe. Progress goes out as
+    plain dicts; the parent writes {"type": "cancel"} back when the awaiting task
+    is cancelled, which the next progress report turns into SubprocessCancelled.
+    """
     def progress_sink(pct, msg, phase):
+        if conn.poll():
+            try:
+                if conn.recv().get("type") == "cancel":
+                    raise SubprocessCancelled("Cancelled by parent")
+            except (EOFError, OSError) as e:
+                raise SubprocessCancelled("Parent went away") from e
         try:
-            queue.put_nowait({"type": "progress", "progress": pct, "message": msg, "phase": phase})
-        except Exception:
+            conn.send({"type": "progress", "progress": pct, "message": msg, "phase": phase})
+        except (BrokenPipeError, OSError):
             pass
 
     kwargs["progress_callback"] = progress_sink
     try:
         return sync_fn(**kwargs)
+    except SubprocessCancelled as e:
+        return {"status": "cancelled", "error": str(e)}
     except Exception as e:
         return {"status": "error", "error": str(e)}
+    finally:
+        conn.close()
 
 
-async def _run_in_subprocess(sync_fn, kwargs: dict, progress_callback=None) -> dict:
-    """Execute sync_fn in a subprocess, bridging progress to async callback."""
-    queue = _get_mp_manager().Queue()
-    loop = asyncio.get_running_loop()
-    pool = _get_process_pool()
+def _drain_pipe(conn, batch: list) -> bool:
+    """Read every message already buffered on conn into batch. False once closed."""
+    try:
+        while conn.poll():
+            batch.append(conn.recv())
+    except (EOFError, OSError):
+        return False
+    return True
 
-    future = loop.run_in_executor(pool, _subprocess_worker, sync_fn, kwargs, queue)
 
-    while not future.done():
-        while True:
+async def _run_in_subprocess(sync_fn, kwargs: dict, progress_callback=None) -> dict:
+    """Execute sync_fn in a subprocess, bridging progress to async callback.
+
+    Progress arrives on a pipe registered with loop.add_reader, so the event loop
+    wakes only when the child has written something -- no polling, and no
+    Manager server process relaying each message. Everything readable at wake-up
+    is delivered as one batch, in order. Loops without add_reader (Windows'
+    ProactorEventLoop) get the same batches from a reader thread blocked on the
+    pipe. Cancelling the awaiting task forwards a cancel message to the child
+    (T2640).
+    """
+    loop = asyncio.get_running_loop()
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=True)
+    fd = parent_conn.fileno()
+    batch: list = []
+    wake = asyncio.Event()
+    reader_open = True
+    reader_thread: threading.Thread | None = None
+    reader_stop = threading.Event()
+
+    def _on_readable():
+        nonlocal reader_open
+        if not _drain_pipe(parent_conn, batch):
+            loop.remove_reader(fd)
+            reader_open = False
+        wake.set()
+
+    def _on_thread_batch(msgs: list):
+        batch.extend(msgs)
+        wake.set()
+
+    def _read_in_thread():
+        while not reader_stop.is_set():
             try:
-                msg = queue.get_nowait()
-                if progress_callback and msg.get("type") == "progress":
-                    await progress_callback(msg["progress"], msg["message"], msg["phase"])
-            except Exception:
-                break
-        await asyncio.sleep(0.05)
-
-    # Drain remaining progress messages after process completes
-    while True:
-        try:
-            msg = queue.get_nowait()
+                if not parent_conn.poll(0.1):
+                    continue
+            except (EOFError, OSError):
+                return
+            msgs: list = []
+            alive = _drain_pipe(parent_conn, msgs)
+            try:
+                loop.call_soon_threadsafe(_on_thread_batch, msgs)
+            except RuntimeError:  # loop already closed
+                return
+            if not alive:
+                return
+
+    async def _deliver():
+        while batch:
+            msg = batch.pop(0)
             if progress_callback and msg.get("type") == "progress":
                 await progress_callback(msg["progress"], msg["message"], msg["phase"])
-        except Exception:
-            break
 
-    return future.result()
+    try:
+        loop.add_reader(fd, _on_readable)
+    except NotImplementedError:
+        reader_open = False
+        reader_thread = threading.Thread(
+            target=_read_in_thread, name="subprocess-progress", daemon=True,
+        )
+        reader_thread.start()
+    try:
+        future = loop.run_in_executor(
+            _get_process_pool(), _subprocess_worker, sync_fn, kwargs, child_conn,
+        )
+        future.add_done_callback(lambda _f: wake.set())
+        try:
+            while not future.done():
+                await wake.wait()
+                wake.clear()
+                await _deliver()
+        except asyncio.CancelledError:
+            try:
+                parent_conn.send({"type": "cancel"})
+            except (BrokenPipeError, OSError):
+                pass
+            raise
+
+        if reader_thread is not None:
+            # Batches it already handed over are queued ahead of this resume.
+            reader_stop.set()
+            await asyncio.to_thread(reader_thread.join)
+        # The child writes progress before returning, so anything it sent is
+        # already buffered on the pipe by the time the future resolves.
+        _drain_pipe(parent_conn, batch)
+        await _deliver()
+        return future.result()
+    finally:
+        if reader_open:
+            loop.remove_reader(fd)
+        reader_stop.set()
+        parent_conn.close()
+        child_conn.close()
 
 # Retry configuration for transient network errors
 NETWORK_RETRY_ATTEMPTS = 3
@@ -2,15 +2,37 @@
 Modal Queue Service
 
 Persistent task queue for GPU operations:
-1. Enqueue task (DB insert)
-2. Process queue (reads DB, dispatches to handler, updates DB)
-3. Same processor runs on startup for recovery
+1. Enqueue task (DB insert) -- enqueue_modal_task
+2. Dispatch: claim a pending row under a lease, run the registered handler for
+   its task_type, record the result (or the failure) on the row
+3. The same dispatch drains a profile's queue on its first session init
+   (process_modal_queue), for recovery
 
 This ensures:
 - Tasks survive server restarts
 - No duplicate processing
 - Clear separation of concerns
 
+Handlers are looked up in a task-type registry (register_task_type). A claim
+holds a lease in modal_task_leases (profile_db v049) that the running task
+renews every MODAL_TASK_HEARTBEAT_SECONDS; a running row whose lease ran out
+(the process died, or stopped heartbeating) is failed by check_stale_tasks and
+re-queued by check_and_retry_failed_tasks with exponential backoff.
+
+One dispatcher loop per process (start_modal_queue, at app startup) re-checks
+every profile that has queue work each MODAL_QUEUE_POLL_SECONDS, or sooner
+when a task is enqueued or finishes. Whoever claims -- the loop or a
+session-init drain -- takes a slot first: at most MODAL_QUEUE_CONCURRENCY
+tasks in flight and MODAL_QUEUE_PER_USER_CONCURRENCY per user, so a burst of
+queued jobs cannot stampede the GPU backend. The caps are counted per process:
+with the single uvicorn worker production runs they are the global caps, and
+a multi-worker deployment multiplies them by the worker count.
+
+The dispatcher runs outside any request, so the middleware never syncs its
+profile DB writes: each claim batch and each finished task is followed by an
+explicit sync_db_to_r2_explicit (T940), or a restore from R2 would revert
+completed tasks to running/pending and run them again.
+
 Currently no task types are enqueued (clip extraction was removed in T740/T800).
 The infrastructure is kept for future GPU task types.
 """
@@ -18,74 +40,235 @@ The infrastructure is kept for future GPU task types.
 import asyncio
 import json
 import logging
+import os
+import threading
+import uuid
+from collections.abc import Awaitable, Callable
 
-from app.database import get_db_connection
-from app.profile_context import set_current_profile_id
-from app.user_context import set_current_user_id
+from app.database import get_db_connection, sync_db_to_r2_explicit
+from app.profile_context import get_current_profile_id, set_current_profile_id
+from app.user_context import get_current_user_id, set_current_user_id
 
 logger = logging.getLogger(__name__)
 
-STALE_TASK_TIMEOUT_MINUTES = 10
+STALE_TASK_TIMEOUT_MINUTES = 10  # running rows from before leases existed
 MAX_RETRY_COUNT = 3
-RETRY_BACKOFF_SECONDS = [60, 300, 900]  # 1min, 5min, 15min
+# Retry n waits RETRY_BACKOFF_BASE_SECONDS * 4**n, capped: 1min, 4min, 15min.
+RETRY_BACKOFF_BASE_SECONDS = int(os.getenv("MODAL_TASK_RETRY_BASE_SECONDS", "60"))
+RETRY_BACKOFF_MAX_SECONDS = int(os.getenv("MODAL_TASK_RETRY_MAX_SECONDS", "900"))
 
+MODAL_QUEUE_CONCURRENCY = int(os.getenv("MODAL_QUEUE_CONCURRENCY", "4"))
+MODAL_QUEUE_PER_USER_CONCURRENCY = int(os.getenv("MODAL_QUEUE_PER_USER_CONCURRENCY", "2"))
+MODAL_QUEUE_POLL_SECONDS = float(os.getenv("MODAL_QUEUE_POLL_SECONDS", "30"))
+MODAL_TASK_LEASE_SECONDS = int(os.getenv("MODAL_TASK_LEASE_SECONDS", "120"))
+MODAL_TASK_HEARTBEAT_SECONDS = float(os.getenv("MODAL_TASK_HEARTBEAT_SECONDS", "30"))
 
-async def process_modal_queue() -> dict:
-    """
-    Process all pending tasks in the modal_tasks queue.
+# A handler gets the claimed task (task_id, task_type, params, raw_clip_id,
+# project_id, game_id) and returns a JSON-serializable result, or raises.
+TaskHandler = Callable[[dict], Awaitable[dict | None]]
 
-    Called on app startup for recovery.
-    Returns summary of processed tasks.
-    """
-    check_stale_tasks()
-    check_and_retry_failed_tasks()
+_TASK_HANDLERS: dict[str, TaskHandler] = {}
 
-    # Phase 1: Find and claim pending tasks
-    tasks_to_process = []
 
+def register_task_type(task_type: str, handler: TaskHandler) -> None:
+    """Route modal_tasks rows of `task_type` to `handler`."""
+    _TASK_HANDLERS[task_type] = handler
+
+
+def enqueue_modal_task(
+    task_type: str,
+    params: dict,
+    raw_clip_id: int | None = None,
+    project_id: int | None = None,
+    game_id: int | None = None,
+) -> int:
+    """Queue a task on the current profile and wake the dispatcher; returns its id."""
     with get_db_connection() as conn:
         cursor = conn.cursor()
-
         cursor.execute("""
-            SELECT id, task_type, params, raw_clip_id, project_id, game_id
-            FROM modal_tasks
-            WHERE status = 'pending'
-            ORDER BY created_at ASC
-        """)
-        tasks = cursor.fetchall()
+            INSERT INTO modal_tasks (task_type, params, raw_clip_id, project_id, game_id)
+            VALUES (?, ?, ?, ?, ?)
+        """, (task_type, json.dumps(params), raw_clip_id, project_id, game_id))
+        task_id = cursor.lastrowid
+        conn.commit()
+    _dispatcher.watch(get_current_user_id(), get_current_profile_id())
+    return task_id
 
-        if not tasks:
-            return {"processed": 0, "succeeded": 0, "failed": 0}
 
-        logger.info(f"[ModalQueue] Found {len(tasks)} tasks to process")
+class _Dispatcher:
+    """In-flight slots, the profiles with queue work, and the loop draining them.
 
-        # Mark all as 'running' to claim them
-        task_ids = [t['id'] for t in tasks]
-        placeholders = ','.join('?' * len(task_ids))
-        cursor.execute(f"""
-            UPDATE modal_tasks
-            SET status = 'running', started_at = CURRENT_TIMESTAMP
-            WHERE id IN ({placeholders})
-        """, task_ids)
-        conn.commit()
+    Slots are plain counters under a threading lock rather than asyncio
+    semaphores: a session-init drain may run on another event loop
+    (run_queue_processor_sync) and must count against the same caps.
+    """
 
-        for task in tasks:
-            tasks_to_process.append({
-                "task_id": task['id'],
-                "task_type": task['task_type'],
-                "params": json.loads(task['params']),
-                "raw_clip_id": task['raw_clip_id'],
-                "project_id": task['project_id'],
-                "game_id": task['game_id'],
-            })
-
-    # Phase 2: Process tasks in parallel (outside DB connection)
-    results = await asyncio.gather(
-        *[_process_single_task(task) for task in tasks_to_process],
-        return_exceptions=True
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._in_flight_by_user: dict[str, int] = {}
+        self._queues: set[tuple[str, str]] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake: asyncio.Event | None = None
+        self._runner: asyncio.Task | None = None
+
+    def acquire(self, user_id: str) -> bool:
+        with self._lock:
+            if self._in_flight >= MODAL_QUEUE_CONCURRENCY:
+                return False
+            if self._in_flight_by_user.get(user_id, 0) >= MODAL_QUEUE_PER_USER_CONCURRENCY:
+                return False
+            self._in_flight += 1
+            self._in_flight_by_user[user_id] = self._in_flight_by_user.get(user_id, 0) + 1
+            return True
+
+    def release(self, user_id: str):
+        with self._lock:
+            self._in_flight -= 1
+            remaining = self._in_flight_by_user.get(user_id, 1) - 1
+            if remaining > 0:
+                self._in_flight_by_user[user_id] = remaining
+            else:
+                self._in_flight_by_user.pop(user_id, None)
+
+    def track(self, task: asyncio.Task):
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def watch(self, user_id: str, profile_id: str):
+        with self._lock:
+            self._queues.add((user_id, profile_id))
+        self.kick()
+
+    def kick(self):
+        """Wake the loop for an early pass; safe from any thread."""
+        loop, wake = self._loop, self._wake
+        if loop is None or wake is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            pass  # loop already closed
+
+    def start(self):
+        if self._runner is not None and not self._runner.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._runner = asyncio.create_task(self._run(self._wake))
+
+    async def stop(self):
+        runner, self._runner = self._runner, None
+        if runner is not None:
+            runner.cancel()
+            try:
+                await runner
+            except asyncio.CancelledError:
+                pass
+        self._loop = self._wake = None
+
+    async def _run(self, wake: asyncio.Event):
+        while True:
+            wake.clear()
+            dirty: set[tuple[str, str]] = set()
+            try:
+                dirty = self._pass()
+            except Exception:
+                logger.exception("[ModalQueue] Dispatch pass failed")
+            for user_id, profile_id in sorted(dirty):
+                await asyncio.to_thread(_sync_profile, user_id, profile_id)
+            # Not wait_for: on 3.11 it drops a cancel that lands as the event
+            # is set, and stop() would wait forever.
+            waiter = asyncio.create_task(wake.wait())
+            try:
+                await asyncio.wait({waiter}, timeout=MODAL_QUEUE_POLL_SECONDS)
+            finally:
+                waiter.cancel()
+
+    def _pass(self) -> set[tuple[str, str]]:
+        """Expire leases and re-queue due retries, then claim round-robin across
+        profiles. Returns the profiles whose DB this pass wrote."""
+        with self._lock:
+            queues = sorted(self._queues)
+        active = []
+        dirty: set[tuple[str, str]] = set()
+        for user_id, profile_id in queues:
+            set_current_user_id(user_id)
+            set_current_profile_id(profile_id)
+            try:
+                has_work, changed = _prepare_queue()
+            except Exception as e:
+                logger.warning(f"[ModalQueue] Skipping {user_id}/{profile_id}: {e}")
+                continue
+            if changed:
+                dirty.add((user_id, profile_id))
+            if has_work:
+                active.append((user_id, profile_id))
+            else:
+                with self._lock:
+                    self._queues.discard((user_id, profile_id))
+
+        launched = True
+        while launched:
+            launched = False
+            for user_id, profile_id in active:
+                set_current_user_id(user_id)
+                set_current_profile_id(profile_id)
+                if _launch_next(user_id) is not None:
+                    launched = True
+                    dirty.add((user_id, profile_id))
+        return dirty
+
+
+_dispatcher = _Dispatcher()
+
+
+async def start_modal_queue():
+    """Start the dispatcher loop. Called from app startup."""
+    _dispatcher.start()
+    logger.info(
+        f"[ModalQueue] Dispatcher started (concurrency={MODAL_QUEUE_CONCURRENCY}, "
+        f"per_user={MODAL_QUEUE_PER_USER_CONCURRENCY})"
     )
 
-    succeeded = sum(1 for r in results if isinstance(r, dict) and r.get("success"))
+
+async def stop_modal_queue():
+    """Stop the dispatcher loop. Leases of tasks still running lapse and are retried."""
+    await _dispatcher.stop()
+    logger.info("[ModalQueue] Dispatcher stopped")
+
+
+async def process_modal_queue() -> dict:
+    """
+    Process pending tasks in the current profile's modal_tasks queue.
+
+    Called on the user's first session init for recovery. Claims as many
+    tasks as the concurrency caps allow, refilling as they finish, and returns
+    once the queue is empty or every slot is held by other work. The profile is
+    handed to the dispatcher loop either way, so retries and anything left
+    behind are picked up later.
+
+    Returns summary of processed tasks.
+    """
+    user_id = get_current_user_id()
+    _dispatcher.watch(user_id, get_current_profile_id())
+
+    results = []
+    in_flight: set[asyncio.Task] = set()
+    while True:
+        _prepare_queue()
+        while (task := _launch_next(user_id)) is not None:
+            in_flight.add(task)
+        if not in_flight:
+            break
+        done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        results.extend(t.result() for t in done)
+
+    if not results:
+        return {"processed": 0, "succeeded": 0, "failed": 0}
+
+    succeeded = sum(1 for r in results if r.get("success"))
     failed = len(results) - succeeded
 
     logger.info(f"[ModalQueue] Processing complete: {succeeded} succeeded, {failed} failed")
@@ -97,63 +280,237 @@ async def process_modal_queue() -> dict:
     }
 
 
+def _sync_profile(user_id: str, profile_id: str) -> None:
+    """Sync a profile DB the dispatcher wrote (no request middleware does it)."""
+    try:
+        if not sync_db_to_r2_explicit(user_id, profile_id):
+            logger.warning(f"[ModalQueue] Profile sync failed for {user_id}/{profile_id}; retried next write")
+    except OSError as e:
+        logger.error(f"[ModalQueue] Failed to sync profile DB to R2: {e}")
+
+
+def _prepare_queue() -> tuple[bool, bool]:
+    """Fail lapsed leases and re-queue due retries.
+
+    Returns (the queue has work, rows were changed)."""
+    changed = check_stale_tasks() + check_and_retry_failed_tasks() > 0
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT 1 FROM modal_tasks
+            WHERE status IN ('pending', 'running')
+            OR (status = 'failed' AND retry_count < ?)
+            LIMIT 1
+        """, (MAX_RETRY_COUNT,))
+        return cursor.fetchone() is not None, changed
+
+
+def _launch_next(user_id: str) -> asyncio.Task | None:
+    """Take a slot and claim the oldest pending task; None if either is unavailable."""
+    if not _dispatcher.acquire(user_id):
+        return None
+    try:
+        task_info = _claim_task()
+    except Exception:
+        _dispatcher.release(user_id)
+        raise
+    if task_info is None:
+        _dispatcher.release(user_id)
+        return None
+
+    profile_id = get_current_profile_id()
+
+    async def run() -> dict:
+        try:
+            return await _process_single_task(task_info)
+        finally:
+            _dispatcher.release(user_id)
+            _dispatcher.kick()
+            await asyncio.to_thread(_sync_profile, user_id, profile_id)
+
+    task = asyncio.create_task(run())
+    _dispatcher.track(task)
+    return task
+
+
+def _claim_task() -> dict | None:
+    """Mark the oldest pending task running and lease it to a fresh owner token."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE modal_tasks
+            SET status = 'running', started_at = CURRENT_TIMESTAMP
+            WHERE id = (
+                SELECT id FROM modal_tasks WHERE status = 'pending'
+                ORDER BY created_at ASC, id ASC LIMIT 1
+            ) AND status = 'pending'
+            RETURNING id, task_type, params, raw_clip_id, project_id, game_id
+        """)
+        task = cursor.fetchone()
+        if task is None:
+            return None
+        lease_owner = uuid.uuid4().hex
+        cursor.execute("""
+            INSERT OR REPLACE INTO modal_task_leases (task_id, owner, leased_until, heartbeat_at)
+            VALUES (?, ?, datetime('now', ? || ' seconds'), CURRENT_TIMESTAMP)
+        """, (task['id'], lease_owner, f'+{MODAL_TASK_LEASE_SECONDS}'))
+        conn.commit()
+
+    return {
+        "task_id": task['id'],
+        "task_type": task['task_type'],
+        "params": json.loads(task['params']),
+        "raw_clip_id": task['raw_clip_id'],
+        "project_id": task['project_id'],
+        "game_id": task['game_id'],
+        "lease_owner": lease_owner,
+    }
+
+
 async def _process_single_task(task_info: dict) -> dict:
-    """Process a single task from the queue."""
+    """Run a claimed task's handler, heartbeating its lease, and record the outcome."""
     task_id = task_info["task_id"]
     task_type = task_info["task_type"]
+    lease_owner = task_info["lease_owner"]
 
-    try:
+    handler = _TASK_HANDLERS.get(task_type)
+    if handler is None:
         logger.warning(f"[ModalQueue] Unknown task type: {task_type}")
-        _mark_task_failed(task_id, f"Unknown task type: {task_type}")
+        # Not retried: a retry would find the same registry.
+        _finish_task(task_id, lease_owner, error=f"Unknown task type: {task_type}", retryable=False)
         return {"success": False, "task_id": task_id, "error": "Unknown task type"}
 
+    heartbeat = asyncio.create_task(_heartbeat(task_id, lease_owner))
+    try:
+        result = await handler(task_info)
     except Exception as e:
         logger.error(f"[ModalQueue] Task {task_id} failed with exception: {e}")
-        _mark_task_failed(task_id, str(e))
+        _finish_task(task_id, lease_owner, error=str(e))
         return {"success": False, "task_id": task_id, "error": str(e)}
-
-
-def _mark_task_failed(task_id: int, error: str):
-    """Mark a task as failed in the database."""
+    finally:
+        heartbeat.cancel()
+
+    if not _finish_task(task_id, lease_owner, result=result):
+        return {"success": False, "task_id": task_id, "error": "Lease lost"}
+    return {"success": True, "task_id": task_id}
+
+
+async def _heartbeat(task_id: int, lease_owner: str):
+    """Extend the lease every MODAL_TASK_HEARTBEAT_SECONDS until cancelled or lost."""
+    while True:
+        await asyncio.sleep(MODAL_TASK_HEARTBEAT_SECONDS)
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                # Lease bookkeeping is local-only: no R2 sync per heartbeat.
+                cursor.execute_local("""
+                    UPDATE modal_task_leases
+                    SET leased_until = datetime('now', ? || ' seconds'),
+                        heartbeat_at = CURRENT_TIMESTAMP
+                    WHERE task_id = ? AND owner = ?
+                """, (f'+{MODAL_TASK_LEASE_SECONDS}', task_id, lease_owner))
+                renewed = cursor.rowcount > 0
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"[ModalQueue] Heartbeat for task {task_id} failed: {e}")
+            continue
+        if not renewed:
+            logger.warning(f"[ModalQueue] Task {task_id} lost its lease")
+            return
+
+
+def _finish_task(
+    task_id: int,
+    lease_owner: str,
+    result: dict | None = None,
+    error: str | None = None,
+    retryable: bool = True,
+) -> bool:
+    """Record a task's outcome if its lease is still ours; False if the lease was lost.
+
+    A task whose lease lapsed has already been failed (and possibly retried by
+    another claim), so its late outcome is dropped rather than overwriting that.
+    """
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             UPDATE modal_tasks
-            SET status = 'failed', completed_at = CURRENT_TIMESTAMP, error = ?
-            WHERE id = ?
-        """, (error, task_id))
+            SET status = ?, completed_at = CURRENT_TIMESTAMP, result = ?, error = ?,
+                retry_count = CASE WHEN ? THEN retry_count ELSE MAX(retry_count, ?) END
+            WHERE id = ? AND status = 'running'
+            AND EXISTS (SELECT 1 FROM modal_task_leases WHERE task_id = ? AND owner = ?)
+        """, (
+            'failed' if error is not None else 'complete',
+            json.dumps(result) if result is not None else None,
+            error,
+            retryable,
+            MAX_RETRY_COUNT,
+            task_id,
+            task_id,
+            lease_owner,
+        ))
+        finished = cursor.rowcount > 0
+        cursor.execute(
+            "DELETE FROM modal_task_leases WHERE task_id = ? AND owner = ?",
+            (task_id, lease_owner),
+        )
         conn.commit()
+    if not finished:
+        logger.warning(f"[ModalQueue] Task {task_id} finished after losing its lease; outcome dropped")
+    return finished
 
 
 def check_stale_tasks() -> int:
     """
-    Mark tasks stuck in 'running' for > STALE_TASK_TIMEOUT_MINUTES as 'failed'.
+    Mark running tasks whose lease has lapsed as 'failed'.
+
+    Rows claimed before leases existed have no lease row; those fall back to
+    the old rule, running for > STALE_TASK_TIMEOUT_MINUTES.
 
     Returns the number of tasks timed out.
     """
     with get_db_connection() as conn:
         cursor = conn.cursor()
+        cursor.execute("""
+            UPDATE modal_tasks
+            SET status = 'failed',
+                completed_at = CURRENT_TIMESTAMP,
+                error = 'Lease expired'
+            WHERE status = 'running'
+            AND id IN (SELECT task_id FROM modal_task_leases WHERE leased_until < datetime('now'))
+        """)
+        stale_count = cursor.rowcount
         cursor.execute(f"""
             UPDATE modal_tasks
             SET status = 'failed',
                 completed_at = CURRENT_TIMESTAMP,
                 error = 'Timed out after {STALE_TASK_TIMEOUT_MINUTES} minutes'
             WHERE status = 'running'
+            AND id NOT IN (SELECT task_id FROM modal_task_leases)
             AND started_at < datetime('now', '-{STALE_TASK_TIMEOUT_MINUTES} minutes')
         """)
-        stale_count = cursor.rowcount
+        stale_count += cursor.rowcount
         if stale_count > 0:
+            cursor.execute("""
+                DELETE FROM modal_task_leases
+                WHERE task_id NOT IN (SELECT id FROM modal_tasks WHERE status = 'running')
+            """)
             conn.commit()
             logger.warning(f"[ModalQueue] Timed out {stale_count} stale running task(s)")
         return stale_count
 
 
+def _retry_backoff_seconds(retry_count: int) -> int:
+    return min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_BASE_SECONDS * 4 ** retry_count)
+
+
 def check_and_retry_failed_tasks() -> int:
     """
     Auto-retry failed tasks with retry_count < MAX_RETRY_COUNT.
 
-    Respects exponential backoff: waits RETRY_BACKOFF_SECONDS[retry_count]
-    after failure before retrying.
+    Respects exponential backoff: waits _retry_backoff_seconds(retry_count)
+    after failure before retrying. Runs on every dispatcher pass, so a failed
+    task comes back on its own once its backoff has passed.
 
     Returns the number of tasks reset to 'pending'.
     """
@@ -168,14 +525,13 @@ def check_and_retry_failed_tasks() -> int:
         candidates = cursor.fetchall()
 
         for task in candidates:
-            retry_count = task['retry_count']
-            backoff_secs = RETRY_BACKOFF_SECONDS[min(retry_count, len(RETRY_BACKOFF_SECONDS) - 1)]
+            backoff_secs = _retry_backoff_seconds(task['retry_count'])
             cursor.execute("""
                 UPDATE modal_tasks
                 SET status = 'pending', retry_count = retry_count + 1,
                     error = NULL, started_at = NULL, completed_at = NULL
                 WHERE id = ? AND status = 'failed'
-                AND completed_at < datetime('now', ? || ' seconds')
+                AND completed_at <= datetime('now', ? || ' seconds')
             """, (task['id'], f'-{backoff_secs}'))
             if cursor.rowcount > 0:
                 retried += 1
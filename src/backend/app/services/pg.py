@@ -242,6 +242,7 @@ CREATE INDEX IF NOT EXISTS idx_segments_acquired ON user_segments(acquired_at);
 CREATE INDEX IF NOT EXISTS idx_segments_origin ON user_segments(origin);
 CREATE INDEX IF NOT EXISTS idx_segments_referrer ON user_segments(referrer_id);
 CREATE INDEX IF NOT EXISTS idx_segments_last_active ON user_segments(last_active_at DESC NULLS LAST);
+CREATE INDEX IF NOT EXISTS idx_segments_last_active_user ON user_segments(last_active_at DESC, user_id DESC);
 CREATE INDEX IF NOT EXISTS idx_segments_acquired_origin ON user_segments(acquired_at, origin);
 
 -- T5770: per-user per-day engaged-usage buckets. Complements the all-time
@@ -267,6 +268,64 @@ CREATE INDEX IF NOT EXISTS idx_actions_action ON user_actions(action);
 CREATE INDEX IF NOT EXISTS idx_actions_action_user ON user_actions(action, user_id);
 CREATE INDEX IF NOT EXISTS idx_actions_platform ON user_actions(platform);
 
+-- Per-user action counts summed over platforms, and distinct users per action,
+-- for the admin user list. Kept exact by trg_user_actions_rollup on every
+-- user_actions row write (analytics writers, account deletion, fixtures);
+-- migration v024 rebuilds both from user_actions. TRUNCATE bypasses it.
+CREATE TABLE IF NOT EXISTS user_action_rollup (
+    user_id   TEXT    NOT NULL,
+    action    TEXT    NOT NULL,
+    count     INTEGER NOT NULL DEFAULT 0,
+    platforms INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, action)
+);
+CREATE TABLE IF NOT EXISTS user_action_totals (
+    action TEXT PRIMARY KEY,
+    users  INTEGER NOT NULL DEFAULT 0
+);
+CREATE OR REPLACE FUNCTION user_actions_rollup() RETURNS trigger AS $$
+DECLARE
+    n INTEGER;
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.user_id = OLD.user_id AND NEW.action = OLD.action THEN
+        IF NEW.count <> OLD.count THEN
+            UPDATE user_action_rollup SET count = count + NEW.count - OLD.count
+            WHERE user_id = NEW.user_id AND action = NEW.action;
+        END IF;
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE user_action_rollup SET count = count - OLD.count, platforms = platforms - 1
+        WHERE user_id = OLD.user_id AND action = OLD.action
+        RETURNING platforms INTO n;
+        IF n = 0 THEN
+            DELETE FROM user_action_rollup WHERE user_id = OLD.user_id AND action = OLD.action;
+            UPDATE user_action_totals SET users = users - 1 WHERE action = OLD.action;
+        END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO user_action_rollup AS r (user_id, action, count, platforms)
+        VALUES (NEW.user_id, NEW.action, NEW.count, 1)
+        ON CONFLICT (user_id, action)
+        DO UPDATE SET count = r.count + EXCLUDED.count, platforms = r.platforms + 1
+        RETURNING platforms INTO n;
+        IF n = 1 THEN
+            INSERT INTO user_action_totals AS t (action, users) VALUES (NEW.action, 1)
+            ON CONFLICT (action) DO UPDATE SET users = t.users + 1;
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_user_actions_rollup') THEN
+        CREATE TRIGGER trg_user_actions_rollup
+            AFTER INSERT OR UPDATE OR DELETE ON user_actions
+            FOR EACH ROW EXECUTE FUNCTION user_actions_rollup();
+    END IF;
+END $$;
+
 CREATE TABLE IF NOT EXISTS daily_counters (
     counter_date DATE NOT NULL DEFAULT CURRENT_DATE,
     origin_type TEXT NOT NULL DEFAULT 'all',
@@ -361,6 +420,47 @@ CREATE TABLE IF NOT EXISTS credit_reservations (
 );
 CREATE INDEX IF NOT EXISTS idx_credit_reservations_user ON credit_reservations(user_id);
 
+-- Per-user running totals of credit_transactions for the admin panel and the
+-- Stripe reconciliation, so neither has to group the whole ledger. Written in
+-- the same transaction as the ledger row by services/credit_ledger.py;
+-- credit_ledger.check_user_totals verifies it against the ledger and, with
+-- repair=True, re-derives drifted rows (_rewrite_totals).
+-- credits_spent excludes admin_set rows; purchase_amounts/purchase_refs list the
+-- stripe_purchase grants (amount, PaymentIntent id) in ledger order.
+CREATE TABLE IF NOT EXISTS credit_user_totals (
+    user_id           TEXT PRIMARY KEY,
+    credits_spent     BIGINT      NOT NULL DEFAULT 0,
+    credits_purchased BIGINT      NOT NULL DEFAULT 0,
+    purchase_amounts  INTEGER[]   NOT NULL DEFAULT '{}',
+    purchase_refs     TEXT[]      NOT NULL DEFAULT '{}',
+    updated_at        TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Admin bulk update emails: one job row per bulk send, one outbox row per
+-- recipient, drained by services/email_outbox.py. status is pending -> sending
+-- (leased until leased_until) -> sent | failed; an expired lease is reclaimed.
+CREATE TABLE IF NOT EXISTS admin_email_jobs (
+    job_id        TEXT PRIMARY KEY,
+    admin_user_id TEXT        NOT NULL,
+    subject       TEXT        NOT NULL,
+    body_html     TEXT        NOT NULL,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE TABLE IF NOT EXISTS admin_email_outbox (
+    id           BIGSERIAL PRIMARY KEY,
+    job_id       TEXT        NOT NULL REFERENCES admin_email_jobs(job_id) ON DELETE CASCADE,
+    user_id      TEXT        NOT NULL,
+    email        TEXT,
+    status       TEXT        NOT NULL DEFAULT 'pending',
+    attempts     INTEGER     NOT NULL DEFAULT 0,
+    error        TEXT,
+    leased_until TIMESTAMPTZ,
+    updated_at   TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_admin_email_outbox_job ON admin_email_outbox(job_id, id);
+CREATE INDEX IF NOT EXISTS idx_admin_email_outbox_open
+    ON admin_email_outbox(id) WHERE status IN ('pending', 'sending');
+
 -- The cutover gate (T5840 4a). One row (id=1). ready_at IS NULL until an admin
 -- confirms the backfill report shows zero drift; credit_ledger mutations 503
 -- until then. Reads are never gated.
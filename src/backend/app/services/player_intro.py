@@ -36,30 +36,34 @@ Text sourcing (seam-critical — see intro_card_geometry's mapping note):
     field_values[field] (omit+log if blank), styling = text_elements[field].
 """
 
+from __future__ import annotations
+
 import hashlib
 import json
 import logging
-import os
 import subprocess
 import tempfile
 from pathlib import Path
 
-import numpy as np
-from PIL import Image
-
 from app.schemas import TextSpec
+from app.services.card_cache import get_or_build as _get_or_build_cached
 from app.services.ffmpeg_concat import probe_media as _probe_media
 from app.services.ffmpeg_concat import run as _run
 from app.services.intro_card_geometry import MOTION, STAGGER_ORDER, aspect_key, band_kind, geometry_for, treatment_for
 from app.services.intro_card_geometry import layout as compute_layout
 from app.services.intro_cards import derive_composition
 from app.services.text_render import render_text_layer_cropped
+from app.utils.lazy_import import lazy_module
 
 logger = logging.getLogger(__name__)
 
+# numpy/Pillow are imported on the first card build, not at app start.
+np = lazy_module("numpy")
+Image = lazy_module("PIL.Image")
+
 # One card per (content hash x probe params); built once per unique key and reused
-# across download requests. System temp dir (survives in-process, cheap to rebuild
-# on a cold start), atomic-renamed so concurrent callers never read a partial file.
+# across download requests and workers (card_cache: single-flight builds, LRU-trimmed
+# by bytes). System temp dir (survives in-process, cheap to rebuild on a cold start).
 _CARD_CACHE_DIR: Path = Path(tempfile.gettempdir()) / "rb_intro_cards"
 
 # Bump whenever the RENDERER (filtergraph, defaults, motion wiring) changes so
@@ -594,9 +598,10 @@ def _get_or_build_card(
     card: dict, field_values: dict, image_path: str | None, info: dict,
     report: dict | None = None,
 ) -> str | None:
-    """Return a cached card path for these inputs, building it if absent. Atomic
-    rename so concurrent callers never read a partial file. Returns None on any
-    failure (never raises).
+    """Return a cached card path for these inputs, building it if absent. Goes
+    through the shared card cache, so concurrent callers for the same card wait for
+    ONE build and never read a partial file. Returns None on any failure (never
+    raises).
 
     `report`: OPTIONAL out-dict. On a SIGNAL-terminated render (an OOM/SIGKILL,
     returncode < 0) it is set `report["degraded_reason"] = INTRO_DEGRADED_KILLED`
@@ -621,15 +626,12 @@ def _get_or_build_card(
         return None
 
     key = _content_hash(card, field_values, image_path, info, composition, aspect, elements)
-    card_path = _CARD_CACHE_DIR / f"card_{key}.mp4"
-    if card_path.exists():
-        return str(card_path)
-
-    tmp_card = str(card_path) + ".tmp"
     try:
-        _build_card(card, field_values, image_path, info, tmp_card)
-        os.replace(tmp_card, str(card_path))
-        return str(card_path)
+        return _get_or_build_cached(
+            _CARD_CACHE_DIR, key,
+            lambda tmp_card: _build_card(card, field_values, image_path, info, tmp_card),
+            namespace="intro",
+        )
     except Exception as e:
         stderr = getattr(e, "stderr", None)
         detail = stderr[-600:] if isinstance(stderr, str) else str(e)
@@ -650,10 +652,6 @@ def _get_or_build_card(
                 report["degraded_reason"] = INTRO_DEGRADED_KILLED
         else:
             logger.error(f"[PlayerIntro] card build failed: {detail}", exc_info=not stderr)
-        try:
-            os.remove(tmp_card)
-        except OSError:
-            pass
         return None
 
 
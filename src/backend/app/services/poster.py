@@ -86,17 +86,117 @@ def _probe_duration(source: str) -> float | None:
         return None
 
 
-def extract_clearest_frame_jpeg(
-    source: str, output_path: str, window: tuple[float, float] | None = None,
-    resize_width: int | None = None, jpeg_quality: int = 3
+# Clearest-frame scoring modes. LAPLACIAN scores sharpness directly (variance of
+# the Laplacian over the luma plane -- blur and defocus flatten second
+# derivatives). JPEG_SIZE reproduces the original heuristic (the candidate that
+# JPEG-encodes largest), kept for parity checks and as an escape hatch.
+SCORE_LAPLACIAN = "laplacian"
+SCORE_JPEG_SIZE = "jpeg_size"
+
+
+def _jpeg_quality_percent(jpeg_quality: int) -> int:
+    """ffmpeg's mjpeg `q:v` (1 best .. 31 worst) -> an IJG 0-100 quality for the
+    in-process encoder, on the scale the callers already assume (3=~70%,
+    2=~80%, 1=~90%)."""
+    return max(5, min(95, 100 - 10 * int(jpeg_quality)))
+
+
+def _split_ppm_stream(data: bytes) -> list:
+    """Split ffmpeg's `image2pipe -c:v ppm` output into RGB ndarrays (H, W, 3)."""
+    import numpy as np
+
+    frames = []
+    pos = 0
+    while pos < len(data):
+        tokens: list[bytes] = []
+        while len(tokens) < 4:
+            while data[pos:pos + 1].isspace():
+                pos += 1
+            end = pos
+            while end < len(data) and not data[end:end + 1].isspace():
+                end += 1
+            tokens.append(data[pos:end])
+            pos = end
+        pos += 1  # the single whitespace byte that ends the header
+        if tokens[0] != b"P6" or tokens[3] != b"255":
+            raise ValueError(f"unexpected PPM header {tokens!r}")
+        w, h = int(tokens[1]), int(tokens[2])
+        size = w * h * 3
+        if pos + size > len(data):
+            raise ValueError("truncated PPM frame")
+        frames.append(np.frombuffer(data, dtype=np.uint8, count=size, offset=pos).reshape(h, w, 3))
+        pos += size
+    return frames
+
+
+def _decode_candidate_frames(source: str, positions: list[float], width: int | None) -> list:
+    """Decode ONE frame at each position with a SINGLE ffmpeg process.
+
+    Each position is its own input with an input-side `-ss` (a ranged read for a
+    faststart URL, same as the old per-candidate spawns), trimmed to one frame
+    and concatenated into a PPM pipe -- so N candidates cost one process and no
+    JPEG encodes. `width` downscales in the same graph. Returns the frames in
+    position order; a position past the end yields no frame, so callers must
+    check the count. Raises on ffmpeg failure (the caller falls back)."""
+    cmd = ["ffmpeg", "-v", "error"]
+    for ts in positions:
+        cmd += ["-ss", f"{ts:.3f}", "-i", source]
+    scale = f",scale={width}:-1" if width else ""
+    chains = [
+        f"[{i}:v]trim=end_frame=1,setpts=PTS-STARTPTS{scale}[c{i}]"
+        for i in range(len(positions))
+    ]
+    refs = "".join(f"[c{i}]" for i in range(len(positions)))
+    graph = ";".join(chains) + f";{refs}concat=n={len(positions)}:v=1:a=0[out]"
+    cmd += [
+        "-filter_complex", graph, "-map", "[out]",
+        # concat restarts every segment at PTS 0; the default CFR muxer sync
+        # would drop the "duplicate" timestamps and return only a couple of frames.
+        # -vsync, not its -fps_mode successor: both the ffmpeg 5.1 production
+        # image and newer builds accept it.
+        "-vsync", "passthrough",
+        "-f", "image2pipe", "-c:v", "ppm", "pipe:1",
+    ]
+    out = subprocess.run(cmd, capture_output=True, check=True, timeout=60)
+    return _split_ppm_stream(out.stdout)
+
+
+def _frame_score(rgb, scoring: str, quality_percent: int) -> float:
+    import cv2
+
+    if scoring == SCORE_JPEG_SIZE:
+        ok, buf = cv2.imencode(".jpg", rgb[:, :, ::-1], [cv2.IMWRITE_JPEG_QUALITY, quality_percent])
+        return float(len(buf)) if ok else -1.0
+    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+def _encode_jpeg(rgb, output_path: str, width: int | None, quality_percent: int) -> bool:
+    import cv2
+
+    h, w = rgb.shape[:2]
+    bgr = rgb[:, :, ::-1]
+    if width and width != w:
+        bgr = cv2.resize(bgr, (width, max(1, round(h * width / w))), interpolation=cv2.INTER_AREA)
+    ok, buf = cv2.imencode(".jpg", bgr, [cv2.IMWRITE_JPEG_QUALITY, quality_percent])
+    if not ok:
+        return False
+    Path(output_path).write_bytes(buf.tobytes())
+    return True
+
+
+def extract_clearest_frame_jpegs(
+    source: str, outputs: list[tuple[str, int | None]],
+    window: tuple[float, float] | None = None,
+    jpeg_quality: int = 3, scoring: str = SCORE_LAPLACIAN,
 ) -> bool:
-    """Pick the CLEAREST frame among a handful of samples (largest JPEG wins).
+    """Pick the CLEAREST frame among a handful of samples and write it once per
+    `(output_path, resize_width)` in `outputs` (width None = native size).
 
-    Heuristic: JPEG-encode one frame at each sampled position and keep the LARGEST
-    encoding - encoded size tracks detail/sharpness (motion blur and defocus
-    compress away detail), so the biggest JPEG is the crispest candidate. Cost:
-    ~5 fast seeks + 5 single-frame encodes (faststart MP4s make remote seeks
-    ranged reads), well under a second of CPU - no ML, no full decode.
+    All candidates are decoded by ONE ffmpeg process (`_decode_candidate_frames`),
+    scored in-process (`scoring`: SCORE_LAPLACIAN sharpness, or SCORE_JPEG_SIZE for
+    the original largest-JPEG heuristic), and only the winner is encoded -- at each
+    requested width, from a single decode at the largest of them.
 
     `window=(start, end)` restricts sampling to that ABSOLUTE time span (seconds
     on the final timeline) - used by the reel poster policy (T5090) to sample only
@@ -104,52 +204,59 @@ def extract_clearest_frame_jpeg(
     across the whole clip (recap posters, T5180; legacy behavior). Falls back to
     the plain first frame when probing/sampling fails.
 
-    `resize_width` (pixels) scales the frame to a card-sized thumbnail (e.g. 480 for
-    home tiles); aspect ratio preserved. T5682: card-size thumbnails for faster TTFB.
-    `jpeg_quality` is ffmpeg's q:v (3=~70%, 2=~80%, 1=~90%; lower = smaller file).
-    Returns True when output_path holds a poster; never raises.
+    `jpeg_quality` is ffmpeg's q:v scale (3=~70%, 2=~80%, 1=~90%).
+    Returns True when every output path holds a poster; never raises.
     """
     if window is not None:
         start, end = window
         if not (end > start):
-            return extract_first_frame_jpeg(source, output_path)
+            return all([extract_first_frame_jpeg(source, path) for path, _w in outputs])
         span = end - start
         positions = [start + frac * span for frac in CANDIDATE_POSITIONS]
     else:
         duration = _probe_duration(source)
         if not duration or duration <= 0:
-            return extract_first_frame_jpeg(source, output_path)
+            return all([extract_first_frame_jpeg(source, path) for path, _w in outputs])
         positions = [duration * frac for frac in CANDIDATE_POSITIONS]
 
-    best_bytes: bytes | None = None
-    with tempfile.TemporaryDirectory() as tmp:
-        for i, ts in enumerate(positions):
-            cand = str(Path(tmp) / f"cand_{i}.jpg")
-            cmd = [
-                "ffmpeg", "-y",
-                "-ss", f"{ts:.3f}",
-                "-i", source,
-                "-frames:v", "1",
-            ]
-            if resize_width:
-                cmd.extend(["-vf", f"scale={resize_width}:-1"])
-            cmd.extend(["-q:v", str(jpeg_quality), cand])
-            try:
-                subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=30)
-            except Exception:
-                continue
-            p = Path(cand)
-            if p.exists() and p.stat().st_size > 0:
-                data = p.read_bytes()
-                if best_bytes is None or len(data) > len(best_bytes):
-                    best_bytes = data
-
-    if best_bytes is None:
-        return extract_first_frame_jpeg(
-            source, output_path, resize_width=resize_width, jpeg_quality=jpeg_quality
-        )
-    Path(output_path).write_bytes(best_bytes)
-    return True
+    widths = [w for _p, w in outputs]
+    decode_width = None if any(w is None for w in widths) else max(widths)
+    quality = _jpeg_quality_percent(jpeg_quality)
+
+    try:
+        frames = _decode_candidate_frames(source, positions, decode_width)
+        if len(frames) != len(positions):
+            # A short pick is not "the clearest frame" -- it is whichever
+            # candidates survived, usually the opening ones.
+            logger.info(
+                f"[Poster] decoded {len(frames)}/{len(positions)} candidates; "
+                f"falling back to first frame"
+            )
+        else:
+            best = max(frames, key=lambda f: _frame_score(f, scoring, quality))
+            if all([_encode_jpeg(best, path, w, quality) for path, w in outputs]):
+                return True
+    except Exception as e:
+        logger.info(f"[Poster] single-pass candidate scoring failed: {e}")
+
+    return all([
+        extract_first_frame_jpeg(source, path, resize_width=w, jpeg_quality=jpeg_quality)
+        for path, w in outputs
+    ])
+
+
+def extract_clearest_frame_jpeg(
+    source: str, output_path: str, window: tuple[float, float] | None = None,
+    resize_width: int | None = None, jpeg_quality: int = 3,
+    scoring: str = SCORE_LAPLACIAN,
+) -> bool:
+    """Single-output `extract_clearest_frame_jpegs`: the clearest sampled frame
+    to `output_path`, scaled to `resize_width` (pixels, aspect preserved; e.g. 480
+    for home tiles, T5682) when given. Never raises."""
+    return extract_clearest_frame_jpegs(
+        source, [(output_path, resize_width)], window=window,
+        jpeg_quality=jpeg_quality, scoring=scoring,
+    )
 
 
 def extract_first_frame_jpeg(
@@ -922,6 +1029,7 @@ def ensure_reel_card_poster(user_id: str, filename_basename: str) -> str | None:
 def ensure_recap_poster(
     recap_key: str, recap_poster_key: str,
     resize_width: int | None = None, jpeg_quality: int = 3,
+    card_poster_key: str | None = None,
 ) -> bool:
     """Generate-on-first-request poster for a game recap (T5180).
 
@@ -940,6 +1048,12 @@ def ensure_recap_poster(
     (`ensure_recap_card_poster`) instead of calling this with a resize -- do not
     resize this shared object.
 
+    `card_poster_key`: when this call has to generate the poster and that
+    480px card object (`recap_card_poster_r2_key`) is also absent, the same
+    clearest-frame pick is encoded at card size and uploaded alongside -- one
+    recap decode instead of a second one on the first tile request. Best-effort:
+    a card failure never fails the full-size poster.
+
     Idempotent + overwrite-safe:
       - poster already cached -> True without re-encoding (cheap HEAD);
       - recap source missing (reclaimed / never generated) -> False (caller 404s,
@@ -962,15 +1076,39 @@ def ensure_recap_poster(
         if not recap_url:
             logger.info(f"[RecapPoster] presign failed for {recap_key}; skipping")
             return False
+        with_card = (
+            card_poster_key is not None
+            and r2_head_object_global(card_poster_key) is None
+        )
         with tempfile.TemporaryDirectory() as tmp:
             out_path = str(Path(tmp) / "recap_poster.jpg")
-            if not extract_clearest_frame_jpeg(recap_url, out_path,
-                                              resize_width=resize_width,
-                                              jpeg_quality=jpeg_quality):
+            card_path = str(Path(tmp) / "recap_card.jpg")
+            if with_card:
+                extracted = extract_clearest_frame_jpegs(
+                    recap_url, [(out_path, resize_width), (card_path, 480)],
+                    jpeg_quality=jpeg_quality,
+                )
+            else:
+                extracted = extract_clearest_frame_jpeg(
+                    recap_url, out_path, resize_width=resize_width, jpeg_quality=jpeg_quality,
+                )
+            if not extracted:
                 logger.info(f"[RecapPoster] extraction failed for {recap_key}")
                 return False
             data = Path(out_path).read_bytes()
             dims = _jpeg_dimensions(out_path)
+            if with_card:
+                card_data = Path(card_path).read_bytes()
+                card_dims = _jpeg_dimensions(card_path)
+        if with_card:
+            card_metadata = {"width": card_dims[0], "height": card_dims[1]} if card_dims else None
+            if upload_bytes_to_r2_global(
+                card_poster_key, card_data, fast=True,
+                content_type="image/jpeg", metadata=card_metadata,
+            ):
+                logger.info(f"[RecapPoster] stored card {card_poster_key} ({len(card_data)} bytes)")
+            else:
+                logger.info(f"[RecapPoster] R2 upload failed for card {card_poster_key}")
         metadata = {"width": dims[0], "height": dims[1]} if dims else None
         if not upload_bytes_to_r2_global(
             recap_poster_key, data, fast=True,
@@ -1385,15 +1523,23 @@ def invalidate_draft_poster(project_id: int) -> None:
     project's clip composition (add/remove/reorder) -- the draft's first clip,
     and thus its thumbnail, may have changed. NO reactive watcher.
 
+    Also drops the local poster byte cache entry: `get_draft_poster` serves a
+    fresh cached copy without touching R2, so deleting only the object would
+    keep the old first clip on the tile for up to POSTER_CACHE_TTL_SECONDS.
+
     Runs in the CURRENT profile context. Best effort: `delete_from_r2` already
     swallows R2 errors, and this wrapper never lets an unexpected error escape,
     so poster invalidation can NEVER fail the parent clip action.
     """
-    from ..storage import delete_from_r2
+    from ..storage import delete_from_r2, r2_key
     from ..user_context import get_current_user_id
+    from . import poster_cache
 
     try:
-        delete_from_r2(get_current_user_id(), draft_poster_rel_path(project_id))
+        user_id = get_current_user_id()
+        rel_path = draft_poster_rel_path(project_id)
+        poster_cache.invalidate(r2_key(user_id, rel_path))
+        delete_from_r2(user_id, rel_path)
     except Exception as e:
         logger.info(f"[DraftPoster] invalidation failed for project {project_id}: {e}")
 
@@ -0,0 +1,326 @@
+"""
+Local poster byte cache keyed by R2 object key + ETag.
+
+Every poster proxy (share unfurls, My Reels tiles, draft tiles) used to pay at
+least one R2 round trip per request: shares HEADed the object and then opened a
+fresh httpx client for the GET; downloads/projects refetched through the pooled
+client every time. Posters are small (~25-80KB) and effectively immutable at
+their deterministic keys, so this module keeps their bytes locally:
+
+  * an in-process LRU bounded by total bytes (POSTER_CACHE_MEMORY_BYTES), in
+    front of
+  * an on-disk cache in the system temp dir (POSTER_CACHE_DISK_BYTES), so a
+    machine wake or a second worker does not refetch the whole working set.
+
+An entry younger than POSTER_CACHE_TTL_SECONDS is served with ZERO R2 round
+trips. An older entry is revalidated with a conditional GET (`If-None-Match`
+carrying the cached ETag) through the pooled `get_poster_r2_client`: a 304 only
+refreshes the validation time, a 200 replaces the bytes, a 404 evicts.
+
+Concurrent misses for the same key share ONE fetch (request coalescing): the
+first caller owns an in-flight future, later callers await it.
+
+Disk reads and writes run in a worker thread (`asyncio.to_thread`) so a slow
+temp dir never stalls the event loop. The directory is only scanned for
+trimming when a running byte estimate crosses the budget, not on every write.
+
+External-boundary failure choice: a non-200/304 R2 status raises
+PosterFetchError (the routers map it to their existing 404/502 responses); a
+broken disk cache is never fatal -- it is logged and the request falls back to
+memory + R2.
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+POSTER_CACHE_TTL_SECONDS = float(os.getenv("POSTER_CACHE_TTL_SECONDS", "300"))
+POSTER_CACHE_MEMORY_BYTES = int(os.getenv("POSTER_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+POSTER_CACHE_DISK_BYTES = int(os.getenv("POSTER_CACHE_DISK_BYTES", str(256 * 1024 * 1024)))
+
+_DISK_DIR: Path = Path(tempfile.gettempdir()) / "rb_poster_cache"
+# Trim down to this fraction of the budget, so a full cache is not rescanned on
+# every following write.
+_DISK_TRIM_TARGET = 0.9
+
+
+class PosterFetchError(Exception):
+    """R2 answered the poster GET with something other than 200/304."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"poster fetch failed: R2 status {status_code}")
+        self.status_code = status_code
+
+
+@dataclass
+class CachedPoster:
+    key: str
+    etag: str
+    body: bytes
+    validated_at: float
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        return now - self.validated_at < POSTER_CACHE_TTL_SECONDS
+
+    def matches(self, if_none_match: str | None) -> bool:
+        """True when the browser's cached copy is this exact object (-> 304)."""
+        return bool(if_none_match and self.etag and if_none_match == self.etag)
+
+
+_memory: "OrderedDict[str, CachedPoster]" = OrderedDict()
+_memory_bytes = 0
+_inflight: dict[str, asyncio.Task] = {}
+# Running estimate of the bytes under _DISK_DIR (None until the first scan).
+# Overwrites are counted twice, which only brings the next scan forward.
+_disk_bytes: int | None = None
+_disk_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# In-process LRU
+# ---------------------------------------------------------------------------
+
+def _memory_get(key: str) -> CachedPoster | None:
+    entry = _memory.get(key)
+    if entry is not None:
+        _memory.move_to_end(key)
+    return entry
+
+
+def _memory_put(entry: CachedPoster) -> None:
+    global _memory_bytes
+    if len(entry.body) > POSTER_CACHE_MEMORY_BYTES:
+        return
+    _memory_drop(entry.key)
+    _memory[entry.key] = entry
+    _memory_bytes += len(entry.body)
+    while _memory_bytes > POSTER_CACHE_MEMORY_BYTES and _memory:
+        _, evicted = _memory.popitem(last=False)
+        _memory_bytes -= len(evicted.body)
+
+
+def _memory_drop(key: str) -> None:
+    global _memory_bytes
+    old = _memory.pop(key, None)
+    if old is not None:
+        _memory_bytes -= len(old.body)
+
+
+# ---------------------------------------------------------------------------
+# On-disk cache: <sha256(key)>.jpg + <sha256(key)>.json {key, etag, validated_at}
+# ---------------------------------------------------------------------------
+
+def _disk_paths(key: str) -> tuple[Path, Path]:
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return _DISK_DIR / f"{digest}.jpg", _DISK_DIR / f"{digest}.json"
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _disk_get(key: str) -> CachedPoster | None:
+    body_path, meta_path = _disk_paths(key)
+    try:
+        meta = json.loads(meta_path.read_text())
+        if meta.get("key") != key:
+            return None
+        body = body_path.read_bytes()
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"[PosterCache] unreadable disk entry for {key}: {e}")
+        return None
+    return CachedPoster(key, meta.get("etag", ""), body, float(meta.get("validated_at", 0)))
+
+
+def _disk_put(entry: CachedPoster) -> None:
+    body_path, meta_path = _disk_paths(entry.key)
+    meta = {"key": entry.key, "etag": entry.etag, "validated_at": entry.validated_at}
+    try:
+        _DISK_DIR.mkdir(parents=True, exist_ok=True)
+        # Body first: a reader that sees the new meta always finds matching bytes.
+        _atomic_write(body_path, entry.body)
+        _atomic_write(meta_path, json.dumps(meta).encode())
+        _disk_account(len(entry.body))
+    except OSError as e:
+        logger.warning(f"[PosterCache] disk write failed for {entry.key}: {e}")
+
+
+def _disk_touch(entry: CachedPoster) -> None:
+    """Persist a refreshed validated_at after a 304 (bytes unchanged)."""
+    _, meta_path = _disk_paths(entry.key)
+    meta = {"key": entry.key, "etag": entry.etag, "validated_at": entry.validated_at}
+    try:
+        if meta_path.exists():
+            _atomic_write(meta_path, json.dumps(meta).encode())
+    except OSError as e:
+        logger.warning(f"[PosterCache] disk touch failed for {entry.key}: {e}")
+
+
+def _disk_drop(key: str) -> None:
+    for path in _disk_paths(key):
+        path.unlink(missing_ok=True)
+
+
+def _disk_account(added: int) -> None:
+    """Add `added` bytes to the running estimate; scan + trim once it overflows."""
+    global _disk_bytes
+    with _disk_lock:
+        if _disk_bytes is not None:
+            _disk_bytes += added
+            if _disk_bytes <= POSTER_CACHE_DISK_BYTES:
+                return
+        _disk_bytes = _disk_trim()
+
+
+def _disk_trim() -> int:
+    """Delete least-recently-written bodies until the dir fits the trim target
+    (a fraction of POSTER_CACHE_DISK_BYTES). Returns the bytes left on disk."""
+    bodies = []
+    total = 0
+    for path in _DISK_DIR.glob("*.jpg"):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        bodies.append((st.st_mtime, st.st_size, path))
+        total += st.st_size
+    if total <= POSTER_CACHE_DISK_BYTES:
+        return total
+    target = POSTER_CACHE_DISK_BYTES * _DISK_TRIM_TARGET
+    for _, size, path in sorted(bodies):
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
+        total -= size
+        if total <= target:
+            break
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+async def _lookup(key: str) -> CachedPoster | None:
+    entry = _memory_get(key)
+    if entry is None:
+        entry = await asyncio.to_thread(_disk_get, key)
+        if entry is not None:
+            _memory_put(entry)
+    return entry
+
+
+async def _store(entry: CachedPoster) -> None:
+    _memory_put(entry)
+    await asyncio.to_thread(_disk_put, entry)
+
+
+async def peek(key: str) -> CachedPoster | None:
+    """A FRESH cached entry for `key`, or None. Never touches R2."""
+    entry = await _lookup(key)
+    if entry is not None and entry.is_fresh():
+        return entry
+    return None
+
+
+def invalidate(key: str) -> None:
+    """Forget `key` (memory + disk), e.g. after the object is overwritten."""
+    _memory_drop(key)
+    _disk_drop(key)
+
+
+def clear() -> None:
+    """Drop every entry (memory + disk). Used by tests."""
+    global _memory_bytes, _disk_bytes
+    _memory.clear()
+    _memory_bytes = 0
+    _disk_bytes = None
+    _inflight.clear()
+    if _DISK_DIR.exists():
+        for path in _DISK_DIR.iterdir():
+            path.unlink(missing_ok=True)
+
+
+async def _fetch(key: str, presign: Callable[[], str | None], cached: CachedPoster | None):
+    from app.storage import get_poster_r2_client
+
+    url = presign()
+    if not url:
+        return None
+    client = get_poster_r2_client()
+    if cached is not None and cached.etag:
+        resp = await client.get(url, headers={"If-None-Match": cached.etag})
+    else:
+        resp = await client.get(url)
+
+    now = time.time()
+    if resp.status_code == 304 and cached is not None:
+        cached.validated_at = now
+        _memory_put(cached)
+        await asyncio.to_thread(_disk_touch, cached)
+        return cached
+    if resp.status_code == 200:
+        entry = CachedPoster(key, resp.headers.get("etag", "") or "", resp.content, now)
+        await _store(entry)
+        return entry
+    if resp.status_code == 404:
+        _memory_drop(key)
+        await asyncio.to_thread(_disk_drop, key)
+    raise PosterFetchError(resp.status_code)
+
+
+async def get_poster(key: str, presign: Callable[[], str | None]) -> CachedPoster | None:
+    """Poster bytes for the R2 object `key`, from cache when possible.
+
+    `presign` returns a GET URL for `key` and is only called when R2 must be
+    contacted (miss or stale entry). Returns None when it yields no URL; raises
+    PosterFetchError on an R2 status other than 200/304.
+    """
+    cached = await _lookup(key)
+    if cached is not None and cached.is_fresh():
+        return cached
+
+    # The fetch is its own task, shielded by every waiter (the first included):
+    # a disconnecting client cancels only its own wait, never the others'.
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch(key, presign, cached))
+        _inflight[key] = task
+        task.add_done_callback(functools.partial(_fetch_done, key))
+    return await asyncio.shield(task)
+
+
+def _fetch_done(key: str, task: asyncio.Task) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        # Waiters re-raise it; mark retrieved so a fetch nobody waits for doesn't warn.
+        task.exception()
+
+
+def poster_response(entry: CachedPoster, if_none_match: str | None, cache_control: str):
+    """200 with the bytes, or 304 when the browser already has this ETag."""
+    from fastapi.responses import Response
+
+    headers = {"Cache-Control": cache_control}
+    if entry.etag:
+        headers["ETag"] = entry.etag
+    if entry.matches(if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="image/jpeg", headers=headers)
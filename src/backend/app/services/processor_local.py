@@ -234,6 +234,7 @@ class LocalGPUProcessor(VideoProcessor):
 
             # Import highlight rendering
             from ..ai_upscaler.keyframe_interpolator import KeyframeInterpolator
+            from ..keyframe_spline import HighlightTrack
 
             # Start FFmpeg process
             ffmpeg_cmd = [
@@ -262,6 +263,11 @@ class LocalGPUProcessor(VideoProcessor):
             )
 
             sorted_regions = sorted(highlight_regions, key=lambda r: r["start_time"])
+            # Each region's frames are splined in one vectorized call on entry.
+            region_tracks = [
+                HighlightTrack(r.get('keyframes', []), r["start_time"], r["end_time"], fps)
+                for r in sorted_regions
+            ]
 
             frame_idx = 0
             try:
@@ -274,16 +280,16 @@ class LocalGPUProcessor(VideoProcessor):
 
                     # Find active region
                     active_region = None
-                    for region in sorted_regions:
+                    active_track = None
+                    for region, track in zip(sorted_regions, region_tracks, strict=True):
                         if region["start_time"] <= current_time <= region["end_time"]:
                             active_region = region
+                            active_track = track
                             break
 
                     # Render highlight
                     if active_region:
-                        highlight = KeyframeInterpolator.interpolate_highlight(
-                            active_region['keyframes'], current_time
-                        )
+                        highlight = active_track.at(frame_idx)
                         if highlight is not None:
                             # T5250: exit fade-out envelope (shared spec) so this render
                             # path matches the editor preview + the primary export.
@@ -6,10 +6,26 @@ Projects are archived when the user clicks "Move to My Reels" (publish) and
 can be restored when the user clicks "Open Reel as Draft" from the gallery.
 
 Archive location: {user_id}/archive/{project_id}.msgpack
+
+Bulk archiving (archive_projects_bulk, used by archive_completed_projects at
+session init) instead packs many projects into one immutable segment object,
+{user_id}/archive/segments/{segment_id}.seg, and records each project's byte
+range in the profile DB's project_archive_index table. load_archive checks the
+index first (one ranged GET) and falls back to the per-project object.
+
+A segment loses a project when it is re-archived or deleted. Nothing deletes
+a segment inline: the session-init sweep (reclaim_archive_segments) compacts
+mostly-dead segments, syncs the profile DB, and only then deletes segments the
+synced index no longer references.
 """
 
 import logging
-from datetime import datetime
+import struct
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import msgpack
@@ -18,11 +34,15 @@ from app.database import (
     DB_SIZE_WARNING_THRESHOLD,
     get_database_path,
     get_db_connection,
+    sync_db_to_r2_explicit,
 )
+from app.profile_context import get_current_profile_id
 from app.queries import latest_working_clips_subquery
+from app.services import highlight_store
 from app.storage import (
     R2_BUCKET,
     R2_ENABLED,
+    delete_from_r2,
     get_r2_client,
     r2_key,
     upload_bytes_to_r2,
@@ -33,17 +53,116 @@ logger = logging.getLogger(__name__)
 
 ARCHIVE_VERSION = 2
 
+# Segment-packed blocks store working_clips / working_videos column-wise
+# ({"columns": [...], "data": [[col0 values], [col1 values], ...]}) and are
+# zlib-compressed: the same column names are not repeated per row, and runs of
+# similar values (version, sort_order, NULL crop_data) compress well.
+SEGMENT_ARCHIVE_VERSION = 3
+
+# A segment is closed once either cap is reached, so one slow PUT never
+# carries an unbounded payload and a ranged GET never lands in a huge object.
+SEGMENT_MAX_PROJECTS = 200
+SEGMENT_MAX_BYTES = 32 * 1024 * 1024
+
+# A segment whose live blocks fill less than this fraction of the object is
+# rewritten with just those blocks (reclaim_archive_segments).
+SEGMENT_COMPACT_LIVE_RATIO = 0.5
+
+# Unreferenced segments younger than this are left alone: a bulk archive in
+# another session uploads its segment before it commits the index rows.
+SEGMENT_DELETE_GRACE = timedelta(hours=1)
+
+# Segment layout: MAGIC | block... | msgpack footer {project_id: [offset, length]}
+# | 8-byte big-endian footer length. The DB index is authoritative; the footer
+# makes a segment self-describing so it can be re-indexed without the DB.
+_SEGMENT_MAGIC = b"RBSEG1\n"
+_FOOTER_LEN = struct.Struct(">Q")
+
+# Bounded LRU of compressed segment blocks, keyed by (user_id, r2 key, offset).
+# Segments are immutable, so a cached block never goes stale. Restore and the
+# poster/metadata paths re-read the same archive back to back; this spares
+# the repeat GET. Process-local, bounded by total bytes.
+_ARCHIVE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+_ARCHIVE_CACHE: "OrderedDict[tuple, bytes]" = OrderedDict()
+_archive_cache_bytes = 0
+_archive_cache_lock = threading.Lock()
+
 
 def _get_archive_r2_key(project_id: int) -> str:
     """Get the R2 key for a project's archive."""
     return f"archive/{project_id}.msgpack"
 
 
+def _get_segment_r2_key(segment_id: str) -> str:
+    """Get the R2 key for a bulk archive segment."""
+    return f"archive/segments/{segment_id}.seg"
+
+
 def _row_to_dict(row) -> dict[str, Any]:
     """Convert a sqlite3.Row to a dictionary. Binary columns stay as raw bytes for msgpack."""
     return {key: row[key] for key in row.keys()}
 
 
+def _cursor_to_columnar(cursor) -> dict[str, list]:
+    """Drain an executed cursor into {"columns", "data"} (one list per column).
+
+    Column names come from cursor.description so an empty result still
+    records the table shape."""
+    columns = [d[0] for d in cursor.description]
+    data: list[list] = [[] for _ in columns]
+    for row in cursor.fetchall():
+        for i, value in enumerate(row):
+            data[i].append(value)
+    return {"columns": columns, "data": data}
+
+
+def _columnar_to_rows(table: dict[str, list] | None) -> list[dict[str, Any]]:
+    """Inverse of _cursor_to_columnar: back to the row dicts restore expects."""
+    if not table:
+        return []
+    columns = table["columns"]
+    return [dict(zip(columns, values)) for values in zip(*table["data"])]
+
+
+def _clear_archive_cache() -> None:
+    """Drop every cached segment block (tests)."""
+    global _archive_cache_bytes
+    with _archive_cache_lock:
+        _ARCHIVE_CACHE.clear()
+        _archive_cache_bytes = 0
+
+
+def _archive_cache_get(key: tuple) -> bytes | None:
+    with _archive_cache_lock:
+        blob = _ARCHIVE_CACHE.get(key)
+        if blob is not None:
+            _ARCHIVE_CACHE.move_to_end(key)  # LRU touch
+        return blob
+
+
+def _archive_cache_drop(full_key: str) -> None:
+    """Drop every cached block of one segment object (it was deleted)."""
+    global _archive_cache_bytes
+    with _archive_cache_lock:
+        for key in [key for key in _ARCHIVE_CACHE if key[0] == full_key]:
+            _archive_cache_bytes -= len(_ARCHIVE_CACHE.pop(key))
+
+
+def _archive_cache_put(key: tuple, blob: bytes) -> None:
+    global _archive_cache_bytes
+    if len(blob) > _ARCHIVE_CACHE_MAX_BYTES:
+        return
+    with _archive_cache_lock:
+        previous = _ARCHIVE_CACHE.pop(key, None)
+        if previous is not None:
+            _archive_cache_bytes -= len(previous)
+        _ARCHIVE_CACHE[key] = blob
+        _archive_cache_bytes += len(blob)
+        while _archive_cache_bytes > _ARCHIVE_CACHE_MAX_BYTES:
+            _, evicted = _ARCHIVE_CACHE.popitem(last=False)  # evict least-recently-used
+            _archive_cache_bytes -= len(evicted)
+
+
 def archive_project(project_id: int, user_id: str | None = None) -> bool:
     """
     Archive a completed project to R2 as msgpack.
@@ -83,12 +202,18 @@ def archive_project(project_id: int, user_id: str | None = None) -> bool:
                 """, (project_id,))
                 working_clips_data = [_row_to_dict(row) for row in cursor.fetchall()]
 
-                # 3. Get all working_videos for this project (all versions)
+                # 3. Get all working_videos for this project (all versions).
+                # Split highlights are assembled into highlights_data so the
+                # archive carries the whole list, as it always has.
+                folded = highlight_store.project_highlight_blobs(cursor, project_id)
                 cursor.execute("""
                     SELECT * FROM working_videos WHERE project_id = ?
                     ORDER BY version
                 """, (project_id,))
                 working_videos_data = [_row_to_dict(row) for row in cursor.fetchall()]
+                for video in working_videos_data:
+                    if video["id"] in folded:
+                        video["highlights_data"] = folded[video["id"]]
 
                 # 4. Build archive
                 archive = {
@@ -123,6 +248,9 @@ def archive_project(project_id: int, user_id: str | None = None) -> bool:
                 clips_deleted = cursor.rowcount
                 cursor.execute("DELETE FROM working_videos WHERE project_id = ?", (project_id,))
                 videos_deleted = cursor.rowcount
+                # A re-publish supersedes any earlier segment copy: without the
+                # index row load_archive reads the per-project object just written.
+                cursor.execute("DELETE FROM project_archive_index WHERE project_id = ?", (project_id,))
 
                 conn.commit()
 
@@ -147,11 +275,397 @@ def archive_project(project_id: int, user_id: str | None = None) -> bool:
         return False
 
 
+def _encode_segment_block(project_data: dict[str, Any], clips: dict, videos: dict) -> bytes:
+    """Serialize one project's archive as a compressed columnar block."""
+    block = {
+        "version": SEGMENT_ARCHIVE_VERSION,
+        "archived_at": datetime.utcnow().isoformat() + "Z",
+        "project": project_data,
+        "working_clips": clips,
+        "working_videos": videos,
+    }
+    return zlib.compress(msgpack.packb(block, use_bin_type=True, default=str), 6)
+
+
+def _decode_segment_block(blob: bytes) -> dict[str, Any]:
+    """Decode a segment block into the same dict shape as a v2 archive, so
+    restore_project and the metadata/poster readers don't care where it came from."""
+    block = msgpack.unpackb(zlib.decompress(blob), raw=False)
+    return {
+        "version": block["version"],
+        "archived_at": block["archived_at"],
+        "project": block["project"],
+        "working_clips": _columnar_to_rows(block.get("working_clips")),
+        "working_videos": _columnar_to_rows(block.get("working_videos")),
+    }
+
+
+def _fold_columnar_highlights(videos: dict[str, list], folded: dict[int, bytes]) -> None:
+    """Substitute assembled highlights (highlight_store.project_highlight_blobs)
+    into a columnar working_videos table, in place."""
+    if not folded:
+        return
+    ids = videos["data"][videos["columns"].index("id")]
+    highlights = videos["data"][videos["columns"].index("highlights_data")]
+    for i, wv_id in enumerate(ids):
+        if wv_id in folded:
+            highlights[i] = folded[wv_id]
+
+
+def _build_segment(blocks: list[tuple[int, bytes]]) -> tuple[bytes, list[tuple[int, int, int]]]:
+    """Concatenate encoded blocks into one segment object.
+
+    Returns (segment_bytes, [(project_id, offset, length), ...])."""
+    parts = [_SEGMENT_MAGIC]
+    offset = len(_SEGMENT_MAGIC)
+    entries = []
+    for project_id, blob in blocks:
+        entries.append((project_id, offset, len(blob)))
+        parts.append(blob)
+        offset += len(blob)
+    footer = msgpack.packb([list(entry) for entry in entries])
+    parts.append(footer)
+    parts.append(_FOOTER_LEN.pack(len(footer)))
+    return b"".join(parts), entries
+
+
+def read_segment_index(segment_bytes: bytes) -> list[tuple[int, int, int]]:
+    """Parse a segment's footer back into [(project_id, offset, length), ...].
+
+    Raises ValueError on a truncated or foreign object."""
+    if not segment_bytes.startswith(_SEGMENT_MAGIC) or len(segment_bytes) < len(_SEGMENT_MAGIC) + _FOOTER_LEN.size:
+        raise ValueError("not an archive segment")
+    (footer_len,) = _FOOTER_LEN.unpack(segment_bytes[-_FOOTER_LEN.size:])
+    footer_start = len(segment_bytes) - _FOOTER_LEN.size - footer_len
+    if footer_start < len(_SEGMENT_MAGIC):
+        raise ValueError("archive segment footer out of range")
+    footer = msgpack.unpackb(segment_bytes[footer_start:-_FOOTER_LEN.size], raw=False)
+    return [tuple(entry) for entry in footer]
+
+
+def _chunk_blocks(blocks: list[tuple[int, bytes]]) -> list[list[tuple[int, bytes]]]:
+    """Split encoded blocks into segments honouring SEGMENT_MAX_PROJECTS/BYTES."""
+    chunks: list[list[tuple[int, bytes]]] = []
+    current: list[tuple[int, bytes]] = []
+    current_bytes = 0
+    for block in blocks:
+        if current and (len(current) >= SEGMENT_MAX_PROJECTS
+                        or current_bytes + len(block[1]) > SEGMENT_MAX_BYTES):
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(block)
+        current_bytes += len(block[1])
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def archive_projects_bulk(project_ids: list[int], user_id: str | None = None) -> int:
+    """
+    Archive many projects into shared segment objects.
+
+    Same end state per project as archive_project (working data removed,
+    archived_at set, final_videos kept), but:
+      1. all projects are read in one pass on a read-only connection,
+      2. each segment of up to SEGMENT_MAX_PROJECTS goes up in ONE PUT with
+         no DB connection held,
+      3. only after the PUT succeeds does one short write transaction per
+         segment delete the working data and record the index rows.
+    A failed segment upload leaves its projects untouched (they are retried on
+    the next session init); other segments still proceed.
+
+    Args:
+        project_ids: IDs of the projects to archive
+        user_id: User ID (defaults to current user from context)
+
+    Returns:
+        Number of projects archived
+    """
+    if user_id is None:
+        user_id = get_current_user_id()
+    if not project_ids:
+        return 0
+
+    archived_count = 0
+    try:
+        if not R2_ENABLED:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    "UPDATE projects SET archived_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    [(pid,) for pid in project_ids],
+                )
+                conn.commit()
+            logger.info(f"Marked {len(project_ids)} projects as archived (R2 disabled, working data kept)")
+            return len(project_ids)
+
+        # 1. Read phase
+        blocks: list[tuple[int, bytes]] = []
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            for project_id in project_ids:
+                cursor.execute("SELECT * FROM projects WHERE id = ?", (project_id,))
+                project_row = cursor.fetchone()
+                if not project_row:
+                    logger.warning(f"Project {project_id} not found for archiving")
+                    continue
+                project_data = _row_to_dict(project_row)
+                cursor.execute("""
+                    SELECT * FROM working_clips WHERE project_id = ?
+                    ORDER BY version, sort_order
+                """, (project_id,))
+                clips = _cursor_to_columnar(cursor)
+                folded = highlight_store.project_highlight_blobs(cursor, project_id)
+                cursor.execute("""
+                    SELECT * FROM working_videos WHERE project_id = ?
+                    ORDER BY version
+                """, (project_id,))
+                videos = _cursor_to_columnar(cursor)
+                _fold_columnar_highlights(videos, folded)
+                blocks.append((project_id, _encode_segment_block(project_data, clips, videos)))
+
+        for chunk in _chunk_blocks(blocks):
+            # 2. Upload phase
+            segment_bytes, entries = _build_segment(chunk)
+            segment_key = _get_segment_r2_key(uuid.uuid4().hex)
+            if not upload_bytes_to_r2(user_id, segment_key, segment_bytes, fast=True):
+                logger.error(
+                    f"Failed to upload archive segment to R2: user={user_id} key={segment_key} "
+                    f"size={len(segment_bytes)} bytes ({len(entries)} projects)"
+                )
+                continue
+            logger.info(
+                f"Uploaded archive segment to R2: {user_id}/{segment_key} "
+                f"({len(segment_bytes)} bytes, {len(entries)} projects)"
+            )
+
+            # 3. Commit phase
+            ids = [(project_id,) for project_id, _, _ in entries]
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    "UPDATE projects SET working_video_id = NULL, archived_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    ids,
+                )
+                cursor.executemany("DELETE FROM working_clips WHERE project_id = ?", ids)
+                cursor.executemany("DELETE FROM working_videos WHERE project_id = ?", ids)
+                cursor.executemany(
+                    """INSERT OR REPLACE INTO project_archive_index
+                       (project_id, segment_key, byte_offset, byte_length)
+                       VALUES (?, ?, ?, ?)""",
+                    [(project_id, segment_key, offset, length) for project_id, offset, length in entries],
+                )
+                conn.commit()
+            archived_count += len(entries)
+
+        return archived_count
+
+    except Exception as e:
+        logger.error(
+            f"Failed to bulk-archive projects (user={user_id}): {type(e).__name__}: {e}",
+            exc_info=True,
+        )
+        return archived_count
+
+
+def _list_segments(client, user_id: str) -> dict[str, tuple[int, datetime]]:
+    """{segment key (relative): (size, last modified)} for the profile's segments."""
+    base = r2_key(user_id, "")
+    kwargs = {"Bucket": R2_BUCKET, "Prefix": r2_key(user_id, "archive/segments/")}
+    segments = {}
+    while True:
+        response = client.list_objects_v2(**kwargs)
+        for obj in response.get("Contents", []):
+            segments[obj["Key"][len(base):]] = (obj["Size"], obj["LastModified"])
+        if not response.get("IsTruncated"):
+            return segments
+        kwargs["ContinuationToken"] = response["NextContinuationToken"]
+
+
+def _compact_segment(client, user_id: str, segment_key: str,
+                     live: list[tuple[int, int, int]]) -> bool:
+    """Rewrite a segment's live blocks into a new segment and repoint their
+    index rows. The old object is left for the delete phase of the sweep."""
+    full_key = r2_key(user_id, segment_key)
+    # One full GET rather than one ranged GET per live block.
+    try:
+        segment_bytes = client.get_object(Bucket=R2_BUCKET, Key=full_key)['Body'].read()
+    except Exception as e:
+        logger.error(f"[Archive] Failed to read archive segment {full_key} for compaction: {e}")
+        return False
+    blocks = [(project_id, segment_bytes[offset:offset + length]) for project_id, offset, length in live]
+    if any(len(blob) != length for (_, blob), (_, _, length) in zip(blocks, live)):
+        logger.error(f"[Archive] Archive segment {full_key} is shorter than its index; not compacting")
+        return False
+
+    new_bytes, entries = _build_segment(blocks)
+    new_key = _get_segment_r2_key(uuid.uuid4().hex)
+    if not upload_bytes_to_r2(user_id, new_key, new_bytes, fast=True):
+        logger.error(f"[Archive] Failed to upload compacted segment {new_key} for {full_key}")
+        return False
+
+    # Guarded on the old key: a project re-archived meanwhile keeps its new row.
+    with get_db_connection() as conn:
+        conn.cursor().executemany(
+            """UPDATE project_archive_index
+               SET segment_key = ?, byte_offset = ?, byte_length = ?
+               WHERE project_id = ? AND segment_key = ?""",
+            [(new_key, offset, length, project_id, segment_key) for project_id, offset, length in entries],
+        )
+        conn.commit()
+    logger.info(
+        f"[Archive] Compacted archive segment {full_key}: {len(entries)} live projects, "
+        f"{len(segment_bytes)} -> {len(new_bytes)} bytes ({new_key})"
+    )
+    return True
+
+
+def reclaim_archive_segments(user_id: str | None = None) -> dict:
+    """
+    Compact and delete archive segments that lost projects.
+
+    Run once per session init. A segment loses a project when the project is
+    re-archived or deleted; index rows whose project no longer exists are
+    dropped first. Segments whose live blocks fill less than
+    SEGMENT_COMPACT_LIVE_RATIO of the object are rewritten. Deletes are
+    durable-first: the profile DB is synced to R2 before any segment is
+    deleted, so the R2 copy of project_archive_index never points at a deleted
+    segment. A failed or conflicting sync deletes nothing; the segments are
+    found again by the next sweep's listing.
+
+    Args:
+        user_id: User ID (defaults to current user from context)
+
+    Returns:
+        Dict with counts: orphans_dropped, segments_compacted, segments_deleted.
+    """
+    result = {"orphans_dropped": 0, "segments_compacted": 0, "segments_deleted": 0}
+    if not R2_ENABLED:
+        return result
+
+    if user_id is None:
+        user_id = get_current_user_id()
+    profile_id = get_current_profile_id()
+
+    try:
+        client = get_r2_client()
+        if not client:
+            logger.error("R2 client not available for archive segment reclaim")
+            return result
+        segments = _list_segments(client, user_id)
+
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM project_archive_index WHERE project_id NOT IN (SELECT id FROM projects)"
+            )
+            result["orphans_dropped"] = cursor.rowcount
+            if cursor.rowcount:
+                conn.commit()
+            cursor.execute(
+                "SELECT segment_key, project_id, byte_offset, byte_length FROM project_archive_index "
+                "ORDER BY segment_key, byte_offset"
+            )
+            live: dict[str, list[tuple[int, int, int]]] = {}
+            for row in cursor.fetchall():
+                live.setdefault(row[0], []).append((row[1], row[2], row[3]))
+
+        referenced = set(live)
+        for segment_key, rows in live.items():
+            if segment_key not in segments:
+                continue
+            size = segments[segment_key][0]
+            if sum(length for _, _, length in rows) >= size * SEGMENT_COMPACT_LIVE_RATIO:
+                continue
+            if _compact_segment(client, user_id, segment_key, rows):
+                referenced.discard(segment_key)
+                result["segments_compacted"] += 1
+
+        cutoff = datetime.now(UTC) - SEGMENT_DELETE_GRACE
+        dead = sorted(
+            key for key, (_, modified) in segments.items()
+            if key not in referenced and modified < cutoff
+        )
+        if dead:
+            sync = sync_db_to_r2_explicit(user_id, profile_id)
+            if not sync:
+                logger.warning(
+                    f"[Archive] Profile sync {sync.value}; leaving {len(dead)} unreferenced "
+                    f"archive segments for the next sweep"
+                )
+                dead = []
+        for segment_key in dead:
+            if delete_from_r2(user_id, segment_key):
+                _archive_cache_drop(r2_key(user_id, segment_key))
+                result["segments_deleted"] += 1
+
+    except Exception as e:
+        logger.error(
+            f"Failed to reclaim archive segments (user={user_id}): {type(e).__name__}: {e}",
+            exc_info=True,
+        )
+
+    if any(result.values()):
+        logger.info(
+            f"[Archive] Segment reclaim: orphans_dropped={result['orphans_dropped']}, "
+            f"compacted={result['segments_compacted']}, deleted={result['segments_deleted']}"
+        )
+    return result
+
+
+def _lookup_segment_entry(project_id: int) -> tuple[str, int, int] | None:
+    """Return (segment_key, offset, length) if the project lives in a segment."""
+    try:
+        with get_db_connection() as conn:
+            row = conn.cursor().execute(
+                "SELECT segment_key, byte_offset, byte_length FROM project_archive_index "
+                "WHERE project_id = ?",
+                (project_id,),
+            ).fetchone()
+    except Exception as e:
+        logger.warning(f"Archive index lookup failed for project {project_id}: {e}")
+        return None
+    return (row[0], row[1], row[2]) if row else None
+
+
+def _load_segment_block(client, user_id: str, segment_key: str, offset: int,
+                        length: int) -> dict[str, Any] | None:
+    """Fetch one project's block with a ranged GET (or the LRU) and decode it."""
+    full_key = r2_key(user_id, segment_key)
+    cache_key = (full_key, offset)
+    blob = _archive_cache_get(cache_key)
+    if blob is None:
+        try:
+            response = client.get_object(
+                Bucket=R2_BUCKET, Key=full_key, Range=f"bytes={offset}-{offset + length - 1}",
+            )
+            blob = response['Body'].read()
+        except Exception as e:
+            logger.error(f"Failed to range-read archive segment {full_key}: {e}")
+            return None
+        if len(blob) != length:
+            logger.error(
+                f"Short read from archive segment {full_key}: "
+                f"expected {length} bytes at {offset}, got {len(blob)}"
+            )
+            return None
+        _archive_cache_put(cache_key, blob)
+        logger.info(f"Range-read archive block from R2: {full_key} @{offset} ({length} bytes)")
+    try:
+        return _decode_segment_block(blob)
+    except Exception as e:
+        logger.error(f"Failed to decode archive block {full_key} @{offset}: {e}")
+        return None
+
+
 def load_archive(project_id: int, user_id: str | None = None) -> dict[str, Any] | None:
     """
     Download and decode a project's msgpack archive from R2.
 
     Shared by restore_project and the v007 collection-metadata backfill.
+    Segment-archived projects (project_archive_index) are read with a ranged
+    GET, served from the in-process LRU on repeat loads; everything else
+    comes from the per-project object.
 
     Args:
         project_id: ID of the archived project
@@ -172,6 +686,13 @@ def load_archive(project_id: int, user_id: str | None = None) -> dict[str, Any]
         logger.error("R2 client not available for archive download")
         return None
 
+    entry = _lookup_segment_entry(project_id)
+    if entry is not None:
+        archive = _load_segment_block(client, user_id, *entry)
+        if archive is not None:
+            return archive
+        logger.warning(f"Segment archive unreadable for project {project_id}, trying per-project object")
+
     r2_path = _get_archive_r2_key(project_id)
     full_key = r2_key(user_id, r2_path)
 
@@ -317,8 +838,6 @@ def archive_completed_projects(user_id: str | None = None) -> int:
     if user_id is None:
         user_id = get_current_user_id()
 
-    archived_count = 0
-
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
@@ -337,19 +856,20 @@ def archive_completed_projects(user_id: str | None = None) -> int:
 
             logger.info(f"Found {len(completed_projects)} completed projects to archive")
 
-        for row in completed_projects:
-            project_id = row['id']
-            if archive_project(project_id, user_id):
-                archived_count += 1
-                logger.info(f"Archived completed project {project_id}")
-            else:
-                logger.warning(f"Failed to archive completed project {project_id}")
-
+        # One segment PUT per SEGMENT_MAX_PROJECTS instead of one PUT per
+        # project; the DB write path is held only for the final short commit.
+        project_ids = [row['id'] for row in completed_projects]
+        archived_count = archive_projects_bulk(project_ids, user_id)
+        if archived_count < len(project_ids):
+            logger.warning(
+                f"Archived {archived_count}/{len(project_ids)} completed projects; "
+                f"the rest are retried on the next session init"
+            )
         return archived_count
 
     except Exception as e:
         logger.error(f"Failed to archive completed projects: {e}", exc_info=True)
-        return archived_count
+        return 0
 
 
 def cleanup_database_bloat() -> dict:
@@ -513,7 +1033,7 @@ def cleanup_database_bloat() -> dict:
 
 def is_project_archived(project_id: int, user_id: str | None = None) -> bool:
     """
-    Check if a project has an archive in R2.
+    Check if a project has an archive in R2 (segment-indexed or per-project).
 
     Args:
         project_id: ID of the project
@@ -528,6 +1048,9 @@ def is_project_archived(project_id: int, user_id: str | None = None) -> bool:
     if user_id is None:
         user_id = get_current_user_id()
 
+    if _lookup_segment_entry(project_id) is not None:
+        return True
+
     from app.storage import file_exists_in_r2
     r2_path = _get_archive_r2_key(project_id)
     return file_exists_in_r2(user_id, r2_path)
@@ -2,6 +2,9 @@
 Cleanup sweep scheduler: asyncio background loop that auto-exports games
 and deletes expired R2 objects.
 
+Phase 3 reconciles the Postgres game_ref_counts counters against the game
+objects R2 actually holds (reconcile_game_ref_counts).
+
 Uses a "cron till next event" pattern — after each sweep, queries
 get_next_expiry() and sleeps until then (capped at 24h).
 """
@@ -13,15 +16,18 @@ from datetime import UTC, datetime
 
 from ..database import ensure_database, get_db_connection, sync_db_to_r2_explicit
 from ..profile_context import set_current_profile_id
-from ..storage import r2_delete_object_global
+from ..storage import r2_delete_object_global, r2_list_game_hashes
 from ..user_context import set_current_user_id
 from .auth_db import (
     count_refs_in_profile,
     delete_grace_deletion,
     delete_ref,
+    delete_zero_ref_counts,
     expire_game_storage,
+    get_all_game_ref_counts,
     get_expired_grace_deletions,
     get_expired_refs_for_profile,
+    get_grace_deletion_hashes,
     get_next_expiry,
     has_remaining_refs,
     heal_ref_count,
@@ -243,10 +249,51 @@ def do_sweep():
                 f"after deletion of hash={blake3_hash[:12]}"
             )
 
+    # Phase 3: reconcile ref counters against R2. Bookkeeping only -- a
+    # failure here must not fail the sweep.
+    try:
+        reconcile_game_ref_counts()
+    except Exception:
+        logger.exception("[Sweep] Ref count reconciliation failed")
+
     elapsed = time.perf_counter() - t0
     logger.info(f"[Sweep] Complete in {elapsed:.2f}s (refs={total_expired}, grace_deleted={len(grace_expired)})")
 
 
+def reconcile_game_ref_counts() -> dict | None:
+    """Compare game_ref_counts against the games/ objects in R2.
+
+    Ref counts moved from R2 object metadata to Postgres, so the two can only
+    disagree through drift or out-of-band R2 changes. Reports:
+      missing_sources  -- counters still > 0 whose R2 object is gone (live refs
+                          to an unplayable video; needs a human)
+      untracked        -- R2 objects with no counter and no grace row (uploads
+                          never activated here, or another env's games -- the
+                          namespace is shared, so never deleted from here)
+    and removes counters that are at 0 for objects no longer in R2 (nothing
+    left to count or delete). Returns None when R2 can't be listed.
+    """
+    r2_hashes = r2_list_game_hashes()
+    if r2_hashes is None:
+        return None
+    counts = get_all_game_ref_counts()
+    grace = get_grace_deletion_hashes()
+
+    missing_sources = sorted(h for h, n in counts.items() if n > 0 and h not in r2_hashes)
+    untracked = sorted(r2_hashes - counts.keys() - grace)
+    removed = delete_zero_ref_counts(
+        [h for h, n in counts.items() if n == 0 and h not in r2_hashes and h not in grace]
+    )
+
+    for h in missing_sources:
+        logger.error(f"[Sweep] ref_count={counts[h]} but no R2 object for hash={h[:12]}")
+    logger.info(
+        f"[Sweep] Reconciled {len(counts)} ref counters against {len(r2_hashes)} R2 games: "
+        f"missing_sources={len(missing_sources)} untracked={len(untracked)} removed={removed}"
+    )
+    return {"missing_sources": missing_sources, "untracked": untracked, "removed": removed}
+
+
 def _count_refs_all_profiles(blake3_hash: str, users: list) -> tuple[int, int, bool]:
     """Sum (total_refs, live_refs, authoritative) for a hash across all profiles.
 
@@ -12,15 +12,22 @@ em-relative fields) is documented ONCE in app/schemas.py above TextSpec —
 this module just implements the resolution formulas from that invariant.
 """
 
+from __future__ import annotations
+
 import hashlib
 import json
 import logging
 from collections import OrderedDict
 
-from PIL import Image, ImageDraw, ImageFilter, ImageFont
-
 from app.schemas import Align, TextSpec
 from app.services.fonts import load_font_for_render
+from app.utils.lazy_import import lazy_module
+
+# Pillow is imported on the first rendered layer (cold-start hygiene).
+Image = lazy_module("PIL.Image")
+ImageDraw = lazy_module("PIL.ImageDraw")
+ImageFilter = lazy_module("PIL.ImageFilter")
+ImageFont = lazy_module("PIL.ImageFont")
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +37,7 @@ logger = logging.getLogger(__name__)
 # range can't grow memory unboundedly (design §6). Process-local, no disk/R2
 # cache — layers are cheap to regenerate.
 _LAYER_CACHE_MAXSIZE = 64
-_LAYER_CACHE: "OrderedDict[str, Image.Image]" = OrderedDict()
+_LAYER_CACHE: OrderedDict[str, Image.Image] = OrderedDict()
 
 
 def _cache_key(spec: TextSpec, frame_w: int, frame_h: int) -> str:
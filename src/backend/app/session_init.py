@@ -295,6 +295,12 @@ def _init_slow_path(user_id: str, hint_profile_id: str | None = None) -> dict:
     except Exception as e:
         logger.error(f"T1640: Failed to archive completed projects: {e}")
 
+    try:
+        from .services.project_archive import reclaim_archive_segments
+        reclaim_archive_segments(user_id=user_id)
+    except Exception as e:
+        logger.error(f"Failed to reclaim archive segments: {e}")
+
     try:
         from .services.project_archive import cleanup_database_bloat
         cleanup_database_bloat()
@@ -2255,13 +2255,28 @@ def delete_local_profile_data(user_id: str, profile_id: str) -> bool:
 # R2 Multipart Upload Functions
 # ==============================================================================
 
-def r2_create_multipart_upload(key: str, content_type: str = "video/mp4") -> str | None:
+# Server-side copies larger than one range are split into UploadPartCopy ranges
+# run in parallel: a single CopyObject is one serial server-side stream (and
+# S3/R2 refuse it above 5GB).
+COPY_PART_SIZE = 256 * 1024 * 1024  # 256MB
+COPY_MAX_WORKERS = 8
+
+
+def r2_create_multipart_upload(
+    key: str,
+    content_type: str = "video/mp4",
+    metadata: dict | None = None,
+) -> str | None:
     """
     Initiate a multipart upload to R2.
 
+    Metadata given here lands on the completed object, so callers that know
+    it up front never need the copy-in-place of r2_set_object_metadata_global.
+
     Args:
         key: R2 object key
         content_type: Content type for the object
+        metadata: Optional user metadata for the completed object
 
     Returns:
         Upload ID string if successful, None otherwise
@@ -2272,9 +2287,10 @@ def r2_create_multipart_upload(key: str, content_type: str = "video/mp4") -> str
 
     try:
         from .utils.retry import TIER_3, retry_r2_call
+        extra = {'Metadata': metadata} if metadata else {}
         response = retry_r2_call(
             client.create_multipart_upload,
-            Bucket=R2_BUCKET, Key=key, ContentType=content_type,
+            Bucket=R2_BUCKET, Key=key, ContentType=content_type, **extra,
             operation=f"create_multipart {key}", **TIER_3,
         )
         upload_id = response.get('UploadId')
@@ -2395,6 +2411,120 @@ def r2_is_multipart_upload_valid(key: str, upload_id: str) -> bool:
         return False
 
 
+def r2_list_multipart_parts(key: str, upload_id: str) -> list[dict] | None:
+    """
+    Every part R2 holds for an in-progress multipart upload.
+
+    Follows list_parts pagination (1000 parts per page). Each entry carries
+    'PartNumber', 'ETag' and 'Size' -- enough to verify a client's part list
+    and the final object size before completing, without a HEAD afterwards.
+
+    Args:
+        key: R2 object key
+        upload_id: Upload ID from create_multipart_upload
+
+    Returns:
+        Parts sorted by part number, or None on error (including NoSuchUpload)
+    """
+    client = get_r2_client()
+    if not client:
+        return None
+
+    try:
+        from .utils.retry import TIER_3, retry_r2_call
+        parts = []
+        marker = 0
+        while True:
+            response = retry_r2_call(
+                client.list_parts,
+                Bucket=R2_BUCKET, Key=key, UploadId=upload_id, PartNumberMarker=marker,
+                operation=f"list_parts {key}", **TIER_3,
+            )
+            parts.extend(
+                {'PartNumber': p['PartNumber'], 'ETag': p['ETag'], 'Size': p['Size']}
+                for p in response.get('Parts', [])
+            )
+            if not response.get('IsTruncated'):
+                break
+            marker = response['NextPartNumberMarker']
+        return sorted(parts, key=lambda p: p['PartNumber'])
+    except Exception as e:
+        logger.error(f"Failed to list multipart parts: {key} - {e}")
+        return None
+
+
+def r2_copy_object_multipart(
+    source_key: str,
+    dest_key: str,
+    size: int,
+    metadata: dict | None = None,
+    content_type: str = "video/mp4",
+    part_size: int = COPY_PART_SIZE,
+    max_workers: int = COPY_MAX_WORKERS,
+) -> bool:
+    """
+    Server-side copy as parallel UploadPartCopy ranges.
+
+    Creates a multipart upload on `dest_key` (with `metadata`), copies
+    [0, size) from `source_key` in `part_size` byte ranges on up to
+    `max_workers` threads, then completes it. `dest_key` may equal
+    `source_key` (copy-in-place to replace metadata). Aborts the upload on
+    any failure.
+
+    Args:
+        source_key: Global R2 key to copy from
+        dest_key: Global R2 key to write
+        size: Source object size in bytes
+        metadata: Metadata for the new object (replaces the source's)
+        content_type: Content type for the new object
+        part_size: Bytes per UploadPartCopy range (S3/R2: 5MB..5GB)
+        max_workers: Concurrent UploadPartCopy requests
+
+    Returns:
+        True if successful, False otherwise
+    """
+    client = get_r2_client()
+    if not client:
+        return False
+
+    upload_id = r2_create_multipart_upload(dest_key, content_type, metadata)
+    if not upload_id:
+        return False
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .utils.retry import TIER_3, retry_r2_call
+
+    def copy_range(part_number: int) -> dict:
+        first = (part_number - 1) * part_size
+        last = min(first + part_size, size) - 1
+        response = retry_r2_call(
+            client.upload_part_copy,
+            Bucket=R2_BUCKET, Key=dest_key, UploadId=upload_id, PartNumber=part_number,
+            CopySource={'Bucket': R2_BUCKET, 'Key': source_key},
+            CopySourceRange=f"bytes={first}-{last}",
+            operation=f"upload_part_copy {dest_key} #{part_number}", **TIER_3,
+        )
+        return {'PartNumber': part_number, 'ETag': response['CopyPartResult']['ETag']}
+
+    part_count = max(1, -(-size // part_size))
+    try:
+        with ThreadPoolExecutor(max_workers=min(max_workers, part_count)) as pool:
+            parts = list(pool.map(copy_range, range(1, part_count + 1)))
+        retry_r2_call(
+            client.complete_multipart_upload,
+            Bucket=R2_BUCKET, Key=dest_key, UploadId=upload_id,
+            MultipartUpload={'Parts': parts},
+            operation=f"complete_multipart {dest_key}", **TIER_3,
+        )
+        logger.info(f"Copied {source_key} -> {dest_key} in {part_count} parallel ranges")
+        return True
+    except Exception as e:
+        logger.error(f"Failed multipart copy {source_key} -> {dest_key}: {e}")
+        r2_abort_multipart_upload(dest_key, upload_id)
+        return False
+
+
 def generate_presigned_part_url(
     key: str,
     upload_id: str,
@@ -2498,16 +2628,19 @@ def r2_get_object_metadata_global(key: str) -> dict | None:
     return None
 
 
-def r2_set_object_metadata_global(key: str, metadata: dict) -> bool:
+def r2_set_object_metadata_global(key: str, metadata: dict, size: int | None = None) -> bool:
     """
     Set metadata on a global R2 object (using copy-in-place).
 
     R2/S3 doesn't support updating metadata directly - you must copy the object
-    to itself with new metadata.
+    to itself with new metadata. When the caller knows the object is larger
+    than one COPY_PART_SIZE range, the copy runs as parallel UploadPartCopy
+    ranges (r2_copy_object_multipart) instead of one serial CopyObject.
 
     Args:
         key: Global R2 key
         metadata: Dict of metadata to set (keys will be lowercased by S3)
+        size: Object size in bytes, if known
 
     Returns:
         True if successful, False otherwise
@@ -2516,6 +2649,12 @@ def r2_set_object_metadata_global(key: str, metadata: dict) -> bool:
     if not client:
         return False
 
+    if size is not None and size > COPY_PART_SIZE:
+        if r2_copy_object_multipart(key, key, size, metadata):
+            logger.debug(f"Set metadata on global object: {key}")
+            return True
+        return False
+
     try:
         from .utils.retry import TIER_3, retry_r2_call
         # Copy object to itself with new metadata
@@ -2533,70 +2672,87 @@ def r2_set_object_metadata_global(key: str, metadata: dict) -> bool:
         return False
 
 
+def _game_hash_from_key(key: str) -> str:
+    """blake3 hash from a global game key ("games/{hash}.mp4")."""
+    return key.removeprefix("games/").removesuffix(".mp4")
+
+
 def increment_ref_count(key: str) -> int:
     """
-    Increment the ref_count metadata on a global R2 object.
+    Increment the ref count of a global game object.
+
+    Counts live in Postgres game_ref_counts, updated with one atomic
+    UPDATE .. RETURNING -- not in R2 object metadata, where every change was a
+    HEAD plus a copy-in-place of a multi-GB object and concurrent adds lost
+    updates. The counter row is created (with its expiry) by
+    auth_db.insert_game_storage_refs.
 
     Args:
         key: Global R2 key (e.g., "games/{hash}.mp4")
 
     Returns:
-        New ref_count value, or -1 if failed
+        New ref_count value, or -1 if the game has no counter
     """
-    metadata = r2_get_object_metadata_global(key)
-    if metadata is None:
-        logger.error(f"Cannot increment ref_count: object not found: {key}")
-        return -1
-
-    try:
-        current_count = int(metadata.get('ref_count', '0'))
-    except (ValueError, TypeError):
-        current_count = 0
+    from .services.auth_db import increment_game_ref_counts
 
-    new_count = current_count + 1
-
-    # Copy all existing metadata and update ref_count
-    new_metadata = dict(metadata)
-    new_metadata['ref_count'] = str(new_count)
-
-    if r2_set_object_metadata_global(key, new_metadata):
-        logger.info(f"Incremented ref_count: {key} -> {new_count}")
-        return new_count
-    return -1
+    blake3_hash = _game_hash_from_key(key)
+    new_count = increment_game_ref_counts([blake3_hash]).get(blake3_hash)
+    if new_count is None:
+        logger.error(f"Cannot increment ref_count: no counter for {key}")
+        return -1
+    logger.info(f"Incremented ref_count: {key} -> {new_count}")
+    return new_count
 
 
 def decrement_ref_count(key: str) -> int:
     """
-    Decrement the ref_count metadata on a global R2 object.
+    Decrement the ref count of a global game object (Postgres game_ref_counts,
+    floored at 0; see increment_ref_count).
 
     Args:
         key: Global R2 key (e.g., "games/{hash}.mp4")
 
     Returns:
-        New ref_count value (0 means object should be deleted), or -1 if failed
+        New ref_count value (0 means object should be deleted); 0 when the game
+        has no counter, so the caller can clean up
     """
-    metadata = r2_get_object_metadata_global(key)
-    if metadata is None:
-        logger.warning(f"Cannot decrement ref_count: object not found: {key}")
-        return 0  # Treat as 0 so caller can clean up
+    from .services.auth_db import decrement_game_ref_counts
 
-    try:
-        current_count = int(metadata.get('ref_count', '1'))
-    except (ValueError, TypeError):
-        current_count = 1
+    blake3_hash = _game_hash_from_key(key)
+    new_count = decrement_game_ref_counts([blake3_hash]).get(blake3_hash)
+    if new_count is None:
+        logger.warning(f"Cannot decrement ref_count: no counter for {key}")
+        return 0
+    logger.info(f"Decremented ref_count: {key} -> {new_count}")
+    return new_count
 
-    new_count = max(0, current_count - 1)
 
-    # Copy all existing metadata and update ref_count
-    new_metadata = dict(metadata)
-    new_metadata['ref_count'] = str(new_count)
+def r2_list_game_hashes() -> set[str] | None:
+    """
+    blake3 hashes of every global game object (games/{hash}.mp4) in R2.
+
+    Paginated list_objects_v2 over the shared games/ prefix, for reconciling
+    game_ref_counts against what R2 actually holds.
 
-    if r2_set_object_metadata_global(key, new_metadata):
-        logger.info(f"Decremented ref_count: {key} -> {new_count}")
-        return new_count
+    Returns:
+        Set of hashes, or None when R2 is unavailable or the listing failed
+    """
+    client = get_r2_client()
+    if not client:
+        return None
 
-    logger.error(f"Failed to decrement ref_count: {key}")
-    return -1
+    try:
+        hashes = set()
+        paginator = client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=R2_BUCKET, Prefix="games/"):
+            for obj in page.get("Contents", []):
+                key = obj["Key"]
+                if key.endswith(".mp4") and "/" not in key.removeprefix("games/"):
+                    hashes.add(_game_hash_from_key(key))
+        return hashes
+    except Exception as e:
+        logger.error(f"Failed to list game objects: {e}")
+        return None
 
 
 def generate_presigned_url_global(
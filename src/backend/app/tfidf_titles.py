@@ -4,24 +4,36 @@ TF-IDF keyword extraction for auto-generating clip titles from notes.
 Uses scikit-learn's TfidfVectorizer when the user has enough notes (>= 5)
 to build a meaningful corpus. Falls back to simple stop-word removal for
 small corpora.
+
+scikit-learn (and the scipy it drags in) costs ~0.4s to import, and the clips
+router imports this module at app start. It is loaded on the first title
+extraction instead, via _coaching_stop_words() / the local import in
+_extract_keywords_vectorizer.
 """
 
-from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
+import functools
 
 # Additional stop words common in coaching notes
-COACHING_STOP_WORDS = ENGLISH_STOP_WORDS.union({
+_COACHING_EXTRA_STOP_WORDS = {
     'like', 'really', 'just', 'get', 'got', 'think', 'know',
     'want', 'need', 'let', 'make', 'going', 'come', 'take',
     'good', 'great', 'nice', 'love', 'thing', 'way', 'lot',
     'try', 'see', 'look', 'keep', 'put', 'much', 'well',
     'also', 'back', 'even', 'still', 'right', 'sure',
-})
+}
 
 MIN_CORPUS_SIZE = 5
 MAX_KEYWORDS = 4
 MIN_KEYWORDS = 2
 
 
+@functools.cache
+def _coaching_stop_words() -> frozenset[str]:
+    """sklearn's English stop words plus the coaching-note extras."""
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+    return ENGLISH_STOP_WORDS.union(_COACHING_EXTRA_STOP_WORDS)
+
+
 def extract_keywords_tfidf(notes: str, corpus: list[str]) -> str:
     """
     Extract keywords from notes using TF-IDF fitted on the user's corpus.
@@ -44,8 +56,10 @@ def extract_keywords_tfidf(notes: str, corpus: list[str]) -> str:
 
 def _extract_keywords_vectorizer(notes: str, corpus: list[str]) -> str:
     """Use TF-IDF vectorizer fitted on corpus to find distinguishing keywords."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
     vectorizer = TfidfVectorizer(
-        stop_words=list(COACHING_STOP_WORDS),
+        stop_words=list(_coaching_stop_words()),
         max_features=500,
         min_df=1,
         max_df=0.9,
@@ -81,10 +95,11 @@ def _extract_keywords_vectorizer(notes: str, corpus: list[str]) -> str:
 
 def _extract_keywords_simple(notes: str) -> str:
     """Simple stop-word removal for small corpora."""
+    stop_words = _coaching_stop_words()
     words = notes.strip().split()
     keywords = [
         w for w in words
-        if w.lower().strip('.,!?;:') not in COACHING_STOP_WORDS
+        if w.lower().strip('.,!?;:') not in stop_words
         and len(w) > 1
     ]
 
@@ -0,0 +1,51 @@
+"""Deferred imports for heavy third-party libraries (cold-start hygiene).
+
+The Fly machine autostops and cold-starts, and every module `app.main` pulls in
+transitively is paid for before the first request is served. cv2, numpy, PIL,
+sklearn and torch are only needed by a handful of render/detection paths, so
+modules that use them bind a `lazy_module(...)` proxy at top level instead of
+importing the library: the real import happens on the first attribute access
+(e.g. `np.zeros`) and is a plain `sys.modules` hit afterwards.
+
+Modules using a proxy should also have `from __future__ import annotations` so
+type hints like `Image.Image` in signatures are not evaluated at import time.
+
+tests/test_import_hygiene.py enforces the result: importing app.main must stay
+under a time budget and must not load any of HEAVY_MODULES.
+"""
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+
+# Libraries that must NOT be imported as a side effect of `import app.main`.
+HEAVY_MODULES = ("cv2", "numpy", "PIL", "sklearn", "scipy", "torch")
+
+
+class LazyModule:
+    """Module proxy that imports `name` on first attribute access."""
+
+    __slots__ = ("_module", "_name")
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module: ModuleType | None = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            # import_module is idempotent and holds the import lock, so two
+            # threads racing here both end up with the same module object.
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Return a proxy for `name`; the import runs on first use, not here."""
+    return LazyModule(name)
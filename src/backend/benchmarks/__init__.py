@@ -0,0 +1,19 @@
+"""
+Offline performance benchmarks for the backend hot paths.
+
+Unlike experiments/ (which measure deployed Modal functions against real R2),
+everything here runs on a laptop with only FFmpeg installed:
+
+  * source videos are synthesized with FFmpeg's lavfi test sources,
+  * AI upscaling is replaced by a no-op upscaler (resize only),
+  * R2 is replaced by a local-filesystem stand-in (harness.LocalR2).
+
+Each case reports wall time, throughput (frames/sec for video cases) and the
+worker's peak RSS as JSON, and `run.py` compares the numbers against the
+committed baseline.json with a relative tolerance (default 20%).
+
+Run from src/backend:
+    python -m benchmarks.run                      # all cases, compare to baseline
+    python -m benchmarks.run --case overlay_export
+    python -m benchmarks.run --update-baseline    # re-record on this machine
+"""
@@ -0,0 +1,438 @@
+"""
+Benchmark cases. Each case splits into an untimed `setup` (synthesize media,
+seed the local R2) and a timed `run` that calls the production code path and
+returns how many units (frames, syncs, lookups) it processed.
+
+A case whose optional dependency is missing (torch for FrameProcessor, modal
+for the stitch function) raises CaseSkipped from setup and is reported as
+skipped rather than failed.
+
+frame_processor is unguarded: baseline.json was recorded on a machine without
+torch, so it has no entry and no slowdown in the case is caught. On a torch
+machine run.py reports it UNCHECKED until someone records it there with
+--update-baseline.
+"""
+
+import os
+import shutil
+import sqlite3
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks.harness import LocalR2, NoopModelManager, make_test_video
+
+FPS = 30
+BUCKET = "bench-bucket"
+USER_ID = "bench-user"
+
+
+class CaseSkipped(Exception):
+    """The case cannot run in this environment (missing optional dependency)."""
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    unit: str
+    setup: Callable[[Path], dict]
+    run: Callable[[dict], int]
+
+
+def _highlight_regions(seconds: float, width: int, height: int) -> list:
+    """Two spotlight regions covering most of the clip, 5 keyframes each."""
+    regions = []
+    for start, end in ((0.2, seconds / 2), (seconds / 2 + 0.1, seconds - 0.2)):
+        keyframes = []
+        for i in range(5):
+            t = start + (end - start) * i / 4
+            keyframes.append({
+                "time": t,
+                "x": width * (0.3 + 0.1 * i),
+                "y": height * 0.5,
+                "radiusX": width * 0.06,
+                "radiusY": height * 0.15,
+                "strokeOpacity": 0.8,
+                "fillOpacity": 0.2,
+                "color": "#FFFF00",
+            })
+        regions.append({"start_time": start, "end_time": end, "keyframes": keyframes})
+    return regions
+
+
+# ---------------------------------------------------------------------------
+# overlay_export: routers.export.overlay._process_frames_to_ffmpeg
+# ---------------------------------------------------------------------------
+
+def _overlay_setup(workdir: Path) -> dict:
+    src = make_test_video(workdir / "overlay_src.mp4", 1280, 720, seconds=4.0, fps=FPS)
+    return {
+        "src": str(src),
+        "out": str(workdir / "overlay_out.mp4"),
+        "regions": _highlight_regions(4.0, 1280, 720),
+    }
+
+
+def _overlay_run(state: dict) -> int:
+    from app.routers.export.overlay import _process_frames_to_ffmpeg
+
+    return _process_frames_to_ffmpeg(
+        state["src"], state["out"], state["regions"], "dark_overlay", lambda *a, **k: None,
+    )
+
+
+# ---------------------------------------------------------------------------
+# frame_processor: ai_upscaler.FrameProcessor.process_single_frame (no-op SR)
+# ---------------------------------------------------------------------------
+
+def _frame_processor_setup(workdir: Path) -> dict:
+    try:
+        import torch
+
+        from app.ai_upscaler.frame_processor import FrameProcessor
+    except ImportError as e:
+        raise CaseSkipped(f"FrameProcessor unavailable: {e}") from e
+
+    src = make_test_video(workdir / "framing_src.mp4", 1280, 720, seconds=2.0, fps=FPS, audio=False)
+    processor = FrameProcessor(NoopModelManager(), None, torch.device("cpu"), export_mode="fast")
+    highlight = _highlight_regions(2.0, 1280, 720)[0]["keyframes"][2]
+    return {"src": str(src), "processor": processor, "highlight": highlight, "frames": 2 * FPS}
+
+
+def _frame_processor_run(state: dict) -> int:
+    crop = {"x": 400, "y": 0, "width": 405, "height": 720}
+    processor = state["processor"]
+    for i in range(state["frames"]):
+        _, frame, ok = processor.process_single_frame((
+            i, i, state["src"], crop, (810, 1440), -1, i / FPS,
+            state["highlight"], (1280, 720), "dark_overlay",
+        ))
+        if not ok or frame is None:
+            raise RuntimeError(f"FrameProcessor failed on frame {i}")
+    return state["frames"]
+
+
+# ---------------------------------------------------------------------------
+# framing_export: local framing path (MockVideoUpscaler crop + resize)
+# ---------------------------------------------------------------------------
+
+def _framing_setup(workdir: Path) -> dict:
+    src = make_test_video(workdir / "crop_src.mp4", 1920, 1080, seconds=4.0, fps=FPS)
+    return {"src": str(src), "out": str(workdir / "crop_out.mp4"), "frames": 4 * FPS}
+
+
+def _framing_run(state: dict) -> int:
+    from app.services.local_processors import MockVideoUpscaler
+
+    keyframes = [{"time": 0.0, "x": 0.34, "y": 0.0, "width": 0.3164, "height": 1.0}]
+    result = MockVideoUpscaler().process_video_with_upscale(state["src"], state["out"], keyframes)
+    if result.get("status") != "success":
+        raise RuntimeError(f"framing export failed: {result}")
+    return state["frames"]
+
+
+# ---------------------------------------------------------------------------
+# clip_cache: services.clip_cache.ClipCache key/miss/put/hit cycle
+# ---------------------------------------------------------------------------
+
+def _clip_cache_setup(workdir: Path) -> dict:
+    clips_dir = workdir / "clips"
+    clips_dir.mkdir()
+    clips = []
+    for i in range(500):
+        path = clips_dir / f"clip_{i}.mp4"
+        path.write_bytes(os.urandom(64 * 1024))
+        clips.append(str(path))
+    keyframes = [
+        {"time": t / 10, "x": 100.5 + t, "y": 20.25, "width": 405.0, "height": 720.0}
+        for t in range(30)
+    ]
+    return {"clips": clips, "keyframes": keyframes, "cache_dir": workdir / "clip_cache"}
+
+
+def _clip_cache_run(state: dict) -> int:
+    from app.services.clip_cache import ClipCache
+
+    shutil.rmtree(state["cache_dir"], ignore_errors=True)
+    cache = ClipCache(state["cache_dir"])
+    lookups = 0
+    for _ in range(2):  # cold pass (miss + put), then warm pass (hit)
+        for path in state["clips"]:
+            key = cache.generate_key(
+                "framing",
+                video_id=cache.get_video_identity(path),
+                crop_keyframes=state["keyframes"],
+                target_fps=30,
+                export_mode="quality",
+            )
+            if cache.get(key) is None:
+                cache.put(path, key)
+            lookups += 1
+    return lookups
+
+
+# ---------------------------------------------------------------------------
+# sqlite_sync: storage.sync_database_to_r2_with_version against LocalR2
+# ---------------------------------------------------------------------------
+
+def _sqlite_sync_setup(workdir: Path) -> dict:
+    db_path = workdir / "profile.sqlite"
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE rows (id INTEGER PRIMARY KEY, payload BLOB)")
+    conn.executemany(
+        "INSERT INTO rows (payload) VALUES (?)",
+        ((os.urandom(256),) for _ in range(20_000)),
+    )
+    conn.commit()
+    conn.close()
+    return {"db_path": db_path, "r2": LocalR2(workdir / "r2"), "syncs": 50}
+
+
+def _sqlite_sync_run(state: dict) -> int:
+    from app import storage
+
+    r2 = state["r2"]
+    shutil.rmtree(r2.root, ignore_errors=True)
+    version = None
+    with patch.object(storage, "R2_ENABLED", True), \
+         patch.object(storage, "R2_BUCKET", BUCKET), \
+         patch.object(storage, "get_r2_sync_client", return_value=r2):
+        for i in range(state["syncs"]):
+            conn = sqlite3.connect(state["db_path"])
+            conn.execute("INSERT INTO rows (payload) VALUES (?)", (os.urandom(256),))
+            conn.commit()
+            conn.close()
+            ok, version = storage.sync_database_to_r2_with_version(
+                USER_ID, state["db_path"], version, profile_id="bench",
+            )
+            if not ok:
+                raise RuntimeError(f"sync {i} refused (version={version})")
+    return state["syncs"]
+
+
+# ---------------------------------------------------------------------------
+# share_merge: services.materialization._materialize_clips, full season
+# ---------------------------------------------------------------------------
+
+_RAW_CLIPS_SCHEMA = """
+    CREATE TABLE raw_clips (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        filename TEXT NOT NULL,
+        rating INTEGER NOT NULL,
+        tags BLOB,
+        name TEXT,
+        notes TEXT,
+        start_time REAL,
+        end_time REAL,
+        game_id INTEGER,
+        video_sequence INTEGER,
+        tagged_teammates BLOB DEFAULT NULL,
+        my_athlete INTEGER DEFAULT 1,
+        shared_by TEXT DEFAULT NULL
+    );
+    CREATE INDEX idx_raw_clips_game ON raw_clips(game_id);
+"""
+
+
+def _share_merge_setup(workdir: Path) -> dict:
+    """A recipient game with 4000 clips (mostly Team layer) over a 90-minute
+    match across two sequences, and a 4000-clip share for the same game:
+    roughly a third of the incoming clips land on an existing Team clip."""
+    import random
+
+    from app.utils.encoding import encode_data
+
+    rng = random.Random(7)
+    template = workdir / "recipient_template.sqlite"
+    conn = sqlite3.connect(template)
+    conn.executescript(_RAW_CLIPS_SCHEMA)
+
+    def clip_times():
+        start = rng.uniform(0, 5400)
+        return start, start + rng.uniform(2, 12)
+
+    existing = []
+    for i in range(4000):
+        start, end = clip_times()
+        existing.append((
+            f"Clip {i}", start, end, rng.randint(0, 1),
+            encode_data(["Player 7"]), 0 if rng.random() < 0.7 else 1,
+        ))
+    conn.executemany(
+        """INSERT INTO raw_clips (filename, rating, name, start_time, end_time, game_id,
+                                  video_sequence, tagged_teammates, my_athlete)
+           VALUES ('', 3, ?, ?, ?, 1, ?, ?, ?)""",
+        existing,
+    )
+    conn.commit()
+    conn.close()
+
+    incoming = []
+    for i in range(4000):
+        start, end = clip_times()
+        incoming.append({
+            "rating": rng.randint(1, 5), "name": f"Shared {i}", "notes": "from a teammate",
+            "start_time": start, "end_time": end, "video_sequence": rng.randint(0, 1),
+            "tags": ["goal"], "tagged_teammates": ["Player 9"],
+        })
+    return {"template": template, "db_path": workdir / "recipient.sqlite", "incoming": incoming}
+
+
+def _share_merge_run(state: dict) -> int:
+    from app.services.materialization import _materialize_clips
+
+    shutil.copyfile(state["template"], state["db_path"])
+    conn = sqlite3.connect(state["db_path"])
+    conn.row_factory = sqlite3.Row
+    try:
+        _materialize_clips(
+            conn, 1, state["incoming"], shared_by="bench@example.com", sharer_profile_name="Bench",
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    return len(state["incoming"])
+
+
+# ---------------------------------------------------------------------------
+# clips_ai: modal_functions.video_processing._clips_ai_pipeline on CPU
+# ---------------------------------------------------------------------------
+
+def _clips_ai_setup(workdir: Path) -> dict:
+    try:
+        from app.modal_functions import video_processing  # noqa: F401
+    except ImportError as e:
+        raise CaseSkipped(f"process_clips_ai unavailable: {e}") from e
+
+    game = make_test_video(workdir / "game.mp4", 1280, 720, seconds=8.0, fps=FPS)
+    clips = [
+        {"clipIndex": 0, "source_start_time": start, "source_end_time": start + 1.0,
+         "keyframes": [{"time": 0, "x": 400, "y": 0, "width": 405, "height": 720},
+                       {"time": 1, "x": 600, "y": 0, "width": 405, "height": 720}]}
+        for start in (0.0, 2.0, 4.0, 6.0)
+    ]
+    return {"game": str(game), "clips": clips, "work": workdir / "clips_ai",
+            "frames": len(clips) * FPS}
+
+
+def _clips_ai_run(state: dict) -> int:
+    from app.modal_functions import video_processing
+    from app.services.local_processors import MockVideoUpscaler
+
+    shutil.rmtree(state["work"], ignore_errors=True)
+    state["work"].mkdir()
+    gen = video_processing._clips_ai_pipeline(
+        "bench", state["clips"], [state["game"]], str(state["work"]), MockVideoUpscaler(),
+        360, 640, FPS, True, source_url=lambda key: key,
+    )
+    for _ in gen:
+        pass
+    return state["frames"]
+
+
+# ---------------------------------------------------------------------------
+# stitching: modal_functions.video_processing.stitch_members run locally
+# ---------------------------------------------------------------------------
+
+def _stitch_setup(workdir: Path) -> dict:
+    try:
+        from app.modal_functions import video_processing  # noqa: F401
+    except ImportError as e:
+        raise CaseSkipped(f"stitch_members unavailable: {e}") from e
+
+    r2 = LocalR2(workdir / "r2")
+    keys = []
+    for i in range(8):
+        member = make_test_video(workdir / f"member_{i}.mp4", 1280, 720, seconds=3.0, fps=FPS)
+        key = f"final_videos/member_{i}.mp4"
+        r2.upload_file(str(member), BUCKET, f"{USER_ID}/{key}")
+        keys.append(key)
+    return {"r2": r2, "keys": keys, "frames": len(keys) * 3 * FPS}
+
+
+def _stitch_run(state: dict) -> int:
+    from app.modal_functions import video_processing
+
+    with patch.object(video_processing, "get_r2_client", return_value=state["r2"]), \
+         patch.dict(os.environ, {"R2_BUCKET_NAME": BUCKET}):
+        video_processing.stitch_members.local(USER_ID, state["keys"], "stitched.mp4")
+    return state["frames"]
+
+
+# ---------------------------------------------------------------------------
+# stitch_fetch: stitch_members over a 20-reel collection, 150ms per GET
+# ---------------------------------------------------------------------------
+
+def _stitch_fetch_setup(workdir: Path) -> dict:
+    try:
+        from app.modal_functions import video_processing  # noqa: F401
+    except ImportError as e:
+        raise CaseSkipped(f"stitch_members unavailable: {e}") from e
+
+    r2 = LocalR2(workdir / "r2", get_latency=0.15)
+    member = make_test_video(workdir / "member.mp4", 640, 360, seconds=1.0, fps=FPS)
+    keys = []
+    for i in range(20):
+        key = f"final_videos/member_{i}.mp4"
+        r2.upload_file(str(member), BUCKET, f"{USER_ID}/{key}")
+        keys.append(key)
+    return {"r2": r2, "keys": keys}
+
+
+def _stitch_fetch_run(state: dict) -> int:
+    from app.modal_functions import video_processing
+
+    with patch.object(video_processing, "get_r2_client", return_value=state["r2"]), \
+         patch.dict(os.environ, {"R2_BUCKET_NAME": BUCKET}):
+        video_processing.stitch_members.local(USER_ID, state["keys"], "stitched.mp4")
+    return len(state["keys"])
+
+
+# ---------------------------------------------------------------------------
+# player_images: image_extractor.extract_player_images_for_region, 45 keyframes
+# ---------------------------------------------------------------------------
+
+def _player_images_setup(workdir: Path) -> dict:
+    src = make_test_video(workdir / "region_src.mp4", 1920, 1080, seconds=6.0, fps=FPS, audio=False)
+    keyframes = [
+        {
+            "raw_frame": frame,
+            "raw_x": 400 + 6 * frame,
+            "raw_y": 540,
+            "raw_radiusX": 90,
+            "raw_radiusY": 200,
+        }
+        for frame in range(0, 6 * FPS, 4)
+    ]
+    return {"src": str(src), "keyframes": keyframes, "out": workdir / "highlights"}
+
+
+def _player_images_run(state: dict) -> int:
+    from app.services import image_extractor
+
+    shutil.rmtree(state["out"], ignore_errors=True)
+    with patch.object(image_extractor, "get_highlights_path", return_value=state["out"]):
+        updated = image_extractor.extract_player_images_for_region(state["src"], 7, state["keyframes"])
+    missing = [kf["raw_frame"] for kf in updated if not kf["player_image_path"]]
+    if missing:
+        raise RuntimeError(f"no player image for frames {missing}")
+    return len(updated)
+
+
+CASES = {
+    case.name: case
+    for case in (
+        Case("overlay_export", "frames", _overlay_setup, _overlay_run),
+        Case("frame_processor", "frames", _frame_processor_setup, _frame_processor_run),
+        Case("framing_export", "frames", _framing_setup, _framing_run),
+        Case("clip_cache", "lookups", _clip_cache_setup, _clip_cache_run),
+        Case("sqlite_sync", "syncs", _sqlite_sync_setup, _sqlite_sync_run),
+        Case("share_merge", "clips", _share_merge_setup, _share_merge_run),
+        Case("clips_ai", "frames", _clips_ai_setup, _clips_ai_run),
+        Case("stitching", "frames", _stitch_setup, _stitch_run),
+        Case("stitch_fetch", "members", _stitch_fetch_setup, _stitch_fetch_run),
+        Case("player_images", "images", _player_images_setup, _player_images_run),
+    )
+}
@@ -0,0 +1,228 @@
+"""
+Shared benchmark plumbing: synthetic media, the no-op upscaler, the local R2
+stand-in, resource measurement and the baseline comparison.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+DEFAULT_TOLERANCE = 0.20
+
+# metric -> True when a larger value is better
+METRICS = {
+    "wall_seconds": False,
+    "throughput": True,
+    "peak_rss_mb": False,
+}
+
+
+# ---------------------------------------------------------------------------
+# Synthetic media
+# ---------------------------------------------------------------------------
+
+def make_test_video(
+    path: Path,
+    width: int = 1280,
+    height: int = 720,
+    seconds: float = 4.0,
+    fps: int = 30,
+    audio: bool = True,
+) -> Path:
+    """Encode a deterministic lavfi test pattern (plus a sine tone) to `path`.
+
+    testsrc2 has moving content on every frame, so the encoder and the per-frame
+    overlay math see realistic work instead of a constant image.
+    """
+    cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate={fps}:duration={seconds}",
+    ]
+    if audio:
+        cmd += ["-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=48000:duration={seconds}"]
+    cmd += ["-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", "-g", str(fps)]
+    cmd += ["-c:a", "aac", "-b:a", "128k", "-shortest"] if audio else ["-an"]
+    cmd.append(str(path))
+    subprocess.run(cmd, check=True, capture_output=True)
+    return path
+
+
+def ffmpeg_available() -> bool:
+    return shutil.which("ffmpeg") is not None and shutil.which("ffprobe") is not None
+
+
+# ---------------------------------------------------------------------------
+# No-op upscaler (stands in for Real-ESRGAN behind FrameProcessor)
+# ---------------------------------------------------------------------------
+
+class NoopUpsampler:
+    """Real-ESRGAN `enhance()` shape, but a plain resize: no model, no GPU."""
+
+    def enhance(self, frame, outscale: float = 4.0):
+        import cv2
+
+        h, w = frame.shape[:2]
+        size = (max(1, round(w * outscale)), max(1, round(h * outscale)))
+        return cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR), None
+
+
+class NoopModelManager:
+    """ModelManager stand-in: every GPU id maps to the same NoopUpsampler."""
+
+    def __init__(self):
+        self._backend = NoopUpsampler()
+
+    def get_backend_for_gpu(self, gpu_id: int):
+        return self._backend
+
+
+# ---------------------------------------------------------------------------
+# Local-filesystem R2 stand-in
+# ---------------------------------------------------------------------------
+
+class LocalR2:
+    """The subset of the boto3 S3 client the app calls, backed by a directory.
+
+    Objects live at `<root>/<bucket>/<key>`; user metadata sits beside them in a
+    `.meta` sidecar so HEAD round-trips `Metadata` like R2 does (the profile DB
+    sync relies on `db-version`). Missing objects raise botocore's ClientError
+    with a 404 code, which is what storage.py branches on.
+
+    `get_latency` (seconds) is slept before every download, standing in for an
+    object store's time-to-first-byte so fetch concurrency shows up in timings.
+    """
+
+    def __init__(self, root: Path, get_latency: float = 0.0):
+        from botocore.exceptions import ClientError
+
+        self.root = Path(root)
+        self.get_latency = get_latency
+        self.exceptions = SimpleNamespace(ClientError=ClientError)
+        self.calls: dict[str, int] = {}
+
+    def _path(self, bucket: str, key: str) -> Path:
+        return self.root / bucket / key
+
+    def _count(self, op: str) -> None:
+        self.calls[op] = self.calls.get(op, 0) + 1
+
+    def _missing(self, op: str, key: str):
+        return self.exceptions.ClientError(
+            {"Error": {"Code": "404", "Message": f"Not Found: {key}"}}, op)
+
+    def _write_meta(self, path: Path, extra_args: dict | None) -> None:
+        import json
+
+        meta = (extra_args or {}).get("Metadata") or {}
+        path.with_name(path.name + ".meta").write_text(json.dumps(meta))
+
+    def upload_file(self, filename, bucket, key, ExtraArgs=None, **_):
+        self._count("upload_file")
+        dest = self._path(bucket, key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(filename, dest)
+        self._write_meta(dest, ExtraArgs)
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, **_):
+        self._count("upload_fileobj")
+        dest = self._path(bucket, key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with open(dest, "wb") as f:
+            shutil.copyfileobj(fileobj, f)
+        self._write_meta(dest, ExtraArgs)
+
+    def download_file(self, bucket, key, filename, **_):
+        self._count("download_file")
+        if self.get_latency:
+            time.sleep(self.get_latency)
+        src = self._path(bucket, key)
+        if not src.exists():
+            raise self._missing("GetObject", key)
+        shutil.copyfile(src, filename)
+
+    def head_object(self, Bucket, Key, **_):
+        import json
+
+        self._count("head_object")
+        path = self._path(Bucket, Key)
+        if not path.exists():
+            raise self._missing("HeadObject", Key)
+        meta_path = path.with_name(path.name + ".meta")
+        meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+        st = path.stat()
+        return {"ContentLength": st.st_size, "ETag": f'"{st.st_mtime_ns:x}"', "Metadata": meta}
+
+
+# ---------------------------------------------------------------------------
+# Measurement + comparison
+# ---------------------------------------------------------------------------
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of THIS process in MB (ffmpeg children excluded)."""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes.
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:  # Windows: no resource module
+        import psutil
+
+        info = psutil.Process(os.getpid()).memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """Regressions of `results` vs `baseline`, one human-readable line each.
+
+    A metric regresses when it is worse than the baseline by more than
+    `tolerance` (relative): wall time / peak RSS above `base * (1 + tol)`,
+    throughput below `base / (1 + tol)` -- so a 20% slowdown trips both the
+    wall-time and the throughput check at the default tolerance. Skipped cases
+    and cases without a baseline entry are never regressions -- `coverage_gaps`
+    reports those.
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if not base or result.get("skipped") or base.get("skipped"):
+            continue
+        for metric, higher_is_better in METRICS.items():
+            new, old = result.get(metric), base.get(metric)
+            if not new or not old:
+                continue
+            if higher_is_better:
+                worse = new < old / (1 + tolerance)
+            else:
+                worse = new > old * (1 + tolerance)
+            if worse:
+                change = (new - old) / old * 100
+                regressions.append(
+                    f"{name}: {metric} {old:.3f} -> {new:.3f} ({change:+.1f}%, tolerance {tolerance:.0%})"
+                )
+    return regressions
+
+
+def coverage_gaps(results: dict, baseline: dict) -> list[str]:
+    """Cases `compare` could not check, one human-readable line each: measured
+    now but with no baseline measurement (a new case nobody recorded, or one the
+    baseline machine skipped), or skipped now although the baseline has numbers.
+    Cases skipped on both sides are not gaps; the runner lists them separately.
+    """
+    gaps = []
+    for name, result in sorted(results.items()):
+        if "error" in result:
+            continue
+        base = baseline.get(name) or {}
+        measured_base = bool(base) and not base.get("skipped")
+        if result.get("skipped"):
+            if measured_base:
+                gaps.append(f"{name}: skipped ({result['skipped']}) but the baseline has measurements")
+        elif not measured_base:
+            reason = f"baseline skipped it ({base['skipped']})" if base else "no baseline entry"
+            gaps.append(f"{name}: measured but {reason}; record it with --update-baseline")
+    return gaps
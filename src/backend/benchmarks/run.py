@@ -0,0 +1,150 @@
+"""
+Run the offline benchmarks and compare them against benchmarks/baseline.json.
+
+Every case runs in a fresh spawned worker so its peak RSS is its own; the
+timed body runs `--repeats` times and the fastest run is reported (the
+minimum is the least noisy estimator on a shared dev machine).
+
+Exit status is 1 when any metric regresses past the tolerance, or when a case
+could not be compared (measured with no baseline, or skipped although the
+baseline has numbers), so the command can gate a PR locally:
+
+    python -m benchmarks.run --tolerance 0.2 --output /tmp/bench.json
+
+Baselines are machine-specific. After an intentional performance change (or
+on a new machine) re-record with --update-baseline and commit the JSON.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+from benchmarks.harness import (
+    DEFAULT_TOLERANCE,
+    compare,
+    coverage_gaps,
+    ffmpeg_available,
+    peak_rss_mb,
+)
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+
+def _run_case(name: str, repeats: int) -> dict:
+    """Worker body: setup once, time `repeats` runs, report the best."""
+    from benchmarks.cases import CASES, CaseSkipped
+
+    logging.basicConfig(level=logging.WARNING)
+    case = CASES[name]
+    with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as workdir:
+        try:
+            state = case.setup(Path(workdir))
+        except CaseSkipped as e:
+            return {"skipped": str(e)}
+        timings = []
+        units = 0
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            units = case.run(state)
+            timings.append(time.perf_counter() - t0)
+    best = min(timings)
+    return {
+        "unit": case.unit,
+        "units": units,
+        "wall_seconds": round(best, 4),
+        "throughput": round(units / best, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "repeats": repeats,
+    }
+
+
+def _worker(name: str, repeats: int, queue) -> None:
+    try:
+        queue.put(_run_case(name, repeats))
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_isolated(name: str, repeats: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_worker, args=(name, repeats, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main(argv=None) -> int:
+    from benchmarks.cases import CASES
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="run only this case (repeatable)")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per case (default 3)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed relative regression (default {DEFAULT_TOLERANCE})")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--output", type=Path, help="also write the results JSON here")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write the results into the baseline instead of comparing")
+    args = parser.parse_args(argv)
+
+    if not ffmpeg_available():
+        print("ffmpeg/ffprobe not found on PATH", file=sys.stderr)
+        return 2
+
+    results = {}
+    for name in args.case or list(CASES):
+        print(f"[bench] {name} ...", file=sys.stderr, flush=True)
+        results[name] = run_isolated(name, args.repeats)
+
+    report = {
+        "generated_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "machine": f"{platform.system()} {platform.machine()} / Python {platform.python_version()}",
+        "cases": results,
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+
+    errors = [f"{name}: {r['error']}" for name, r in results.items() if "error" in r]
+    for line in errors:
+        print(f"[bench] ERROR {line}", file=sys.stderr)
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {"cases": {}}
+        for name, result in results.items():
+            # Only measurements go in: a machine without torch/modal neither
+            # erases a real number nor records a skip as if it were one.
+            if "error" in result or "skipped" in result:
+                continue
+            baseline["cases"][name] = result
+        baseline["generated_at"], baseline["machine"] = report["generated_at"], report["machine"]
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"[bench] baseline updated: {args.baseline}", file=sys.stderr)
+        return 1 if errors else 0
+
+    baseline = json.loads(args.baseline.read_text())["cases"] if args.baseline.exists() else {}
+    regressions = compare(results, baseline, args.tolerance)
+    gaps = coverage_gaps(results, baseline)
+    for name, result in sorted(results.items()):
+        if result.get("skipped"):
+            print(f"[bench] SKIPPED {name}: {result['skipped']}", file=sys.stderr)
+    for line in gaps:
+        print(f"[bench] UNCHECKED {line}", file=sys.stderr)
+    for line in regressions:
+        print(f"[bench] REGRESSION {line}", file=sys.stderr)
+    if not regressions and not errors and not gaps:
+        print("[bench] no regressions", file=sys.stderr)
+    return 1 if regressions or errors or gaps else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
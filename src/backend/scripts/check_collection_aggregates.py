@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Consistency check for the incrementally maintained Collections aggregates.
+
+Re-derives every collection_aggregates row from final_videos for one profile
+and prints any drift against the stored rows (see
+app/services/collection_aggregates.py). With --repair, a drifted profile is
+rebuilt from scratch.
+
+Usage:
+    cd src/backend
+    .venv/Scripts/python.exe scripts/check_collection_aggregates.py --user-id a --profile-id <id>
+
+Options:
+    --repair     Rebuild the aggregates when drift is found
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def main():
+    # Load .env file from project root before the app reads its config
+    from dotenv import load_dotenv
+    load_dotenv(Path(__file__).parent.parent.parent.parent / ".env")
+
+    from app.database import ensure_database, get_db_connection
+    from app.profile_context import set_current_profile_id
+    from app.services.collection_aggregates import check_collection_aggregates
+    from app.user_context import set_current_user_id
+
+    parser = argparse.ArgumentParser(description='Check Collections aggregates for drift')
+    parser.add_argument('--user-id', default='a', help='User ID to check (default: a)')
+    parser.add_argument('--profile-id', required=True, help='Profile ID to check')
+    parser.add_argument('--repair', action='store_true', help='Rebuild when drift is found')
+    args = parser.parse_args()
+
+    set_current_user_id(args.user_id)
+    set_current_profile_id(args.profile_id)
+    ensure_database()
+
+    with get_db_connection() as conn:
+        drift = check_collection_aggregates(conn, repair=args.repair)
+
+    if not drift:
+        print("Collection aggregates are consistent.")
+        return 0
+    print(f"Found {len(drift)} drifted field(s):")
+    for line in drift:
+        print(f"  {line}")
+    if args.repair:
+        print("Rebuilt from final_videos. Sync the profile DB to persist the repair.")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Consistency check for credit_user_totals.
+
+Re-derives every user's credit totals (spent, purchased, purchase history)
+from credit_transactions and prints any drift against the stored rows (see
+app/services/credit_ledger.py). With --repair, drifted rows are rewritten from
+the ledger. The v025 migration does the initial backfill; this is the
+verify/repair pass to run after it, or whenever the admin numbers look off.
+
+Usage:
+    cd src/backend
+    .venv/Scripts/python.exe scripts/check_credit_totals.py
+    .venv/Scripts/python.exe scripts/check_credit_totals.py --user-id a --user-id b --repair
+
+Options:
+    --user-id    Limit the check to this user (repeatable; default: every user)
+    --repair     Rewrite drifted rows from the ledger
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def main():
+    # Load .env file from project root before the app reads its config
+    from dotenv import load_dotenv
+    load_dotenv(Path(__file__).parent.parent.parent.parent / ".env")
+
+    from app.services.credit_ledger import check_user_totals
+    from app.services.pg import close_pg_pool, init_pg_pool
+
+    parser = argparse.ArgumentParser(description='Check credit_user_totals for drift')
+    parser.add_argument('--user-id', action='append', dest='user_ids', help='User ID to check (repeatable)')
+    parser.add_argument('--repair', action='store_true', help='Rewrite drifted rows from the ledger')
+    args = parser.parse_args()
+
+    init_pg_pool()
+    try:
+        drift = check_user_totals(user_ids=args.user_ids, repair=args.repair)
+    finally:
+        close_pg_pool()
+
+    if not drift:
+        print("Credit totals are consistent.")
+        return 0
+    print(f"Found {len(drift)} drifted user(s):")
+    for d in drift:
+        print(
+            f"  {d['user_id']}: spent {d['stored_spent']} (ledger {d['ledger_spent']}), "
+            f"purchased {d['stored_purchased']} (ledger {d['ledger_purchased']}), "
+            f"purchases {d['stored_purchase_amounts']} (ledger {d['ledger_purchase_amounts']})"
+        )
+    if args.repair:
+        print("Rewrote drifted rows from credit_transactions.")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
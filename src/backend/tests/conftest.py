@@ -68,11 +68,24 @@ def _mock_pg_startup():
          patch("app.services.sharing_db.get_pg", _stub_get_pg), \
          patch("app.services.credit_ledger.get_pg", _stub_get_pg), \
          patch("app.services.credit_backfill.get_pg", _stub_get_pg), \
+         patch("app.services.email_outbox.get_pg", _stub_get_pg), \
          patch("app.services.cleanup.start_cleanup_loop", new_callable=AsyncMock), \
          patch("app.services.cleanup.stop_cleanup_loop", new_callable=AsyncMock):
         yield
 
 
+@pytest.fixture(autouse=True)
+def _isolated_poster_cache(tmp_path, monkeypatch):
+    """Every test starts with an empty poster byte cache on a private disk dir,
+    so a poster served by one test is never a cache hit in the next."""
+    from app.services import poster_cache
+
+    monkeypatch.setattr(poster_cache, "_DISK_DIR", tmp_path / "poster_cache")
+    poster_cache.clear()
+    yield
+    poster_cache.clear()
+
+
 _TEST_USER_IDS = (
     "admin-user", "regular-user", "sharer-user", "recipient-user",
     "user-1", "user-2", "test-user-1", "test-user", "user-a", "user-b", "user-c",
@@ -151,8 +164,9 @@ def pg_conn(monkeypatch):
     cur.execute(f"DELETE FROM credit_transactions WHERE user_id IN ({placeholders})", _TEST_USER_IDS)
     cur.execute(f"DELETE FROM credit_reservations WHERE user_id IN ({placeholders})", _TEST_USER_IDS)
     cur.execute(f"DELETE FROM credits WHERE user_id IN ({placeholders})", _TEST_USER_IDS)
+    cur.execute(f"DELETE FROM credit_user_totals WHERE user_id IN ({placeholders})", _TEST_USER_IDS)
     cur.execute(f"DELETE FROM users WHERE user_id IN ({placeholders})", _TEST_USER_IDS)
-    cur.execute("TRUNCATE otp_codes, r2_grace_deletions, impersonation_audit, pending_teammate_shares, game_ref_counts, daily_counters")
+    cur.execute("TRUNCATE otp_codes, r2_grace_deletions, impersonation_audit, pending_teammate_shares, game_ref_counts, daily_counters, admin_email_jobs, admin_email_outbox")
     cur.execute(_SEED_SQL)
     # T5840: open the credits_ready gate by default so the general test suite
     # (which predates the gate) doesn't 503 on every grant/debit. Tests that
@@ -167,6 +181,8 @@ def pg_conn(monkeypatch):
 
     from app.services import credit_ledger
     credit_ledger.reset_ready_cache_for_tests()
+    from app.routers import admin
+    admin.reset_user_count_cache_for_tests()
 
     @contextmanager
     def mock_get_pg():
@@ -186,6 +202,7 @@ def pg_conn(monkeypatch):
     monkeypatch.setattr("app.analytics.get_pg", mock_get_pg)
     monkeypatch.setattr("app.routers.admin.get_pg", mock_get_pg)
     monkeypatch.setattr("app.services.credit_ledger.get_pg", mock_get_pg)
+    monkeypatch.setattr("app.services.email_outbox.get_pg", mock_get_pg)
     monkeypatch.setattr("app.services.credit_backfill.get_pg", mock_get_pg)
 
     yield dsn
@@ -206,6 +223,7 @@ def pg_conn(monkeypatch):
     tc.execute(f"DELETE FROM credit_transactions WHERE user_id IN ({placeholders})", _TEST_USER_IDS)
     tc.execute(f"DELETE FROM credit_reservations WHERE user_id IN ({placeholders})", _TEST_USER_IDS)
     tc.execute(f"DELETE FROM credits WHERE user_id IN ({placeholders})", _TEST_USER_IDS)
+    tc.execute(f"DELETE FROM credit_user_totals WHERE user_id IN ({placeholders})", _TEST_USER_IDS)
     tc.execute(f"DELETE FROM users WHERE user_id IN ({placeholders})", _TEST_USER_IDS)
     teardown.close()
 
@@ -12,6 +12,7 @@ Tests cover:
 - POST /api/admin/users/{id}/grant-credits grants credits
 """
 
+import time
 from unittest.mock import patch
 
 import pytest
@@ -398,7 +399,17 @@ class TestAdminBulkEmail:
         )
         assert resp.status_code == 403
 
-    def test_happy_path_sends_each_recipient(self, client):
+    def _wait_for_job(self, client, job_id, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            resp = client.get(f"/api/admin/users/bulk/email/{job_id}", headers=_auth_headers("admin-user"))
+            assert resp.status_code == 200
+            data = resp.json()
+            if data["status"] == "done" or time.monotonic() > deadline:
+                return data
+            time.sleep(0.05)
+
+    def test_happy_path_queues_and_sends_each_recipient(self, client):
         resp = client.post(
             "/api/admin/users/bulk/email",
             json={
@@ -409,13 +420,40 @@ class TestAdminBulkEmail:
             headers=_auth_headers("admin-user"),
         )
         assert resp.status_code == 200
-        data = resp.json()
+        queued = resp.json()
+        assert queued["total"] == 2
+        assert queued["queued"] == 2
+
+        data = self._wait_for_job(client, queued["job_id"])
+        assert data["status"] == "done"
         assert data["sent"] == 2
         assert data["failed"] == 0
         by_id = {r["user_id"]: r for r in data["results"]}
         assert by_id["regular-user"]["ok"] is True
         assert by_id["regular-user"]["email"] == "other@test.local"
 
+    def test_unknown_user_is_a_failed_result_not_an_error(self, client):
+        resp = client.post(
+            "/api/admin/users/bulk/email",
+            json={"user_ids": ["regular-user", "nobody-here"], "subject": "Hi", "body": "Body"},
+            headers=_auth_headers("admin-user"),
+        )
+        assert resp.json()["queued"] == 1
+
+        data = self._wait_for_job(client, resp.json()["job_id"])
+        assert data["sent"] == 1
+        assert data["failed"] == 1
+        by_id = {r["user_id"]: r for r in data["results"]}
+        assert by_id["nobody-here"] == {"user_id": "nobody-here", "ok": False, "error": "no email on file"}
+
+    def test_status_of_unknown_job_is_404(self, client):
+        resp = client.get("/api/admin/users/bulk/email/nope", headers=_auth_headers("admin-user"))
+        assert resp.status_code == 404
+
+    def test_status_non_admin_gets_403(self, client):
+        resp = client.get("/api/admin/users/bulk/email/nope", headers=_auth_headers("regular-user"))
+        assert resp.status_code == 403
+
     def test_test_send_ignores_ids_and_hits_only_caller(self, client):
         resp = client.post(
             "/api/admin/users/bulk/email",
@@ -436,14 +474,14 @@ class TestAdminBulkEmail:
         assert data["results"][0]["email"] == "test-admin@test.local"
 
     def test_dev_mode_does_not_500(self, client):
-        """With RESEND_API_KEY unset, the endpoint returns 200 (logs), not 500."""
+        """With RESEND_API_KEY unset, the job completes (logs), never 500s."""
         resp = client.post(
             "/api/admin/users/bulk/email",
             json={"user_ids": ["regular-user"], "subject": "Yo", "body": "Body"},
             headers=_auth_headers("admin-user"),
         )
         assert resp.status_code == 200
-        assert resp.json()["sent"] == 1
+        assert self._wait_for_job(client, resp.json()["job_id"])["sent"] == 1
 
     def test_over_cap_rejected(self, client):
         resp = client.post(
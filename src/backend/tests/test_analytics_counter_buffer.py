@@ -0,0 +1,161 @@
+"""
+_DailyCounterBuffer (app/analytics.py): every pending (day, origin) key is
+written in ONE multi-row upsert on ONE pool checkout, the buffer is bounded
+with inline-flush backpressure, and close() does the final flush.
+
+Runs against the local Postgres (the counters fixture empties daily_counters).
+"""
+
+import time
+from contextlib import contextmanager
+from datetime import UTC, date, datetime
+from unittest.mock import patch
+
+import pytest
+
+from app import analytics
+from app.analytics import _DailyCounterBuffer
+
+COLUMNS = ["signups", "games_created", "clips_created", "exports_completed", "sessions_started"]
+
+
+@pytest.fixture()
+def counters_db(pg_conn):
+    with analytics.get_pg() as conn:
+        conn.cursor().execute("DELETE FROM daily_counters")
+    yield
+    with analytics.get_pg() as conn:
+        conn.cursor().execute("DELETE FROM daily_counters")
+
+
+@pytest.fixture()
+def buffer(counters_db):
+    buf = _DailyCounterBuffer(flush_interval=3600, max_keys=1000)
+    yield buf
+    buf.close()
+
+
+def _counters():
+    with analytics.get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT * FROM daily_counters")
+        return {(r["counter_date"], r["origin_type"]): r for r in cur.fetchall()}
+
+
+@contextmanager
+def _count_checkouts():
+    checkouts = []
+    get_pg = analytics.get_pg  # pg_conn's direct-connect stand-in for the pool
+
+    @contextmanager
+    def counting_get_pg():
+        checkouts.append(1)
+        with get_pg() as conn:
+            yield conn
+
+    with patch.object(analytics, "get_pg", counting_get_pg):
+        yield checkouts
+
+
+class _Clock(datetime):
+    # 23:30 UTC is already the next day east of UTC: the key must be the UTC day.
+    current = datetime(2026, 3, 1, 23, 30, tzinfo=UTC)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current.astimezone(tz)
+
+
+def _utc_today():
+    return datetime.now(UTC).date()
+
+
+def test_flush_writes_every_key_in_one_statement(buffer):
+    origins = [f"origin-{i}" for i in range(400)]
+    for i, origin in enumerate(origins):
+        for column in COLUMNS[: 1 + i % len(COLUMNS)]:
+            buffer.increment(origin, column)
+        buffer.increment(origin, "signups")
+
+    with _count_checkouts() as checkouts, \
+         patch.object(analytics, "execute_values", wraps=analytics.execute_values) as spy:
+        started = time.perf_counter()
+        buffer.flush()
+        elapsed = time.perf_counter() - started
+
+    assert len(checkouts) == 1
+    spy.assert_called_once()
+    assert spy.call_args.kwargs["page_size"] == len(origins)  # one page -> one round trip
+    counters = _counters()
+    today = _utc_today()
+    assert len(counters) == len(origins)
+    assert counters[(today, "origin-0")]["signups"] == 2
+    assert counters[(today, "origin-4")]["sessions_started"] == 1
+    assert counters[(today, "origin-4")]["invites_sent"] == 0
+    assert elapsed < 2.0, f"flush of {len(origins)} keys took {elapsed:.3f}s"
+
+    # A second flush adds to the existing rows.
+    buffer.increment("origin-0", "signups")
+    buffer.flush()
+    assert _counters()[(today, "origin-0")]["signups"] == 3
+
+
+def test_day_is_taken_at_increment_time(buffer):
+    _Clock.current = datetime(2026, 3, 1, 23, 30, tzinfo=UTC)
+    with patch.object(analytics, "datetime", _Clock):
+        buffer.increment("all", "signups")
+        _Clock.current = datetime(2026, 3, 2, 0, 30, tzinfo=UTC)
+        buffer.increment("all", "signups")
+        buffer.increment("all", "signups")
+    buffer.flush()
+
+    counters = _counters()
+    assert counters[(date(2026, 3, 1), "all")]["signups"] == 1
+    assert counters[(date(2026, 3, 2), "all")]["signups"] == 2
+
+
+def test_full_buffer_flushes_inline(counters_db):
+    buf = _DailyCounterBuffer(flush_interval=3600, max_keys=3)
+    try:
+        for origin in ("a", "b", "c"):
+            buf.increment(origin, "signups")
+        assert _counters() == {}
+
+        buf.increment("d", "signups")  # 4th key: the caller flushes first
+
+        assert {origin for _, origin in _counters()} == {"a", "b", "c"}
+    finally:
+        buf.close()
+    assert {origin for _, origin in _counters()} == {"a", "b", "c", "d"}
+
+
+def test_failing_postgres_bounds_the_buffer_and_keeps_counts(counters_db):
+    buf = _DailyCounterBuffer(flush_interval=3600, max_keys=2)
+
+    @contextmanager
+    def down():
+        raise ConnectionError("pg down")
+        yield
+
+    try:
+        with patch.object(analytics, "get_pg", down):
+            for origin in ("a", "b", "c", "d", "e"):
+                buf.increment(origin, "signups")
+            buf.increment("a", "signups")  # pending key: still merges
+
+        assert buf.dropped == 1
+        buf.flush()
+        counters = {origin: row["signups"] for (_, origin), row in _counters().items()}
+        assert counters == {"a": 2, "b": 1, "c": 1, "d": 1}
+    finally:
+        buf.close()
+
+
+def test_close_flushes_and_stops_the_timer(counters_db):
+    buf = _DailyCounterBuffer(flush_interval=3600)
+    buf.increment("all", "exports_started")
+
+    buf.close()
+
+    assert not buf._timer.is_alive()
+    assert _counters()[(_utc_today(), "all")]["exports_started"] == 1
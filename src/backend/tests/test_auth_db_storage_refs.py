@@ -6,16 +6,10 @@ Tests for game storage functions after T2930 refactor:
 """
 
 import sqlite3
-import sys
-import types
 import pytest
 from datetime import datetime, timedelta, timezone
 from unittest.mock import patch
 
-# Prevent cv2 import failure when app.services.__init__ loads image_extractor
-if "cv2" not in sys.modules:
-    sys.modules["cv2"] = types.ModuleType("cv2")
-
 from app.services import auth_db
 
 
@@ -145,6 +139,53 @@ class TestInsertGameStorageRef:
         assert row["latest_expiry"].isoformat() >= late[:19]
 
 
+def _ref_counts():
+    with auth_db.get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT blake3_hash, ref_count, latest_expiry FROM game_ref_counts")
+        return {r["blake3_hash"]: (r["ref_count"], r["latest_expiry"]) for r in cur.fetchall()}
+
+
+class TestInsertGameStorageRefsBatch:
+    def test_batch_matches_sequential_semantics(self, temp_auth_db):
+        now = datetime.now(timezone.utc)
+        d30, d60, d90 = ((now + timedelta(days=d)).isoformat() for d in (30, 60, 90))
+        auth_db.insert_grace_deletion("hash_b")
+
+        counts = auth_db.insert_game_storage_refs("user-1", "prof-1", [
+            ("hash_a", 1000, d60),
+            ("hash_b", 2000, d30),
+            ("hash_a", 1500, d30),  # repeated hash: SQLite takes the last, PG the latest expiry
+        ])
+
+        assert counts == {"hash_a": 1, "hash_b": 1}
+        ref_a = auth_db.get_game_storage_ref("user-1", "prof-1", "hash_a")
+        assert (ref_a["game_size_bytes"], ref_a["storage_expires_at"]) == (1500, d30)
+        pg = _ref_counts()
+        assert pg["hash_a"][0] == 1
+        assert pg["hash_a"][1] == datetime.fromisoformat(d60)
+        assert auth_db.get_grace_deletion_hashes() == set()
+
+        counts = auth_db.insert_game_storage_refs("user-1", "prof-1", [
+            ("hash_a", 1500, d90),
+            ("hash_c", 10, d30),
+        ])
+
+        assert counts == {"hash_c": 1}  # hash_a already held by this profile
+        pg = _ref_counts()
+        assert pg["hash_a"] == (1, datetime.fromisoformat(d90))
+
+    def test_other_profiles_increment_atomically(self, temp_auth_db):
+        future = (datetime.now(timezone.utc) + timedelta(days=30)).isoformat()
+        auth_db.insert_game_storage_refs("user-1", "prof-1", [("hash_a", 1000, future)])
+        _setup_user2_profile(temp_auth_db["tmp_path"])
+
+        assert auth_db.insert_game_storage_refs("user-2", "prof-2", [("hash_a", 1000, future)]) == {"hash_a": 2}
+        assert auth_db.decrement_game_ref_counts(["hash_a", "unknown"]) == {"hash_a": 1}
+        assert auth_db.increment_game_ref_counts(["hash_a", "unknown"]) == {"hash_a": 2}
+        assert auth_db.insert_game_storage_refs("user-2", "prof-2", []) == {}
+
+
 # ---------------------------------------------------------------------------
 # get_game_storage_ref
 # ---------------------------------------------------------------------------
@@ -162,6 +203,21 @@ class TestGetGameStorageRef:
         assert ref["storage_expires_at"] == future
 
 
+class TestGetGameStorageRefs:
+    def test_batch_lookup_returns_only_existing_hashes(self, temp_auth_db):
+        future = (datetime.now(timezone.utc) + timedelta(days=30)).isoformat()
+        auth_db.insert_game_storage_ref("user-1", "prof-1", "hash_a", 2000, future)
+        auth_db.insert_game_storage_ref("user-1", "prof-1", "hash_b", 3000, future)
+
+        refs = auth_db.get_game_storage_refs("user-1", "prof-1", ["hash_a", "nope", "hash_b", "hash_a"])
+        assert set(refs) == {"hash_a", "hash_b"}
+        assert refs["hash_b"]["game_size_bytes"] == 3000
+        assert refs["hash_a"] == auth_db.get_game_storage_ref("user-1", "prof-1", "hash_a")
+
+    def test_empty_input(self, temp_auth_db):
+        assert auth_db.get_game_storage_refs("user-1", "prof-1", []) == {}
+
+
 # ---------------------------------------------------------------------------
 # get_storage_refs_for_user
 # ---------------------------------------------------------------------------
@@ -234,8 +234,8 @@ def _common_patches(tmp_path):
     stack.enter_context(patch("app.services.materialization.USER_DATA_BASE", tmp_path))
     stack.enter_context(patch("app.database.USER_DATA_BASE", tmp_path))
     stack.enter_context(patch("app.storage.R2_ENABLED", False))
-    stack.enter_context(patch("app.services.materialization.insert_game_storage_ref"))
-    stack.enter_context(patch("app.services.materialization.get_game_storage_ref", return_value=None))
+    stack.enter_context(patch("app.services.materialization.insert_game_storage_refs"))
+    stack.enter_context(patch("app.services.materialization.get_game_storage_refs", return_value={}))
     stack.enter_context(patch("app.services.project_archive.archive_completed_projects", return_value=0))
     stack.enter_context(patch("app.services.project_archive.cleanup_database_bloat"))
     stack.enter_context(patch("app.session_init._schedule_startup_recovery"))
@@ -0,0 +1,54 @@
+"""
+Offline benchmark harness (benchmarks/): the baseline comparison that gates a
+slowdown, and the local-filesystem R2 stand-in the sync/stitch cases run on.
+"""
+
+import io
+
+import pytest
+
+from benchmarks.harness import LocalR2, compare, coverage_gaps
+
+BASE = {"overlay_export": {"wall_seconds": 4.0, "throughput": 30.0, "peak_rss_mb": 180.0}}
+
+
+def test_twenty_five_percent_slowdown_is_a_regression():
+    slower = {"overlay_export": {"wall_seconds": 5.0, "throughput": 24.0, "peak_rss_mb": 180.0}}
+    regressions = compare(slower, BASE, tolerance=0.2)
+    assert [r.split(":")[1].split()[0] for r in regressions] == ["wall_seconds", "throughput"]
+
+
+def test_noise_within_tolerance_and_skips_pass():
+    noisy = {
+        "overlay_export": {"wall_seconds": 4.4, "throughput": 27.3, "peak_rss_mb": 190.0},
+        "frame_processor": {"skipped": "no torch"},
+    }
+    assert compare(noisy, BASE, tolerance=0.2) == []
+    assert coverage_gaps(noisy, {**BASE, "frame_processor": {"skipped": "no torch"}}) == []
+
+
+def test_cases_without_a_baseline_are_reported():
+    results = {
+        "overlay_export": {"skipped": "no ffmpeg"},
+        "new_case": {"wall_seconds": 99.0},
+        "frame_processor": {"wall_seconds": 2.0},
+    }
+    baseline = {**BASE, "frame_processor": {"skipped": "no torch"}}
+    assert compare(results, baseline, tolerance=0.2) == []
+    assert [g.split(":")[0] for g in coverage_gaps(results, baseline)] == [
+        "frame_processor", "new_case", "overlay_export",
+    ]
+
+
+def test_local_r2_round_trips_metadata_and_404s(tmp_path):
+    r2 = LocalR2(tmp_path)
+    r2.upload_fileobj(io.BytesIO(b"db"), "b", "u/profile.sqlite",
+                      ExtraArgs={"Metadata": {"db-version": "3"}})
+    assert r2.head_object(Bucket="b", Key="u/profile.sqlite")["Metadata"] == {"db-version": "3"}
+
+    r2.download_file("b", "u/profile.sqlite", str(tmp_path / "copy"))
+    assert (tmp_path / "copy").read_bytes() == b"db"
+
+    with pytest.raises(r2.exceptions.ClientError) as e:
+        r2.head_object(Bucket="b", Key="u/missing")
+    assert e.value.response["Error"]["Code"] == "404"
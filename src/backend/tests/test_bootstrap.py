@@ -18,12 +18,14 @@ Run with: pytest src/backend/tests/test_bootstrap.py -v
 """
 
 import asyncio
+import json
 import shutil
 import sys
 import uuid
 from pathlib import Path
 
 import pytest
+from starlette.requests import Request
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -54,7 +56,9 @@ def teardown_module():
     reset_user_id()
 
 
-from app.routers.bootstrap import bootstrap
+from app.routers import bootstrap as bootstrap_module
+
+bootstrap = bootstrap_module.bootstrap
 
 
 def _ctx():
@@ -66,9 +70,18 @@ def _ctx():
     set_current_profile_id(TEST_PROFILE_ID)
 
 
-def _run_bootstrap():
+def _request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/api/bootstrap", "headers": headers})
+
+
+def _call_bootstrap(if_none_match=None, delta=False):
     _ctx()
-    return asyncio.run(bootstrap())
+    return asyncio.run(bootstrap(_request(if_none_match), delta=delta))
+
+
+def _run_bootstrap():
+    return json.loads(_call_bootstrap().body)
 
 
 @pytest.fixture
@@ -157,3 +170,127 @@ class TestBootstrapContract:
         for _ in range(3):
             again = _run_bootstrap()
             assert set(again.keys()) == set(first.keys())
+
+
+class TestBootstrapSnapshot:
+    """Repeat loads: 304 on a matching ETag, cached sections while neither SQLite
+    file changed, a full re-read once one did, and opt-in delta responses."""
+
+    @pytest.fixture(autouse=True)
+    def _clean_snapshots(self):
+        bootstrap_module.clear_snapshots()
+        yield
+        bootstrap_module.clear_snapshots()
+
+    @pytest.fixture
+    def read_count(self, monkeypatch):
+        calls = []
+        real = bootstrap_module._read_sections
+
+        async def counting(user_id):
+            calls.append(user_id)
+            return await real(user_id)
+
+        monkeypatch.setattr(bootstrap_module, "_read_sections", counting)
+        return calls
+
+    def test_matching_etag_is_304_without_reads(self, read_count):
+        first = _call_bootstrap()
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"] == "private, no-cache"
+
+        again = _call_bootstrap(if_none_match=etag)
+
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+        assert len(read_count) == 1
+
+    def test_unchanged_databases_serve_the_cached_snapshot(self, read_count):
+        first = _call_bootstrap()
+        second = _call_bootstrap()
+
+        assert len(read_count) == 1
+        assert second.body == first.body
+        assert second.headers["etag"] == first.headers["etag"]
+
+    def test_profile_write_invalidates_the_snapshot(self, read_count, seeded_game):
+        first = _call_bootstrap()
+        _ctx()
+        from app.database import get_db_connection
+        with get_db_connection() as conn:
+            conn.cursor().execute("UPDATE games SET name = ? WHERE id = ?", ("Renamed Game", seeded_game["id"]))
+            conn.commit()
+
+        second = _call_bootstrap(if_none_match=first.headers["etag"])
+
+        assert second.status_code == 200
+        assert second.headers["etag"] != first.headers["etag"]
+        assert len(read_count) == 2
+        names = [g.get("name") for g in json.loads(second.body)["games"]["games"]]
+        assert "Renamed Game" in names
+
+    def test_grace_set_change_invalidates_the_snapshot(self, pg_conn, read_count, seeded_game):
+        """can_extend is read from Postgres r2_grace_deletions, outside both
+        SQLite files -- the vector's grace version must move the ETag."""
+        from app.services.auth_db import delete_grace_deletion, insert_grace_deletion
+
+        def can_extend(response):
+            games = json.loads(response.body)["games"]["games"]
+            return next(g["can_extend"] for g in games if g["id"] == seeded_game["id"])
+
+        first = _call_bootstrap()
+        assert can_extend(first) is False
+        insert_grace_deletion(seeded_game["hash"])
+        try:
+            second = _call_bootstrap(if_none_match=first.headers["etag"])
+            assert second.status_code == 200
+            assert second.headers["etag"] != first.headers["etag"]
+            assert can_extend(second) is True
+            assert len(read_count) == 2
+
+            data = json.loads(_call_bootstrap(if_none_match=first.headers["etag"], delta=True).body)
+            assert "games" in data and "projects" not in data
+        finally:
+            delete_grace_deletion(seeded_game["hash"])
+
+    def test_unrelated_grace_write_keeps_the_snapshot(self, pg_conn, read_count, seeded_game):
+        """Another user's game entering the grace set must not move this ETag."""
+        from app.services.auth_db import delete_grace_deletion, insert_grace_deletion
+
+        first = _call_bootstrap()
+        other_hash = uuid.uuid4().hex
+        insert_grace_deletion(other_hash)
+        try:
+            second = _call_bootstrap(if_none_match=first.headers["etag"])
+            assert second.status_code == 304
+            assert len(read_count) == 1
+        finally:
+            delete_grace_deletion(other_hash)
+
+    def test_delta_returns_only_moved_sections(self, seeded_game):
+        first = _call_bootstrap()
+        _ctx()
+        from app.database import get_db_connection
+        with get_db_connection() as conn:
+            conn.cursor().execute("UPDATE games SET name = ? WHERE id = ?", ("Delta Game", seeded_game["id"]))
+            conn.commit()
+
+        data = json.loads(_call_bootstrap(if_none_match=first.headers["etag"], delta=True).body)
+
+        assert data["delta"] is True
+        assert "credits" in data
+        assert {"projects", "games", "downloads", "exports", "pending_uploads", "quests_progress"} <= data.keys()
+        assert "profiles" not in data and "settings" not in data
+
+    def test_ttl_bucket_expires_the_snapshot(self, read_count, monkeypatch):
+        first = _call_bootstrap()
+        real_time = bootstrap_module.time.time
+        monkeypatch.setattr(
+            bootstrap_module.time, "time",
+            lambda: real_time() + bootstrap_module.BOOTSTRAP_SNAPSHOT_TTL_SECONDS,
+        )
+
+        second = _call_bootstrap(if_none_match=first.headers["etag"])
+
+        assert second.status_code == 200
+        assert len(read_count) == 2
@@ -0,0 +1,127 @@
+"""
+Shared intro/outro card cache (app/services/card_cache.py): a burst of callers for
+the same card renders it exactly once -- across threads and across processes --
+the directory is LRU-trimmed by total bytes, and hit/miss/build counters add up.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services import card_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats():
+    card_cache.reset_stats()
+    yield
+    card_cache.reset_stats()
+
+
+def _slow_build(calls, size=1000, delay=0.2):
+    def build(tmp_path):
+        calls.append(tmp_path)
+        time.sleep(delay)
+        Path(tmp_path).write_bytes(b"x" * size)
+    return build
+
+
+def test_concurrent_callers_build_each_card_once(tmp_path):
+    calls = []
+    build = _slow_build(calls)
+    results = []
+
+    def worker(key):
+        results.append(card_cache.get_or_build(tmp_path, key, build, namespace="intro"))
+
+    threads = [threading.Thread(target=worker, args=(f"k{i % 2}",)) for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 2, "one build per distinct card"
+    assert sorted(set(results)) == [
+        str(card_cache.card_path(tmp_path, "k0")), str(card_cache.card_path(tmp_path, "k1")),
+    ]
+    stats = card_cache.stats("intro")
+    assert stats["builds"] == 2
+    assert stats["misses"] == 2
+    assert stats["hits"] + stats["coalesced"] == 8
+    assert stats["build_seconds"] >= 0.4
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def _build_in_subprocess(cache_dir, log_path):
+    def build(tmp_path):
+        with open(log_path, "a") as f:
+            f.write(f"{os.getpid()}\n")
+        time.sleep(0.3)
+        Path(tmp_path).write_bytes(b"card")
+    card_cache.get_or_build(Path(cache_dir), "shared", build)
+
+
+@pytest.mark.skipif(card_cache.fcntl is None, reason="cross-process lock needs fcntl")
+def test_workers_share_one_build_through_the_file_lock(tmp_path):
+    log_path = tmp_path / "builds.log"
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_build_in_subprocess, args=(tmp_path, log_path)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=30)
+
+    assert all(p.exitcode == 0 for p in procs)
+    assert len(log_path.read_text().splitlines()) == 1
+    assert card_cache.card_path(tmp_path, "shared").read_bytes() == b"card"
+
+
+def test_failed_build_raises_and_leaves_no_partial_file(tmp_path):
+    def bad_build(tmp_card):
+        Path(tmp_card).write_bytes(b"partial")
+        raise RuntimeError("ffmpeg died")
+
+    with pytest.raises(RuntimeError):
+        card_cache.get_or_build(tmp_path, "k", bad_build, namespace="outro")
+
+    assert not list(tmp_path.glob("card_k.mp4*"))
+    assert card_cache.stats("outro")["build_failures"] == 1
+
+    calls = []
+    card_cache.get_or_build(tmp_path, "k", _slow_build(calls, delay=0), namespace="outro")
+    assert len(calls) == 1, "a failed build is retried by the next caller"
+
+
+def test_trim_evicts_least_recently_used_cards(tmp_path, monkeypatch):
+    monkeypatch.setattr(card_cache, "CARD_CACHE_MAX_BYTES", 2500)
+    monkeypatch.setattr(card_cache, "CARD_CACHE_EVICT_GRACE_SECONDS", 0)
+    calls = []
+    build = _slow_build(calls, delay=0)
+    now = time.time()
+    for i, key in enumerate(("a", "b")):
+        path = card_cache.get_or_build(tmp_path, key, build)
+        os.utime(path, (now - 100 + i, now - 100 + i))
+
+    card_cache.get_or_build(tmp_path, "a", build)  # hit: "a" becomes most recent
+    card_cache.get_or_build(tmp_path, "c", build)  # 3000 bytes > 2500 -> evict "b"
+
+    assert sorted(p.name for p in tmp_path.glob("card_*.mp4")) == ["card_a.mp4", "card_c.mp4"]
+    assert card_cache.stats("card")["evictions"] == 1
+    if card_cache.fcntl is not None:
+        # Another worker may be blocked on it: the lock file outlives its card.
+        assert (tmp_path / "card_b.lock").exists()
+
+
+def test_trim_spares_recently_used_cards(tmp_path, monkeypatch):
+    monkeypatch.setattr(card_cache, "CARD_CACHE_MAX_BYTES", 1500)
+    calls = []
+    build = _slow_build(calls, delay=0)
+    for key in ("a", "b", "c"):
+        card_cache.get_or_build(tmp_path, key, build)
+
+    assert len(list(tmp_path.glob("card_*.mp4"))) == 3
+    assert card_cache.stats("card")["evictions"] == 0
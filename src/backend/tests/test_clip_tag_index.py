@@ -0,0 +1,168 @@
+"""
+Normalized tag index for library clip filtering (services/clip_tag_index).
+
+preview-clips / from-clips filter tags through raw_clip_tags; triggers queue
+changed clips into raw_clip_tags_dirty in the writer's transaction, and a
+tracked writer's commit folds them. Most clips are written with plain SQL (an
+untracked writer) so the triggers -- not the service -- have to notice every
+change, and the preview must answer for still-queued clips without writing.
+"""
+
+import asyncio
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from app.services import clip_tag_index
+from app.utils.encoding import encode_data
+
+USER_ID = "test-user-cliptags"
+PROFILE_ID = "testdefault"
+
+
+@pytest.fixture()
+def db(tmp_path):
+    from app.profile_context import set_current_profile_id
+    from app.user_context import set_current_user_id
+
+    set_current_user_id(USER_ID)
+    set_current_profile_id(PROFILE_ID)
+    with patch("app.database.USER_DATA_BASE", tmp_path), \
+         patch("app.database._initialized_users", set()), \
+         patch("app.database.R2_ENABLED", False):
+        from app.database import ensure_database, get_database_path
+        ensure_database()
+        yield get_database_path()
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _insert_clip(conn, *, rating=3, tags=None, game_id=None, end_time=10.0):
+    cur = conn.execute(
+        "INSERT INTO raw_clips (filename, rating, tags, game_id, start_time, end_time) "
+        "VALUES ('c.mp4', ?, ?, ?, 0, ?)",
+        (rating, encode_data(tags) if tags is not None else None, game_id, end_time),
+    )
+    return cur.lastrowid
+
+
+def _preview(**kwargs):
+    from app.routers.projects import ClipsPreviewRequest, preview_clips
+    resp = asyncio.run(preview_clips(ClipsPreviewRequest(**{"min_rating": 0, **kwargs})))
+    return sorted(c.id if hasattr(c, "id") else c["id"] for c in resp.clips)
+
+
+def _index(conn):
+    return sorted(tuple(r) for r in conn.execute("SELECT clip_id, tag FROM raw_clip_tags"))
+
+
+def test_all_tags_filter_intersects_the_index(db):
+    conn = _connect(db)
+    goal_assist = _insert_clip(conn, tags=["Goal", "Assist"], end_time=1)
+    goal = _insert_clip(conn, tags=["Goal"], end_time=2)
+    _insert_clip(conn, tags=["Save"], end_time=3)
+    _insert_clip(conn, tags=None, end_time=4)
+    conn.commit()
+    assert conn.execute("SELECT COUNT(*) FROM raw_clip_tags_dirty").fetchone()[0] == 3
+
+    assert _preview(tags=["Goal"]) == sorted([goal_assist, goal])
+    assert _preview(tags=["Goal", "Assist"]) == [goal_assist]
+    assert _preview(tags=["Goal", "Goal"]) == sorted([goal_assist, goal]), "duplicate tags count once"
+    assert _preview(tags=["Goal", "Save"]) == []
+    conn.close()
+
+    # Folded (as a tracked writer's commit would), the index answers alone.
+    conn = _connect(db)
+    assert clip_tag_index.apply_pending_clip_tags(conn) == 3
+    assert _preview(tags=["Goal", "Assist"]) == [goal_assist]
+    assert _preview(tags=["Goal", "Goal"]) == sorted([goal_assist, goal])
+    conn.close()
+
+
+def test_tag_edits_and_deletes_reach_the_index(db):
+    conn = _connect(db)
+    a = _insert_clip(conn, tags=["Goal"], end_time=1)
+    b = _insert_clip(conn, tags=["Goal"], end_time=2)
+    conn.commit()
+    assert _preview(tags=["Goal"]) == sorted([a, b])
+
+    conn.execute("UPDATE raw_clips SET tags = ? WHERE id = ?", (encode_data(["Save"]), a))
+    conn.execute("DELETE FROM raw_clips WHERE id = ?", (b,))
+    conn.commit()
+    assert [r[0] for r in conn.execute("SELECT clip_id FROM raw_clip_tags_dirty")] == [a], \
+        "the delete is immediate, the edit is queued"
+
+    assert _preview(tags=["Goal"]) == []
+    assert _preview(tags=["Save"]) == [a]
+    conn.close()
+
+
+def test_preview_is_read_only_and_tracked_commits_fold(db):
+    from app.database import data_version, get_database_path, get_db_connection
+
+    conn = _connect(db)
+    queued = _insert_clip(conn, tags=["Goal"], end_time=1)
+    conn.commit()
+    assert _preview(tags=["Save"]) == []  # first open settles the journal mode
+    version = data_version(get_database_path(), ("profile", USER_ID, PROFILE_ID))
+
+    assert _preview(tags=["Goal"]) == [queued]
+    assert data_version(get_database_path(), ("profile", USER_ID, PROFILE_ID)) == version
+    assert conn.execute("SELECT COUNT(*) FROM raw_clip_tags_dirty").fetchone()[0] == 1
+
+    with get_db_connection() as tracked:
+        tracked.execute("UPDATE raw_clips SET tags = ? WHERE id = ?", (encode_data(["Save"]), queued))
+        tracked.commit()
+    assert _index(conn) == [(queued, "Save")]
+    assert conn.execute("SELECT COUNT(*) FROM raw_clip_tags_dirty").fetchone()[0] == 0
+    conn.close()
+
+
+def test_rating_and_game_filters_combine_with_tags(db):
+    conn = _connect(db)
+    conn.execute("INSERT INTO games (id, name) VALUES (1, 'G1'), (2, 'G2')")
+    keep = _insert_clip(conn, rating=5, tags=["Goal"], game_id=1, end_time=1)
+    _insert_clip(conn, rating=2, tags=["Goal"], game_id=1, end_time=2)
+    _insert_clip(conn, rating=5, tags=["Goal"], game_id=2, end_time=3)
+    conn.commit()
+
+    assert _preview(tags=["Goal"], min_rating=4, game_ids=[1]) == [keep]
+    conn.close()
+
+
+def test_tag_filter_does_not_scan_raw_clips(db):
+    from app.routers.projects import _build_clips_filter_query
+
+    conn = _connect(db)
+    query, params = _build_clips_filter_query([], 0, ["Goal", "Assist"])
+    plan = " | ".join(r["detail"] for r in conn.execute(f"EXPLAIN QUERY PLAN {query}", params))
+    assert "raw_clip_tags" in plan
+    assert "SCAN rc" not in plan, plan
+
+    query, params = _build_clips_filter_query([1, 2], 4, [])
+    plan = " | ".join(r["detail"] for r in conn.execute(f"EXPLAIN QUERY PLAN {query}", params))
+    assert "SCAN rc" not in plan, plan
+    conn.close()
+
+
+def test_v048_backfills_an_existing_profile(db):
+    from app.migrations.profile_db.v048_clip_tag_index import V048ClipTagIndex
+
+    conn = _connect(db)
+    a = _insert_clip(conn, tags=["Goal", "Dribble"], end_time=1)
+    _insert_clip(conn, tags=[], end_time=2)
+    conn.commit()
+    for table in ("raw_clip_tags", "raw_clip_tags_dirty"):
+        conn.execute(f"DROP TABLE {table}")
+    conn.commit()
+
+    V048ClipTagIndex().up(conn)
+    V048ClipTagIndex().up(conn)
+    assert _index(conn) == [(a, "Dribble"), (a, "Goal")]
+    assert clip_tag_index.apply_pending_clip_tags(conn) == 0
+    conn.close()
@@ -0,0 +1,141 @@
+"""
+process_clips_ai's staged pipeline (_clips_ai_pipeline): scratch extraction +
+decode, enhance, and encode of neighbouring clips overlap, the output matches
+the clip order, and a failing stage stops the others. Runs on CPU with
+MockVideoUpscaler standing in for Real-ESRGAN.
+"""
+
+import shutil
+import subprocess
+import threading
+import time
+
+import cv2
+import pytest
+
+from app.modal_functions import video_processing
+from app.services.local_processors import MockVideoUpscaler
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="FFmpeg not installed")
+
+
+def _make_source(path, seconds=2.0):
+    subprocess.run(
+        ["ffmpeg", "-y", "-v", "error", "-f", "lavfi",
+         "-i", f"testsrc2=size=320x240:rate=30:duration={seconds}",
+         "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", "-g", "30", "-an", str(path)],
+        check=True, capture_output=True,
+    )
+    return path
+
+
+class _SlowUpscaler(MockVideoUpscaler):
+    """Mock enhance plus a fixed per-frame cost, like a GPU kernel."""
+
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def enhance(self, img, outscale=4):
+        time.sleep(self.delay)
+        return super().enhance(img, outscale)
+
+
+def _run(tmp_path, clips_data, upsampler, sources):
+    work = tmp_path / "work"
+    work.mkdir(exist_ok=True)
+    gen = video_processing._clips_ai_pipeline(
+        "job-1", clips_data, sources, str(work), upsampler,
+        90, 160, 30, False, source_url=lambda key: key,
+    )
+    updates = []
+    try:
+        while True:
+            updates.append(next(gen))
+    except StopIteration as done:
+        return done.value, updates
+
+
+def _frame_count(path):
+    cap = cv2.VideoCapture(path)
+    try:
+        return int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        cap.release()
+
+
+def test_clips_come_out_in_order_with_stages_overlapped(tmp_path):
+    source = str(_make_source(tmp_path / "game.mp4", seconds=4.0))
+    clips_data = [
+        {"clipIndex": 0, "source_start_time": 0.0, "source_end_time": 1.0},
+        {"clipIndex": 0, "source_start_time": 1.0, "source_end_time": 3.0},
+        {"clipIndex": 0, "source_start_time": 2.0, "source_end_time": 3.0},
+    ]
+
+    result, updates = _run(tmp_path, clips_data, _SlowUpscaler(0.01), [source])
+
+    assert [p.rsplit("/", 1)[1] for p in result["paths"]] == ["clip_0.mp4", "clip_1.mp4", "clip_2.mp4"]
+    counts = [_frame_count(p) for p in result["paths"]]
+    assert counts[1] > counts[0] and counts[1] > counts[2]
+    # Scratch + frames are cleaned up as each clip is encoded.
+    assert not list((tmp_path / "work").glob("frames_*/*.png"))
+    assert not list((tmp_path / "work").glob("clip_source_*"))
+
+    assert [u["clip"] for u in updates if u["phase"] == "encoding"] == [1, 2, 3]
+
+    stages = result["stage_seconds"]
+    assert all(v > 0 for v in stages.values())
+    assert result["wall_seconds"] < sum(stages.values()), "stages ran back to back"
+
+
+def test_read_ahead_is_bounded_by_the_frame_queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(video_processing, "CLIPS_AI_PREFETCH_FRAMES", 4)
+    source = str(_make_source(tmp_path / "game.mp4"))
+    decoded = []
+    enhanced = []
+    lead = []
+    real_crop = video_processing.rotate_then_crop
+
+    def counting_crop(*args):
+        decoded.append(1)
+        return real_crop(*args)
+
+    class _Counting(_SlowUpscaler):
+        def enhance(self, img, outscale=4):
+            lead.append(len(decoded) - len(enhanced))
+            enhanced.append(1)
+            return super().enhance(img, outscale)
+
+    monkeypatch.setattr(video_processing, "rotate_then_crop", counting_crop)
+    result, _ = _run(tmp_path, [{"source_start_time": 0.0, "source_end_time": 2.0}],
+                     _Counting(0.005), [source])
+
+    assert len(result["paths"]) == 1
+    assert len(enhanced) == len(decoded) > 30
+    # 4 queued + 1 blocked in put + 1 being enhanced.
+    assert max(lead) <= 6
+
+
+def test_extraction_failure_propagates_and_stops_the_reader(tmp_path):
+    source = str(_make_source(tmp_path / "game.mp4"))
+    clips_data = [
+        {"clipIndex": 0, "source_start_time": 0.0, "source_end_time": 1.0},
+        {"clipIndex": 1, "source_start_time": 0.0, "source_end_time": 1.0},
+    ]
+
+    with pytest.raises(RuntimeError, match="Scratch extraction failed for clip 2"):
+        _run(tmp_path, clips_data, MockVideoUpscaler(), [source, str(tmp_path / "missing.mp4")])
+
+    assert not [t for t in threading.enumerate() if t.name.startswith("clips-ai-read-")]
+
+
+def test_closing_the_generator_stops_the_reader(tmp_path):
+    source = str(_make_source(tmp_path / "game.mp4"))
+    gen = video_processing._clips_ai_pipeline(
+        "job-2", [{"source_start_time": 0.0, "source_end_time": 2.0}], [source],
+        str(tmp_path), MockVideoUpscaler(), 90, 160, 30, False, source_url=lambda key: key,
+    )
+    assert next(gen)["phase"] == "upscaling"
+    gen.close()
+
+    assert not [t for t in threading.enumerate() if t.name == "clips-ai-read-job-2"]
@@ -0,0 +1,216 @@
+"""
+Incrementally maintained Collections aggregates (services/collection_aggregates).
+
+collections_summary reads collection_aggregates rows; triggers queue changed
+reels into collection_dirty in the writer's transaction and the summary folds
+them. Every test mutates through plain SQL (the triggers must catch writers
+that never call into the service) and then asserts both the summary and
+check_collection_aggregates' from-scratch rebuild agree.
+"""
+
+import asyncio
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from app.services import collection_aggregates as ca
+from app.services.collection_metadata import encode_game_ids
+from app.utils.encoding import encode_data
+
+USER_ID = "test-user-collagg"
+PROFILE_ID = "testdefault"
+
+
+@pytest.fixture()
+def db(tmp_path):
+    from app.profile_context import set_current_profile_id
+    from app.user_context import set_current_user_id
+
+    set_current_user_id(USER_ID)
+    set_current_profile_id(PROFILE_ID)
+    with patch("app.database.USER_DATA_BASE", tmp_path), \
+         patch("app.database._initialized_users", set()), \
+         patch("app.database.R2_ENABLED", False):
+        from app.database import ensure_database, get_database_path
+        ensure_database()
+        yield get_database_path()
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _insert_fv(conn, *, project_id, game_ids=None, ratio="9:16", duration=10.0,
+               tags=None, version=1, clip_count=1, source_clip_id=None,
+               published_at="2026-01-01 00:00:00"):
+    cur = conn.execute(
+        "INSERT INTO final_videos (project_id, filename, version, duration, source_type, "
+        "name, aspect_ratio, tags, game_ids, clip_count, published_at, source_clip_id) "
+        "VALUES (?, 'f.mp4', ?, ?, 'custom_project', 'Reel', ?, ?, ?, ?, ?, ?)",
+        (project_id, version, duration, ratio, encode_data(tags) if tags else None,
+         encode_game_ids(game_ids) if game_ids else None, clip_count, published_at,
+         source_clip_id),
+    )
+    return cur.lastrowid
+
+
+def _summary():
+    from app.routers.collections import collections_summary
+    return asyncio.run(collections_summary())
+
+
+def _assert_consistent(db_path):
+    conn = _connect(db_path)
+    try:
+        assert ca.check_collection_aggregates(conn) == []
+        assert conn.execute("SELECT COUNT(*) FROM collection_dirty").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+
+def test_writes_queue_reels_and_summary_folds_them(db):
+    conn = _connect(db)
+    conn.execute("INSERT INTO games (id, name, game_date) VALUES (7, 'G', '2025-10-04')")
+    a = _insert_fv(conn, project_id=1, game_ids=[7], duration=20.0, tags=["Goal"])
+    _insert_fv(conn, project_id=2, game_ids=[7], duration=15.0, ratio="16:9")
+    conn.commit()
+    queued = {r[0] for r in conn.execute("SELECT final_video_id FROM collection_dirty")}
+    conn.close()
+    assert a in queued
+
+    s = _summary()
+    assert s.total_reel_count == 2
+    (game,) = s.games
+    assert (game.game_id, game.reel_count, game.leading_reel_id) == (7, 2, a)
+    assert game.ratio_counts == {"9:16": 1, "16:9": 1}
+    assert [(t.season, t.ratio) for t in s.season_totals] == [("Fall 2025", "16:9"), ("Fall 2025", "9:16")]
+    assert [(t.tag, t.reel_count) for t in s.tag_totals] == [("Goal", 1)]
+    _assert_consistent(db)
+
+
+def test_watch_unpublish_and_delete_are_folded_incrementally(db):
+    conn = _connect(db)
+    a = _insert_fv(conn, project_id=1, duration=20.0)
+    b = _insert_fv(conn, project_id=2, duration=None, published_at="2026-03-01 00:00:00")
+    c = _insert_fv(conn, project_id=3, duration=12.0)
+    conn.commit()
+    conn.close()
+    assert _summary().mixes.unwatched_count == 3
+
+    conn = _connect(db)
+    conn.execute("UPDATE final_videos SET watched_at = CURRENT_TIMESTAMP WHERE id = ?", (a,))
+    conn.execute("UPDATE final_videos SET published_at = NULL WHERE id = ?", (b,))
+    conn.commit()
+    conn.close()
+    mixes = _summary().mixes
+    assert (mixes.reel_count, mixes.unwatched_count) == (2, 1)
+    assert mixes.has_null_durations is False
+    # The removed reel held latest_published_at -> recomputed from members.
+    assert mixes.latest_published_at == "2026-01-01T00:00:00Z"
+
+    conn = _connect(db)
+    conn.execute("DELETE FROM final_videos WHERE id = ?", (a,))
+    conn.commit()
+    conn.close()
+    mixes = _summary().mixes
+    assert (mixes.reel_count, mixes.leading_reel_id, mixes.total_duration) == (1, c, 12.0)
+    _assert_consistent(db)
+
+
+def test_new_version_replaces_its_predecessor(db):
+    conn = _connect(db)
+    v1 = _insert_fv(conn, project_id=9, duration=10.0)
+    conn.commit()
+    conn.close()
+    assert _summary().mixes.leading_reel_id == v1
+
+    conn = _connect(db)
+    v2 = _insert_fv(conn, project_id=9, version=2, duration=40.0)
+    conn.commit()
+    conn.close()
+    s = _summary()
+    assert (s.total_reel_count, s.mixes.leading_reel_id, s.mixes.total_duration) == (1, v2, 40.0)
+    _assert_consistent(db)
+
+
+def test_teammate_flip_and_game_date_edit_requeue_reels(db):
+    conn = _connect(db)
+    conn.execute("INSERT INTO games (id, name, game_date) VALUES (3, 'G', '2025-10-04')")
+    conn.execute(
+        "INSERT INTO raw_clips (id, filename, rating, start_time, end_time, game_id, my_athlete) "
+        "VALUES (50, 'c.mp4', 5, 0, 10, 3, 1)"
+    )
+    _insert_fv(conn, project_id=1, game_ids=[3], source_clip_id=50)
+    conn.commit()
+    conn.close()
+    assert [t.season for t in _summary().season_totals] == ["Fall 2025"]
+
+    conn = _connect(db)
+    conn.execute("UPDATE games SET game_date = '2026-04-11' WHERE id = 3")
+    conn.commit()
+    conn.close()
+    assert [t.season for t in _summary().season_totals] == ["Spring 2026"]
+
+    conn = _connect(db)
+    conn.execute("UPDATE raw_clips SET my_athlete = 0 WHERE id = 50")
+    conn.commit()
+    conn.close()
+    s = _summary()
+    assert s.total_reel_count == 0 and s.games == []
+    _assert_consistent(db)
+
+
+def test_checker_reports_drift_and_repairs_it(db):
+    conn = _connect(db)
+    _insert_fv(conn, project_id=1, game_ids=[4], duration=20.0)
+    conn.commit()
+    ca.apply_pending_collection_changes(conn)
+    conn.execute("UPDATE collection_aggregates SET reel_count = 5 WHERE scope = 'game:4'")
+    conn.execute("DELETE FROM collection_aggregates WHERE scope = 'top_plays'")
+    conn.commit()
+
+    drift = ca.check_collection_aggregates(conn, repair=True)
+    assert "game:4 [9:16]: reel_count stored=5 expected=1" in drift
+    assert "top_plays [9:16]: missing row" in drift
+    assert ca.check_collection_aggregates(conn) == []
+    conn.close()
+
+
+def test_fold_is_a_local_write_not_an_r2_sync(db):
+    from app.database import _request_context, get_db_connection
+
+    conn = _connect(db)
+    _insert_fv(conn, project_id=1)
+    conn.commit()
+    conn.close()
+
+    ctx = {}
+    token = _request_context.set(ctx)
+    try:
+        with get_db_connection() as tracked:
+            assert ca.apply_pending_collection_changes(tracked) == 1
+    finally:
+        _request_context.reset(token)
+    assert not ctx.get("has_writes")
+
+
+def test_v046_backfills_an_existing_profile(db):
+    from app.migrations.profile_db.v046_collection_aggregates import V046CollectionAggregates
+
+    conn = _connect(db)
+    _insert_fv(conn, project_id=1, game_ids=[2], duration=31.0)
+    conn.commit()
+    for table in ("collection_dirty", "collection_aggregates", "collection_scope_members",
+                  "collection_reels"):
+        conn.execute(f"DROP TABLE {table}")
+    conn.commit()
+
+    V046CollectionAggregates().up(conn)
+    V046CollectionAggregates().up(conn)
+    rows = ca.read_collection_aggregates(conn)
+    assert rows["game:2"]["9:16"]["reel_count"] == 1
+    assert ca.check_collection_aggregates(conn) == []
+    conn.close()
@@ -77,6 +77,10 @@ class TestBackfillOneUser:
         # across a machine replacement).
         sig = credit_backfill._content_sig({"source": "new_account_bonus", "amount": 8, "created_at": "2025-12-31 00:00:00"})
         assert has_key(USER, f"legacy:{sig}:0")
+        # Bulk-inserted rows land in credit_user_totals too.
+        from app.services.credit_ledger import check_user_totals, stats_for_admin
+        assert stats_for_admin([USER])[USER]["purchase_credit_amounts"] == [100]
+        assert check_user_totals([USER]) == []
 
     def test_rerun_is_idempotent_no_new_rows(self, pg_conn, tmp_path, no_r2, monkeypatch):
         user_dir = tmp_path / USER
@@ -737,3 +741,27 @@ class TestReconcileAgainstStripe:
         result = credit_backfill.reconcile_against_stripe()
 
         assert any(u["pi_id"] == "pi_test_mode_only" for u in result["unknown_stripe_grant"])
+
+    def test_aligned_purchases_need_no_per_pi_lookup(self, pg_conn, monkeypatch):
+        """PIs found in credit_user_totals.purchase_refs are matched without a
+        has_key round trip; only the unmatched one falls back to it."""
+        grant(USER, 80, "stripe_purchase", credit_key("stripe_purchase", "pi_a"), reference_id="pi_a")
+        grant(USER, 40, "stripe_purchase", credit_key("stripe_purchase", "pi_b"), reference_id="pi_b")
+        intents = [
+            {"id": pi, "status": "succeeded", "livemode": True, "metadata": {"user_id": USER, "credits": "80"}}
+            for pi in ("pi_a", "pi_c")
+        ]
+        monkeypatch.setattr("app.services.revenue_reconciliation.fetch_stripe_intents", lambda: intents)
+        looked_up = []
+        real_has_key = has_key
+        monkeypatch.setattr(
+            "app.services.credit_ledger.has_key",
+            lambda uid, key: looked_up.append(key) or real_has_key(uid, key),
+        )
+
+        result = credit_backfill.reconcile_against_stripe()
+
+        assert looked_up == [credit_key("stripe_purchase", "pi_c")]
+        assert [r["pi_id"] for r in result["missing_stripe_grant"]] == ["pi_c"]
+        assert [(u["pi_id"], u["amount"]) for u in result["unknown_stripe_grant"]
+                if u["user_id"] == USER] == [("pi_b", 40)]
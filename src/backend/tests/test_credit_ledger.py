@@ -204,6 +204,80 @@ class TestStatsForAdmin:
         assert stats_for_admin([]) == {}
 
 
+class TestUserTotals:
+    """credit_user_totals moves with every ledger write and agrees with a
+    fresh aggregate of credit_transactions."""
+
+    def _totals(self, user_id):
+        with _pg() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT credits_spent, credits_purchased, purchase_amounts, purchase_refs "
+                "FROM credit_user_totals WHERE user_id = %s",
+                (user_id,),
+            )
+            row = cur.fetchone()
+        return dict(row) if row else None
+
+    def test_every_primitive_keeps_totals_exact(self, pg_conn):
+        grant(USER, 100, "stripe_purchase", credit_key("stripe_purchase", "pi_1"), reference_id="pi_1")
+        grant(USER, 100, "stripe_purchase", credit_key("stripe_purchase", "pi_1"), reference_id="pi_1")  # retry
+        grant(USER, 5, "quest_reward", credit_key("quest_reward", "q1"), reference_id="q1")
+        debit(USER, 30, "framing_usage", credit_key("framing_usage", "export_1"))
+        assert debit(USER, 500, "framing_usage", credit_key("framing_usage", "too_big"))["ok"] is False
+        set_balance(USER, 60, "adminset:admin-1:req-1")
+        reserve_credits(USER, 10, "job-confirmed")
+        confirm_reservation(USER, "job-confirmed")
+        reserve_credits(USER, 7, "job-released")
+        release_reservation(USER, "job-released")
+
+        assert self._totals(USER) == {
+            "credits_spent": 40,
+            "credits_purchased": 100,
+            "purchase_amounts": [100],
+            "purchase_refs": ["pi_1"],
+        }
+        assert credit_ledger.check_user_totals() == []
+
+    def test_check_reports_and_repairs_drift(self, pg_conn):
+        grant(USER, 50, "stripe_purchase", credit_key("stripe_purchase", "pi_1"), reference_id="pi_1")
+        grant(OTHER_USER, 20, "stripe_purchase", credit_key("stripe_purchase", "pi_2"), reference_id="pi_2")
+        with _pg() as conn:
+            cur = conn.cursor()
+            cur.execute("UPDATE credit_user_totals SET credits_spent = 999 WHERE user_id = %s", (USER,))
+            cur.execute("DELETE FROM credit_user_totals WHERE user_id = %s", (OTHER_USER,))
+
+        drift = credit_ledger.check_user_totals([USER, OTHER_USER])
+        assert [(d["user_id"], d["stored_spent"], d["stored_purchased"]) for d in drift] == [
+            (USER, 999, 50),
+            (OTHER_USER, 0, 0),
+        ]
+        assert credit_ledger.check_user_totals([USER, OTHER_USER]) == drift, "report-only by default"
+
+        credit_ledger.check_user_totals([USER, OTHER_USER], repair=True)
+        assert credit_ledger.check_user_totals([USER, OTHER_USER]) == []
+        assert stats_for_admin([OTHER_USER])[OTHER_USER]["purchase_credit_amounts"] == [20]
+
+    def test_migration_backfill_matches_maintained_totals(self, pg_conn):
+        from app.migrations.postgres.v025_credit_user_totals import V025CreditUserTotals
+
+        grant(USER, 100, "stripe_purchase", credit_key("stripe_purchase", "pi_1"), reference_id="pi_1")
+        grant(USER, 25, "stripe_purchase", credit_key("stripe_purchase", "pi_2"), reference_id="pi_2")
+        debit(USER, 30, "framing_usage", credit_key("framing_usage", "export_1"))
+        maintained = self._totals(USER)
+
+        with _pg() as conn:
+            V025CreditUserTotals().up(conn)
+
+        assert self._totals(USER) == maintained
+
+
+def _pg():
+    # Resolved per call: pg_conn patches app.services.pg.get_pg after import.
+    from app.services import pg
+    return pg.get_pg()
+
+
 class TestBackwardCompatShims:
     """These preserve the old user_db.py call signatures so most of the 16
     real call sites (games.py, payments.py, etc.) are a mechanical import
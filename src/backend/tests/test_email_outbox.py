@@ -0,0 +1,191 @@
+"""
+Admin bulk-email outbox (app/services/email_outbox.py): recipients are resolved
+in one query, sends go through a local HTTP sink standing in for Resend, the
+dispatcher honours its concurrency and rate limits, and leased rows left behind
+by a dead process are resumed or given up on.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services import email, email_outbox
+
+RECIPIENTS = ("user-1", "user-2", "user-a", "user-b", "user-c", "test-user")
+
+
+class _Sink:
+    """Records each POSTed email and how many were in flight at once."""
+
+    def __init__(self, delay=0.0, reject=()):
+        self.delay = delay
+        self.reject = set(reject)
+        self.received: list[tuple[float, dict]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def handler(self):
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with sink._lock:
+                    sink.received.append((time.monotonic(), payload))
+                    sink.in_flight += 1
+                    sink.max_in_flight = max(sink.max_in_flight, sink.in_flight)
+                time.sleep(sink.delay)
+                with sink._lock:
+                    sink.in_flight -= 1
+                status = 422 if payload["to"][0] in sink.reject else 200
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(b'{"id": "sink"}')
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+@pytest.fixture()
+def sink_server(monkeypatch):
+    servers = []
+
+    def start(**kwargs):
+        sink = _Sink(**kwargs)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), sink.handler())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        monkeypatch.setenv("RESEND_API_KEY", "test-key")
+        monkeypatch.setattr(email, "RESEND_API_URL", f"http://127.0.0.1:{server.server_port}/emails")
+        return sink
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture()
+def recipients(pg_conn):
+    from app.services.auth_db import create_user
+
+    for uid in RECIPIENTS:
+        create_user(uid, email=f"{uid}@test.local")
+    return list(RECIPIENTS)
+
+
+def _wait_done(job_id, timeout=15.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        job = email_outbox.get_job(job_id)
+        if job["status"] == "done":
+            return job
+        assert time.monotonic() < deadline, f"job still open: {job}"
+        time.sleep(0.05)
+
+
+def test_workers_never_exceed_the_concurrency_cap(recipients, sink_server, monkeypatch):
+    monkeypatch.setattr(email_outbox, "ADMIN_EMAIL_CONCURRENCY", 2)
+    monkeypatch.setattr(email_outbox, "ADMIN_EMAIL_RATE_PER_SEC", 0)
+    sink = sink_server(delay=0.2)
+
+    queued = email_outbox.enqueue_bulk_email("admin-user", [*recipients, "user-1"], "Hi", "<p>Body</p>")
+    assert queued["total"] == len(recipients), "duplicate ids are sent once"
+    job = _wait_done(queued["job_id"])
+
+    assert job["sent"] == len(recipients)
+    assert sink.max_in_flight == 2
+    sent_to = sorted(p["to"][0] for _, p in sink.received)
+    assert sent_to == sorted(f"{uid}@test.local" for uid in recipients)
+    assert all(len(p["to"]) == 1 and p["subject"] == "Hi" for _, p in sink.received)
+
+
+def test_send_starts_are_paced_to_the_rate_limit(recipients, sink_server, monkeypatch):
+    monkeypatch.setattr(email_outbox, "ADMIN_EMAIL_CONCURRENCY", 4)
+    monkeypatch.setattr(email_outbox, "ADMIN_EMAIL_RATE_PER_SEC", 10)
+    sink = sink_server()
+
+    job = _wait_done(email_outbox.enqueue_bulk_email("admin-user", recipients, "Hi", "<p>Body</p>")["job_id"])
+
+    assert job["sent"] == len(recipients)
+    # Six sends at 10/s span at least five intervals (minus network jitter),
+    # even though four workers could have fired them all at once.
+    starts = sorted(t for t, _ in sink.received)
+    assert starts[-1] - starts[0] >= 0.45, starts
+
+
+def test_rejected_send_is_recorded_per_recipient(recipients, sink_server, monkeypatch):
+    monkeypatch.setattr(email_outbox, "ADMIN_EMAIL_RATE_PER_SEC", 0)
+    sink_server(reject={"user-b@test.local"})
+
+    job = _wait_done(email_outbox.enqueue_bulk_email("admin-user", recipients, "Hi", "<p>Body</p>")["job_id"])
+
+    assert job["sent"] == len(recipients) - 1
+    assert job["failed"] == 1
+    failed = [r for r in job["results"] if not r["ok"]]
+    assert failed == [{"user_id": "user-b", "email": "user-b@test.local", "ok": False, "error": "send failed"}]
+
+
+def test_expired_leases_are_resumed_or_given_up(recipients, sink_server, monkeypatch):
+    """Rows a dead process left in 'sending' are reclaimed once their lease
+    expires; a row already claimed ADMIN_EMAIL_MAX_ATTEMPTS times is failed."""
+    from app.services.pg import get_pg
+
+    monkeypatch.setattr(email_outbox, "ADMIN_EMAIL_RATE_PER_SEC", 0)
+    sink = sink_server()
+    with get_pg() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO admin_email_jobs (job_id, admin_user_id, subject, body_html) "
+            "VALUES ('crashed', 'admin-user', 'Hi', '<p>Body</p>')"
+        )
+        cur.executemany(
+            """INSERT INTO admin_email_outbox (job_id, user_id, email, status, attempts, leased_until)
+               VALUES ('crashed', %s, %s, 'sending', %s, %s)""",
+            [
+                ("user-1", "user-1@test.local", 1, "2000-01-01T00:00:00Z"),
+                ("user-2", "user-2@test.local", email_outbox.ADMIN_EMAIL_MAX_ATTEMPTS, "2000-01-01T00:00:00Z"),
+                ("user-a", "user-a@test.local", 1, "2999-01-01T00:00:00Z"),
+            ],
+        )
+
+    email_outbox.start_email_outbox()
+    deadline = time.monotonic() + 10
+    while email_outbox.get_job("crashed")["sent"] + email_outbox.get_job("crashed")["failed"] < 2:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+    job = email_outbox.get_job("crashed")
+    by_id = {r["user_id"]: r for r in job["results"]}
+    assert by_id["user-1"]["ok"] is True
+    assert by_id["user-2"]["error"] == f"gave up after {email_outbox.ADMIN_EMAIL_MAX_ATTEMPTS} attempts"
+    assert "user-a" not in by_id, "a live lease is left to its owner"
+    assert job["pending"] == 1
+    assert [p["to"] for _, p in sink.received] == [["user-1@test.local"]]
+
+
+def test_recipient_lookup_is_one_query(recipients, monkeypatch):
+    calls = []
+    real = email_outbox.get_emails_by_user_ids
+
+    def counting(user_ids):
+        calls.append(list(user_ids))
+        return real(user_ids)
+
+    monkeypatch.setattr(email_outbox, "get_emails_by_user_ids", counting)
+    monkeypatch.setattr(email_outbox._dispatcher, "kick", lambda: None)
+
+    queued = email_outbox.enqueue_bulk_email("admin-user", [*recipients, "ghost"], "Hi", "<p>Body</p>")
+
+    assert calls == [[*recipients, "ghost"]]
+    assert queued["queued"] == len(recipients)
+    job = email_outbox.get_job(queued["job_id"])
+    assert job["pending"] == len(recipients)
+    assert job["results"] == [{"user_id": "ghost", "ok": False, "error": "no email on file"}]
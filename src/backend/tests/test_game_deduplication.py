@@ -207,109 +207,65 @@ class TestMultipartUrlGeneration:
 
 
 class TestRefCountOperations:
-    """Test reference count increment/decrement."""
+    """Reference counts live in Postgres game_ref_counts, not R2 metadata."""
 
-    @patch('app.storage.r2_set_object_metadata_global')
-    @patch('app.storage.r2_get_object_metadata_global')
-    def test_increment_ref_count_new_object(self, mock_get_meta, mock_set_meta):
-        """Incrementing ref_count on object with no metadata."""
-        from app.storage import increment_ref_count
-
-        # Object exists but has no ref_count metadata
-        mock_get_meta.return_value = {}
-        mock_set_meta.return_value = True
+    @pytest.fixture(autouse=True)
+    def _pg(self, pg_conn):
+        from app.services.pg import get_pg
 
-        result = increment_ref_count("games/test.mp4")
-
-        assert result == 1
-        mock_set_meta.assert_called_once()
-        # Check that ref_count was set to "1"
-        call_args = mock_set_meta.call_args
-        assert call_args[0][1]['ref_count'] == '1'
+        with get_pg() as conn:
+            conn.cursor().execute(
+                "INSERT INTO game_ref_counts (blake3_hash, ref_count, latest_expiry) "
+                "VALUES ('test', 5, now()), ('one', 1, now()), ('zero', 0, now())"
+            )
 
     @patch('app.storage.r2_set_object_metadata_global')
     @patch('app.storage.r2_get_object_metadata_global')
     def test_increment_ref_count_existing(self, mock_get_meta, mock_set_meta):
-        """Incrementing ref_count on object with existing count."""
+        """Incrementing is a row update: no R2 HEAD, no metadata copy."""
         from app.storage import increment_ref_count
 
-        # Object has ref_count = 5
-        mock_get_meta.return_value = {'ref_count': '5'}
-        mock_set_meta.return_value = True
-
-        result = increment_ref_count("games/test.mp4")
+        assert increment_ref_count("games/test.mp4") == 6
+        assert increment_ref_count("games/test.mp4") == 7
+        mock_get_meta.assert_not_called()
+        mock_set_meta.assert_not_called()
 
-        assert result == 6
-        call_args = mock_set_meta.call_args
-        assert call_args[0][1]['ref_count'] == '6'
-
-    @patch('app.storage.r2_get_object_metadata_global')
-    def test_increment_ref_count_missing_object(self, mock_get_meta):
-        """Incrementing ref_count on non-existent object returns -1."""
+    def test_increment_ref_count_missing_counter(self):
+        """Incrementing a game with no counter row returns -1."""
         from app.storage import increment_ref_count
 
-        mock_get_meta.return_value = None
+        assert increment_ref_count("games/nonexistent.mp4") == -1
 
-        result = increment_ref_count("games/nonexistent.mp4")
-
-        assert result == -1
-
-    @patch('app.storage.r2_set_object_metadata_global')
-    @patch('app.storage.r2_get_object_metadata_global')
-    def test_decrement_ref_count(self, mock_get_meta, mock_set_meta):
-        """Decrementing ref_count from 3 to 2."""
+    def test_decrement_ref_count(self):
+        """Decrementing ref_count from 5 to 4, then 1 to 0."""
         from app.storage import decrement_ref_count
 
-        mock_get_meta.return_value = {'ref_count': '3'}
-        mock_set_meta.return_value = True
+        assert decrement_ref_count("games/test.mp4") == 4
+        assert decrement_ref_count("games/one.mp4") == 0
 
-        result = decrement_ref_count("games/test.mp4")
-
-        assert result == 2
-        call_args = mock_set_meta.call_args
-        assert call_args[0][1]['ref_count'] == '2'
-
-    @patch('app.storage.r2_set_object_metadata_global')
-    @patch('app.storage.r2_get_object_metadata_global')
-    def test_decrement_ref_count_to_zero(self, mock_get_meta, mock_set_meta):
-        """Decrementing ref_count from 1 to 0."""
-        from app.storage import decrement_ref_count
-
-        mock_get_meta.return_value = {'ref_count': '1'}
-        mock_set_meta.return_value = True
-
-        result = decrement_ref_count("games/test.mp4")
-
-        assert result == 0
-        call_args = mock_set_meta.call_args
-        assert call_args[0][1]['ref_count'] == '0'
-
-    @patch('app.storage.r2_set_object_metadata_global')
-    @patch('app.storage.r2_get_object_metadata_global')
-    def test_decrement_ref_count_never_negative(self, mock_get_meta, mock_set_meta):
+    def test_decrement_ref_count_never_negative(self):
         """Decrementing ref_count should never go below 0."""
         from app.storage import decrement_ref_count
 
-        mock_get_meta.return_value = {'ref_count': '0'}
-        mock_set_meta.return_value = True
+        assert decrement_ref_count("games/zero.mp4") == 0
 
-        result = decrement_ref_count("games/test.mp4")
+    def test_decrement_ref_count_missing_counter(self):
+        """Decrementing a game with no counter returns 0."""
+        from app.storage import decrement_ref_count
 
-        assert result == 0
-        call_args = mock_set_meta.call_args
-        assert call_args[0][1]['ref_count'] == '0'
+        # Returns 0 so caller can clean up
+        assert decrement_ref_count("games/nonexistent.mp4") == 0
 
-    @patch('app.storage.r2_get_object_metadata_global')
-    def test_decrement_ref_count_missing_object(self, mock_get_meta):
-        """Decrementing ref_count on non-existent object returns 0."""
-        from app.storage import decrement_ref_count
+    def test_concurrent_increments_are_not_lost(self):
+        """Each increment is one atomic UPDATE .. RETURNING: no lost updates."""
+        from concurrent.futures import ThreadPoolExecutor
 
-        mock_get_meta.return_value = None
+        from app.storage import increment_ref_count
 
-        result = decrement_ref_count("games/nonexistent.mp4")
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: increment_ref_count("games/test.mp4"), range(20)))
 
-        # Returns 0 so caller can clean up
-        assert result == 0
+        assert sorted(results) == list(range(6, 26))
 
 
 class TestGlobalKeyHelpers:
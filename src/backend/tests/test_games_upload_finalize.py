@@ -0,0 +1,286 @@
+"""
+Game upload finalize (routers/games_upload.py) against an in-memory R2 stand-in.
+
+Finalize used to complete the multipart upload, HEAD the object to check its
+size, then copy the whole object onto itself to attach metadata. Metadata is
+now set at prepare (create_multipart_upload), parts are verified against R2's
+list_parts (ETags + sizes) before completing, and the only remaining
+server-side copy -- a session created without metadata getting it at finalize
+-- runs as parallel UploadPartCopy ranges.
+
+The stand-in tracks object sizes, not bytes, and charges a simulated per-request
+latency plus a per-byte cost for server-side copies, so finalize latency on a
+4 GB upload can be measured without moving 4 GB.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import games_upload
+from app.routers.games_upload import (
+    PART_SIZE,
+    FinalizeUploadRequest,
+    PartInfo,
+    PrepareUploadRequest,
+    finalize_upload,
+    prepare_upload,
+)
+
+USER_ID = "test-user-finalize"
+PROFILE_ID = "testdefault"
+BLAKE3 = "ab" * 32
+FOUR_GB = 4 * 1024 ** 3
+
+REQUEST_LATENCY = 0.001   # seconds per R2 request
+COPY_BANDWIDTH = 20e9     # bytes/second of one server-side copy stream
+
+
+class _NoSuchUpload(Exception):
+    pass
+
+
+class FakeR2:
+    """Just enough of the S3 API for multipart upload + copy, sizes only."""
+
+    class exceptions:
+        NoSuchUpload = _NoSuchUpload
+
+    def __init__(self, list_page_size=1000):
+        self.objects = {}   # key -> {'size', 'metadata'}
+        self.uploads = {}   # upload_id -> {'key', 'metadata', 'parts': {n: (etag, size)}}
+        self.calls = []
+        self.copied_bytes = 0
+        self.list_page_size = list_page_size
+        self._lock = threading.Lock()
+
+    def _request(self, name, copy_bytes=0):
+        with self._lock:
+            self.calls.append(name)
+            self.copied_bytes += copy_bytes
+        time.sleep(REQUEST_LATENCY + copy_bytes / COPY_BANDWIDTH)
+
+    def count(self, name):
+        return self.calls.count(name)
+
+    # --- multipart -----------------------------------------------------------
+
+    def create_multipart_upload(self, Bucket, Key, ContentType, Metadata=None):
+        self._request("create_multipart_upload")
+        upload_id = f"up-{len(self.uploads)}"
+        self.uploads[upload_id] = {'key': Key, 'metadata': dict(Metadata or {}), 'parts': {}}
+        return {'UploadId': upload_id}
+
+    def put_part(self, upload_id, part_number, size):
+        """What the browser's presigned PUT does."""
+        etag = f'"etag-{upload_id}-{part_number}-{size}"'
+        self.uploads[upload_id]['parts'][part_number] = (etag, size)
+        return etag
+
+    def list_parts(self, Bucket, Key, UploadId, PartNumberMarker=0, MaxParts=None):
+        self._request("list_parts")
+        if UploadId not in self.uploads:
+            raise _NoSuchUpload(UploadId)
+        numbers = sorted(n for n in self.uploads[UploadId]['parts'] if n > PartNumberMarker)
+        page = numbers[:MaxParts or self.list_page_size]
+        parts = self.uploads[UploadId]['parts']
+        return {
+            'Parts': [{'PartNumber': n, 'ETag': parts[n][0], 'Size': parts[n][1]} for n in page],
+            'IsTruncated': len(page) < len(numbers),
+            'NextPartNumberMarker': page[-1] if page else PartNumberMarker,
+        }
+
+    def upload_part_copy(self, Bucket, Key, UploadId, PartNumber, CopySource, CopySourceRange):
+        first, last = (int(b) for b in CopySourceRange.removeprefix("bytes=").split("-"))
+        assert last < self.objects[CopySource['Key']]['size']
+        self._request("upload_part_copy", copy_bytes=last - first + 1)
+        etag = f'"copy-{UploadId}-{PartNumber}"'
+        self.uploads[UploadId]['parts'][PartNumber] = (etag, last - first + 1)
+        return {'CopyPartResult': {'ETag': etag}}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        self._request("complete_multipart_upload")
+        upload = self.uploads.pop(UploadId)
+        size = 0
+        for part in MultipartUpload['Parts']:
+            etag, part_size = upload['parts'][part['PartNumber']]
+            assert etag == part['ETag']
+            size += part_size
+        self.objects[Key] = {'size': size, 'metadata': upload['metadata']}
+        return {}
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self._request("abort_multipart_upload")
+        self.uploads.pop(UploadId, None)
+
+    # --- single-object -------------------------------------------------------
+
+    def head_object(self, Bucket, Key):
+        self._request("head_object")
+        if Key not in self.objects:
+            raise Exception("404 Not Found")
+        obj = self.objects[Key]
+        return {'ContentLength': obj['size'], 'Metadata': dict(obj['metadata'])}
+
+    def copy_object(self, Bucket, CopySource, Key, Metadata, MetadataDirective):
+        source = self.objects[CopySource['Key']]
+        self._request("copy_object", copy_bytes=source['size'])
+        self.objects[Key] = {'size': source['size'], 'metadata': dict(Metadata)}
+
+
+@pytest.fixture()
+def r2(tmp_path):
+    from app.profile_context import set_current_profile_id
+    from app.user_context import set_current_user_id
+
+    set_current_user_id(USER_ID)
+    set_current_profile_id(PROFILE_ID)
+    fake = FakeR2()
+    with patch("app.database.USER_DATA_BASE", tmp_path), \
+         patch("app.database._initialized_users", set()), \
+         patch("app.database.R2_ENABLED", False), \
+         patch.object(games_upload, "R2_ENABLED", True), \
+         patch("app.storage.get_r2_client", return_value=fake), \
+         patch.object(games_upload, "get_credit_balance", return_value={"balance": 0}), \
+         patch.object(games_upload, "generate_multipart_urls", return_value=[]):
+        from app.database import ensure_database
+        ensure_database()
+        yield fake
+
+
+def _prepare(r2, size, **video):
+    resp = asyncio.run(prepare_upload(PrepareUploadRequest(
+        blake3_hash=BLAKE3, file_size=size, original_filename="match.mp4", **video,
+    )))
+    upload_id = next(iter(r2.uploads))
+    parts = []
+    for n, offset in enumerate(range(0, size, PART_SIZE), start=1):
+        etag = r2.put_part(upload_id, n, min(PART_SIZE, size - offset))
+        parts.append(PartInfo(part_number=n, etag=etag))
+    return resp["upload_session_id"], parts
+
+
+def _finalize(session_id, parts, **video):
+    return asyncio.run(finalize_upload(
+        FinalizeUploadRequest(upload_session_id=session_id, parts=parts, **video), None,
+    ))
+
+
+def test_finalize_4gb_without_head_or_copy(r2):
+    video = {"video_duration": 5400.0, "video_width": 1920, "video_height": 1080}
+    session_id, parts = _prepare(r2, FOUR_GB, **video)
+    r2.calls.clear()
+
+    started = time.perf_counter()
+    # Clients resend the metadata at finalize; the session already has it.
+    result = _finalize(session_id, parts, **video)
+    elapsed = time.perf_counter() - started
+
+    assert result["file_size"] == FOUR_GB
+    assert r2.calls == ["list_parts", "complete_multipart_upload"]
+    assert r2.copied_bytes == 0
+    obj = r2.objects[f"games/{BLAKE3}.mp4"]
+    assert obj['size'] == FOUR_GB
+    assert obj['metadata']['original_filename'] == "match.mp4"
+    assert obj['metadata']['duration'] == "5400.0" and obj['metadata']['height'] == "1080"
+    # A serial copy-in-place alone would cost FOUR_GB / COPY_BANDWIDTH (~0.2s).
+    assert elapsed < FOUR_GB / COPY_BANDWIDTH / 2
+
+
+def test_legacy_finalize_metadata_copies_in_parallel_ranges(r2):
+    from app.storage import COPY_MAX_WORKERS, COPY_PART_SIZE
+
+    session_id, parts = _prepare(r2, FOUR_GB)
+    r2.calls.clear()
+
+    started = time.perf_counter()
+    _finalize(session_id, parts, video_duration=5400.0)
+    elapsed = time.perf_counter() - started
+
+    ranges = FOUR_GB // COPY_PART_SIZE
+    assert r2.count("upload_part_copy") == ranges
+    assert r2.count("copy_object") == 0 and r2.count("head_object") == 0
+    assert r2.copied_bytes == FOUR_GB
+    assert r2.objects[f"games/{BLAKE3}.mp4"]['metadata']['duration'] == "5400.0"
+    serial = FOUR_GB / COPY_BANDWIDTH
+    waves = -(-ranges // COPY_MAX_WORKERS)
+    assert elapsed < serial * waves / ranges * 3
+
+
+def test_session_from_before_the_deploy_gets_metadata_at_finalize(r2):
+    from app.database import get_db_connection
+
+    session_id, parts = _prepare(r2, 4 * PART_SIZE, video_duration=90.0, video_width=1280)
+    with get_db_connection() as conn:
+        # Created by the old prepare-upload: no metadata on the multipart upload.
+        conn.execute("UPDATE pending_uploads SET video_metadata_set = 0 WHERE id = ?", (session_id,))
+        conn.commit()
+    next(iter(r2.uploads.values()))['metadata'] = {'original_filename': "match.mp4"}
+
+    _finalize(session_id, parts, video_duration=90.0, video_width=1280, video_height=720)
+
+    metadata = r2.objects[f"games/{BLAKE3}.mp4"]['metadata']
+    assert (metadata['duration'], metadata['width'], metadata['height']) == ("90.0", "1280", "720")
+    assert r2.copied_bytes == 4 * PART_SIZE
+
+
+def test_finalize_before_the_v050_migration_copies(r2):
+    from app.database import get_db_connection
+
+    with get_db_connection() as conn:
+        conn.execute("ALTER TABLE pending_uploads DROP COLUMN video_metadata_set")
+        conn.commit()
+    session_id, parts = _prepare(r2, 2 * PART_SIZE, video_duration=90.0)
+
+    _finalize(session_id, parts, video_duration=90.0)
+
+    assert r2.objects[f"games/{BLAKE3}.mp4"]['metadata']['duration'] == "90.0"
+    assert r2.copied_bytes == 2 * PART_SIZE
+
+
+def test_part_verification_rejects_before_completing(r2):
+    size = 3 * PART_SIZE
+    session_id, parts = _prepare(r2, size)
+
+    tampered = [parts[0], PartInfo(part_number=2, etag='"stale"'), parts[2]]
+    with pytest.raises(HTTPException) as exc:
+        _finalize(session_id, tampered)
+    assert exc.value.status_code == 400 and "ETag" in exc.value.detail
+
+    with pytest.raises(HTTPException) as exc:
+        _finalize(session_id, parts[:2])
+    assert exc.value.status_code == 400 and "size mismatch" in exc.value.detail
+
+    # Nothing was completed or aborted: the session still finalizes.
+    assert r2.count("complete_multipart_upload") == 0
+    assert _finalize(session_id, parts)["file_size"] == size
+
+
+def test_list_parts_follows_pagination(r2):
+    from app.storage import r2_list_multipart_parts
+
+    r2.list_page_size = 50
+    session_id, parts = _prepare(r2, 130 * PART_SIZE)
+    upload_id = next(iter(r2.uploads))
+
+    listed = r2_list_multipart_parts(f"games/{BLAKE3}.mp4", upload_id)
+
+    assert [p['PartNumber'] for p in listed] == list(range(1, 131))
+    assert r2.count("list_parts") == 3
+    assert _finalize(session_id, parts)["file_size"] == 130 * PART_SIZE
+
+
+def test_small_object_metadata_keeps_single_copy(r2):
+    from app.storage import r2_set_object_metadata_global
+
+    r2.objects["games/small.mp4"] = {'size': 10 * 1024 ** 2, 'metadata': {}}
+
+    assert r2_set_object_metadata_global("games/small.mp4", {'ref_count': '2'}, size=10 * 1024 ** 2)
+    assert r2_set_object_metadata_global("games/small.mp4", {'ref_count': '3'})
+
+    assert r2.count("copy_object") == 2 and r2.count("upload_part_copy") == 0
+    assert r2.objects["games/small.mp4"]['metadata'] == {'ref_count': '3'}
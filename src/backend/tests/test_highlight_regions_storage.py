@@ -0,0 +1,205 @@
+"""
+Row-per-region overlay highlight storage (services/highlight_store, v047).
+
+Overlay actions read and rewrite ONE highlight_regions row per gesture instead
+of the whole working_videos.highlights_data blob. Readers (the overlay-data
+GET, the render, the framing carry-over, the archive) still see the same
+assembled list. Any blob write hands authority back to the blob.
+"""
+
+import asyncio
+import json
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from app.routers.export.overlay import (
+    OverlayAction,
+    _get_overlay_data,
+    get_overlay_data,
+    overlay_action,
+)
+from app.services import highlight_store
+from app.utils.encoding import decode_data, encode_data
+
+USER_ID = "test-user-hlregions"
+PROFILE_ID = "testdefault"
+
+
+def _region(rid, start, times):
+    return {
+        "id": rid, "start_time": start, "end_time": start + 2.0, "enabled": True,
+        "keyframes": [{"time": t, "x": 100.0, "y": 50.0, "radiusX": 20.0, "radiusY": 40.0,
+                       "strokeOpacity": 0.85, "fillOpacity": 0.05, "color": "#FFFFFF"}
+                      for t in times],
+        "detections": [],
+    }
+
+
+REGIONS = [_region("r1", 0.0, [0.0, 1.0]), _region("r2", 3.0, [3.0, 4.0]), _region("r3", 6.0, [6.5])]
+
+
+@pytest.fixture()
+def db(tmp_path):
+    from app.profile_context import set_current_profile_id
+    from app.user_context import set_current_user_id
+
+    set_current_user_id(USER_ID)
+    set_current_profile_id(PROFILE_ID)
+    with patch("app.database.USER_DATA_BASE", tmp_path), \
+         patch("app.database._initialized_users", set()), \
+         patch("app.database.R2_ENABLED", False):
+        from app.database import ensure_database, get_database_path
+        ensure_database()
+        yield get_database_path()
+
+
+@pytest.fixture()
+def project(db):
+    conn = sqlite3.connect(str(db))
+    conn.execute("INSERT INTO projects (id, name, aspect_ratio) VALUES (1, 'P', '9:16')")
+    conn.execute(
+        "INSERT INTO working_videos (id, project_id, filename, version, highlights_data, overlay_version) "
+        "VALUES (10, 1, 'wv.mp4', 1, ?, 0)",
+        (encode_data(REGIONS),),
+    )
+    conn.execute("UPDATE projects SET working_video_id = 10 WHERE id = 1")
+    conn.commit()
+    conn.close()
+    return db
+
+
+def _act(**body):
+    resp = asyncio.run(overlay_action(1, OverlayAction(**body)))
+    assert resp.status_code == 200, resp.body
+    return json.loads(resp.body)
+
+
+def _rows(db_path):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(
+            "SELECT id, region_id, position, data FROM highlight_regions "
+            "WHERE working_video_id = 10 ORDER BY position"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def _blob(db_path):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT highlights_data FROM working_videos WHERE id = 10").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _assembled():
+    from app.database import get_db_connection
+
+    with get_db_connection() as conn:
+        highlights, *_ = _get_overlay_data(conn.cursor(), 1)
+    return highlights
+
+
+def test_keyframe_gesture_rewrites_only_its_region_row(project):
+    _act(action="set_effect_type", data={"effect_type": "brightness_boost"})
+    before = _rows(project)
+    assert _blob(project) is None
+    assert [r[1] for r in before] == ["r1", "r2", "r3"]
+
+    _act(action="update_keyframe", target={"region_id": "r2", "keyframe_time": 4.0}, data={"x": 900.0})
+
+    after = _rows(project)
+    assert [r[0] for r in after] == [r[0] for r in before]
+    assert after[0][3] == before[0][3] and after[2][3] == before[2][3]
+    assert decode_data(after[1][3])["keyframes"][1]["x"] == 900.0
+    assert [r["id"] for r in _assembled()] == ["r1", "r2", "r3"]
+
+
+def test_region_create_and_delete_are_targeted(project):
+    created = _act(action="create_region", data={"start_time": 9.0, "region_id": "r4"})
+    assert created["region_id"] == "r4"
+    _act(action="delete_region", target={"region_id": "r1"})
+    _act(action="toggle_region", target={"region_id": "r3"}, data={"enabled": False})
+
+    regions = _assembled()
+    assert [r["id"] for r in regions] == ["r2", "r3", "r4"]
+    assert regions[1]["enabled"] is False
+
+    resp = asyncio.run(overlay_action(1, OverlayAction(action="delete_region", target={"region_id": "nope"})))
+    assert resp.status_code == 400
+
+
+def test_overlay_data_read_matches_the_blob_it_replaced(project):
+    before = json.loads(asyncio.run(get_overlay_data(1)).body)["highlights_data"]
+    _act(action="set_highlight_color", data={"highlight_color": "#FF0000"})
+    assert _rows(project)
+    after = json.loads(asyncio.run(get_overlay_data(1)).body)["highlights_data"]
+    assert after == before
+
+
+def test_blob_write_and_delete_drop_the_rows(project):
+    _act(action="set_effect_type", data={"effect_type": "original"})
+    conn = sqlite3.connect(str(project))
+    conn.execute("UPDATE working_videos SET highlights_data = ? WHERE id = 10", (encode_data(REGIONS[:1]),))
+    conn.commit()
+    assert _rows(project) == []
+    assert [r["id"] for r in _assembled()] == ["r1"]
+
+    conn.execute("UPDATE working_videos SET highlights_data = NULL WHERE id = 10")
+    conn.commit()
+    _act(action="create_region", data={"start_time": 1.0, "region_id": "x"})
+    conn.execute("UPDATE projects SET working_video_id = NULL WHERE id = 1")
+    conn.execute("DELETE FROM working_videos WHERE id = 10")
+    conn.commit()
+    conn.close()
+    assert _rows(project) == []
+
+
+def test_carry_over_and_archive_fold_see_the_whole_list(project):
+    from app.database import get_db_connection
+
+    _act(action="delete_region", target={"region_id": "r3"})
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        carried = highlight_store.highlights_blob(cursor, 10, None)
+        assert [r["id"] for r in decode_data(carried)] == ["r1", "r2"]
+
+        assert highlight_store.fold_project_highlights(cursor, 1) == 1
+        conn.commit()
+    assert [r["id"] for r in decode_data(_blob(project))] == ["r1", "r2"]
+    assert _rows(project) == []
+
+
+def test_v047_splits_current_working_videos_only(project):
+    from app.migrations.profile_db.v047_highlight_regions import V047HighlightRegions
+
+    conn = sqlite3.connect(str(project))
+    conn.execute(
+        "INSERT INTO working_videos (id, project_id, filename, version, highlights_data) "
+        "VALUES (9, 1, 'old.mp4', 0, ?)",
+        (encode_data(REGIONS),),
+    )
+    conn.execute("INSERT INTO projects (id, name, aspect_ratio) VALUES (2, 'Bad', '9:16')")
+    conn.execute(
+        "INSERT INTO working_videos (id, project_id, filename, version, highlights_data) "
+        "VALUES (11, 2, 'bad.mp4', 1, X'C1')"
+    )
+    conn.execute("UPDATE projects SET working_video_id = 11 WHERE id = 2")
+    conn.commit()
+
+    V047HighlightRegions().up(conn)
+    V047HighlightRegions().up(conn)
+    conn.commit()
+
+    counts = dict(conn.execute(
+        "SELECT working_video_id, COUNT(*) FROM highlight_regions GROUP BY working_video_id"
+    ).fetchall())
+    blobs = dict(conn.execute("SELECT id, highlights_data FROM working_videos").fetchall())
+    conn.close()
+    assert counts == {10: 3}
+    assert blobs[10] is None
+    assert blobs[9] is not None  # history untouched
+    assert blobs[11] == b"\xc1"  # undecodable blob left for recovery (T4210)
@@ -0,0 +1,85 @@
+"""
+Cold-start import hygiene for the API process.
+
+Fly machines autostop, so `import app.main` runs on every wake and is paid by the
+first user request. Heavy libraries (cv2, numpy, PIL, sklearn, scipy, torch) are
+only needed on render/detection paths and must be loaded on first use via
+app.utils.lazy_import, never as a side effect of importing the app.
+
+The import runs in a fresh interpreter so modules already loaded by other tests
+can't mask a regression. APP_IMPORT_BUDGET_SECONDS overrides the time budget on
+slow CI hosts.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.utils.lazy_import import HEAVY_MODULES, lazy_module
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+IMPORT_BUDGET_SECONDS = float(os.getenv("APP_IMPORT_BUDGET_SECONDS", "4.0"))
+
+_PROBE = f"""
+import json, sys, time
+t0 = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - t0
+heavy = sorted(m for m in sys.modules if m.split(".")[0] in {HEAVY_MODULES!r})
+print("@@" + json.dumps({{"elapsed": elapsed, "heavy": heavy,
+                          "reported": app.main.APP_IMPORT_SECONDS}}))
+"""
+
+
+def _import_app_main_in_fresh_interpreter() -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    line = next(ln for ln in proc.stdout.splitlines() if ln.startswith("@@"))
+    return json.loads(line[2:])
+
+
+def test_import_app_main_is_lean_and_fast():
+    result = _import_app_main_in_fresh_interpreter()
+
+    assert result["heavy"] == [], (
+        f"`import app.main` loaded heavy modules {result['heavy']}; defer them with "
+        f"app.utils.lazy_import.lazy_module or a function-local import"
+    )
+    assert result["elapsed"] < IMPORT_BUDGET_SECONDS, (
+        f"`import app.main` took {result['elapsed']:.2f}s "
+        f"(budget {IMPORT_BUDGET_SECONDS:.2f}s)"
+    )
+    assert 0 < result["reported"] <= result["elapsed"]
+
+
+def test_lazy_module_defers_import_until_first_attribute(tmp_path, monkeypatch):
+    (tmp_path / "lazy_probe_mod.py").write_text("VALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, "lazy_probe_mod", raising=False)
+
+    proxy = lazy_module("lazy_probe_mod")
+    assert "not loaded" in repr(proxy)
+    assert "lazy_probe_mod" not in sys.modules
+
+    assert proxy.VALUE == 42
+    assert "lazy_probe_mod" in sys.modules
+    assert "(loaded)" in repr(proxy)
+    sys.modules.pop("lazy_probe_mod")
+
+
+def test_lifespan_records_startup_phases():
+    from fastapi.testclient import TestClient
+
+    from app import main
+
+    with TestClient(main.app):
+        pass
+
+    assert {"postgres", "poster_warmer", "sweep_loop", "cleanup_loop"} <= set(main.STARTUP_PHASES)
+    assert all(ms >= 0 for ms in main.STARTUP_PHASES.values())
@@ -0,0 +1,125 @@
+"""
+Vectorized keyframe evaluation (app/keyframe_spline.py) must reproduce the
+scalar reference -- KeyframeInterpolator.interpolate_crop / interpolate_highlight,
+which mirror the frontend splines -- exactly, frame for frame.
+
+The timelines are a 90s clip at 60fps: the export loops index these arrays by
+frame instead of calling the scalar spline 5400 times.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.ai_upscaler.keyframe_interpolator import KeyframeInterpolator
+from app.keyframe_spline import HighlightTrack, crop_positions, highlight_positions
+
+FPS = 60
+TIMES = np.arange(90 * FPS) / FPS
+
+
+def _key_times(rng, n):
+    times = sorted(round(rng.uniform(0, 90), 2) for _ in range(n))
+    if n > 2 and rng.random() < 0.4:
+        times[1] = times[0]  # duplicate keyframe time
+    return times
+
+
+def _crop_keyframes(rng, n):
+    return [
+        {'time': t, 'x': rng.uniform(0, 1500), 'y': rng.randint(0, 400),
+         'width': rng.uniform(300, 700), 'height': 720.0}
+        for t in _key_times(rng, n)
+    ]
+
+
+def _highlight_keyframes(rng, n):
+    return [
+        {'time': t, 'x': rng.uniform(0, 1900), 'y': rng.randint(0, 1000),
+         'radiusX': rng.uniform(10, 90), 'radiusY': 40,
+         # Out-of-range opacities exercise the [0, 1] clamp.
+         'strokeOpacity': rng.uniform(-0.3, 1.3), 'fillOpacity': rng.uniform(0, 1),
+         'color': rng.choice(['#FFFFFF', '#FF0000', 'none'])}
+        for t in _key_times(rng, n)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_crop_positions_match_scalar_reference(seed):
+    rng = random.Random(seed)
+    keyframes = _crop_keyframes(rng, rng.randint(1, 12))
+
+    vectorized = crop_positions(keyframes, TIMES)
+
+    assert len(vectorized) == len(TIMES)
+    for t, crop in zip(TIMES.tolist(), vectorized, strict=True):
+        assert crop == KeyframeInterpolator.interpolate_crop(keyframes, t)
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_highlight_positions_match_scalar_reference(seed):
+    rng = random.Random(100 + seed)
+    keyframes = _highlight_keyframes(rng, rng.randint(1, 12))
+
+    vectorized = highlight_positions(keyframes, TIMES)
+
+    for t, highlight in zip(TIMES.tolist(), vectorized, strict=True):
+        assert highlight == KeyframeInterpolator.interpolate_highlight(keyframes, t)
+
+
+def test_highlight_positions_sort_and_skip_timeless_keyframes():
+    keyframes = _highlight_keyframes(random.Random(7), 5)
+    shuffled = [keyframes[3], {'time': None, 'x': 0}, keyframes[0], keyframes[4], keyframes[1], keyframes[2]]
+
+    assert highlight_positions(shuffled, TIMES) == highlight_positions(keyframes, TIMES)
+    assert highlight_positions([], [0.0, 1.0]) == [None, None]
+    assert crop_positions([], [0.0]) == [None]
+
+
+def test_endpoint_results_are_copies():
+    keyframes = _crop_keyframes(random.Random(3), 3)
+
+    first = crop_positions(keyframes, [-1.0])[0]
+    first['x'] = -1
+
+    assert keyframes[0]['x'] != -1
+
+
+def test_highlight_track_matches_per_frame_lookup():
+    keyframes = _highlight_keyframes(random.Random(11), 6)
+    start, end = keyframes[0]['time'], keyframes[-1]['time']
+    track = HighlightTrack(keyframes, start, end, FPS)
+
+    # Frames inside the window, at its edges and far outside (evaluated alone).
+    frames = [*range(int(start * FPS) - 3, int(end * FPS) + 4), 0, 90 * FPS - 1]
+    for frame_idx in frames:
+        assert track.at(frame_idx) == KeyframeInterpolator.interpolate_highlight(keyframes, frame_idx / FPS)
+
+
+def test_modal_track_render_matches_single_frame_render():
+    """The Modal loops draw from a per-region track (keyframes scaled from
+    detection space once); the single-frame path must draw the same pixels."""
+    from app.modal_functions.video_processing import _draw_highlight, _highlight_track, _render_highlight
+
+    keyframes = _highlight_keyframes(random.Random(5), 4)
+    for kf in keyframes:
+        kf['strokeOpacity'] = 0.8
+        kf['color'] = '#FFFF00'
+    region = {
+        'start_time': keyframes[0]['time'], 'end_time': keyframes[-1]['time'],
+        'keyframes': keyframes, 'videoWidth': 1920, 'videoHeight': 1080,
+    }
+    width, height = 960, 540
+    scaled_region = {**region, 'keyframes': [
+        {**kf, 'x': kf['x'] / 2, 'y': kf['y'] / 2, 'radiusX': kf['radiusX'] / 2, 'radiusY': kf['radiusY'] / 2}
+        for kf in keyframes
+    ]}
+    track = _highlight_track(region, FPS, width, height)
+    frame = np.full((height, width, 3), 90, dtype=np.uint8)
+
+    for frame_idx in range(int(region['start_time'] * FPS) + 1, int(region['end_time'] * FPS), 97):
+        t = frame_idx / FPS
+        expected = _render_highlight(frame.copy(), scaled_region, t, "dark_overlay")
+        actual = _draw_highlight(frame.copy(), track.at(frame_idx), region, t, "dark_overlay")
+        assert np.array_equal(actual, expected)
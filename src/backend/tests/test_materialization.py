@@ -195,6 +195,11 @@ def _insert_clip(conn, game_id, start_time, end_time, tagged_teammates=None,
     return clip_id
 
 
+def _refs_for_every_hash(ref):
+    """get_game_storage_refs side effect: the sharer holds `ref` for every hash."""
+    return lambda _user_id, _profile_id, hashes: {h: ref for h in hashes}
+
+
 # ===========================================================================
 # Unit tests: clip filtering
 # ===========================================================================
@@ -517,6 +522,83 @@ class TestMaterializeClips:
         conn.close()
 
 
+    def test_oldest_overlapping_team_clip_wins_and_grows(self, tmp_path):
+        conn = _create_profile_db(tmp_path / "recipient" / "profile.sqlite")
+        game_id = _insert_game(conn)
+        older = _insert_clip(conn, game_id, 10, 12, name="Older", video_sequence=0, my_athlete=0)
+        newer = _insert_clip(conn, game_id, 4, 8, name="Newer", video_sequence=0, my_athlete=0)
+
+        incoming = [
+            # Overlaps both: the older (lower id) clip wins even though it starts later.
+            {"rating": 3, "name": "A", "notes": "a", "start_time": 6, "end_time": 11,
+             "video_sequence": 0, "tags": None},
+            # Only overlaps "Older" as grown by A.
+            {"rating": 3, "name": "B", "notes": "b", "start_time": 6.5, "end_time": 7,
+             "video_sequence": 0, "tags": None},
+            # Other sequence: never a merge target.
+            {"rating": 3, "name": "C", "notes": None, "start_time": 4, "end_time": 8,
+             "video_sequence": 1, "tags": None},
+        ]
+        result = _materialize_clips(conn, game_id, incoming)
+        conn.commit()
+
+        assert (result["inserted"], result["merged"]) == (1, 2)
+        rows = {r["id"]: r for r in conn.execute("SELECT * FROM raw_clips").fetchall()}
+        assert (rows[older]["start_time"], rows[older]["end_time"]) == (6, 12)
+        assert rows[older]["notes"] == "a\nb"
+        assert (rows[newer]["start_time"], rows[newer]["end_time"]) == (4, 8)
+        assert [c["name"] for c in result["inserted_clips"]] == ["C"]
+        assert rows[result["inserted_clips"][0]["id"]]["video_sequence"] == 1
+        conn.close()
+
+    def test_sweep_matches_pairwise_merge(self, tmp_path):
+        """Randomized check against the straightforward pairwise scan: same
+        merge targets, same final rows, inserted ids mapped to the right clips."""
+        import random
+
+        rng = random.Random(42)
+        for trial in range(20):
+            conn = _create_profile_db(tmp_path / f"t{trial}" / "profile.sqlite")
+            game_id = _insert_game(conn)
+            for i in range(rng.randint(0, 40)):
+                start = rng.randint(0, 200)
+                _insert_clip(conn, game_id, start, start + rng.randint(1, 15),
+                             name=f"ex{i}", notes=f"n{i}", video_sequence=rng.randint(0, 1),
+                             my_athlete=rng.choice([0, 0, 1]))
+            incoming = []
+            for i in range(rng.randint(0, 60)):
+                start = rng.randint(0, 200)
+                incoming.append({"rating": 3, "name": f"in{i}", "notes": f"i{i}",
+                                 "start_time": start, "end_time": start + rng.randint(1, 15),
+                                 "video_sequence": rng.randint(0, 1), "tags": None})
+
+            expected = {r["id"]: dict(r) for r in conn.execute(
+                "SELECT * FROM raw_clips ORDER BY id").fetchall()}
+            targets = [r for r in expected.values() if r["my_athlete"] == 0]
+            expected_inserts = []
+            for clip in sorted(incoming, key=lambda c: (c["start_time"], c["end_time"])):
+                hit = next((t for t in targets if clips_overlap(t, clip)), None)
+                if hit is None:
+                    expected_inserts.append(clip["name"])
+                    continue
+                hit["start_time"] = min(hit["start_time"], clip["start_time"])
+                hit["end_time"] = max(hit["end_time"], clip["end_time"])
+
+            result = _materialize_clips(conn, game_id, incoming)
+            conn.commit()
+
+            rows = {r["id"]: r for r in conn.execute("SELECT * FROM raw_clips").fetchall()}
+            for clip_id, row in expected.items():
+                assert (rows[clip_id]["start_time"], rows[clip_id]["end_time"]) == \
+                    (row["start_time"], row["end_time"])
+            assert sorted(c["name"] for c in result["inserted_clips"]) == sorted(expected_inserts)
+            for clip in result["inserted_clips"]:
+                assert rows[clip["id"]]["name"] == clip["name"]
+                assert rows[clip["id"]]["my_athlete"] == 0
+            assert result["merged"] + result["inserted"] == len(incoming)
+            conn.close()
+
+
 # ===========================================================================
 # Unit tests: athlete attribution on materialized clips
 # ===========================================================================
@@ -684,8 +766,8 @@ class TestMaterializeGameShare:
         return s_conn, r_conn
 
     @patch("app.services.materialization.mark_game_share_materialized")
-    @patch("app.services.materialization.insert_game_storage_ref")
-    @patch("app.services.materialization.get_game_storage_ref")
+    @patch("app.services.materialization.insert_game_storage_refs")
+    @patch("app.services.materialization.get_game_storage_refs")
     @patch("app.services.materialization.USER_DATA_BASE")
     def test_full_materialization(self, mock_base, mock_get_ref, mock_insert_ref,
                                   mock_mark, tmp_path):
@@ -698,10 +780,10 @@ class TestMaterializeGameShare:
         _insert_clip(s_conn, game_id, 0, 5, tagged_teammates=["Jake"], name="Jake Goal")
         _insert_clip(s_conn, game_id, 10, 15, tagged_teammates=["Other"], name="Other Play")
 
-        mock_get_ref.return_value = {
+        mock_get_ref.side_effect = _refs_for_every_hash({
             "game_size_bytes": 100000,
             "storage_expires_at": "2027-01-01T00:00:00+00:00",
-        }
+        })
 
         with patch("app.services.materialization.USER_DATA_BASE", tmp_path):
             result = materialize_game_share(
@@ -752,8 +834,8 @@ class TestMaterializeGameShare:
 
     @patch("app.services.materialization.sync_db_to_r2_explicit")
     @patch("app.services.materialization.mark_game_share_materialized")
-    @patch("app.services.materialization.insert_game_storage_ref")
-    @patch("app.services.materialization.get_game_storage_ref")
+    @patch("app.services.materialization.insert_game_storage_refs")
+    @patch("app.services.materialization.get_game_storage_refs")
     @patch("app.services.materialization.USER_DATA_BASE")
     def test_recipient_db_is_explicitly_synced_to_r2(
         self, mock_base, mock_get_ref, mock_insert_ref, mock_mark, mock_sync, tmp_path
@@ -769,7 +851,7 @@ class TestMaterializeGameShare:
         s_conn, r_conn = self._setup_dbs(tmp_path)
         game_id = _insert_game(s_conn, name="League Match", blake3_hash="game_hash_sync")
         _insert_clip(s_conn, game_id, 0, 5, tagged_teammates=["Jake"], name="Jake Goal")
-        mock_get_ref.return_value = None
+        mock_get_ref.return_value = {}
 
         with patch("app.services.materialization.USER_DATA_BASE", tmp_path):
             materialize_game_share(
@@ -798,8 +880,8 @@ class TestMaterializeGameShare:
     # -----------------------------------------------------------------
 
     @patch("app.services.materialization.mark_game_share_materialized")
-    @patch("app.services.materialization.insert_game_storage_ref")
-    @patch("app.services.materialization.get_game_storage_ref")
+    @patch("app.services.materialization.insert_game_storage_refs")
+    @patch("app.services.materialization.get_game_storage_refs")
     def test_recipient_upload_contains_the_materialized_data(
         self, mock_get_ref, mock_insert_ref, mock_mark, tmp_path
     ):
@@ -812,7 +894,7 @@ class TestMaterializeGameShare:
         from app.storage import profile_r2_key
         from tests.test_t4050_durable_sync import FakeR2, _r2_patched
 
-        mock_get_ref.return_value = None
+        mock_get_ref.return_value = {}
 
         s_conn, r_conn = self._setup_dbs(tmp_path)
         game_id = _insert_game(s_conn, name="League Match", blake3_hash="game_hash_walcheck")
@@ -851,8 +933,8 @@ class TestMaterializeGameShare:
         mock_mark.assert_called_once()
 
     @patch("app.services.materialization.mark_game_share_materialized")
-    @patch("app.services.materialization.insert_game_storage_ref")
-    @patch("app.services.materialization.get_game_storage_ref")
+    @patch("app.services.materialization.insert_game_storage_refs")
+    @patch("app.services.materialization.get_game_storage_refs")
     def test_contended_checkpoint_refuses_instead_of_uploading_stale_bytes(
         self, mock_get_ref, mock_insert_ref, mock_mark, tmp_path
     ):
@@ -871,7 +953,7 @@ class TestMaterializeGameShare:
         from app.storage import profile_r2_key
         from tests.test_t4050_durable_sync import FakeR2, _r2_patched
 
-        mock_get_ref.return_value = None
+        mock_get_ref.return_value = {}
 
         s_conn, r_conn = self._setup_dbs(tmp_path)
         game_id = _insert_game(s_conn, name="League Match", blake3_hash="game_hash_contend")
@@ -914,8 +996,8 @@ class TestMaterializeGameShare:
 
     @patch("app.services.materialization.sync_db_to_r2_explicit")
     @patch("app.services.materialization.mark_game_share_materialized")
-    @patch("app.services.materialization.insert_game_storage_ref")
-    @patch("app.services.materialization.get_game_storage_ref")
+    @patch("app.services.materialization.insert_game_storage_refs")
+    @patch("app.services.materialization.get_game_storage_refs")
     @patch("app.services.materialization.USER_DATA_BASE")
     def test_sync_failure_refuses_to_mark_materialized(
         self, mock_base, mock_get_ref, mock_insert_ref, mock_mark, mock_sync, tmp_path
@@ -930,7 +1012,7 @@ class TestMaterializeGameShare:
         s_conn, r_conn = self._setup_dbs(tmp_path)
         game_id = _insert_game(s_conn, name="League Match", blake3_hash="game_hash_syncfail")
         _insert_clip(s_conn, game_id, 0, 5, tagged_teammates=["Jake"], name="Jake Goal")
-        mock_get_ref.return_value = None
+        mock_get_ref.return_value = {}
 
         with patch("app.services.materialization.USER_DATA_BASE", tmp_path), \
              pytest.raises(ProfileDBRefreshFailed):
@@ -952,8 +1034,8 @@ class TestMaterializeGameShare:
         r_conn.close()
 
     @patch("app.services.materialization.mark_game_share_materialized")
-    @patch("app.services.materialization.insert_game_storage_ref")
-    @patch("app.services.materialization.get_game_storage_ref")
+    @patch("app.services.materialization.insert_game_storage_refs")
+    @patch("app.services.materialization.get_game_storage_refs")
     def test_materialization_with_existing_game_merges(
         self, mock_get_ref, mock_insert_ref, mock_mark, tmp_path
     ):
@@ -972,10 +1054,10 @@ class TestMaterializeGameShare:
                      my_athlete=0)
         r_conn.commit()
 
-        mock_get_ref.return_value = {
+        mock_get_ref.side_effect = _refs_for_every_hash({
             "game_size_bytes": 50000,
             "storage_expires_at": "2027-01-01T00:00:00+00:00",
-        }
+        })
 
         with patch("app.services.materialization.USER_DATA_BASE", tmp_path):
             result = materialize_game_share(
@@ -998,8 +1080,8 @@ class TestMaterializeGameShare:
         r_conn.close()
 
     @patch("app.services.materialization.mark_game_share_materialized")
-    @patch("app.services.materialization.insert_game_storage_ref")
-    @patch("app.services.materialization.get_game_storage_ref")
+    @patch("app.services.materialization.insert_game_storage_refs")
+    @patch("app.services.materialization.get_game_storage_refs")
     def test_game_only_share_when_no_clips_for_tag(
         self, mock_get_ref, mock_insert_ref, mock_mark, tmp_path
     ):
@@ -1008,10 +1090,10 @@ class TestMaterializeGameShare:
         s_game_id = _insert_game(s_conn, name="Match")
         _insert_clip(s_conn, s_game_id, 0, 5, tagged_teammates=["Other"])
 
-        mock_get_ref.return_value = {
+        mock_get_ref.side_effect = _refs_for_every_hash({
             "game_size_bytes": 50000,
             "storage_expires_at": "2027-01-01T00:00:00+00:00",
-        }
+        })
 
         with patch("app.services.materialization.USER_DATA_BASE", tmp_path):
             result = materialize_game_share(
@@ -1034,8 +1116,8 @@ class TestMaterializeGameShare:
         r_conn.close()
 
     @patch("app.services.materialization.mark_game_share_materialized")
-    @patch("app.services.materialization.insert_game_storage_ref")
-    @patch("app.services.materialization.get_game_storage_ref")
+    @patch("app.services.materialization.insert_game_storage_refs")
+    @patch("app.services.materialization.get_game_storage_refs")
     def test_materializes_from_clip_data(
         self, mock_get_ref, mock_insert_ref, mock_mark, tmp_path
     ):
@@ -1048,10 +1130,10 @@ class TestMaterializeGameShare:
              "start_time": 0, "end_time": 5, "video_sequence": 0, "tags": None},
         ]
 
-        mock_get_ref.return_value = {
+        mock_get_ref.side_effect = _refs_for_every_hash({
             "game_size_bytes": 50000,
             "storage_expires_at": "2027-01-01T00:00:00+00:00",
-        }
+        })
 
         with patch("app.services.materialization.USER_DATA_BASE", tmp_path):
             result = materialize_game_share(
@@ -1072,8 +1154,8 @@ class TestMaterializeGameShare:
         r_conn.close()
 
     @patch("app.services.materialization.mark_game_share_materialized")
-    @patch("app.services.materialization.insert_game_storage_ref")
-    @patch("app.services.materialization.get_game_storage_ref")
+    @patch("app.services.materialization.insert_game_storage_refs")
+    @patch("app.services.materialization.get_game_storage_refs")
     def test_five_star_shared_clip_creates_draft_reel(
         self, mock_get_ref, mock_insert_ref, mock_mark, tmp_path
     ):
@@ -1087,10 +1169,10 @@ class TestMaterializeGameShare:
         _insert_clip(s_conn, s_game_id, 10, 15, tagged_teammates=["Jake"],
                      name="Ordinary Play", rating=3)
 
-        mock_get_ref.return_value = {
+        mock_get_ref.side_effect = _refs_for_every_hash({
             "game_size_bytes": 50000,
             "storage_expires_at": "2027-01-01T00:00:00+00:00",
-        }
+        })
 
         with patch("app.services.materialization.USER_DATA_BASE", tmp_path):
             materialize_game_share(
@@ -1136,8 +1218,8 @@ class TestMaterializeGameShare:
         r_conn2.close()
 
     @patch("app.services.materialization.mark_game_share_materialized")
-    @patch("app.services.materialization.insert_game_storage_ref")
-    @patch("app.services.materialization.get_game_storage_ref")
+    @patch("app.services.materialization.insert_game_storage_refs")
+    @patch("app.services.materialization.get_game_storage_refs")
     def test_no_draft_reel_without_five_star_clip(
         self, mock_get_ref, mock_insert_ref, mock_mark, tmp_path
     ):
@@ -1147,10 +1229,10 @@ class TestMaterializeGameShare:
         _insert_clip(s_conn, s_game_id, 0, 5, tagged_teammates=["Jake"],
                      name="Good Play", rating=4)
 
-        mock_get_ref.return_value = {
+        mock_get_ref.side_effect = _refs_for_every_hash({
             "game_size_bytes": 50000,
             "storage_expires_at": "2027-01-01T00:00:00+00:00",
-        }
+        })
 
         with patch("app.services.materialization.USER_DATA_BASE", tmp_path):
             materialize_game_share(
@@ -1174,8 +1256,8 @@ class TestMaterializeGameShare:
         r_conn2.close()
 
     @patch("app.services.materialization.mark_game_share_materialized")
-    @patch("app.services.materialization.insert_game_storage_ref")
-    @patch("app.services.materialization.get_game_storage_ref")
+    @patch("app.services.materialization.insert_game_storage_refs")
+    @patch("app.services.materialization.get_game_storage_refs")
     def test_re_materialization_does_not_duplicate_draft_reel(
         self, mock_get_ref, mock_insert_ref, mock_mark, tmp_path
     ):
@@ -1186,10 +1268,10 @@ class TestMaterializeGameShare:
         _insert_clip(s_conn, s_game_id, 0, 5, tagged_teammates=["Jake"],
                      name="Brilliant Goal", rating=5)
 
-        mock_get_ref.return_value = {
+        mock_get_ref.side_effect = _refs_for_every_hash({
             "game_size_bytes": 50000,
             "storage_expires_at": "2027-01-01T00:00:00+00:00",
-        }
+        })
 
         def _run():
             with patch("app.services.materialization.USER_DATA_BASE", tmp_path):
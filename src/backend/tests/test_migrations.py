@@ -130,10 +130,11 @@ class TestTrackImports:
     def test_postgres_track(self):
         from app.migrations.postgres import MIGRATIONS, RUNNER
         # v020/v021 (Share the Game epic) merged alongside T5770's v022, so the
-        # track is contiguous again: 22 registered migrations, head at v022.
-        assert len(MIGRATIONS) == 22
+        # track is contiguous again; v023-v025 add the email outbox, action
+        # rollups and credit totals.
+        assert len(MIGRATIONS) == 25
         assert MIGRATIONS[0].version == 1
-        assert RUNNER.latest_version == 22
+        assert RUNNER.latest_version == 25
 
     def test_orchestrator_imports(self):
         from app.migrations import get_migration_status
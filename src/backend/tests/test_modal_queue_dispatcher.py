@@ -0,0 +1,260 @@
+"""
+Modal task dispatcher (services/modal_queue).
+
+Tasks are queued with enqueue_modal_task and run by a fake handler registered
+for a test-only task type -- the local executor standing in for Modal. Covers
+the global and per-user concurrency caps under a burst, retries with backoff,
+reclaiming a task whose lease lapsed, heartbeats keeping a long task's lease
+alive, and the explicit profile sync after the loop's claims and outcomes.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.services import modal_queue
+
+PROFILE_ID = "testdefault"
+TASK_TYPE = "__fake_gpu__"
+
+
+@pytest.fixture()
+def profiles(tmp_path):
+    """Two users with a fresh profile DB each; yields a context switcher."""
+    from app.database import ensure_database
+    from app.profile_context import set_current_profile_id
+    from app.user_context import set_current_user_id
+
+    def use(user_id):
+        set_current_user_id(user_id)
+        set_current_profile_id(PROFILE_ID)
+
+    with patch("app.database.USER_DATA_BASE", tmp_path), \
+         patch("app.database._initialized_users", set()), \
+         patch("app.database.R2_ENABLED", False), \
+         patch.dict(modal_queue._TASK_HANDLERS, clear=True), \
+         patch.object(modal_queue, "_dispatcher", modal_queue._Dispatcher()):
+        for user_id in ("mq-user-a", "mq-user-b"):
+            use(user_id)
+            ensure_database()
+        yield use
+
+
+def _rows():
+    from app.database import get_db_connection
+
+    with get_db_connection() as conn:
+        return [
+            dict(r) for r in conn.execute(
+                "SELECT id, status, retry_count, result, error FROM modal_tasks ORDER BY id"
+            ).fetchall()
+        ]
+
+
+def _leases():
+    from app.database import get_db_connection
+
+    with get_db_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM modal_task_leases").fetchone()[0]
+
+
+def test_burst_respects_global_and_per_user_caps(profiles):
+    running = {"total": 0, "mq-user-a": 0, "mq-user-b": 0}
+    peaks = {"total": 0, "mq-user-a": 0, "mq-user-b": 0}
+
+    async def fake_gpu(task):
+        user = task["params"]["user"]
+        for key in ("total", user):
+            running[key] += 1
+            peaks[key] = max(peaks[key], running[key])
+        await asyncio.sleep(0.02)
+        for key in ("total", user):
+            running[key] -= 1
+        return {"n": task["params"]["n"]}
+
+    modal_queue.register_task_type(TASK_TYPE, fake_gpu)
+
+    async def scenario():
+        await modal_queue.start_modal_queue()
+        try:
+            for n in range(8):
+                for user in ("mq-user-a", "mq-user-b"):
+                    profiles(user)
+                    modal_queue.enqueue_modal_task(TASK_TYPE, {"user": user, "n": n})
+            for _ in range(500):
+                done = True
+                for user in ("mq-user-a", "mq-user-b"):
+                    profiles(user)
+                    done = done and all(r["status"] == "complete" for r in _rows())
+                if done:
+                    return
+                await asyncio.sleep(0.02)
+            pytest.fail("queue did not drain")
+        finally:
+            await modal_queue.stop_modal_queue()
+
+    with patch.object(modal_queue, "MODAL_QUEUE_CONCURRENCY", 3), \
+         patch.object(modal_queue, "MODAL_QUEUE_PER_USER_CONCURRENCY", 2), \
+         patch.object(modal_queue, "MODAL_QUEUE_POLL_SECONDS", 0.05):
+        asyncio.run(scenario())
+
+    assert peaks == {"total": 3, "mq-user-a": 2, "mq-user-b": 2}
+    for user in ("mq-user-a", "mq-user-b"):
+        profiles(user)
+        assert [r["result"] for r in _rows()] == [f'{{"n": {n}}}' for n in range(8)]
+        assert _leases() == 0
+
+
+def test_failed_task_is_retried_with_backoff_until_it_succeeds(profiles):
+    profiles("mq-user-a")
+    attempts = []
+
+    async def flaky(task):
+        attempts.append(task["task_id"])
+        if len(attempts) < 3:
+            raise RuntimeError("GPU hiccup")
+        return {"ok": True}
+
+    modal_queue.register_task_type(TASK_TYPE, flaky)
+    task_id = modal_queue.enqueue_modal_task(TASK_TYPE, {})
+
+    # Default backoff: the first failure waits a minute, so this drain stops there.
+    summary = asyncio.run(modal_queue.process_modal_queue())
+    assert summary == {"processed": 1, "succeeded": 0, "failed": 1}
+    assert _rows()[0]["status"] == "failed"
+    assert modal_queue.check_and_retry_failed_tasks() == 0
+
+    with patch.object(modal_queue, "RETRY_BACKOFF_BASE_SECONDS", 0):
+        summary = asyncio.run(modal_queue.process_modal_queue())
+    assert summary == {"processed": 2, "succeeded": 1, "failed": 1}
+    assert attempts == [task_id] * 3
+    row = _rows()[0]
+    assert (row["status"], row["retry_count"], row["error"]) == ("complete", 2, None)
+    assert [modal_queue._retry_backoff_seconds(n) for n in range(3)] == [60, 240, 900]
+
+
+def test_retries_stop_at_max_and_unknown_types_are_not_retried(profiles):
+    profiles("mq-user-a")
+
+    async def broken(task):
+        raise RuntimeError("always")
+
+    modal_queue.register_task_type(TASK_TYPE, broken)
+    modal_queue.enqueue_modal_task(TASK_TYPE, {})
+    modal_queue.enqueue_modal_task("__unregistered__", {})
+
+    with patch.object(modal_queue, "RETRY_BACKOFF_BASE_SECONDS", 0):
+        summary = asyncio.run(modal_queue.process_modal_queue())
+    assert summary["processed"] == 1 + modal_queue.MAX_RETRY_COUNT + 1
+    assert [(r["status"], r["retry_count"]) for r in _rows()] == [
+        ("failed", modal_queue.MAX_RETRY_COUNT),
+        ("failed", modal_queue.MAX_RETRY_COUNT),
+    ]
+    assert _rows()[1]["error"] == "Unknown task type: __unregistered__"
+
+
+def test_lapsed_lease_is_reclaimed(profiles):
+    from app.database import get_db_connection
+
+    profiles("mq-user-a")
+    modal_queue.register_task_type(TASK_TYPE, lambda task: asyncio.sleep(0, {"done": True}))
+    with get_db_connection() as conn:
+        # Claimed by a process that died: running, lease already lapsed.
+        dead = conn.execute(
+            "INSERT INTO modal_tasks (task_type, params, status, started_at) "
+            "VALUES (?, '{}', 'running', CURRENT_TIMESTAMP)", (TASK_TYPE,)
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO modal_task_leases (task_id, owner, leased_until, heartbeat_at) "
+            "VALUES (?, 'dead-owner', datetime('now', '-5 seconds'), datetime('now', '-65 seconds'))",
+            (dead,),
+        )
+        # Claimed before leases existed: no lease row, only the started_at timeout.
+        conn.execute(
+            "INSERT INTO modal_tasks (task_type, params, status, started_at) "
+            "VALUES (?, '{}', 'running', datetime('now', '-11 minutes'))", (TASK_TYPE,)
+        )
+        # Alive elsewhere: lease still valid, must not be touched.
+        alive = conn.execute(
+            "INSERT INTO modal_tasks (task_type, params, status, started_at) "
+            "VALUES (?, '{}', 'running', CURRENT_TIMESTAMP)", (TASK_TYPE,)
+        ).lastrowid
+        conn.execute(
+            "INSERT INTO modal_task_leases (task_id, owner, leased_until, heartbeat_at) "
+            "VALUES (?, 'live-owner', datetime('now', '+60 seconds'), CURRENT_TIMESTAMP)",
+            (alive,),
+        )
+        conn.commit()
+
+    with patch.object(modal_queue, "RETRY_BACKOFF_BASE_SECONDS", 0):
+        summary = asyncio.run(modal_queue.process_modal_queue())
+    assert summary == {"processed": 2, "succeeded": 2, "failed": 0}
+    assert [(r["status"], r["retry_count"]) for r in _rows()] == [
+        ("complete", 1), ("complete", 1), ("running", 0),
+    ]
+    assert _leases() == 1
+
+
+def test_heartbeat_keeps_a_long_task_leased(profiles):
+    from app.database import get_db_connection
+
+    profiles("mq-user-a")
+    stale_seen = []
+
+    async def long_task(task):
+        with get_db_connection() as conn:
+            # Let the lease run out as if the task had outlived it...
+            conn.execute(
+                "UPDATE modal_task_leases SET leased_until = datetime('now', '-1 seconds') "
+                "WHERE task_id = ?", (task["task_id"],)
+            )
+            conn.commit()
+        # ...and the heartbeat renews it before anyone sweeps.
+        await asyncio.sleep(0.1)
+        stale_seen.append(modal_queue.check_stale_tasks())
+        return {"done": True}
+
+    modal_queue.register_task_type(TASK_TYPE, long_task)
+    modal_queue.enqueue_modal_task(TASK_TYPE, {})
+    with patch.object(modal_queue, "MODAL_TASK_HEARTBEAT_SECONDS", 0.02):
+        summary = asyncio.run(modal_queue.process_modal_queue())
+
+    assert stale_seen == [0]
+    assert summary == {"processed": 1, "succeeded": 1, "failed": 0}
+    assert _rows()[0]["status"] == "complete"
+
+
+def test_dispatcher_syncs_the_profile_after_claim_and_outcome(profiles):
+    from app.database import SyncResult
+
+    profiles("mq-user-a")
+    synced = []
+
+    def record_sync(user_id, profile_id):
+        # The loop has no request around it, so this is the only sync it gets.
+        profiles(user_id)
+        synced.append((user_id, profile_id, [r["status"] for r in _rows()]))
+        return SyncResult.OK
+
+    modal_queue.register_task_type(TASK_TYPE, lambda task: asyncio.sleep(0, {"done": True}))
+
+    async def scenario():
+        await modal_queue.start_modal_queue()
+        try:
+            profiles("mq-user-a")
+            modal_queue.enqueue_modal_task(TASK_TYPE, {})
+            for _ in range(250):
+                if any(statuses == ["complete"] for *_, statuses in synced):
+                    return
+                await asyncio.sleep(0.02)
+            pytest.fail("outcome was never synced")
+        finally:
+            await modal_queue.stop_modal_queue()
+
+    with patch.object(modal_queue, "sync_db_to_r2_explicit", side_effect=record_sync), \
+         patch.object(modal_queue, "MODAL_QUEUE_POLL_SECONDS", 0.05):
+        asyncio.run(scenario())
+
+    assert synced[0] == ("mq-user-a", PROFILE_ID, ["running"])
+    assert synced[-1] == ("mq-user-a", PROFILE_ID, ["complete"])
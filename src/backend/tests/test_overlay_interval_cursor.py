@@ -0,0 +1,68 @@
+"""
+_IntervalCursor (routers/export/overlay.py): the overlay frame loop's interval
+index must answer exactly what the per-frame linear scans it replaced did --
+first active region in start order on the closed [start, end], every active
+text layer in blend order on the half-open [start, end).
+"""
+
+import random
+
+import pytest
+
+from app.routers.export.overlay import _IntervalCursor
+
+FPS = 30
+
+
+def _random_intervals(rng, n, duration):
+    intervals = []
+    for i in range(n):
+        start = round(rng.uniform(0, duration), 2)
+        if rng.random() < 0.2:
+            start = round(rng.randint(0, int(duration * FPS)) / FPS, 6)  # lands on a frame
+        end = round(start + rng.choice([0.0, 0.1, 1.0, rng.uniform(0, 30)]), 2)
+        intervals.append((start, end, f"item-{i}"))
+    return intervals
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_regions_match_first_match_linear_scan(seed):
+    rng = random.Random(seed)
+    intervals = sorted(_random_intervals(rng, 40, 600), key=lambda iv: iv[0])
+    cursor = _IntervalCursor(intervals, closed_end=True)
+
+    for frame_idx in range(600 * FPS):
+        t = frame_idx / FPS
+        expected = next((item for start, end, item in intervals if start <= t <= end), None)
+        active = cursor.advance(t)
+        assert (active[0] if active else None) == expected
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_text_layers_match_half_open_filter_in_input_order(seed):
+    rng = random.Random(50 + seed)
+    intervals = _random_intervals(rng, 25, 300)  # NOT start-sorted: blend order is input order
+    cursor = _IntervalCursor(intervals, closed_end=False)
+
+    for frame_idx in range(300 * FPS):
+        t = frame_idx / FPS
+        assert cursor.advance(t) == [item for start, end, item in intervals if start <= t < end]
+
+
+def test_boundaries_closed_vs_half_open():
+    intervals = [(1.0, 2.0, "a"), (2.0, 3.0, "b")]
+    regions = _IntervalCursor(intervals, closed_end=True)
+    texts = _IntervalCursor(intervals, closed_end=False)
+
+    assert regions.advance(2.0) == ["a", "b"]
+    assert texts.advance(2.0) == ["b"]
+    assert regions.advance(3.0) == ["b"]
+    assert texts.advance(3.0) == []
+
+
+def test_time_going_backwards_restarts():
+    cursor = _IntervalCursor([(0.0, 1.0, "a"), (5.0, 6.0, "b")], closed_end=True)
+
+    assert cursor.advance(5.5) == ["b"]
+    assert cursor.advance(0.5) == ["a"]
+    assert cursor.advance(7.0) == []
@@ -32,9 +32,9 @@ from fastapi.testclient import TestClient
 from app.database import get_db_connection
 from app.main import app
 from app.profile_context import set_current_profile_id
+from app.routers.export.overlay import _get_overlay_data
 from app.session_init import _init_cache
 from app.user_context import set_current_user_id
-from app.utils.encoding import decode_data
 
 TEST_USER_ID = f"test_ovseed_{uuid.uuid4().hex[:8]}"
 TEST_PROFILE_ID = "testdefault"
@@ -100,19 +100,10 @@ def _post(project_id: int, body: dict):
 
 
 def _stored_regions(project_id: int) -> list:
+    # Assembled from the per-region rows the actions write (highlight_store).
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            SELECT wv.highlights_data
-            FROM working_videos wv
-            JOIN projects p ON p.working_video_id = wv.id
-            WHERE p.id = ?
-            """,
-            (project_id,),
-        )
-        row = cursor.fetchone()
-    return decode_data(row['highlights_data']) or []
+        highlights, *_ = _get_overlay_data(conn.cursor(), project_id)
+    return highlights or []
 
 
 class TestCreateRegionPersistsSeedKeyframes:
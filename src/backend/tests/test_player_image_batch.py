@@ -0,0 +1,106 @@
+"""
+Batch player-image extraction (services/image_extractor.extract_player_images).
+
+A region's keyframes are cropped from one VideoCapture decoded forward, instead
+of one open + seek per keyframe. The crops must be pixel-identical to what a
+seek to each frame returns, keep the clip_{id}_frame_{n}_kf{i}.png naming, and
+come back in keyframe order whatever order the frames were requested in.
+"""
+
+import shutil
+import subprocess
+from unittest.mock import patch
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from app.services import image_extractor  # noqa: E402
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+
+FRAMES = 90
+
+
+@pytest.fixture(scope="module")
+def video(tmp_path_factory):
+    path = tmp_path_factory.mktemp("player_images") / "clip.mp4"
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "lavfi", "-i", f"testsrc2=size=320x240:rate=30:duration={FRAMES / 30}",
+            "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p", "-g", "30",
+            str(path),
+        ],
+        check=True,
+    )
+    return str(path)
+
+
+@pytest.fixture()
+def highlights(tmp_path):
+    with patch.object(image_extractor, "get_highlights_path", return_value=tmp_path):
+        yield tmp_path
+
+
+def _seek_crop(video, frame_number, x, y, rx, ry):
+    cap = cv2.VideoCapture(video)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+    ok, frame = cap.read()
+    cap.release()
+    assert ok
+    return image_extractor._crop_player(
+        frame, {"x": x, "y": y, "radiusX": rx, "radiusY": ry}, 0.1
+    )
+
+
+def test_region_crops_match_a_seek_per_frame(video, highlights):
+    # Out of order, a repeated frame, a backwards jump and a gap past the seek
+    # threshold -- every branch of the forward walk.
+    frames = [40, 3, 3, 88, 10, 12]
+    keyframes = [
+        {"raw_frame": f, "raw_x": 60 + 2 * f, "raw_y": 120, "raw_radiusX": 20, "raw_radiusY": 40}
+        for f in frames
+    ]
+    with patch.object(image_extractor, "PLAYER_IMAGE_SEEK_GAP", 20):
+        updated = image_extractor.extract_player_images_for_region(video, 42, keyframes)
+
+    assert [kf["player_image_path"] for kf in updated] == [
+        f"highlights/clip_42_frame_{f}_kf{i}.png" for i, f in enumerate(frames)
+    ]
+    for i, f in enumerate(frames):
+        saved = cv2.imread(str(highlights / f"clip_42_frame_{f}_kf{i}.png"))
+        expected = _seek_crop(video, f, 60 + 2 * f, 120, 20, 40)
+        assert saved.shape == expected.shape
+        assert (saved == expected).all(), f"frame {f} differs from a direct seek"
+
+
+def test_one_capture_per_region(video, highlights):
+    real = cv2.VideoCapture
+    opened = []
+
+    def tracking(path):
+        opened.append(path)
+        return real(path)
+
+    keyframes = [{"raw_frame": f, "raw_x": 100, "raw_y": 100} for f in range(0, FRAMES, 9)]
+    with patch.object(cv2, "VideoCapture", side_effect=tracking):
+        updated = image_extractor.extract_player_images_for_region(video, 5, keyframes)
+
+    assert opened == [video]
+    assert all(kf["player_image_path"] for kf in updated)
+
+
+def test_bad_entries_fail_alone(video, highlights):
+    results = image_extractor.extract_player_images(video, 9, [
+        (FRAMES + 5, 0, {"x": 100, "y": 100}),                      # past the end
+        (5, 1, {"x": 100, "y": 100}),
+        (6, 2, {"x": 5000, "y": 5000, "radiusX": 10, "radiusY": 10}),  # outside the frame
+    ])
+    assert results == [None, "highlights/clip_9_frame_5_kf1.png", None]
+    assert sorted(p.name for p in highlights.iterdir()) == ["clip_9_frame_5_kf1.png"]
+
+    assert image_extractor.extract_player_image(video, 7, {"x": 100, "y": 100}, 9, 3) == (
+        "highlights/clip_9_frame_7_kf3.png"
+    )
+    assert image_extractor.extract_player_images("/nonexistent.mp4", 9, [(1, 0, {})]) == [None]
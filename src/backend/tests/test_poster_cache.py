@@ -0,0 +1,209 @@
+"""
+Local ETag-keyed poster byte cache (app.services.poster_cache).
+
+Poster proxies (share unfurls, My Reels / draft tiles) used to pay an R2 HEAD
+and/or GET on every request. The cache keeps bytes in a bounded in-process LRU
+backed by a temp-dir disk cache: fresh entries cost zero R2 round trips, stale
+ones are revalidated with If-None-Match, concurrent misses share one fetch, and
+a browser holding the current ETag gets a 304.
+
+R2 is replaced by a fake pooled client (storage.get_poster_r2_client) that
+records every GET; conftest points the disk cache at a per-test tmp dir.
+"""
+
+import asyncio
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers import shares
+from app.services import poster_cache
+
+KEY = "global/share_posters/reel_abc.mp4.jpg"
+URL = "https://r2/poster.jpg?sig=1"
+
+
+class _FakeR2Client:
+    """Pooled-client stand-in: serves `body`/`etag`, honours If-None-Match."""
+
+    def __init__(self, body=b"\xff\xd8v1", etag='"v1"', status_code=200, delay=0.0):
+        self.body = body
+        self.etag = etag
+        self.status_code = status_code
+        self.delay = delay
+        self.calls: list[dict] = []
+
+    async def get(self, url, headers=None):
+        self.calls.append({"url": url, "headers": headers or {}})
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        resp = MagicMock(content=b"")
+        resp.headers = {"etag": self.etag}
+        if self.status_code != 200:
+            resp.status_code = self.status_code
+        elif (headers or {}).get("If-None-Match") == self.etag:
+            resp.status_code = 304
+        else:
+            resp.status_code = 200
+            resp.content = self.body
+        return resp
+
+
+@pytest.fixture
+def r2():
+    client = _FakeR2Client()
+    with patch("app.storage.get_poster_r2_client", return_value=client):
+        yield client
+
+
+def _get(key=KEY):
+    return asyncio.run(poster_cache.get_poster(key, lambda: URL))
+
+
+def test_hot_poster_costs_zero_r2_round_trips(r2):
+    first = _get()
+    second = _get()
+    assert first.body == second.body == b"\xff\xd8v1"
+    assert second.etag == '"v1"'
+    assert len(r2.calls) == 1
+    assert asyncio.run(poster_cache.peek(KEY)) is second
+
+
+def test_stale_entry_revalidates_with_if_none_match(r2):
+    _get()
+    with patch.object(poster_cache, "POSTER_CACHE_TTL_SECONDS", 0):
+        entry = _get()
+    assert r2.calls[-1]["headers"] == {"If-None-Match": '"v1"'}
+    assert entry.body == b"\xff\xd8v1"  # 304 kept the cached bytes
+
+    # Object overwritten in R2 -> the revalidation GET returns the new bytes.
+    r2.body, r2.etag = b"\xff\xd8v2", '"v2"'
+    with patch.object(poster_cache, "POSTER_CACHE_TTL_SECONDS", 0):
+        entry = _get()
+    assert (entry.body, entry.etag) == (b"\xff\xd8v2", '"v2"')
+
+
+def test_revalidation_404_evicts(r2):
+    _get()
+    r2.status_code = 404
+    with patch.object(poster_cache, "POSTER_CACHE_TTL_SECONDS", 0), \
+         pytest.raises(poster_cache.PosterFetchError) as e:
+        _get()
+    assert e.value.status_code == 404
+    assert asyncio.run(poster_cache._lookup(KEY)) is None
+
+
+def test_concurrent_misses_share_one_fetch(r2):
+    r2.delay = 0.05
+
+    async def burst():
+        return await asyncio.gather(*(
+            poster_cache.get_poster(KEY, lambda: URL) for _ in range(8)
+        ))
+
+    entries = asyncio.run(burst())
+    assert len(r2.calls) == 1
+    assert {e.body for e in entries} == {b"\xff\xd8v1"}
+
+
+def test_concurrent_miss_failure_reaches_every_waiter(r2):
+    r2.delay, r2.status_code = 0.05, 500
+
+    async def burst():
+        return await asyncio.gather(
+            *(poster_cache.get_poster(KEY, lambda: URL) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(burst())
+    assert len(r2.calls) == 1
+    assert all(isinstance(r, poster_cache.PosterFetchError) for r in results)
+
+
+def test_cancelled_first_waiter_does_not_cancel_followers(r2):
+    r2.delay = 0.05
+
+    async def burst():
+        owner = asyncio.create_task(poster_cache.get_poster(KEY, lambda: URL))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(poster_cache.get_poster(KEY, lambda: URL))
+        await asyncio.sleep(0.01)
+        owner.cancel()  # client disconnect
+        entry = await follower
+        return owner, entry
+
+    owner, entry = asyncio.run(burst())
+    assert owner.cancelled()
+    assert entry.body == b"\xff\xd8v1"
+    assert len(r2.calls) == 1
+    assert poster_cache._inflight == {}
+
+
+def test_disk_cache_survives_a_cold_process(r2):
+    _get()
+    poster_cache._memory.clear()  # simulate a restarted worker
+    poster_cache._memory_bytes = 0
+
+    entry = _get()
+    assert entry.body == b"\xff\xd8v1"
+    assert len(r2.calls) == 1
+
+
+def test_memory_lru_is_bounded_by_bytes(r2):
+    with patch.object(poster_cache, "POSTER_CACHE_MEMORY_BYTES", 10):
+        _get("a.jpg")
+        _get("b.jpg")
+        _get("c.jpg")
+    assert list(poster_cache._memory) == ["b.jpg", "c.jpg"]
+    assert poster_cache._memory_bytes <= 10
+
+
+def test_disk_cache_is_trimmed_to_budget(r2):
+    with patch.object(poster_cache, "POSTER_CACHE_DISK_BYTES", 10):
+        for i, name in enumerate(("a.jpg", "b.jpg", "c.jpg")):
+            _get(name)
+            body_path, _ = poster_cache._disk_paths(name)
+            # Distinct mtimes so the trim order is deterministic.
+            t = time.time() - 100 + i
+            os.utime(body_path, (t, t))
+        poster_cache._disk_put(poster_cache._memory["c.jpg"])
+    assert len(list(poster_cache._DISK_DIR.glob("*.jpg"))) == 2
+    assert poster_cache._disk_get("a.jpg") is None
+
+
+def test_disk_is_only_scanned_when_the_estimate_overflows(r2):
+    with patch.object(poster_cache, "_disk_trim", wraps=poster_cache._disk_trim) as trim:
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            _get(name)
+    assert trim.call_count == 1  # the first write seeds the estimate
+
+
+def test_share_poster_browser_etag_gets_304_without_r2(r2):
+    share = {"video_filename": "reel_abc.mp4", "sharer_user_id": "u1",
+             "sharer_profile_id": "p1", "revoked_at": None}
+    request = MagicMock()
+    request.headers = {"if-none-match": '"v1"'}
+
+    with patch.object(shares, "get_share_by_token", return_value=share), \
+         patch.object(shares, "generate_presigned_url_global", return_value=URL):
+        first = asyncio.run(shares.get_shared_poster("tok", None))
+        again = asyncio.run(shares.get_shared_poster("tok", request))
+
+    assert first.status_code == 200 and first.headers["etag"] == '"v1"'
+    assert again.status_code == 304
+    assert again.body == b""
+    assert len(r2.calls) == 1
+
+
+def test_share_poster_missing_object_is_404(r2):
+    r2.status_code = 404
+    share = {"video_filename": "reel_abc.mp4", "sharer_user_id": "u1",
+             "sharer_profile_id": "p1", "revoked_at": None}
+    with patch.object(shares, "get_share_by_token", return_value=share), \
+         patch.object(shares, "generate_presigned_url_global", return_value=URL), \
+         pytest.raises(HTTPException) as e:
+        asyncio.run(shares.get_shared_poster("tok"))
+    assert e.value.status_code == 404
@@ -0,0 +1,378 @@
+"""
+Bulk project archiving into segment objects (project_archive.archive_projects_bulk).
+
+archive_completed_projects used to issue one archive/{project_id}.msgpack PUT
+per project. It now packs projects into one columnar, compressed segment
+object, records each project's byte range in project_archive_index, and
+load_archive range-reads a single project back (cached in a bounded LRU).
+Segments that lose projects are compacted or deleted by the session-init sweep
+(reclaim_archive_segments), deletes only after the profile DB is synced.
+
+R2 is replaced by an in-memory object store so the real ranged-GET path runs.
+"""
+
+import uuid
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from app.database import SyncResult, get_db_connection
+from app.profile_context import set_current_profile_id
+from app.services import highlight_store
+from app.services import project_archive as pa
+from app.user_context import set_current_user_id
+from app.utils.encoding import decode_data, encode_data
+
+TEST_USER_ID = f"test_archive_seg_{uuid.uuid4().hex[:8]}"
+TEST_PROFILE_ID = "testdefault"
+
+
+class _FakeBody:
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def read(self) -> bytes:
+        return self._data
+
+
+class _FakeR2:
+    """Just enough of the boto3 client + upload_bytes_to_r2 for the archive paths."""
+
+    class exceptions:
+        class NoSuchKey(Exception):
+            pass
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+        self.modified: dict[str, datetime] = {}
+        self.puts: list[str] = []
+        self.deletes: list[str] = []
+        self.gets: list[tuple[str, str | None]] = []
+        self.fail_uploads = False
+
+    def upload(self, user_id, path, data, fast=False):
+        if self.fail_uploads:
+            return False
+        key = pa.r2_key(user_id, path)
+        self.objects[key] = bytes(data)
+        self.modified[key] = datetime.now(UTC)
+        self.puts.append(key)
+        return True
+
+    def delete(self, user_id, path):
+        key = pa.r2_key(user_id, path)
+        self.objects.pop(key, None)
+        self.deletes.append(key)
+        return True
+
+    def age_all(self):
+        """Make every stored object older than the sweep's delete grace."""
+        for key in self.modified:
+            self.modified[key] -= pa.SEGMENT_DELETE_GRACE + timedelta(minutes=1)
+
+    def list_objects_v2(self, Bucket, Prefix, ContinuationToken=None):
+        return {"Contents": [
+            {"Key": key, "Size": len(data), "LastModified": self.modified[key]}
+            for key, data in self.objects.items() if key.startswith(Prefix)
+        ]}
+
+    def get_object(self, Bucket, Key, Range=None):
+        self.gets.append((Key, Range))
+        if Key not in self.objects:
+            raise self.exceptions.NoSuchKey(Key)
+        data = self.objects[Key]
+        if Range:
+            start, end = Range.removeprefix("bytes=").split("-")
+            data = data[int(start):int(end) + 1]
+        return {"Body": _FakeBody(data)}
+
+
+@pytest.fixture
+def fake_r2():
+    set_current_user_id(TEST_USER_ID)
+    set_current_profile_id(TEST_PROFILE_ID)
+    pa._clear_archive_cache()
+    r2 = _FakeR2()
+    with patch.object(pa, "R2_ENABLED", True), \
+         patch.object(pa, "upload_bytes_to_r2", side_effect=r2.upload), \
+         patch.object(pa, "delete_from_r2", side_effect=r2.delete), \
+         patch.object(pa, "get_r2_client", return_value=r2), \
+         patch.object(pa, "sync_db_to_r2_explicit", return_value=SyncResult.OK) as sync:
+        r2.sync = sync
+        yield r2
+    pa._clear_archive_cache()
+
+
+@pytest.fixture
+def projects():
+    """Three projects, each with two working_clips versions and one working_video."""
+    set_current_user_id(TEST_USER_ID)
+    set_current_profile_id(TEST_PROFILE_ID)
+    ids = []
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        for n in range(3):
+            cursor.execute(
+                "INSERT INTO projects (name, aspect_ratio) VALUES (?, '9:16')", (f"Seg {n}",)
+            )
+            project_id = cursor.lastrowid
+            for version in (1, 2):
+                cursor.execute("""
+                    INSERT INTO working_clips (project_id, uploaded_filename, version, crop_data)
+                    VALUES (?, ?, ?, ?)
+                """, (project_id, f"clip{n}.mp4", version,
+                      encode_data([{"frame": 0, "x": n, "y": version}])))
+            cursor.execute("""
+                INSERT INTO working_videos (project_id, filename, version, highlights_data, duration)
+                VALUES (?, ?, 1, ?, 5.0)
+            """, (project_id, f"wv{n}.mp4", encode_data([{"id": f"r{n}"}])))
+            cursor.execute(
+                "UPDATE projects SET working_video_id = ? WHERE id = ?",
+                (cursor.lastrowid, project_id),
+            )
+            ids.append(project_id)
+        conn.commit()
+    yield ids
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        for project_id in ids:
+            cursor.execute("DELETE FROM working_clips WHERE project_id = ?", (project_id,))
+            cursor.execute("DELETE FROM working_videos WHERE project_id = ?", (project_id,))
+            cursor.execute("DELETE FROM project_archive_index WHERE project_id = ?", (project_id,))
+            cursor.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+        conn.commit()
+
+
+def _working_rows(project_id):
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT * FROM working_clips WHERE project_id = ? ORDER BY version, sort_order",
+            (project_id,),
+        )
+        clips = [pa._row_to_dict(r) for r in cursor.fetchall()]
+        cursor.execute("SELECT * FROM working_videos WHERE project_id = ? ORDER BY version", (project_id,))
+        videos = [pa._row_to_dict(r) for r in cursor.fetchall()]
+    return clips, videos
+
+
+def test_segment_footer_round_trips_entries():
+    blocks = [(7, b"alpha"), (9, b"bravo-charlie")]
+    segment, entries = pa._build_segment(blocks)
+    assert pa.read_segment_index(segment) == entries
+    for (project_id, blob), (pid, offset, length) in zip(blocks, entries):
+        assert pid == project_id
+        assert segment[offset:offset + length] == blob
+    with pytest.raises(ValueError):
+        pa.read_segment_index(b"not a segment at all")
+
+
+def test_bulk_archive_is_one_put_and_load_matches_original_rows(fake_r2, projects):
+    originals = {pid: _working_rows(pid) for pid in projects}
+
+    assert pa.archive_projects_bulk(projects, TEST_USER_ID) == 3
+    assert len(fake_r2.puts) == 1
+    assert "/archive/segments/" in fake_r2.puts[0]
+
+    for project_id in projects:
+        assert _working_rows(project_id) == ([], [])
+        assert pa.is_project_archived(project_id, TEST_USER_ID)
+        archive = pa.load_archive(project_id, TEST_USER_ID)
+        assert archive["version"] == pa.SEGMENT_ARCHIVE_VERSION
+        assert archive["project"]["id"] == project_id
+        assert (archive["working_clips"], archive["working_videos"]) == originals[project_id]
+        assert isinstance(archive["working_clips"][0]["crop_data"], bytes)
+
+    # Every load was a ranged GET on the one segment, never a full-object read.
+    assert {key for key, _ in fake_r2.gets} == {fake_r2.puts[0]}
+    assert all(rng and rng.startswith("bytes=") for _, rng in fake_r2.gets)
+
+
+def test_repeat_load_is_served_from_lru(fake_r2, projects):
+    pa.archive_projects_bulk(projects[:1], TEST_USER_ID)
+    first = pa.load_archive(projects[0], TEST_USER_ID)
+    second = pa.load_archive(projects[0], TEST_USER_ID)
+    assert first == second
+    assert len(fake_r2.gets) == 1
+
+
+def test_restore_from_segment_brings_working_data_back(fake_r2, projects):
+    project_id = projects[1]
+    original = _working_rows(project_id)
+    pa.archive_projects_bulk(projects, TEST_USER_ID)
+
+    assert pa.restore_project(project_id, TEST_USER_ID)
+    assert _working_rows(project_id) == original
+
+
+def test_failed_segment_upload_leaves_projects_untouched(fake_r2, projects):
+    originals = {pid: _working_rows(pid) for pid in projects}
+    fake_r2.fail_uploads = True
+
+    assert pa.archive_projects_bulk(projects, TEST_USER_ID) == 0
+    for project_id in projects:
+        assert _working_rows(project_id) == originals[project_id]
+        assert pa._lookup_segment_entry(project_id) is None
+
+
+def test_segments_split_at_project_cap(fake_r2, projects):
+    with patch.object(pa, "SEGMENT_MAX_PROJECTS", 2):
+        assert pa.archive_projects_bulk(projects, TEST_USER_ID) == 3
+    assert len(fake_r2.puts) == 2
+    segment_keys = {pa._lookup_segment_entry(pid)[0] for pid in projects}
+    assert len(segment_keys) == 2
+
+
+def test_republish_supersedes_segment_copy(fake_r2, projects):
+    project_id = projects[0]
+    pa.archive_projects_bulk([project_id], TEST_USER_ID)
+    assert pa.restore_project(project_id, TEST_USER_ID)
+
+    assert pa.archive_project(project_id, TEST_USER_ID)
+    assert pa._lookup_segment_entry(project_id) is None
+    archive = pa.load_archive(project_id, TEST_USER_ID)
+    assert archive["version"] == pa.ARCHIVE_VERSION
+    assert fake_r2.gets[-1] == (pa.r2_key(TEST_USER_ID, pa._get_archive_r2_key(project_id)), None)
+
+
+def test_rearchive_leaves_the_dead_segment_to_the_sweep(fake_r2, projects):
+    project_id = projects[0]
+    pa.archive_projects_bulk([project_id], TEST_USER_ID)
+    segment = fake_r2.puts[0]
+    assert pa.restore_project(project_id, TEST_USER_ID)
+
+    assert pa.archive_project(project_id, TEST_USER_ID)
+    assert fake_r2.deletes == []
+
+    fake_r2.age_all()
+    result = pa.reclaim_archive_segments(TEST_USER_ID)
+    assert result["segments_deleted"] == 1
+    assert fake_r2.deletes == [segment]
+    fake_r2.sync.assert_called_once_with(TEST_USER_ID, TEST_PROFILE_ID)
+
+
+def test_sweep_deletes_nothing_when_the_profile_sync_fails(fake_r2, projects):
+    pa.archive_projects_bulk(projects[:1], TEST_USER_ID)
+    assert pa.restore_project(projects[0], TEST_USER_ID)
+    assert pa.archive_project(projects[0], TEST_USER_ID)
+    fake_r2.age_all()
+
+    for outcome in (SyncResult.FAILED, SyncResult.CONFLICT):
+        fake_r2.sync.return_value = outcome
+        assert pa.reclaim_archive_segments(TEST_USER_ID)["segments_deleted"] == 0
+    assert fake_r2.deletes == []
+
+    fake_r2.sync.return_value = SyncResult.OK
+    assert pa.reclaim_archive_segments(TEST_USER_ID)["segments_deleted"] == 1
+
+
+def test_sweep_keeps_young_unreferenced_segments(fake_r2, projects):
+    """A segment uploaded by a bulk archive that has not committed its index
+    rows yet looks unreferenced; the grace period keeps it."""
+    pa.archive_projects_bulk(projects[:1], TEST_USER_ID)
+    with get_db_connection() as conn:
+        conn.cursor().execute("DELETE FROM project_archive_index WHERE project_id = ?", (projects[0],))
+        conn.commit()
+
+    assert pa.reclaim_archive_segments(TEST_USER_ID)["segments_deleted"] == 0
+    fake_r2.sync.assert_not_called()
+
+
+def test_sweep_compacts_a_mostly_dead_segment(fake_r2, projects):
+    survivor = projects[2]
+    original = _working_rows(survivor)
+    pa.archive_projects_bulk(projects, TEST_USER_ID)
+    old_segment = fake_r2.puts[0]
+    for project_id in projects[:2]:
+        assert pa.restore_project(project_id, TEST_USER_ID)
+    assert pa.archive_projects_bulk(projects[:2], TEST_USER_ID) == 2
+    fake_r2.age_all()
+
+    result = pa.reclaim_archive_segments(TEST_USER_ID)
+    assert result == {"orphans_dropped": 0, "segments_compacted": 1, "segments_deleted": 1}
+
+    # puts: original segment, the re-archive's segment, the compacted survivor.
+    assert len(fake_r2.puts) == 3
+    assert fake_r2.deletes == [old_segment]
+    segment_key = pa._lookup_segment_entry(survivor)[0]
+    assert pa.r2_key(TEST_USER_ID, segment_key) == fake_r2.puts[2]
+    pa._clear_archive_cache()
+    archive = pa.load_archive(survivor, TEST_USER_ID)
+    assert (archive["working_clips"], archive["working_videos"]) == original
+
+
+def test_live_segment_is_left_alone(fake_r2, projects):
+    pa.archive_projects_bulk(projects, TEST_USER_ID)
+    assert pa.restore_project(projects[0], TEST_USER_ID)
+    assert pa.archive_project(projects[0], TEST_USER_ID)
+    fake_r2.age_all()
+
+    assert pa.reclaim_archive_segments(TEST_USER_ID)["segments_deleted"] == 0
+    assert fake_r2.deletes == []
+    assert pa._lookup_segment_entry(projects[1])[0] in fake_r2.puts[0]
+
+
+def test_sweep_reclaims_segments_of_deleted_projects(fake_r2, projects):
+    pa.archive_projects_bulk(projects[:1], TEST_USER_ID)
+    segment = fake_r2.puts[0]
+    with get_db_connection() as conn:
+        conn.cursor().execute("DELETE FROM projects WHERE id = ?", (projects[0],))
+        conn.commit()
+    fake_r2.age_all()
+
+    result = pa.reclaim_archive_segments(TEST_USER_ID)
+    assert result == {"orphans_dropped": 1, "segments_compacted": 0, "segments_deleted": 1}
+    assert segment not in fake_r2.objects
+    assert pa._lookup_segment_entry(projects[0]) is None
+
+
+def test_bulk_read_phase_does_not_write_split_highlights(fake_r2, projects):
+    project_id = projects[0]
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        wv_id, blob = cursor.execute(
+            "SELECT id, highlights_data FROM working_videos WHERE project_id = ?", (project_id,)
+        ).fetchone()
+        highlight_store.split_highlights(cursor, wv_id, blob)
+        conn.commit()
+
+    # A failed upload leaves only the read phase: its connection must not be
+    # marked dirty (which would schedule a profile DB sync) or touch the rows.
+    opened = []
+
+    @contextmanager
+    def tracking_connection():
+        with get_db_connection() as conn:
+            opened.append(conn)
+            yield conn
+
+    fake_r2.fail_uploads = True
+    with patch.object(pa, "get_db_connection", tracking_connection):
+        assert pa.archive_projects_bulk([project_id], TEST_USER_ID) == 0
+    assert len(opened) == 1
+    assert not opened[0]._has_writes
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        assert cursor.execute(
+            "SELECT highlights_data FROM working_videos WHERE id = ?", (wv_id,)
+        ).fetchone()[0] is None
+        assert len(highlight_store._region_rows(cursor, wv_id)) == 1
+
+    fake_r2.fail_uploads = False
+    assert pa.archive_projects_bulk([project_id], TEST_USER_ID) == 1
+    archive = pa.load_archive(project_id, TEST_USER_ID)
+    assert decode_data(archive["working_videos"][0]["highlights_data"]) == [{"id": "r0"}]
+
+
+def test_v045_creates_index_table_idempotently(tmp_path):
+    import sqlite3
+
+    from app.migrations.profile_db.v045_project_archive_segments import V045ProjectArchiveSegments
+
+    conn = sqlite3.connect(str(tmp_path / "profile.sqlite"))
+    V045ProjectArchiveSegments().up(conn)
+    V045ProjectArchiveSegments().up(conn)
+    cols = [row[1] for row in conn.execute("PRAGMA table_info(project_archive_index)").fetchall()]
+    assert cols == ["project_id", "segment_key", "byte_offset", "byte_length", "archived_at"]
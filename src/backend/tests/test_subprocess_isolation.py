@@ -3,7 +3,7 @@ Tests for T2640: Local Processing Subprocess Isolation.
 
 Validates:
 1. _run_in_subprocess wrapper works with simple functions
-2. Progress bridging via multiprocessing.Queue
+2. Progress bridging via a pipe registered with the event loop
 3. Sync processor functions are picklable (required for ProcessPoolExecutor)
 4. Sync processor functions can import app modules in a child process
 5. Error handling in subprocess
@@ -41,6 +41,24 @@ def _slow_sync_with_progress(steps=5, progress_callback=None):
     return {"status": "success", "steps": steps}
 
 
+def _report_until_cancelled(marker_path, progress_callback=None):
+    from app.services.modal_client import SubprocessCancelled
+    try:
+        for i in range(500):
+            progress_callback(i, f"tick {i}", "processing")
+            time.sleep(0.01)
+    except SubprocessCancelled:
+        Path(marker_path).write_text("cancelled")
+        raise
+    return {"status": "success"}
+
+
+def _burst_progress(count=200, progress_callback=None):
+    for i in range(count):
+        progress_callback(i, f"burst {i}", "processing")
+    return {"status": "success", "count": count}
+
+
 def _progress_then_fail(progress_callback=None):
     if progress_callback:
         progress_callback(25, "starting", "phase1")
@@ -286,6 +304,93 @@ class TestProgressBridging:
         # Just verify no crash
 
 
+class TestPipeProgressChannel:
+    """Progress transport is a pipe on the event loop, not a Manager queue."""
+
+    def test_no_manager_process(self):
+        import app.services.modal_client as mc
+        assert not hasattr(mc, "_get_mp_manager")
+
+    @pytest.mark.asyncio
+    async def test_burst_delivered_complete_and_in_order(self):
+        from app.services.modal_client import _run_in_subprocess
+        updates = []
+
+        async def track(pct, msg, phase):
+            updates.append(pct)
+
+        result = await _run_in_subprocess(
+            _burst_progress, {"count": 200}, progress_callback=track,
+        )
+        assert result["status"] == "success"
+        assert updates == list(range(200))
+
+    @pytest.mark.asyncio
+    async def test_cancel_propagates_to_child(self, tmp_path):
+        from app.services.modal_client import _run_in_subprocess
+        marker = tmp_path / "cancelled.txt"
+        first = asyncio.Event()
+
+        async def track(pct, msg, phase):
+            first.set()
+
+        task = asyncio.create_task(_run_in_subprocess(
+            _report_until_cancelled, {"marker_path": str(marker)}, progress_callback=track,
+        ))
+        await asyncio.wait_for(first.wait(), timeout=10)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        deadline = time.time() + 10
+        while not marker.exists() and time.time() < deadline:
+            await asyncio.sleep(0.05)
+        assert marker.read_text() == "cancelled"
+
+
+class TestReaderThreadFallback:
+    """Loops without add_reader (Windows' ProactorEventLoop) read progress on a
+    thread instead."""
+
+    @pytest.fixture
+    def no_add_reader(self, monkeypatch):
+        from asyncio.selector_events import BaseSelectorEventLoop
+
+        def unsupported(*a, **k):
+            raise NotImplementedError
+
+        monkeypatch.setattr(BaseSelectorEventLoop, "add_reader", unsupported)
+        monkeypatch.setattr(BaseSelectorEventLoop, "remove_reader", unsupported)
+
+    @pytest.mark.asyncio
+    async def test_burst_delivered_complete_and_in_order(self, no_add_reader):
+        from app.services.modal_client import _run_in_subprocess
+        updates = []
+
+        async def track(pct, msg, phase):
+            updates.append(pct)
+
+        result = await _run_in_subprocess(
+            _burst_progress, {"count": 200}, progress_callback=track,
+        )
+        assert result["status"] == "success"
+        assert updates == list(range(200))
+
+    @pytest.mark.asyncio
+    async def test_progress_arrives_while_child_runs(self, no_add_reader):
+        from app.services.modal_client import _run_in_subprocess
+        updates = []
+
+        async def track(pct, msg, phase):
+            updates.append(pct)
+
+        result = await _run_in_subprocess(
+            _slow_sync_with_progress, {"steps": 5}, progress_callback=track,
+        )
+        assert result["status"] == "success"
+        assert updates == [20, 40, 60, 80, 100]
+
+
 class TestFramingProfileContext:
     """T5680 infra: _framing_sync must re-establish the profile context in the
     ProcessPoolExecutor child, since ContextVars do NOT cross the process boundary
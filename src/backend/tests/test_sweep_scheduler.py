@@ -623,6 +623,38 @@ class TestDeleteRefCounterDrift:
         assert remaining == 0
 
 
+class TestReconcileGameRefCounts:
+    """Phase 3: game_ref_counts (Postgres) against the games/ objects in R2."""
+
+    def test_reports_drift_and_drops_dead_zero_counters(self, pg_conn):
+        from app.services import auth_db
+        from app.services.sweep_scheduler import reconcile_game_ref_counts
+
+        with auth_db.get_pg() as conn:
+            conn.cursor().execute(
+                "INSERT INTO game_ref_counts (blake3_hash, ref_count, latest_expiry) VALUES "
+                "('live', 2, now()), ('gone_live', 1, now()), ('gone_zero', 0, now()), "
+                "('queued_zero', 0, now()), ('kept_zero', 0, now())"
+            )
+        auth_db.insert_grace_deletion("queued_zero")
+        auth_db.insert_grace_deletion("queued_obj")
+
+        with patch(f"{M}.r2_list_game_hashes",
+                   return_value={"live", "kept_zero", "orphan", "queued_obj"}):
+            report = reconcile_game_ref_counts()
+
+        assert report == {"missing_sources": ["gone_live"], "untracked": ["orphan"], "removed": 1}
+        assert set(auth_db.get_all_game_ref_counts()) == {"live", "gone_live", "queued_zero", "kept_zero"}
+
+    def test_skipped_when_r2_unavailable(self):
+        from app.services.sweep_scheduler import reconcile_game_ref_counts
+
+        with patch(f"{M}.r2_list_game_hashes", return_value=None), \
+             patch(f"{M}.get_all_game_ref_counts") as mock_counts:
+            assert reconcile_game_ref_counts() is None
+        mock_counts.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # start/stop sweep loop tests
 # ---------------------------------------------------------------------------
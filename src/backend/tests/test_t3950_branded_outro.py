@@ -188,11 +188,12 @@ def test_render_time_only_no_persistence_imports():
     banned = ("user_db", "database", "get_db_connection", "queries", ".pg")
     offenders = [m for m in imported for b in banned if b in m]
     assert not offenders, f"branded_outro must not import persistence layers: {offenders}"
-    # The ONLY app dependencies are R2 storage (render I/O) and the shared
+    # The ONLY app dependencies are R2 storage (render I/O), the shared
     # ffmpeg_concat probe/join helpers (T5220 strangler-fig extraction of the
-    # byte-duplicated concat code -- itself pure render-time, no DB/persistence).
+    # byte-duplicated concat code -- itself pure render-time, no DB/persistence)
+    # and the shared on-disk card_cache (temp-dir files only).
     app_imports = {m for m in imported if m.startswith("app.")}
-    allowed_prefixes = ("app.storage", "app.services.ffmpeg_concat")
+    allowed_prefixes = ("app.storage", "app.services.ffmpeg_concat", "app.services.card_cache")
     offenders2 = [m for m in app_imports if not m.startswith(allowed_prefixes)]
     assert not offenders2, app_imports
 
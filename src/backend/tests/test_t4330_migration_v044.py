@@ -90,7 +90,9 @@ def test_registered_in_profile_db_migrations_and_is_the_new_head():
 
     versions = [m.version for m in MIGRATIONS]
     assert 44 in versions, "v044 must be registered in profile_db MIGRATIONS"
-    assert RUNNER.latest_version == 44, "v044 must be the current head (no unmerged gap)"
+    # v045 (project_archive_index), v046 (collection aggregates) and v047
+    # (highlight_regions) have since landed above it.
+    assert RUNNER.latest_version >= 44, "v044 must not sit above the runner head"
 
 
 def test_fresh_ensure_database_already_has_the_column(tmp_path):
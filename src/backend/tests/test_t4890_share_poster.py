@@ -322,29 +322,29 @@ def test_resolve_poster_present_without_dims():
     assert (w, h) == (None, None)
 
 
+def _fake_poster_r2_client(status_code=200, content=b"\xff\xd8jpegbytes", etag='"r2etag"'):
+    """Stand-in for storage.get_poster_r2_client() (the pooled poster client)."""
+    from unittest.mock import AsyncMock, MagicMock
+    fake_resp = MagicMock(status_code=status_code, content=content)
+    fake_resp.headers = {"etag": etag} if etag else {}
+    client = MagicMock()
+    client.get = AsyncMock(return_value=fake_resp)
+    return client
+
+
 def test_poster_endpoint_serves_jpeg_with_cache_header():
     import asyncio
-    from unittest.mock import MagicMock
 
     from app.routers import shares
 
     share = {**_share(), "revoked_at": None}
-    fake_resp = MagicMock(status_code=200, content=b"\xff\xd8jpegbytes")
-
-    class _FakeClient:
-        def __init__(self, *a, **k): ...
-        async def __aenter__(self): return self
-        async def __aexit__(self, *a): return False
-        async def get(self, url): return fake_resp
-
-    import httpx
     with patch.object(shares, "get_share_by_token", return_value=share), \
-         patch.object(shares, "r2_head_object_global", return_value={"Metadata": {}}), \
          patch.object(shares, "generate_presigned_url_global", return_value="https://r2/p.jpg?sig=1"), \
-         patch.object(httpx, "AsyncClient", _FakeClient):
+         patch("app.storage.get_poster_r2_client", return_value=_fake_poster_r2_client()):
         resp = asyncio.run(shares.get_shared_poster("tok123"))
     assert resp.media_type == "image/jpeg"
     assert resp.headers["cache-control"] == "public, max-age=86400"
+    assert resp.headers["etag"] == '"r2etag"'
     assert resp.body == b"\xff\xd8jpegbytes"
 
 
@@ -369,11 +369,19 @@ def test_poster_endpoint_404_when_absent_or_revoked():
 
     live = {**_share(), "revoked_at": None}
     with patch.object(shares, "get_share_by_token", return_value=live), \
-         patch.object(shares, "r2_head_object_global", return_value=None):
+         patch.object(shares, "generate_presigned_url_global", return_value="https://r2/p.jpg?sig=1"), \
+         patch("app.storage.get_poster_r2_client", return_value=_fake_poster_r2_client(status_code=404)):
         with pytest.raises(HTTPException) as e:
             asyncio.run(shares.get_shared_poster("tok123"))
         assert e.value.status_code == 404
 
+    with patch.object(shares, "get_share_by_token", return_value=live), \
+         patch.object(shares, "generate_presigned_url_global", return_value="https://r2/p.jpg?sig=1"), \
+         patch("app.storage.get_poster_r2_client", return_value=_fake_poster_r2_client(status_code=500)):
+        with pytest.raises(HTTPException) as e:
+            asyncio.run(shares.get_shared_poster("tok123"))
+        assert e.value.status_code == 502
+
 
 def test_build_poster_r2_key():
     from app.routers import shares
@@ -504,6 +512,95 @@ def test_clearest_frame_skips_blurry_opening(tmp_path):
     assert Path(out).stat().st_size > Path(first).stat().st_size * 2
 
 
+def _black_then_detail_clip(tmp_path) -> str:
+    import subprocess
+
+    src = str(tmp_path / "clip.mp4")
+    subprocess.run(
+        ["ffmpeg", "-y",
+         "-f", "lavfi", "-i", "color=black:s=320x240:d=1",
+         "-f", "lavfi", "-i", "testsrc=size=320x240:rate=25:duration=2",
+         "-filter_complex", "[0:v][1:v]concat=n=2:v=1[v]",
+         "-map", "[v]", src],
+        capture_output=True, check=True, timeout=60,
+    )
+    return src
+
+
+def test_clearest_frame_decodes_all_candidates_in_one_ffmpeg(tmp_path, monkeypatch):
+    """Windowed selection (no duration probe) spawns exactly ONE ffmpeg for all
+    candidates -- not one seek+encode per CANDIDATE_POSITIONS entry."""
+    import subprocess
+
+    from app.services import poster as poster_mod
+
+    src = _black_then_detail_clip(tmp_path)
+    real_run = subprocess.run
+    spawned = []
+
+    def counting_run(cmd, *a, **k):
+        spawned.append(cmd[0])
+        return real_run(cmd, *a, **k)
+
+    monkeypatch.setattr(poster_mod.subprocess, "run", counting_run)
+    assert poster_mod.extract_clearest_frame_jpeg(src, str(tmp_path / "p.jpg"), window=(0.0, 3.0))
+    assert spawned == ["ffmpeg"]
+
+
+def test_clearest_frame_scoring_modes_agree_on_black_vs_detail(tmp_path):
+    from pathlib import Path
+
+    from app.services import poster as poster_mod
+
+    src = _black_then_detail_clip(tmp_path)
+    first = str(tmp_path / "first.jpg")
+    assert poster_mod.extract_first_frame_jpeg(src, first)
+    for mode in (poster_mod.SCORE_LAPLACIAN, poster_mod.SCORE_JPEG_SIZE):
+        out = str(tmp_path / f"{mode}.jpg")
+        assert poster_mod.extract_clearest_frame_jpeg(src, out, scoring=mode)
+        assert Path(out).stat().st_size > Path(first).stat().st_size * 2, mode
+
+
+def test_clearest_frame_encodes_winner_at_each_requested_width(tmp_path):
+    from app.services import poster as poster_mod
+
+    src = _black_then_detail_clip(tmp_path)
+    full = str(tmp_path / "full.jpg")
+    card = str(tmp_path / "card.jpg")
+    assert poster_mod.extract_clearest_frame_jpegs(src, [(full, None), (card, 160)])
+    assert poster_mod._jpeg_dimensions(full) == (320, 240)
+    assert poster_mod._jpeg_dimensions(card) == (160, 120)
+
+
+def test_clearest_frame_decodes_one_frame_per_candidate(tmp_path):
+    from app.services import poster as poster_mod
+
+    src = _black_then_detail_clip(tmp_path)
+    positions = [3.0 * f for f in poster_mod.CANDIDATE_POSITIONS]
+    frames = poster_mod._decode_candidate_frames(src, positions, None)
+    assert len(frames) == len(positions)
+
+
+def test_clearest_frame_falls_back_on_short_decode(tmp_path, monkeypatch):
+    """Fewer frames than positions is not a valid pick -- use the first frame."""
+    import numpy as np
+
+    from app.services import poster as poster_mod
+
+    sharp = np.random.default_rng(0).integers(0, 255, (240, 320, 3), dtype=np.uint8)
+    monkeypatch.setattr(poster_mod, "_decode_candidate_frames", lambda *a: [sharp, sharp])
+    called = []
+
+    def fake_first(source, output_path, resize_width=None, jpeg_quality=3):
+        called.append(output_path)
+        return True
+
+    monkeypatch.setattr(poster_mod, "extract_first_frame_jpeg", fake_first)
+    out = str(tmp_path / "o.jpg")
+    assert poster_mod.extract_clearest_frame_jpeg("clip.mp4", out, window=(0.0, 3.0))
+    assert called == [out]
+
+
 def test_clearest_frame_falls_back_when_probe_fails(tmp_path, monkeypatch):
     from app.services import poster as poster_mod
 
@@ -466,11 +466,82 @@ def test_local_stitch_delegates_to_concat_segments_for_mixed_resolution(tmp_path
             out, str(tmp_path),
         )
 
-    assert seen["downloaded"] == ["final_videos/a.mp4", "final_videos/b.mp4", "final_videos/c.mp4"]
-    assert len(seen["concat_segments"]) == 3, "all members handed to concat_segments in order"
+    # Fetches run bounded-parallel, so only the SET of downloads is fixed...
+    assert sorted(seen["downloaded"]) == ["final_videos/a.mp4", "final_videos/b.mp4", "final_videos/c.mp4"]
+    # ...while concat still gets every member in rank order.
+    assert seen["concat_segments"] == ["member_0.mp4", "member_1.mp4", "member_2.mp4"]
     assert os.path.exists(out)
 
 
+def test_local_stitch_fetches_members_concurrently_in_order(tmp_path):
+    """Member downloads overlap (bounded by COLLECTION_STITCH_FETCH_CONCURRENCY)
+    instead of paying each GET's latency back to back, and the concat list still
+    maps member i -> key i even when later members land first."""
+    import threading
+    import time as _time
+
+    from app.routers.collections import _stitch_members_local
+
+    keys = [f"final_videos/m{i}.mp4" for i in range(8)]
+    in_flight = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def _slow_download(user_id, relative_path, local_path, progress_callback=None, profile_id=None):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        # Later members finish first.
+        _time.sleep(0.05 + 0.02 * (len(keys) - keys.index(relative_path)))
+        with open(local_path, "w") as f:
+            f.write(relative_path)
+        with lock:
+            in_flight["now"] -= 1
+        return True
+
+    concat_inputs = []
+
+    def _fake_concat(segments, out_path, probe):
+        for seg in segments:
+            with open(seg) as f:
+                concat_inputs.append(f.read())
+        with open(out_path, "wb") as f:
+            f.write(b"OUT")
+        return True
+
+    started = _time.perf_counter()
+    with patch("app.routers.collections.R2_ENABLED", True), \
+         patch("app.routers.collections.COLLECTION_STITCH_FETCH_CONCURRENCY", 4), \
+         patch("app.routers.collections.download_from_r2", _slow_download), \
+         patch("app.services.ffmpeg_concat.probe_media", lambda path: {}), \
+         patch("app.services.ffmpeg_concat.concat_segments", _fake_concat):
+        _stitch_members_local(USER_ID, PROFILE_ID, keys, str(tmp_path / "out.mp4"), str(tmp_path))
+    elapsed = _time.perf_counter() - started
+
+    assert concat_inputs == keys
+    assert in_flight["peak"] == 4
+    serial = sum(0.05 + 0.02 * (len(keys) - i) for i in range(len(keys)))
+    assert elapsed < serial * 0.6
+
+
+def test_local_stitch_member_failure_raises(tmp_path):
+    from app.routers.collections import _stitch_members_local
+
+    def _download(user_id, relative_path, local_path, progress_callback=None, profile_id=None):
+        if relative_path.endswith("bad.mp4"):
+            return False
+        with open(local_path, "wb") as f:
+            f.write(b"X")
+        return True
+
+    with patch("app.routers.collections.R2_ENABLED", True), \
+         patch("app.routers.collections.download_from_r2", _download), \
+         pytest.raises(RuntimeError, match=r"bad\.mp4"):
+        _stitch_members_local(
+            USER_ID, PROFILE_ID, ["final_videos/a.mp4", "final_videos/bad.mp4"],
+            str(tmp_path / "out.mp4"), str(tmp_path),
+        )
+
+
 def test_local_stitch_single_member_needs_no_concat(tmp_path):
     """One member -> the stitched file is just that member (no concat), so
     compose still gets a single file to prepend the intro / append the outro."""
@@ -496,3 +567,40 @@ def test_local_stitch_single_member_needs_no_concat(tmp_path):
     assert called["concat"] is False
     with open(out, "rb") as f:
         assert f.read() == b"SOLO"
+
+
+def test_modal_stitch_fetch_overlaps_gets_and_keeps_member_order(tmp_path):
+    """stitch_members' _stitch_fetch: GETs overlap (bounded), each member is
+    probed as it lands, and paths/probes come back in member order."""
+    import time as _time
+
+    from app.modal_functions import video_processing
+    from benchmarks.harness import LocalR2
+
+    r2 = LocalR2(tmp_path / "r2", get_latency=0.1)
+    keys = []
+    for i in range(6):
+        src = tmp_path / f"src_{i}.mp4"
+        src.write_bytes(f"member {i}".encode())
+        r2.upload_file(str(src), "bucket", f"{USER_ID}/final_videos/m{i}.mp4")
+        keys.append(f"{USER_ID}/final_videos/m{i}.mp4")
+    work = tmp_path / "work"
+    work.mkdir()
+
+    def _probe(path):
+        with open(path, "rb") as f:
+            return {"body": f.read()}
+
+    started = _time.perf_counter()
+    with patch.object(video_processing, "STITCH_FETCH_CONCURRENCY", 3), \
+         patch.object(video_processing, "_stitch_probe", _probe):
+        paths, probes = video_processing._stitch_fetch(r2, "bucket", keys, str(work))
+    elapsed = _time.perf_counter() - started
+
+    assert [os.path.basename(p) for p in paths] == [f"member_{i}.mp4" for i in range(6)]
+    assert [p["body"] for p in probes] == [f"member {i}".encode() for i in range(6)]
+    assert elapsed < 0.6 * 6 * 0.1 + 0.1, "two waves of 3, not six serial GETs"
+
+    with patch.object(video_processing, "_stitch_probe", _probe), \
+         pytest.raises(r2.exceptions.ClientError):
+        video_processing._stitch_fetch(r2, "bucket", [*keys, f"{USER_ID}/missing.mp4"], str(work))
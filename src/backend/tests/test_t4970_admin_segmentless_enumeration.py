@@ -61,7 +61,7 @@ def test_list_users_endpoint_includes_segmentless_with_null_fields(pg_conn):
         # Query() default resolution, so the filter params must be real None.
         resp = asyncio.run(admin.list_users(
             page=1, page_size=50,
-            origin=None, acquired_from=None, acquired_to=None, filter=None,
+            origin=None, acquired_from=None, acquired_to=None, filter=None, cursor=None,
         ))
 
     by_id = {u["user_id"]: u for u in resp["users"]}
@@ -112,6 +112,39 @@ def test_ensure_recap_poster_generates_whole_clip(tmp_path):
     assert captured["metadata"] == {"width": 1280, "height": 720}
 
 
+def test_ensure_recap_poster_writes_card_from_same_decode():
+    card_key = f"dev/users/{USER_ID}/profiles/{PROFILE_ID}/recaps/posters/{GAME_ID}.card.jpg"
+
+    def head(key):
+        return None if key in (POSTER_KEY, card_key) else {"ContentLength": 999}
+
+    decodes = []
+    uploaded = {}
+
+    def fake_extract_many(source, outputs, window=None, jpeg_quality=3):
+        decodes.append([w for _p, w in outputs])
+        from pathlib import Path
+        for path, _w in outputs:
+            Path(path).write_bytes(b"\xff\xd8jpegbytes")
+        return True
+
+    def fake_upload(key, data, *, fast=False, content_type=None, metadata=None):
+        uploaded[key] = content_type
+        return True
+
+    with patch("app.storage.r2_head_object_global", side_effect=head), \
+         patch("app.storage.generate_presigned_url_global", return_value="https://r2/recap.mp4?sig=1"), \
+         patch.object(poster_mod, "extract_clearest_frame_jpegs", side_effect=fake_extract_many), \
+         patch.object(poster_mod, "extract_clearest_frame_jpeg") as single, \
+         patch.object(poster_mod, "_jpeg_dimensions", return_value=(1280, 720)), \
+         patch("app.storage.upload_bytes_to_r2_global", side_effect=fake_upload):
+        assert poster_mod.ensure_recap_poster(RECAP_KEY, POSTER_KEY, card_poster_key=card_key) is True
+    # One decode, full-size og:image plus the 480px card.
+    assert decodes == [[None, 480]]
+    single.assert_not_called()
+    assert uploaded == {POSTER_KEY: "image/jpeg", card_key: "image/jpeg"}
+
+
 def test_ensure_recap_poster_never_raises():
     with patch("app.storage.r2_head_object_global", side_effect=RuntimeError("r2 down")):
         assert poster_mod.ensure_recap_poster(RECAP_KEY, POSTER_KEY) is False
@@ -150,28 +183,23 @@ def test_resolve_recap_poster_url_no_game_id():
 # ---------------------------------------------------------------------------
 
 def _fake_jpeg_client():
+    """Stand-in for storage.get_poster_r2_client() (the pooled poster client)."""
+    from unittest.mock import AsyncMock
     fake_resp = MagicMock(status_code=200, content=b"\xff\xd8jpegbytes")
-
-    class _FakeClient:
-        def __init__(self, *a, **k): ...
-        async def __aenter__(self): return self
-        async def __aexit__(self, *a): return False
-        async def get(self, url): return fake_resp
-
-    return _FakeClient
+    fake_resp.headers = {"etag": '"recapetag"'}
+    client = MagicMock()
+    client.get = AsyncMock(return_value=fake_resp)
+    return client
 
 
 def test_teammate_poster_serves_jpeg_and_generates():
-    import httpx
-
     from app.routers import shares
 
     share = _game_share()
     with patch.object(shares, "get_game_share_by_token", return_value=share), \
          patch("app.services.poster.ensure_recap_poster", return_value=True) as gen, \
-         patch.object(shares, "r2_head_object_global", return_value={"Metadata": {}}), \
          patch.object(shares, "generate_presigned_url_global", return_value="https://r2/p.jpg?sig=1"), \
-         patch.object(httpx, "AsyncClient", _fake_jpeg_client()):
+         patch("app.storage.get_poster_r2_client", return_value=_fake_jpeg_client()):
         resp = asyncio.run(shares.get_shared_teammate_poster("gtok"))
 
     assert resp.media_type == "image/jpeg"
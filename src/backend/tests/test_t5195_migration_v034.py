@@ -139,8 +139,12 @@ def test_registry_head_is_v043():
     # once T5215 landed first; T6850 added v043 (drops
     # intro_min_duration_seconds -- T6680 made the v041 threshold dead); T4330
     # added v044 (working_clips.framing_version mutation counter for the
-    # unified action client's two-writer 409 conflict detection).
-    assert max(m.version for m in MIGRATIONS) == 44
+    # unified action client's two-writer 409 conflict detection); v045 added
+    # project_archive_index (segment-packed bulk project archives); v046 added
+    # the incrementally maintained collection aggregates; v047 split overlay
+    # highlights into per-region rows; v048 added the raw_clip_tags index;
+    # v049 added modal_task_leases; v050 added pending_uploads.video_metadata_set.
+    assert max(m.version for m in MIGRATIONS) == 50
     # Exactly one migration owns each version (no collision with a sibling branch).
     assert sum(1 for m in MIGRATIONS if m.version == 34) == 1
     assert sum(1 for m in MIGRATIONS if m.version == 35) == 1
@@ -151,11 +155,17 @@ def test_registry_head_is_v043():
     assert sum(1 for m in MIGRATIONS if m.version == 42) == 1
     assert sum(1 for m in MIGRATIONS if m.version == 43) == 1
     assert sum(1 for m in MIGRATIONS if m.version == 44) == 1
+    assert sum(1 for m in MIGRATIONS if m.version == 45) == 1
+    assert sum(1 for m in MIGRATIONS if m.version == 46) == 1
+    assert sum(1 for m in MIGRATIONS if m.version == 47) == 1
+    assert sum(1 for m in MIGRATIONS if m.version == 48) == 1
+    assert sum(1 for m in MIGRATIONS if m.version == 49) == 1
+    assert sum(1 for m in MIGRATIONS if m.version == 50) == 1
     # Every registered migration is REACHABLE: the runner applies versions above a
     # DB's user_version, so a class that never made it into MIGRATIONS is dead code
     # (v040 shipped unregistered once -- CI caught it here).
     registered = {m.version for m in MIGRATIONS}
-    assert {34, 35, 36, 38, 40, 41, 42, 43, 44} <= registered
+    assert {34, 35, 36, 38, 40, 41, 42, 43, 44, 45, 46, 47, 48, 49, 50} <= registered
     # v037 / v039 belong to the sibling T5215 / T6630 branches' PRE-RENUMBER
     # claims. They must be renumbered ABOVE this head before they merge, or the
     # runner skips them. Both already did (T5215 -> v041, T6630 -> v042, above).
@@ -94,15 +94,12 @@ def _seed_game(user_id=USER_ID, profile_id=PROFILE_ID, blake3="abc123hash"):
 
 
 def _fake_jpeg_client():
+    """Stand-in for storage.get_poster_r2_client() (the pooled poster client)."""
     fake_resp = MagicMock(status_code=200, content=b"\xff\xd8jpegbytes")
-
-    class _FakeClient:
-        def __init__(self, *a, **k): ...
-        async def __aenter__(self): return self
-        async def __aexit__(self, *a): return False
-        async def get(self, url): return fake_resp
-
-    return _FakeClient
+    fake_resp.headers = {"etag": '"recap"'}
+    client = MagicMock()
+    client.get = AsyncMock(return_value=fake_resp)
+    return client
 
 
 class _FakeR2:
@@ -285,7 +282,7 @@ def test_first_get_after_creation_does_not_reencode(db_env):
         assert poster_key in fake_r2.objects  # object exists BEFORE any GET
 
         with patch.object(shares, "get_game_share_by_token", return_value=game_share_row), \
-             patch("httpx.AsyncClient", _fake_jpeg_client()):
+             patch("app.storage.get_poster_r2_client", return_value=_fake_jpeg_client()):
             resp = asyncio.run(shares.get_shared_teammate_poster("tok5"))
 
     assert resp.media_type == "image/jpeg"
@@ -406,6 +406,35 @@ def test_reorder_clips_invalidates_poster(db):
     inval.assert_called_once_with(pid)
 
 
+def test_reorder_then_fetch_serves_the_new_poster(db):
+    """The byte cache must not keep serving the old first clip's poster after a
+    reorder invalidates the R2 object."""
+    from app.routers import clips, projects
+    pid = _seed_project(db)
+    rc_a = _seed_raw_clip(db, filename="a.mp4", end=5.0)
+    rc_b = _seed_raw_clip(db, filename="b.mp4", end=7.0)
+    wc_a = _seed_working_clip(db, pid, rc_a, sort_order=0)
+    wc_b = _seed_working_clip(db, pid, rc_b, sort_order=1)
+    rel_path = poster_mod.draft_poster_rel_path(pid)
+
+    def fetch(client):
+        with patch("app.services.poster.ensure_draft_poster", return_value=rel_path) as ensure, \
+             patch.object(projects, "generate_presigned_url", return_value="https://r2/p.jpg?sig=1"), \
+             patch("app.storage.get_poster_r2_client", return_value=client):
+            resp = asyncio.run(projects.get_draft_poster(pid, _fake_request()))
+        return resp, ensure
+
+    resp, _ = fetch(_fake_poster_r2_client(content=b"\xff\xd8first-a", etag='"a"'))
+    assert resp.body == b"\xff\xd8first-a"
+
+    with patch("app.storage.delete_from_r2", return_value=True):
+        assert asyncio.run(clips.reorder_clips(pid, [wc_b, wc_a])) == {"success": True}
+
+    resp, ensure = fetch(_fake_poster_r2_client(content=b"\xff\xd8first-b", etag='"b"'))
+    ensure.assert_called_once()
+    assert resp.body == b"\xff\xd8first-b"
+
+
 def test_add_clip_invalidates_poster(db):
     from app.routers import clips
     pid = _seed_project(db)
@@ -127,12 +127,12 @@ class TestTeamLayerClips:
 class TestClaimGameLink:
     @pytest.fixture()
     def env(self, pg_conn, tmp_path):
-        # get_game_storage_ref / insert_game_storage_ref go through
+        # get_game_storage_refs / insert_game_storage_refs go through
         # get_db_connection (the CURRENT context's profile SQLite), so they are
         # mocked here exactly as the existing materialization tests do -- the
         # claim's provenance/clip behavior is what these tests assert, not the
         # storage-ref bookkeeping (which the head-object-guarded heal path owns,
-        # T4820). get_ref defaults to None so a claim fabricates NO storage ref.
+        # T4820). get_ref defaults to {} so a claim fabricates NO storage ref.
         import app.services.pg as pgmod
         from app.services.auth_db import create_user
         create_user(SHARER_ID, email=SHARER_EMAIL)
@@ -140,9 +140,9 @@ class TestClaimGameLink:
         with patch("app.services.materialization.USER_DATA_BASE", tmp_path), \
              patch("app.database.USER_DATA_BASE", tmp_path), \
              patch("app.services.materialization.get_pg", pgmod.get_pg), \
-             patch("app.services.materialization.get_game_storage_ref",
-                   return_value=None) as get_ref, \
-             patch("app.services.materialization.insert_game_storage_ref") as insert_ref:
+             patch("app.services.materialization.get_game_storage_refs",
+                   return_value={}) as get_ref, \
+             patch("app.services.materialization.insert_game_storage_refs") as insert_ref:
             self.get_ref = get_ref
             self.insert_ref = insert_ref
             yield tmp_path
@@ -331,14 +331,14 @@ class TestClaimGameLink:
         assert row["channel"] == "game_link_share"
 
     def test_expired_source_imports_annotations_no_fabricated_ref(self, env):
-        """Source expired = the sharer has no live storage ref (get_game_storage_ref
+        """Source expired = the sharer has no live storage ref (get_game_storage_refs
         -> None). The claim still imports the game + annotations, but fabricates NO
         storage ref for the recipient -- source availability is resolved honestly by
         the head-object-guarded heal path (T4820), so the game shows the existing
         expired degradation rather than a faked live ref."""
         game_id = _seed_sharer_dbs(env)
         share = _make_game_link_share(game_id)
-        # env's get_ref already returns None (source gone).
+        # env's get_ref already returns {} (source gone).
         claim_game_link(share, CLAIMER_ID, CLAIMER_PROFILE,
                         include_annotations=True, sharer_email=SHARER_EMAIL)
         conn = _open(env, CLAIMER_ID, CLAIMER_PROFILE)
@@ -182,9 +182,9 @@ class TestScopedMaterialization:
         with patch("app.services.materialization.USER_DATA_BASE", tmp_path), \
              patch("app.database.USER_DATA_BASE", tmp_path), \
              patch("app.services.materialization.get_pg", pgmod.get_pg), \
-             patch("app.services.materialization.get_game_storage_ref",
-                   return_value=None), \
-             patch("app.services.materialization.insert_game_storage_ref"):
+             patch("app.services.materialization.get_game_storage_refs",
+                   return_value={}), \
+             patch("app.services.materialization.insert_game_storage_refs"):
             yield tmp_path
 
     def _seed_sharer(self, base):
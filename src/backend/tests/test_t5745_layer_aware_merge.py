@@ -32,6 +32,7 @@ from app.services.materialization import (
 # Reuse the canonical fixtures from the materialization test module.
 from tests.test_materialization import (
     _create_profile_db, _insert_game, _insert_game_video, _insert_clip,
+    _refs_for_every_hash,
 )
 
 
@@ -309,8 +310,8 @@ class TestFullClaimPath:
         return s_conn, r_conn
 
     @patch("app.services.materialization.mark_game_share_materialized")
-    @patch("app.services.materialization.insert_game_storage_ref")
-    @patch("app.services.materialization.get_game_storage_ref")
+    @patch("app.services.materialization.insert_game_storage_refs")
+    @patch("app.services.materialization.get_game_storage_refs")
     def test_recipient_my_athlete_clip_survives_real_claim(
         self, mock_get_ref, mock_insert_ref, mock_mark, tmp_path
     ):
@@ -332,10 +333,10 @@ class TestFullClaimPath:
                               name="My kid scores", video_sequence=0)
         r_conn.close()
 
-        mock_get_ref.return_value = {
+        mock_get_ref.side_effect = _refs_for_every_hash({
             "game_size_bytes": 50000,
             "storage_expires_at": "2027-01-01T00:00:00+00:00",
-        }
+        })
 
         with patch("app.services.materialization.USER_DATA_BASE", tmp_path):
             result = materialize_game_share(
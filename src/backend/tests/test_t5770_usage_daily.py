@@ -81,7 +81,7 @@ def _call_list_users():
          patch.object(admin.credit_ledger, "stats_for_admin", return_value={}):
         return asyncio.run(admin.list_users(
             page=1, page_size=50,
-            origin=None, acquired_from=None, acquired_to=None, filter=None,
+            origin=None, acquired_from=None, acquired_to=None, filter=None, cursor=None,
         ))
 
 
@@ -313,6 +313,7 @@ class TestBoundedQueries:
             create_user_segment(uid, "organic", None, "otp")
             _add_daily(uid, 0, 60)
 
+        admin.reset_user_count_cache_for_tests()  # both runs count from cold
         counter = [0]
         base_get_pg = admin.get_pg  # pg_conn's mock_get_pg (NOT self-nested)
 
@@ -326,7 +327,7 @@ class TestBoundedQueries:
              patch.object(admin.credit_ledger, "stats_for_admin", return_value={}):
             asyncio.run(admin.list_users(
                 page=1, page_size=50,
-                origin=None, acquired_from=None, acquired_to=None, filter=None,
+                origin=None, acquired_from=None, acquired_to=None, filter=None, cursor=None,
             ))
         return counter[0]
 
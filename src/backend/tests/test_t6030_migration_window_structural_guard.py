@@ -57,6 +57,7 @@ POST_V023_COLUMNS = {
     "working_clips": ["rotation", "framing_version"],                                     # v029, v044
     "projects": ["poster_marker_time"],                                                  # v032
     "intro_cards": ["subtitle_text"],                                                    # v035
+    "pending_uploads": ["video_metadata_set"],                                          # v050
     # v031 (T5725 reclassify teammate-tagged clips to Team) adds NO column -> nothing to guard.
     # (v030 belongs to the sibling T5800 branch, not present here; audit it on that merge.)
     # v033 (T5830 heal pre-T5810 moved-reel attribution) adds NO column -> nothing to guard.
@@ -102,8 +103,26 @@ POST_V023_COLUMNS = {
     #   test_framing_action_version_conflict.py::TestFramingActionPreMigration. No hot LIST
     #   read (list_project_clips) names the new column, so nothing else in this fixture needs
     #   to change.
+    # v045 (project_archive_index for segment-packed archives) adds a TABLE, no column ->
+    #   nothing to guard. ensure_database() creates it (CREATE TABLE IF NOT EXISTS) on
+    #   every profile's first open, and project_archive's index lookup treats a missing
+    #   table as "no segment" and falls back to the per-project archive object.
+    # v046 (collection aggregates) adds TABLES + triggers, no column -> nothing to guard.
+    #   ensure_database() creates them on every profile's first open and queues every
+    #   existing reel, so collections_summary's first fold builds the aggregates.
+    # v047 (highlight_regions) adds a TABLE + triggers, no column -> nothing to guard.
+    #   ensure_database() creates it; blobs are split lazily by the first overlay action.
+    # v048 (raw_clip_tags) adds TABLES + an index + triggers, no column -> nothing to guard.
+    #   ensure_database() creates them and queues every existing clip, so the first
+    #   tag-filtered preview folds them into the index.
+    # v049 (modal_task_leases) adds a TABLE, no column -> nothing to guard.
+    #   ensure_database() creates it; running rows without a lease keep the old
+    #   started_at timeout in check_stale_tasks.
+    # v050 (pending_uploads.video_metadata_set): prepare-upload writes it and finalize
+    #   reads it only behind column_exists; a missing column means "created without
+    #   metadata", so finalize takes the copy path. The bootstrap read doesn't name it.
 }
-HEAD_VERSION_AUDITED = 44
+HEAD_VERSION_AUDITED = 50
 
 
 def _cleanup(user_id: str) -> None:
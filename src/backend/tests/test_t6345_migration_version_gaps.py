@@ -146,7 +146,7 @@ def _applied_versions(conn):
 
 class TestRealPostgresGapHeals:
     def test_gap_below_max_reported_pending_and_applied(self, pg_conn, preserve_schema_migrations):
-        """[1..19, 22] -> v020/v021 pending AND applied by RUNNER.run(); ledger becomes 1..22.
+        """[1..19, 22..25] -> v020/v021 pending AND applied by RUNNER.run(); ledger becomes 1..25.
 
         T6750: `_seed_versions` wipes the whole ledger; `preserve_schema_migrations`
         restores it in teardown so a mid-test failure can't poison later tests.
@@ -155,7 +155,7 @@ class TestRealPostgresGapHeals:
 
         conn = psycopg2.connect(pg_conn, cursor_factory=RealDictCursor)
         try:
-            _seed_versions(conn, list(range(1, 20)) + [22])
+            _seed_versions(conn, list(range(1, 20)) + [22, 23, 24, 25])
 
             # Direct proof of the ledger BEFORE (the reproduced incident state).
             before = _applied_versions(conn)
@@ -169,12 +169,12 @@ class TestRealPostgresGapHeals:
             assert [m.version for m in applied] == [20, 21]
 
             after = _applied_versions(conn)
-            assert after == list(range(1, 23)), f"ledger not contiguous 1..22: {after}"
+            assert after == list(range(1, 26)), f"ledger not contiguous 1..25: {after}"
         finally:
             conn.close()
 
     def test_contiguous_history_reports_nothing_pending(self, pg_conn, preserve_schema_migrations):
-        """A fully-migrated [1..22] env still reports nothing pending (AC #4).
+        """A fully-migrated [1..25] env still reports nothing pending (AC #4).
 
         T6750: `_seed_versions` wipes the whole ledger; `preserve_schema_migrations`
         restores it in teardown so a mid-test failure can't poison later tests.
@@ -183,7 +183,7 @@ class TestRealPostgresGapHeals:
 
         conn = psycopg2.connect(pg_conn, cursor_factory=RealDictCursor)
         try:
-            _seed_versions(conn, list(range(1, 23)))
+            _seed_versions(conn, list(range(1, 26)))
             pending = RUNNER.get_pending(conn, "postgres")
             assert pending == [], f"contiguous history should be pending-free, got {[m.version for m in pending]}"
 
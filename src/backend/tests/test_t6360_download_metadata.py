@@ -14,6 +14,8 @@ by the existing downloads/shares/collections suites, which now pass `coll_meta`/
   - ffmpeg-failure path: `stamp_download_metadata` returns False and the caller
     ships the unstamped input (never a broken/missing file).
   - The input object is never mutated (serve-time only).
+  - Streamed delivery: tags-only stamps stream as fragmented MP4; a cover or an
+    unreadable input falls back to the file pass with an exact Content-Length.
   - `build_download_metadata` omits absent fields (no guessed date).
 """
 
@@ -221,6 +223,101 @@ def test_apply_download_metadata_returns_stamped_path_on_success(tmp_path, reel)
     assert Path(result).exists()
 
 
+# --------------------------------------------------------------------------- #
+# Streamed delivery: fragmented-MP4 stamp piped into the response body
+# --------------------------------------------------------------------------- #
+
+def test_streamed_stamp_is_fragmented_mp4_with_tags(tmp_path, reel):
+    chunks = dm.open_stamped_stream(str(reel), FULL_META)
+    assert chunks is not None
+    body = b"".join(chunks)
+    assert body[4:8] == b"ftyp"
+    assert b"moof" in body, "streamed body must be fragmented (moof/mdat)"
+
+    out = tmp_path / "streamed.mp4"
+    out.write_bytes(body)
+    info = _ffprobe_json(out)
+    tags = {k.lower(): v for k, v in info["format"].get("tags", {}).items()}
+    assert tags["title"] == "Vs Sharks Dec 6"
+    assert tags["artist"] == "Marcus Johnson"
+    assert _video_stream_md5(out) == _video_stream_md5(reel)
+
+
+def test_streamed_stamp_declines_when_cover_present(reel, poster):
+    """fMP4 cannot carry an attached_pic cleanly -- a cover keeps the file pass."""
+    assert dm.open_stamped_stream(str(reel), {**FULL_META, "cover_path": str(poster)}) is None
+
+
+def test_streamed_stamp_declines_on_unreadable_input(tmp_path):
+    bogus = tmp_path / "not-a-video.mp4"
+    bogus.write_bytes(b"nope")
+    assert dm.open_stamped_stream(str(bogus), FULL_META) is None
+
+
+def test_streamed_stamp_close_early_kills_ffmpeg(reel):
+    chunks = dm.open_stamped_stream(str(reel), FULL_META)
+    next(chunks)
+    chunks.close()  # client disconnect; must not hang or leak the process
+
+
+def _dying_mux(monkeypatch, nbytes: int):
+    """Replace the stamping ffmpeg with one that writes `nbytes` and exits 1."""
+    import sys
+    script = f"import sys; sys.stdout.buffer.write(b'x' * {nbytes}); sys.exit(1)"
+    monkeypatch.setattr(dm, "_stamp_cmd", lambda *a: [sys.executable, "-c", script])
+
+
+def test_streamed_stamp_failing_mid_stream_aborts(monkeypatch, caplog):
+    """No Content-Length on the streamed body, so a truncated file must not end
+    as a clean 200: the iterator raises after the partial body."""
+    _dying_mux(monkeypatch, dm.STREAM_CHUNK_BYTES * 2 + 10)
+    chunks = dm.open_stamped_stream("in.mp4", FULL_META)
+    assert chunks is not None
+    received = 0
+    with pytest.raises(dm.StreamedStampFailed):
+        for chunk in chunks:
+            received += len(chunk)
+    assert received == dm.STREAM_CHUNK_BYTES * 2 + 10
+    assert "failed mid-stream" in caplog.text
+
+
+def test_streamed_stamp_failing_in_first_chunk_takes_file_pass(monkeypatch):
+    _dying_mux(monkeypatch, 100)
+    assert dm.open_stamped_stream("in.mp4", FULL_META) is None
+
+
+def test_open_download_stream_streams_without_content_length(tmp_path, reel):
+    cleanup = tmp_path / "scratch"
+    cleanup.mkdir()
+    chunks, headers = dm.open_download_stream(
+        str(reel), str(cleanup), FULL_META, cleanup_dir=str(cleanup),
+    )
+    assert "Content-Length" not in headers
+    assert b"".join(chunks)[4:8] == b"ftyp"
+    assert not cleanup.exists(), "scratch dir is removed once the body is done"
+
+
+def test_open_download_stream_file_fallback_sets_content_length(tmp_path, reel, poster):
+    chunks, headers = dm.open_download_stream(
+        str(reel), str(tmp_path), {**FULL_META, "cover_path": str(poster)},
+    )
+    body = b"".join(chunks)
+    assert headers["Content-Length"] == str(len(body))
+    out = tmp_path / "served.mp4"
+    out.write_bytes(body)
+    pics = [s for s in _ffprobe_json(out)["streams"]
+            if s.get("disposition", {}).get("attached_pic") == 1]
+    assert len(pics) == 1
+
+
+def test_open_download_stream_unreadable_input_serves_it_unchanged(tmp_path):
+    bogus = tmp_path / "not-a-video.mp4"
+    bogus.write_bytes(b"nope")
+    chunks, headers = dm.open_download_stream(str(bogus), str(tmp_path), FULL_META)
+    assert b"".join(chunks) == b"nope"
+    assert headers["Content-Length"] == "4"
+
+
 def test_stamp_leaves_source_object_untouched(tmp_path, reel, poster):
     """Serve-time only: stamping reads the reel and writes a NEW file; the source
     reel bytes are unchanged (no stored-object mutation)."""
@@ -117,10 +117,16 @@ class TestMigrationV043:
         # picks up v044. Asserting both preserves this test's original intent
         # (a below-head DB reaches the TRUE head), not just v043 in isolation.
         assert any(m.version == 44 for m in applied)
+        assert any(m.version == 45 for m in applied)
+        assert any(m.version == 46 for m in applied)
+        assert any(m.version == 47 for m in applied)
+        assert any(m.version == 48 for m in applied)
+        assert any(m.version == 49 for m in applied)
+        assert any(m.version == 50 for m in applied)
 
         cols = {r[1] for r in conn.execute("PRAGMA table_info(user_settings)").fetchall()}
         assert "intro_min_duration_seconds" not in cols
-        assert conn.execute("PRAGMA user_version").fetchone()[0] == 44
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == 50
         conn.close()
 
     def test_v043_is_still_the_free_version(self):
@@ -135,9 +141,12 @@ class TestMigrationV043:
     def test_registered_and_is_the_new_head(self):
         from app.migrations.profile_db import MIGRATIONS, RUNNER
 
-        # T4330 (v044) landed above v043 -- v043 is no longer the head.
-        assert max(m.version for m in MIGRATIONS) == 44
-        assert RUNNER.latest_version == 44
+        # T4330 (v044), the archive-segment index (v045), the collection
+        # aggregates (v046), highlight_regions (v047), the clip tag index
+        # (v048), modal_task_leases (v049) and pending_uploads.video_metadata_set
+        # (v050) landed above v043 -- v043 is no longer the head.
+        assert max(m.version for m in MIGRATIONS) == 50
+        assert RUNNER.latest_version == 50
 
 
 class TestFreshDbHasNoColumn:
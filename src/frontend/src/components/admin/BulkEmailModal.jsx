@@ -10,7 +10,8 @@ import { useAdminStore } from '../../stores/adminStore';
  * - onClose: called when the modal is dismissed
  *
  * Flow: subject + body + recipient count + "Send test to me". The real send is
- * two-step (Send -> "Really send to {n} users?" confirm) and the result summary
+ * two-step (Send -> "Really send to {n} users?" confirm); the backend queues it
+ * and returns a job id, which is polled until done so the result summary
  * (sent/failed per user) renders before close. NO backdrop-click close (project
  * rule) — only the X button and Done/Cancel dismiss.
  */
@@ -24,7 +25,10 @@ export function BulkEmailModal({ users, onClose }) {
   const [summary, setSummary] = useState(null);
 
   const sendBulkEmail = useAdminStore(state => state.sendBulkEmail);
-  const loading = useAdminStore(state => state.bulkActionLoading);
+  const fetchBulkEmailJob = useAdminStore(state => state.fetchBulkEmailJob);
+  const bulkActionLoading = useAdminStore(state => state.bulkActionLoading);
+  const [progress, setProgress] = useState(null);
+  const loading = bulkActionLoading || progress !== null;
 
   const validate = useCallback(() => {
     if (!subject.trim()) { setError('Subject is required'); return false; }
@@ -51,17 +55,26 @@ export function BulkEmailModal({ users, onClose }) {
     if (!validate()) return;
     if (!confirming) { setConfirming(true); return; }
     try {
-      const data = await sendBulkEmail(users.map(u => u.user_id), subject, body, { test: false });
+      const { job_id: jobId, total } = await sendBulkEmail(users.map(u => u.user_id), subject, body, { test: false });
+      setProgress({ done: 0, total });
+      let data = await fetchBulkEmailJob(jobId);
+      while (data.status !== 'done') {
+        setProgress({ done: data.sent + data.failed, total: data.total });
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        data = await fetchBulkEmailJob(jobId);
+      }
+      setProgress(null);
       setSummary({
         sent: data.sent,
         failed: data.failed,
         failedIds: data.results.filter(r => !r.ok),
       });
     } catch (err) {
+      setProgress(null);
       setError(err.message);
       setConfirming(false);
     }
-  }, [validate, confirming, sendBulkEmail, users, subject, body]);
+  }, [validate, confirming, sendBulkEmail, fetchBulkEmailJob, users, subject, body]);
 
   return (
     <div className="fixed inset-0 z-50 flex items-center justify-center bg-black/60">
@@ -151,7 +164,9 @@ export function BulkEmailModal({ users, onClose }) {
                   }`}
                 >
                   <Send size={13} />
-                  {loading
+                  {progress
+                    ? `Sending ${progress.done}/${progress.total}…`
+                    : loading
                     ? 'Sending…'
                     : (confirming ? `Really send to ${n} users?` : 'Send')}
                 </button>
@@ -132,6 +132,7 @@ export function UserTable({ users, onUserClick, funnelTotals }) {
   const currentPage = useAdminStore(s => s.currentPage);
   const totalPages = useAdminStore(s => s.totalPages);
   const totalUsers = useAdminStore(s => s.totalUsers);
+  const nextCursor = useAdminStore(s => s.nextCursor);
   const nextPage = useAdminStore(s => s.nextPage);
   const prevPage = useAdminStore(s => s.prevPage);
 
@@ -431,7 +432,7 @@ export function UserTable({ users, onUserClick, funnelTotals }) {
           </span>
           <button
             onClick={nextPage}
-            disabled={currentPage >= totalPages}
+            disabled={!nextCursor}
             className="flex items-center gap-1 px-3 py-1.5 text-xs rounded-md border border-white/10 text-gray-300 hover:bg-white/5 transition-colors disabled:opacity-30 disabled:cursor-not-allowed"
           >
             Next
@@ -501,6 +501,11 @@ export async function ensureVideoInR2(file, onProgress, options = {}) {
     blake3_hash: hash,
     file_size: uploadSize,
     original_filename: file.name,
+    // Set on the R2 object when the multipart upload is created, so finalize
+    // never has to copy the object to attach metadata.
+    video_duration: options.videoDuration || null,
+    video_width: options.videoWidth || null,
+    video_height: options.videoHeight || null,
   };
   if (options.label) {
     prepareBody.label = options.label;
@@ -587,6 +592,8 @@ export async function ensureVideoInR2(file, onProgress, options = {}) {
         part_number: p.part_number,
         etag: p.etag,
       })),
+      // Only used for a session created without metadata (e.g. one resumed
+      // from before prepare-upload took it); otherwise ignored, no copy.
       video_duration: options.videoDuration || null,
       video_width: options.videoWidth || null,
       video_height: options.videoHeight || null,
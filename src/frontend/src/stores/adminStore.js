@@ -12,6 +12,10 @@ export const useAdminStore = create((set, get) => ({
   totalPages: 1,
   totalUsers: 0,
   pageSize: 10,
+  // Keyset paging: page number -> the cursor that fetches it (page 1 needs none).
+  // Filled from each response's next_cursor; reset whenever page 1 is fetched.
+  pageCursors: {},
+  nextCursor: null,
 
   grantState: {},
   bulkActionLoading: false,
@@ -53,12 +57,14 @@ export const useAdminStore = create((set, get) => ({
 
   fetchUsers: async (page, pageSize) => {
     const state = get();
-    const p = page ?? state.currentPage;
     const ps = pageSize ?? state.pageSize;
+    const p = ps === state.pageSize ? (page ?? state.currentPage) : 1;
+    const cursor = p > 1 ? state.pageCursors[p] : null;
 
     set({ usersLoading: true, usersError: null });
     try {
       const params = new URLSearchParams({ page: p, page_size: ps });
+      if (cursor) params.set('cursor', cursor);
       if (state.segmentOrigin) params.set('origin', state.segmentOrigin);
       if (state.segmentFrom) params.set('acquired_from', state.segmentFrom);
       if (state.segmentTo) params.set('acquired_to', state.segmentTo);
@@ -66,8 +72,12 @@ export const useAdminStore = create((set, get) => ({
       const res = await apiFetch(`${API_BASE}/api/admin/users?${params}`);
       if (!res.ok) throw new Error(`HTTP ${res.status}`);
       const data = await res.json();
+      const pageCursors = p === 1 ? {} : { ...get().pageCursors };
+      if (data.next_cursor) pageCursors[data.page + 1] = data.next_cursor;
       set({
         users: data.users,
+        pageCursors,
+        nextCursor: data.next_cursor || null,
         currentPage: data.page,
         totalPages: data.total_pages,
         totalUsers: data.total_users,
@@ -81,8 +91,8 @@ export const useAdminStore = create((set, get) => ({
   },
 
   nextPage: () => {
-    const { currentPage, totalPages, fetchUsers } = get();
-    if (currentPage < totalPages) fetchUsers(currentPage + 1);
+    const { currentPage, nextCursor, fetchUsers } = get();
+    if (nextCursor) fetchUsers(currentPage + 1);
   },
 
   prevPage: () => {
@@ -183,6 +193,16 @@ export const useAdminStore = create((set, get) => ({
     }
   },
 
+  // Progress of a queued (non-test) bulk email: {status: 'sending'|'done', sent, failed, pending, results}
+  fetchBulkEmailJob: async (jobId) => {
+    const res = await apiFetch(`${API_BASE}/api/admin/users/bulk/email/${jobId}`);
+    if (!res.ok) {
+      const err = await res.json();
+      throw new Error(err.detail || `HTTP ${res.status}`);
+    }
+    return res.json();
+  },
+
   fetchFunnel: async (from, to, origin = 'all') => {
     set({ funnelLoading: true });
     try {